@@ -1,8 +1,16 @@
-from algopy import BoxMap, Txn, op, subroutine
-from algopy.arc4 import Address, Bool, Struct, abimethod, emit
+from algopy import BoxMap, Bytes, Global, Txn, UInt64, op, subroutine, urange
+from algopy.arc4 import Address, Bool, DynamicArray, Struct, abimethod, emit
 
-from ..types import Bytes16
-from .interfaces.IAccessControl import IAccessControl, RoleAdminChanged, RoleGranted, RoleRevoked
+from ..types import ARC4UInt64, Bytes16
+from .interfaces.IAccessControl import IAccessControl, RoleAdminChanged, RoleExpiryUpdated, RoleGranted, RoleRevoked
+
+# maximum number of grants or revokes in a batch so their events fit in the 1024 byte log limit of a transaction
+MAX_ROLES_BATCH_SIZE = 12
+# byte length of the value of an address role box of a grant which expires, holding the expiry timestamp
+EXPIRY_SIZE = 8
+# minimum balance of a box is a flat amount plus an amount per byte of its key and value
+BOX_FLAT_MIN_BALANCE = 2_500
+BOX_BYTE_MIN_BALANCE = 400
 
 # Structs
 class AddressRoleKey(Struct):
@@ -15,11 +23,15 @@ class AccessControl(IAccessControl):
     OpenZeppelin equivalent contract.
 
     Roles are referred to by their `Bytes16` identifier. These should be exposed in the external API and be unique. The
-    best way to achieve this is by using readonly ABI methods with hash digests:
+    best way to achieve this is by using readonly ABI methods with hash digests. To avoid hashing on every call, the
+    digest can be precomputed as a module constant with `python -m scripts.identifiers --role MY_ROLE`:
     ```python
+    # keccak256("MY_ROLE")[:16]
+    MY_ROLE_ROLE = b"\\x..."
+
     @abimethod(readonly=True)
     def my_role(self) -> Bytes16:
-        return Bytes16.from_bytes(op.extract(op.keccak256(b"MY_ROLE"), 0, 16))
+        return Bytes16.from_bytes(MY_ROLE_ROLE)
     ```
 
     Roles can be used to represent a set of permissions. To restrict access to a method call, use {has_role}:
@@ -37,8 +49,20 @@ class AccessControl(IAccessControl):
         self._check_sender_role(self.my_role())
         ...
     ```
+    Similarly {has_any_role} and {_check_sender_any_role} authorise an account holding at least one of several roles
+    e.g. an operator or an admin, and {has_all_roles} and {_check_sender_all_roles} one holding all of them.
     Roles can be granted and revoked dynamically via the {grant_role} and {revoke_role} functions. Each role has an
     associated admin role, and only accounts that have a role's admin role can call {grant_role} and {revoke_role}.
+    Multiple accounts can be granted or revoked in a single call with {grant_roles}, {revoke_roles},
+    {grant_role_pairs} and {revoke_role_pairs}.
+
+    Temporary roles can be granted with {grant_role_until}, after which the role is treated as revoked without any
+    further transaction. The boxes of expired grants can be deleted by anyone with {prune_expired} to reclaim their
+    minimum balance.
+
+    NOTE: As a grant box holds either a boolean or an expiry, `addresses_roles` is declared with `Bytes` values, so its
+    value type in the ARC-56 spec is `byte[]` rather than `bool`. Permanent grants are still stored as the ARC-4 bool
+    true, so existing boxes remain valid, but clients reading the box map must decode the value themselves.
 
     By default, the admin role for all roles is `{default_admin_role}`, which means that only accounts with this role
     will be able to grant or revoke other roles. More complex role relationships can be created by using
@@ -50,9 +74,10 @@ class AccessControl(IAccessControl):
     def __init__(self) -> None:
         # role -> role admin (which is itself a role)
         self.roles = BoxMap(Bytes16, Bytes16, key_prefix=b"role_")
-        # (role, address) -> whether address has role
+        # (role, address) -> grant, either the ARC-4 bool true if permanent or the 8 byte big-endian expiry timestamp if
+        # it expires, so declared as raw bytes and read through `_address_role_key`
         self.addresses_roles = BoxMap(
-            AddressRoleKey, Bool, key_prefix=b"address_roles_"
+            AddressRoleKey, Bytes, key_prefix=b"address_roles_"
         )
 
     @abimethod
@@ -83,6 +108,149 @@ class AccessControl(IAccessControl):
         self._check_sender_role(self.get_role_admin(role))
         self._revoke_role(role, account)
 
+    @abimethod
+    def grant_role_until(self, role: Bytes16, account: Address, expiry: UInt64) -> None:
+        """Grant a role to an account until the given time, after which the account no longer has the role
+
+        If the account already has the role then its expiry is replaced, including making a permanent grant expire.
+
+        Args:
+            role: The role to grant
+            account: The account to grant the role to
+            expiry: The timestamp from which the account no longer has the role
+
+        Raises:
+            AssertionError: If the sender doesn't have role's admin role.
+            AssertionError: If the expiry is not in the future.
+        """
+        self._check_sender_role(self.get_role_admin(role))
+        self._grant_role_until(role, account, expiry)
+
+    @abimethod
+    def prune_expired(self, role: Bytes16, accounts: DynamicArray[Address]) -> UInt64:
+        """Deletes the boxes of the expired grants of a role. Anyone can call this method.
+
+        Accounts whose grant is permanent, has not expired or doesn't exist are skipped. Emits {RoleRevoked} for each
+        grant deleted, so indexers following the events drop it.
+
+        Args:
+            role: The role whose grants to prune
+            accounts: The accounts to prune the grants of
+
+        Returns:
+            The minimum balance freed in microALGO
+
+        Raises:
+            AssertionError: If the number of accounts exceeds the maximum batch size.
+        """
+        self._check_roles_batch_size(accounts.length)
+        freed_min_balance = UInt64(0)
+        for idx in urange(accounts.length):
+            account = accounts[idx]
+            address_role_key = self._address_role_key(role, account)
+            value, exists = op.Box.get(address_role_key)
+            if exists and value.length == EXPIRY_SIZE and op.btoi(value) <= Global.latest_timestamp:
+                op.Box.delete(address_role_key)
+                freed_min_balance += BOX_FLAT_MIN_BALANCE + BOX_BYTE_MIN_BALANCE * (
+                    address_role_key.length + value.length
+                )
+                emit(RoleRevoked(role, account, Address(Txn.sender)))
+        return freed_min_balance
+
+    @abimethod
+    def grant_roles(self, role: Bytes16, accounts: DynamicArray[Address]) -> None:
+        """Grant a role to multiple accounts. The sender's admin role is only checked once.
+
+        Args:
+            role: The role to grant
+            accounts: The accounts to grant the role to
+
+        Raises:
+            AssertionError: If the number of accounts exceeds the maximum batch size.
+            AssertionError: If the sender doesn't have role's admin role.
+        """
+        self._check_roles_batch_size(accounts.length)
+        self._check_sender_role(self.get_role_admin(role))
+        for idx in urange(accounts.length):
+            self._grant_role(role, accounts[idx])
+
+    @abimethod
+    def revoke_roles(self, role: Bytes16, accounts: DynamicArray[Address]) -> None:
+        """Revokes a role from multiple accounts. The sender's admin role is only checked once.
+
+        Args:
+            role: The role to revoke
+            accounts: The accounts to revoke the role from
+
+        Raises:
+            AssertionError: If the number of accounts exceeds the maximum batch size.
+            AssertionError: If the sender doesn't have role's admin role.
+        """
+        self._check_roles_batch_size(accounts.length)
+        self._check_sender_role(self.get_role_admin(role))
+        for idx in urange(accounts.length):
+            self._revoke_role(role, accounts[idx])
+
+    @abimethod
+    def grant_role_pairs(self, pairs: DynamicArray[AddressRoleKey]) -> None:
+        """Grant each role to its paired account.
+
+        The admin of each distinct role is only read once, and the sender is only checked for each distinct admin role
+        once, the first time a role it administers appears, against the state at that point in the batch. Roles sharing
+        an admin e.g. the default admin role are checked with a single read of the sender's box.
+
+        Args:
+            pairs: The (role, account) pairs to grant
+
+        Raises:
+            AssertionError: If the number of pairs exceeds the maximum batch size.
+            AssertionError: If the sender doesn't have the admin role of any of the roles.
+        """
+        self._check_roles_batch_size(pairs.length)
+        checked_roles = DynamicArray[Bytes16]()
+        checked_admin_roles = DynamicArray[Bytes16]()
+        for idx in urange(pairs.length):
+            pair = pairs[idx].copy()
+            role = pair.role.copy()
+            # the admin of a role can't change within the batch so its box is only read the first time the role appears
+            if not self._contains_role(checked_roles, role):
+                admin_role = self.get_role_admin(role)
+                if not self._contains_role(checked_admin_roles, admin_role):
+                    self._check_sender_role(admin_role)
+                    checked_admin_roles.append(admin_role.copy())
+                checked_roles.append(role.copy())
+            self._grant_role(role, pair.address)
+
+    @abimethod
+    def revoke_role_pairs(self, pairs: DynamicArray[AddressRoleKey]) -> None:
+        """Revokes each role from its paired account.
+
+        The admin of each distinct role is only read once, and the sender is only checked for each distinct admin role
+        once, the first time a role it administers appears, against the state at that point in the batch. Roles sharing
+        an admin e.g. the default admin role are checked with a single read of the sender's box.
+
+        Args:
+            pairs: The (role, account) pairs to revoke
+
+        Raises:
+            AssertionError: If the number of pairs exceeds the maximum batch size.
+            AssertionError: If the sender doesn't have the admin role of any of the roles.
+        """
+        self._check_roles_batch_size(pairs.length)
+        checked_roles = DynamicArray[Bytes16]()
+        checked_admin_roles = DynamicArray[Bytes16]()
+        for idx in urange(pairs.length):
+            pair = pairs[idx].copy()
+            role = pair.role.copy()
+            # the admin of a role can't change within the batch so its box is only read the first time the role appears
+            if not self._contains_role(checked_roles, role):
+                admin_role = self.get_role_admin(role)
+                if not self._contains_role(checked_admin_roles, admin_role):
+                    self._check_sender_role(admin_role)
+                    checked_admin_roles.append(admin_role.copy())
+                checked_roles.append(role.copy())
+            self._revoke_role(role, pair.address)
+
     @abimethod
     def renounce_role(self, role: Bytes16) -> None:
         """Revokes a role from the caller
@@ -112,8 +280,64 @@ class AccessControl(IAccessControl):
         Returns:
             Whether the account has been granted a role
         """
-        address_role_key = self._address_role_key(role, account)
-        return Bool(address_role_key in self.addresses_roles) and self.addresses_roles[address_role_key]
+        return Bool(self._has_role(role, account))
+
+    @abimethod(readonly=True)
+    def get_role_expiry(self, role: Bytes16, account: Address) -> UInt64:
+        """Returns when the account's grant of a role expires
+
+        Args:
+            role: The role to check
+            account: The account to check
+
+        Returns:
+            The expiry timestamp, or zero if the grant is permanent or doesn't exist
+        """
+        value, exists = op.Box.get(self._address_role_key(role, account))
+        if exists and value.length == EXPIRY_SIZE:
+            return op.btoi(value)
+        return UInt64(0)
+
+    @abimethod(readonly=True)
+    def has_any_role(self, roles: DynamicArray[Bytes16], account: Address) -> Bool:
+        """Returns whether the account has been granted at least one of the roles
+
+        Stops at the first role the account has, so only the boxes of the roles checked up to that point need to be
+        referenced. List the roles most likely to be held first.
+
+        Args:
+            roles: The roles to check
+            account: The account to check
+
+        Returns:
+            Whether the account has been granted any of the roles
+        """
+        for idx in urange(roles.length):
+            if self._has_role(roles[idx].copy(), account):
+                return Bool(True)
+        return Bool(False)
+
+    @abimethod(readonly=True)
+    def has_all_roles(self, roles: DynamicArray[Bytes16], account: Address) -> Bool:
+        """Returns whether the account has been granted every one of the roles
+
+        Stops at the first role the account doesn't have, so only the boxes of the roles checked up to that point need
+        to be referenced. List the roles least likely to be held first.
+
+        Args:
+            roles: The roles to check
+            account: The account to check
+
+        Returns:
+            Whether the account has been granted all of the roles, false if there are no roles so that an empty list
+            doesn't authorise every account
+        """
+        if not roles.length:
+            return Bool(False)
+        for idx in urange(roles.length):
+            if not self._has_role(roles[idx].copy(), account):
+                return Bool(False)
+        return Bool(True)
 
     @abimethod(readonly=True)
     def get_role_admin(self, role: Bytes16) -> Bytes16:
@@ -142,8 +366,33 @@ class AccessControl(IAccessControl):
         emit(RoleAdminChanged(role, previous_role_admin, admin_role))
 
     @subroutine
-    def _address_role_key(self, role: Bytes16, account: Address) -> AddressRoleKey:
-        return AddressRoleKey(role.copy(), account)
+    def _check_roles_batch_size(self, batch_size: UInt64) -> None:
+        assert batch_size <= MAX_ROLES_BATCH_SIZE, "Exceeds maximum batch size"
+
+    @subroutine
+    def _contains_role(self, roles: DynamicArray[Bytes16], role: Bytes16) -> bool:
+        for idx in urange(roles.length):
+            if roles[idx] == role:
+                return True
+        return False
+
+    @subroutine
+    def _address_role_key(self, role: Bytes16, account: Address) -> Bytes:
+        # build the box key directly rather than copying into an AddressRoleKey
+        return self.addresses_roles.key_prefix + role.bytes + account.bytes
+
+    @subroutine
+    def _has_role(self, role: Bytes16, account: Address) -> bool:
+        # read the box once, rather than checking existence and then reading it
+        value, exists = op.Box.get(self._address_role_key(role, account))
+        return exists and self._is_grant_active(value)
+
+    @subroutine
+    def _is_grant_active(self, value: Bytes) -> bool:
+        # a grant which expires holds its expiry timestamp instead of a boolean
+        if value.length == EXPIRY_SIZE:
+            return Global.latest_timestamp < op.btoi(value)
+        return value == Bool(True).bytes
 
     @subroutine
     def _check_sender_role(self, role: Bytes16) -> None:
@@ -151,7 +400,23 @@ class AccessControl(IAccessControl):
 
     @subroutine
     def _check_role(self, role: Bytes16, account: Address) -> None:
-        assert self.has_role(role, account), "Access control unauthorised account"
+        assert self._has_role(role, account), "Access control unauthorised account"
+
+    @subroutine
+    def _check_sender_any_role(self, roles: DynamicArray[Bytes16]) -> None:
+        self._check_any_role(roles, Address(Txn.sender))
+
+    @subroutine
+    def _check_any_role(self, roles: DynamicArray[Bytes16], account: Address) -> None:
+        assert self.has_any_role(roles, account), "Access control unauthorised account"
+
+    @subroutine
+    def _check_sender_all_roles(self, roles: DynamicArray[Bytes16]) -> None:
+        self._check_all_roles(roles, Address(Txn.sender))
+
+    @subroutine
+    def _check_all_roles(self, roles: DynamicArray[Bytes16], account: Address) -> None:
+        assert self.has_all_roles(roles, account), "Access control unauthorised account"
 
     @subroutine
     def _grant_role(self, role: Bytes16, account: Address) -> Bool:
@@ -159,22 +424,68 @@ class AccessControl(IAccessControl):
         if role not in self.roles:
             self.roles[role] = self.default_admin_role()
 
-        # grant role to account if it doesn't have
-        if not self.has_role(role, account):
-            address_role_key = self._address_role_key(role, account)
-            self.addresses_roles[address_role_key] = Bool(True)
+        # skip if account already has permanent grant
+        address_role_key = self._address_role_key(role, account)
+        value, exists = op.Box.get(address_role_key)
+        granted = False
+        if not (exists and value == Bool(True).bytes):
+            # replace any grant which expires with a permanent grant
+            had_role = exists and self._is_grant_active(value)
+            if exists:
+                op.Box.delete(address_role_key)
+            op.Box.put(address_role_key, Bool(True).bytes)
+            if had_role:
+                emit(RoleExpiryUpdated(role, account, ARC4UInt64(0)))
+            else:
+                emit(RoleGranted(role, account, Address(Txn.sender)))
+                granted = True
+        return Bool(granted)
+
+    @subroutine
+    def _grant_role_until(self, role: Bytes16, account: Address, expiry: UInt64) -> Bool:
+        """Grants a role to an account which expires at the given time, replacing any existing grant.
+
+        Args:
+            role: The role to grant
+            account: The account to grant the role to
+            expiry: The timestamp from which the account no longer has the role
+
+        Returns:
+            Whether the account didn't have the role before
+
+        Raises:
+            AssertionError: If the expiry is not in the future.
+        """
+        assert expiry > Global.latest_timestamp, "Expiry must be in the future"
+
+        # if new role then add the default admin role
+        if role not in self.roles:
+            self.roles[role] = self.default_admin_role()
+
+        # write expiry, replacing the existing grant (which may be a different size) if any
+        address_role_key = self._address_role_key(role, account)
+        value, exists = op.Box.get(address_role_key)
+        had_role = exists and self._is_grant_active(value)
+        if exists:
+            op.Box.delete(address_role_key)
+        op.Box.put(address_role_key, op.itob(expiry))
+
+        if not had_role:
             emit(RoleGranted(role, account, Address(Txn.sender)))
-            return Bool(True)
-        else:
-            return Bool(False)
+        emit(RoleExpiryUpdated(role, account, ARC4UInt64(expiry)))
+        return Bool(not had_role)
 
     @subroutine
     def _revoke_role(self, role: Bytes16, account: Address) -> Bool:
-        # revoke role from account if it does have
-        if self.has_role(role, account):
-            address_role_key = self._address_role_key(role, account)
-            del self.addresses_roles[address_role_key]
-            emit(RoleRevoked(role, account, Address(Txn.sender)))
-            return Bool(True)
-        else:
-            return Bool(False)
+        # delete grant if any, including an expired grant to free its box
+        address_role_key = self._address_role_key(role, account)
+        value, exists = op.Box.get(address_role_key)
+        revoked = False
+        if exists:
+            op.Box.delete(address_role_key)
+
+            # revoke role from account if it does have
+            if self._is_grant_active(value):
+                emit(RoleRevoked(role, account, Address(Txn.sender)))
+                revoked = True
+        return Bool(revoked)
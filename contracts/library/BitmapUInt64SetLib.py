@@ -0,0 +1,139 @@
+from algopy import Bytes, UInt64, op, subroutine, urange
+from algopy.arc4 import Bool
+
+
+"""Library for a set of small UInt64 values stored as a bitmap inside a box. Suited to dense ranges of identifiers
+e.g. chain ids, role indexes and nonce windows, costing one bit per possible value rather than 8 bytes per item.
+
+The box starts with an 8-byte count of the items in the set, followed by the bitmap in 8-byte words. Item `i` is bit
+`i % 8` (most significant first, as with `getbit`/`setbit`) of byte `i // 8` of the bitmap. The box is created on the
+first addition and grown in whole words to fit the largest item added, so its size depends on the largest item rather
+than the number of items. A missing box is treated as an empty set.
+
+{has_item}, {add_item}, {remove_item} and {popcount} have a constant opcode cost. {add_range} and {remove_range} cost
+is proportional to the number of 64-bit words covered by the range so a caller may need to increase the opcode budget
+for large ranges.
+
+Note only supports items less than 262080 because a box cannot exceed 32768 bytes.
+"""
+# byte length of the item count stored at the start of the box
+HEADER_SIZE = 8
+# byte length of a bitmap word
+WORD_SIZE = 8
+# exclusive upper bound of the items which fit in a box
+MAX_ITEMS = 262080
+ALL_BITS = 0xFFFFFFFFFFFFFFFF
+
+
+@subroutine
+def popcount(box_key: Bytes) -> UInt64:
+    exists = op.Box.length(box_key)[1]
+    return op.btoi(op.Box.extract(box_key, 0, HEADER_SIZE)) if exists else UInt64(0)
+
+@subroutine
+def capacity(box_key: Bytes) -> UInt64:
+    box_length, exists = op.Box.length(box_key)
+    return (box_length - HEADER_SIZE) * 8 if exists else UInt64(0)
+
+@subroutine
+def has_item(to_search: UInt64, box_key: Bytes) -> Bool:
+    if to_search >= capacity(box_key):
+        return Bool(False)
+    byte = op.Box.extract(box_key, HEADER_SIZE + to_search // 8, 1)
+    return Bool(op.getbit(byte, to_search % 8) == 1)
+
+@subroutine
+def add_item(to_add: UInt64, box_key: Bytes) -> Bool:
+    assert to_add < MAX_ITEMS, "Item exceeds maximum"
+    _ensure_capacity(to_add + 1, box_key)
+    return Bool(_set_bit(to_add, UInt64(1), box_key))
+
+@subroutine
+def remove_item(to_remove: UInt64, box_key: Bytes) -> Bool:
+    if to_remove >= capacity(box_key):
+        return Bool(False)
+    return Bool(_set_bit(to_remove, UInt64(0), box_key))
+
+@subroutine
+def add_range(start: UInt64, end: UInt64, box_key: Bytes) -> UInt64:
+    """Adds all the items in [start, end).
+
+    Returns:
+        The number of items which were not already present.
+    """
+    assert start <= end, "Invalid range"
+    if start == end:
+        return UInt64(0)
+    _ensure_capacity(end, box_key)
+    return _update_range(start, end, True, box_key)
+
+@subroutine
+def remove_range(start: UInt64, end: UInt64, box_key: Bytes) -> UInt64:
+    """Removes all the items in [start, end).
+
+    Returns:
+        The number of items which were present.
+    """
+    assert start <= end, "Invalid range"
+    max_end = capacity(box_key)
+    if end > max_end:
+        end = max_end
+    if start >= end:
+        return UInt64(0)
+    return _update_range(start, end, False, box_key)
+
+@subroutine
+def _ensure_capacity(num_items: UInt64, box_key: Bytes) -> None:
+    # grow box to the number of whole words needed to fit the items
+    assert num_items <= MAX_ITEMS, "Item exceeds maximum"
+    size = HEADER_SIZE + (num_items + 63) // 64 * WORD_SIZE
+    box_length, exists = op.Box.length(box_key)
+    if not exists:
+        op.Box.create(box_key, size)
+    elif box_length < size:
+        op.Box.resize(box_key, size)
+
+@subroutine
+def _set_bit(item: UInt64, value: UInt64, box_key: Bytes) -> bool:
+    # returns whether the bit changed, in which case the count is updated
+    byte_offset = HEADER_SIZE + item // 8
+    byte = op.Box.extract(box_key, byte_offset, 1)
+    if op.getbit(byte, item % 8) == value:
+        return False
+    op.Box.replace(box_key, byte_offset, op.setbit_bytes(byte, item % 8, value))
+    count = op.btoi(op.Box.extract(box_key, 0, HEADER_SIZE))
+    op.Box.replace(box_key, 0, op.itob(count + 1 if value else count - 1))
+    return True
+
+@subroutine
+def _update_range(start: UInt64, end: UInt64, add: bool, box_key: Bytes) -> UInt64:
+    # sets or clears bits word by word, counting the bits which change
+    num_changed = UInt64(0)
+    for word in urange(start // 64, (end - 1) // 64 + 1):
+        word_start = word * 64
+        low = start - word_start if start > word_start else UInt64(0)
+        high = end - word_start if end < word_start + 64 else UInt64(64)
+        mask = UInt64(ALL_BITS) >> low
+        if high < 64:
+            mask &= ~(UInt64(ALL_BITS) >> high)
+
+        word_offset = HEADER_SIZE + word * WORD_SIZE
+        old_word = op.btoi(op.Box.extract(box_key, word_offset, WORD_SIZE))
+        new_word = old_word | mask if add else old_word & ~mask
+        if new_word != old_word:
+            num_changed += _popcount64(new_word ^ old_word)
+            op.Box.replace(box_key, word_offset, op.itob(new_word))
+
+    # update count
+    count = op.btoi(op.Box.extract(box_key, 0, HEADER_SIZE))
+    op.Box.replace(box_key, 0, op.itob(count + num_changed if add else count - num_changed))
+    return num_changed
+
+@subroutine
+def _popcount64(x: UInt64) -> UInt64:
+    # SWAR bit count, using mulw for the final sum so the multiplication cannot overflow
+    x = x - ((x >> 1) & 0x5555555555555555)
+    x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+    high, low = op.mulw(x, 0x0101010101010101)
+    return low >> 56
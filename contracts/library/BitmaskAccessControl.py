@@ -0,0 +1,257 @@
+from algopy import BoxMap, Bytes, Txn, UInt64, op, subroutine
+from algopy.arc4 import Address, Bool, Struct, abimethod, emit
+
+from ..types import ARC4UInt8, Bytes16
+from .interfaces.IAccessControl import IAccessControl, RoleAdminChanged, RoleGranted, RoleRevoked
+
+# maximum number of roles which fit in the bitmask of an address
+MAX_ROLES = 64
+
+# Structs
+class RoleData(Struct):
+    admin_role: Bytes16
+    index: ARC4UInt8
+
+
+class BitmaskAccessControl(IAccessControl):
+    """Contract module that allows children to implement role-based access control mechanisms, storing the roles of
+    each address in a single bitmask.
+
+    Shares the interface, events and semantics of AccessControl (see its documentation for how to use roles) but uses
+    a different storage layout. Every role is registered to a small index (in the order they are first used) and the
+    roles of an address are stored as a uint64 bitmask in a single box, where the role with index `i` is the bit
+    `1 << i`. Compared to AccessControl which uses a box per (role, address) pair:
+     - An address with many roles only requires the minimum balance of a single box.
+     - Checking several roles of an address only reads a single address box (plus the box of each role to look up its
+       index). Where the indexes of roles are known in advance, {_has_roles_mask} checks any number of roles without
+       reading the role boxes at all.
+
+    Checking a single role with {has_role} reads the box of the role as well as the box of the address, so it needs two
+    box references where AccessControl needs one, and costs more opcodes to look up the index. The indexes can't be
+    kept in global state instead as its schema is fixed at creation and would have to reserve a slot for each of the 64
+    roles. Contracts which mostly check single roles of addresses with few roles should prefer AccessControl.
+
+    The box of an address is deleted when its last role is revoked.
+
+    Note supports up to 64 roles (including the default admin role). Indexes are never reused.
+    """
+    def __init__(self) -> None:
+        # number of roles registered
+        self.num_roles = UInt64(0)
+        # role -> role admin (which is itself a role) and role index
+        self.roles = BoxMap(Bytes16, RoleData, key_prefix=b"role_")
+        # address -> bitmask of roles address has
+        self.addresses_roles = BoxMap(Address, UInt64, key_prefix=b"address_roles_")
+
+    @abimethod
+    def grant_role(self, role: Bytes16, account: Address) -> None:
+        """Grant a role to an account
+
+        Args:
+            role: The role to grant
+            account: The account to grant the role to
+
+        Raises:
+            AssertionError: If the sender doesn't have role's admin role.
+        """
+        self._check_sender_role(self.get_role_admin(role))
+        self._grant_role(role, account)
+
+    @abimethod
+    def revoke_role(self, role: Bytes16, account: Address) -> None:
+        """Revokes a role from an account
+
+        Args:
+            role: The role to revoke
+            account: The account to revoke the role from
+
+        Raises:
+            AssertionError: If the sender doesn't have role's admin role.
+        """
+        self._check_sender_role(self.get_role_admin(role))
+        self._revoke_role(role, account)
+
+    @abimethod
+    def renounce_role(self, role: Bytes16) -> None:
+        """Revokes a role from the caller
+
+        Args:
+            role: The role to renounce
+        """
+        self._revoke_role(role, Address(Txn.sender))
+
+    @abimethod(readonly=True)
+    def default_admin_role(self) -> Bytes16:
+        """Returns the role identifier for the default admin role
+
+        Returns:
+            Empty bytes of length 16
+        """
+        return Bytes16.from_bytes(op.bzero(16))
+
+    @abimethod(readonly=True)
+    def has_role(self, role: Bytes16, account: Address) -> Bool:
+        """Returns whether the account has been granted a role
+
+        Args:
+            role: The role to check
+            account: The account to check
+
+        Returns:
+            Whether the account has been granted a role
+        """
+        role_data_bytes, exists = op.Box.get(self._role_box_key(role))
+        if not exists:
+            return Bool(False)
+        return Bool(self._has_roles_mask(self._role_mask(RoleData.from_bytes(role_data_bytes).index.native), account))
+
+    @abimethod(readonly=True)
+    def get_role_admin(self, role: Bytes16) -> Bytes16:
+        """Returns the admin role that controls a role
+
+        Args:
+            role: The role to get its admin of
+
+        Returns:
+            The role admin
+        """
+        role_data_bytes, exists = op.Box.get(self._role_box_key(role))
+        if not exists:
+            return self.default_admin_role()
+        return RoleData.from_bytes(role_data_bytes).admin_role
+
+    @abimethod(readonly=True)
+    def get_role_index(self, role: Bytes16) -> UInt64:
+        """Returns the index of a role, which is its position in the bitmask of an address
+
+        Args:
+            role: The role to get its index of
+
+        Returns:
+            The role index
+
+        Raises:
+            AssertionError: If the role is unknown.
+        """
+        role_data_bytes, exists = op.Box.get(self._role_box_key(role))
+        assert exists, "Unknown role"
+        return RoleData.from_bytes(role_data_bytes).index.native
+
+    @abimethod(readonly=True)
+    def get_roles_mask(self, account: Address) -> UInt64:
+        """Returns the bitmask of the roles the account has been granted
+
+        Args:
+            account: The account to get its roles of
+
+        Returns:
+            The bitmask of roles, where the role with index `i` is the bit `1 << i`
+        """
+        return self.addresses_roles.get(account, default=UInt64(0))
+
+    @subroutine(inline=False)
+    def _set_role_admin(self, role: Bytes16, admin_role: Bytes16) -> None:
+        """Sets a role's admin role. Registers the role if it is new.
+
+        Args:
+            role: The role whose admin role to set
+            admin_role: The new admin role
+        """
+        previous_role_admin = self.get_role_admin(role)
+        role_data = self._register_role(role)
+        role_data.admin_role = admin_role.copy()
+        self.roles[role] = role_data.copy()
+        emit(RoleAdminChanged(role, previous_role_admin, admin_role))
+
+    @subroutine
+    def _register_role(self, role: Bytes16) -> RoleData:
+        """Registers a role to the next index if it is new, with the default admin role as its admin.
+
+        Args:
+            role: The role to register
+
+        Returns:
+            The data of the role
+
+        Raises:
+            AssertionError: If the maximum number of roles is already registered.
+        """
+        role_data_bytes, exists = op.Box.get(self._role_box_key(role))
+        if exists:
+            role_data = RoleData.from_bytes(role_data_bytes)
+        else:
+            assert self.num_roles < MAX_ROLES, "Exceeds maximum number of roles"
+            role_data = RoleData(self.default_admin_role(), ARC4UInt8(self.num_roles))
+            self.roles[role] = role_data.copy()
+            self.num_roles += 1
+        return role_data
+
+    @subroutine
+    def _role_box_key(self, role: Bytes16) -> Bytes:
+        # the role data is a mutable struct so is read from the box directly rather than unpacked from maybe
+        return self.roles.key_prefix + role.bytes
+
+    @subroutine
+    def _role_mask(self, index: UInt64) -> UInt64:
+        return UInt64(1) << index
+
+    @subroutine
+    def _has_roles_mask(self, mask: UInt64, account: Address) -> bool:
+        """Returns whether the account has been granted all of the roles in the bitmask.
+
+        Args:
+            mask: The bitmask of roles to check, where the role with index `i` is the bit `1 << i`
+            account: The account to check
+
+        Returns:
+            Whether the account has all the roles, false if the bitmask is empty
+        """
+        if not mask:
+            return False
+        return self.addresses_roles.get(account, default=UInt64(0)) & mask == mask
+
+    @subroutine
+    def _check_sender_role(self, role: Bytes16) -> None:
+        self._check_role(role, Address(Txn.sender))
+
+    @subroutine
+    def _check_role(self, role: Bytes16, account: Address) -> None:
+        assert self.has_role(role, account), "Access control unauthorised account"
+
+    @subroutine
+    def _grant_role(self, role: Bytes16, account: Address) -> Bool:
+        # if new role then register it with the default admin role
+        role_data = self._register_role(role)
+
+        # grant role to account if it doesn't have
+        roles_mask = self.addresses_roles.get(account, default=UInt64(0))
+        role_mask = self._role_mask(role_data.index.native)
+        if not roles_mask & role_mask:
+            self.addresses_roles[account] = roles_mask | role_mask
+            emit(RoleGranted(role, account, Address(Txn.sender)))
+            return Bool(True)
+        else:
+            return Bool(False)
+
+    @subroutine
+    def _revoke_role(self, role: Bytes16, account: Address) -> Bool:
+        # role cannot be held if it is unknown
+        role_data_bytes, exists = op.Box.get(self._role_box_key(role))
+        if not exists:
+            return Bool(False)
+        role_data = RoleData.from_bytes(role_data_bytes)
+
+        # revoke role from account if it does have
+        roles_mask = self.addresses_roles.get(account, default=UInt64(0))
+        role_mask = self._role_mask(role_data.index.native)
+        if roles_mask & role_mask:
+            new_roles_mask = roles_mask & ~role_mask
+            if new_roles_mask:
+                self.addresses_roles[account] = new_roles_mask
+            else:
+                # free the box when the address has no roles left
+                del self.addresses_roles[account]
+            emit(RoleRevoked(role, account, Address(Txn.sender)))
+            return Bool(True)
+        else:
+            return Bool(False)
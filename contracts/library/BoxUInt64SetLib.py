@@ -0,0 +1,91 @@
+from algopy import Bytes, UInt64, op, subroutine
+from algopy.arc4 import Bool
+
+
+"""Library for a set of UInt64 values stored directly inside a box. Implemented using a sorted array of 8-byte items.
+
+Unlike UInt64SetLib, the set is never loaded onto the stack. Membership tests binary search the box reading a single
+8-byte item per step with `box_extract`, and mutations splice the 8-byte item into or out of the box in place with
+`box_splice`. Each operation therefore has a near-constant opcode cost regardless of the size of the set.
+
+The box is identified by its full key, is created on the first addition and deleted when its last item is removed. A
+missing box is treated as an empty set.
+
+Note only supports up to 4096 items because a box cannot exceed 32768 bytes. The box references in the transaction
+group must cover the size of the box, i.e. one reference per 1024 bytes (128 items).
+"""
+# byte length of an encoded item
+ITEM_SIZE = 8
+# maximum number of items which fit in a box
+MAX_ITEMS = 4096
+
+
+@subroutine
+def length(box_key: Bytes) -> UInt64:
+    box_length, exists = op.Box.length(box_key)
+    return box_length // ITEM_SIZE if exists else UInt64(0)
+
+@subroutine
+def get_item(box_key: Bytes, idx: UInt64) -> UInt64:
+    assert idx < length(box_key), "Index out of bounds"
+    return op.btoi(op.Box.extract(box_key, idx * ITEM_SIZE, ITEM_SIZE))
+
+@subroutine
+def _lower_bound(value: UInt64, box_key: Bytes, num_items: UInt64) -> UInt64:
+    # index of the first item which is greater than or equal to value, or the length if there is none
+    low = UInt64(0)
+    high = num_items
+    while low < high:
+        mid = (low + high) // 2
+        if op.btoi(op.Box.extract(box_key, mid * ITEM_SIZE, ITEM_SIZE)) < value:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+@subroutine
+def _is_item_at(value: UInt64, idx: UInt64, box_key: Bytes, num_items: UInt64) -> bool:
+    if idx >= num_items:
+        return False
+    return op.btoi(op.Box.extract(box_key, idx * ITEM_SIZE, ITEM_SIZE)) == value
+
+@subroutine
+def has_item(to_search: UInt64, box_key: Bytes) -> Bool:
+    num_items = length(box_key)
+    idx = _lower_bound(to_search, box_key, num_items)
+    return Bool(_is_item_at(to_search, idx, box_key, num_items))
+
+@subroutine
+def add_item(to_add: UInt64, box_key: Bytes) -> Bool:
+    # check if already added in which case skip
+    num_items = length(box_key)
+    idx = _lower_bound(to_add, box_key, num_items)
+    if _is_item_at(to_add, idx, box_key, num_items):
+        return Bool(False)
+
+    # if here then item is not present so must be inserted at its sorted position
+    assert num_items < MAX_ITEMS, "Set is full"
+    if num_items == 0:
+        op.Box.put(box_key, op.itob(to_add))
+    else:
+        # grow by one item, then shift the tail along by inserting the item (which truncates the new zero bytes)
+        op.Box.resize(box_key, (num_items + 1) * ITEM_SIZE)
+        op.Box.splice(box_key, idx * ITEM_SIZE, 0, op.itob(to_add))
+    return Bool(True)
+
+@subroutine
+def remove_item(to_remove: UInt64, box_key: Bytes) -> Bool:
+    num_items = length(box_key)
+    idx = _lower_bound(to_remove, box_key, num_items)
+    if not _is_item_at(to_remove, idx, box_key, num_items):
+        # if here then item is not present
+        return Bool(False)
+
+    if num_items == 1:
+        # free the box when the set becomes empty
+        op.Box.delete(box_key)
+    else:
+        # shift the tail back over the item (which zero fills the end), then shrink by one item
+        op.Box.splice(box_key, idx * ITEM_SIZE, ITEM_SIZE, Bytes())
+        op.Box.resize(box_key, (num_items - 1) * ITEM_SIZE)
+    return Bool(True)
@@ -0,0 +1,407 @@
+from algopy import BigUInt, BoxMap, Bytes, Global, UInt64, subroutine, op, urange
+from algopy.arc4 import Bool, DynamicArray, UInt256, abimethod, emit
+
+from ..types import ARC4UInt64, ARC4UInt256, Bytes32
+from .interfaces.IPackedRateLimiter import (
+    IPackedRateLimiter,
+    GroupBucketAdded,
+    BucketGroupRemoved,
+    GroupBucketRateLimitUpdated,
+    GroupBucketRateDurationUpdated,
+    GroupBucketConsumed,
+    GroupBucketFilled,
+    GroupBucketsConsumed,
+    GroupBucketsFilled
+)
+from .RateLimiter import RateLimitBucket, refill_bucket
+
+# byte length of an encoded RateLimitBucket
+BUCKET_SIZE = 80
+# maximum number of buckets which fit in a group box
+MAX_GROUP_SIZE = 409
+# maximum number of buckets in a batch so the aggregated event fits in a single 1024 byte log
+MAX_GROUP_BATCH_SIZE = 24
+
+
+class PackedRateLimiter(IPackedRateLimiter):
+    """Contract module that allows children to implement rate limiting mechanisms, storing the buckets packed together.
+
+    Shares the bucket semantics of RateLimiter but instead of storing each bucket in its own box, buckets are arranged
+    into groups and every bucket in a group is stored in a single box. A bucket is referred to by the `Bytes32`
+    identifier of its group and its slot inside the group. The box of a group is the concatenation of the fixed size
+    `RateLimitBucket` records of its buckets, where the bucket in slot `i` is stored at byte offset `i * 80`.
+
+    Compared to RateLimiter this has two benefits when there are many related buckets e.g. one per asset:
+     - Only one box reference is needed to access any of the buckets in a group (provided the group box is at most
+       1024 bytes, i.e. 12 buckets, otherwise one reference per 1024 bytes).
+     - Each additional bucket in a group only requires the minimum balance for its 80 bytes rather than for a new box
+       and its 51 byte key.
+
+    Slots are assigned in order starting from zero when buckets are added. A single bucket cannot be removed since
+    this would move the buckets after it to another slot, instead the whole group is removed at once. A duration of
+    zero is interpreted to mean an infinite bucket.
+
+    Note supports up to 409 buckets per group because a box cannot exceed 32768 bytes.
+    """
+    def __init__(self) -> None:
+        # group id -> buckets
+        self.rate_limit_groups = BoxMap(Bytes32, Bytes, key_prefix=b"rate_limit_groups_")
+
+    @abimethod(readonly=True)
+    def get_current_capacity(self, group_id: Bytes32, slot: UInt64) -> UInt256:
+        """Returns the current capacity of the bucket were it to be updated.
+
+        Args:
+            group_id: The group of the bucket to get the current capacity for.
+            slot: The slot of the bucket inside the group.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._update_capacity(group_id, slot)
+
+        # return capacity now that's updated to current time
+        return rate_limit_bucket.current_capacity
+
+    @abimethod(readonly=True)
+    def has_capacity(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> Bool:
+        """Returns whether there's sufficient capacity inside bucket for amount.
+
+        Args:
+            group_id: The group of the bucket to consume from.
+            slot: The slot of the bucket inside the group.
+            amount: The amount to consume.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._update_capacity(group_id, slot)
+
+        # ignore if duration is zero
+        if not rate_limit_bucket.duration.native:
+            return Bool(True)
+
+        # ensure there is enough capacity
+        return Bool(amount <= rate_limit_bucket.current_capacity)
+
+    @abimethod(readonly=True)
+    def get_rate_limit(self, group_id: Bytes32, slot: UInt64) -> UInt256:
+        """Returns the rate limit of the bucket
+
+        Args:
+            group_id: The group of the bucket to get the rate limit of
+            slot: The slot of the bucket inside the group
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        return self._get_bucket(group_id, slot).limit
+
+    @abimethod(readonly=True)
+    def get_rate_duration(self, group_id: Bytes32, slot: UInt64) -> UInt64:
+        """Returns the rate duration of the bucket
+
+        Args:
+            group_id: The group of the bucket to get the rate duration of
+            slot: The slot of the bucket inside the group
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        return self._get_bucket(group_id, slot).duration.native
+
+    @abimethod(readonly=True)
+    def get_group_size(self, group_id: Bytes32) -> UInt64:
+        """Returns the number of buckets in the group, or zero if the group is unknown.
+
+        Args:
+            group_id: The group to get the number of buckets of
+        """
+        return self._get_group_size(group_id)
+
+    @subroutine
+    def _add_bucket(self, group_id: Bytes32, limit: UInt256, duration: UInt64) -> UInt64:
+        """Creates a new bucket with the specified parameters in the next free slot of the group.
+
+        The group is created if it does not exist yet.
+
+        Args:
+            group_id: The group identifier.
+            limit: The maximum capacity during the duration time.
+            duration: The equivalent time to fully replenish the bucket.
+
+        Returns:
+            The slot of the new bucket inside the group.
+
+        Raises:
+            AssertionError: If the group is full.
+        """
+        slot = self._get_group_size(group_id)
+        assert slot < MAX_GROUP_SIZE, "Bucket group is full"
+
+        rate_limit_bucket = RateLimitBucket(
+            limit=limit,
+            current_capacity=limit,
+            duration=ARC4UInt64(duration),
+            last_updated=ARC4UInt64(Global.latest_timestamp)
+        )
+        group_key = self._get_group_key(group_id)
+        if slot == 0:
+            op.Box.put(group_key, rate_limit_bucket.bytes)
+        else:
+            op.Box.resize(group_key, (slot + 1) * BUCKET_SIZE)
+            op.Box.replace(group_key, slot * BUCKET_SIZE, rate_limit_bucket.bytes)
+        emit(GroupBucketAdded(group_id, ARC4UInt64(slot), limit, ARC4UInt64(duration)))
+        return slot
+
+    @subroutine
+    def _remove_group(self, group_id: Bytes32) -> None:
+        """Removes an existing group and all of its buckets.
+
+        Args:
+            group_id: The group identifier.
+
+        Raises:
+            AssertionError: If the group is unknown.
+        """
+        assert group_id in self.rate_limit_groups, "Unknown bucket group"
+
+        del self.rate_limit_groups[group_id]
+        emit(BucketGroupRemoved(group_id))
+
+    @subroutine
+    def _update_rate_limit(self, group_id: Bytes32, slot: UInt64, new_limit: UInt256) -> None:
+        """Update rate limit of existing bucket.
+
+        Args:
+            group_id: The group of the bucket to update.
+            slot: The slot of the bucket inside the group.
+            new_limit: The new limit to set.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(group_id, slot)
+
+        # increase or decrease capacity by change in limit
+        if new_limit.native < rate_limit_bucket.limit.native:
+            # if reducing limit then decrease capacity by difference
+            diff = rate_limit_bucket.limit.native - new_limit.native
+            new_capacity = rate_limit_bucket.current_capacity.native - diff \
+                if rate_limit_bucket.current_capacity.native > diff else BigUInt(0)
+        else:
+            # if increasing limit then increase capacity by difference
+            diff = new_limit.native - rate_limit_bucket.limit.native
+            new_capacity = rate_limit_bucket.current_capacity.native + diff
+        rate_limit_bucket.current_capacity = ARC4UInt256(new_capacity)
+
+        # update limit
+        rate_limit_bucket.limit = new_limit
+        self._set_bucket(group_id, slot, rate_limit_bucket)
+        emit(GroupBucketRateLimitUpdated(group_id, ARC4UInt64(slot), new_limit))
+
+    @subroutine
+    def _update_rate_duration(self, group_id: Bytes32, slot: UInt64, new_duration: UInt64) -> None:
+        """Update duration of existing bucket.
+
+        Args:
+            group_id: The group of the bucket to update.
+            slot: The slot of the bucket inside the group.
+            new_duration: The new duration to set.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(group_id, slot)
+
+        # update duration
+        rate_limit_bucket.duration = ARC4UInt64(new_duration)
+        self._set_bucket(group_id, slot, rate_limit_bucket)
+        emit(GroupBucketRateDurationUpdated(group_id, ARC4UInt64(slot), ARC4UInt64(new_duration)))
+
+    @subroutine(inline=False)
+    def _consume_amount(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> None:
+        """Consumes an amount inside a bucket.
+
+        Args:
+            group_id: The group of the bucket to consume from.
+            slot: The slot of the bucket inside the group.
+            amount: The amount to consume.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+            AssertionError: If there is insufficient capacity.
+        """
+        if self._consume_from_bucket(group_id, slot, amount):
+            emit(GroupBucketConsumed(group_id, ARC4UInt64(slot), amount))
+
+    @subroutine(inline=False)
+    def _fill_amount(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> None:
+        """Fills an amount inside a bucket. Will not exceed the bucket's limit.
+
+        Args:
+            group_id: The group of the bucket to fill into.
+            slot: The slot of the bucket inside the group.
+            amount: The amount to fill.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        filled, fill_amount = self._fill_into_bucket(group_id, slot, amount)
+        if filled:
+            emit(GroupBucketFilled(group_id, ARC4UInt64(slot), fill_amount))
+
+    @subroutine(inline=False)
+    def _consume_amounts(
+        self,
+        group_id: Bytes32,
+        slots: DynamicArray[ARC4UInt64],
+        amounts: DynamicArray[ARC4UInt256]
+    ) -> None:
+        """Consumes an amount inside each of multiple buckets of the same group.
+
+        Emits a single GroupBucketsConsumed event for the buckets consumed from, if any. Buckets with a duration of
+        zero are ignored and not included in the event. The same slot may appear more than once, in which case the
+        amounts are consumed one after another. If there is insufficient capacity in any bucket then the whole
+        transaction fails so either all the amounts are consumed or none are.
+
+        Args:
+            group_id: The group of the buckets to consume from.
+            slots: The slots of the buckets inside the group.
+            amounts: The amount to consume from each bucket.
+
+        Raises:
+            AssertionError: If the number of slots and amounts differ.
+            AssertionError: If the number of slots exceeds the maximum batch size.
+            AssertionError: If any bucket is unknown.
+            AssertionError: If there is insufficient capacity in any bucket.
+        """
+        self._check_batch(slots.length, amounts.length)
+
+        consumed_slots = DynamicArray[ARC4UInt64]()
+        consumed_amounts = DynamicArray[ARC4UInt256]()
+        for idx in urange(slots.length):
+            slot = slots[idx]
+            amount = amounts[idx]
+            if self._consume_from_bucket(group_id, slot.native, amount):
+                consumed_slots.append(slot)
+                consumed_amounts.append(amount)
+        if consumed_slots.length:
+            emit(GroupBucketsConsumed(group_id, consumed_slots.copy(), consumed_amounts.copy()))
+
+    @subroutine(inline=False)
+    def _fill_amounts(
+        self,
+        group_id: Bytes32,
+        slots: DynamicArray[ARC4UInt64],
+        amounts: DynamicArray[ARC4UInt256]
+    ) -> None:
+        """Fills an amount inside each of multiple buckets of the same group. Will not exceed the buckets' limits.
+
+        Emits a single GroupBucketsFilled event for the buckets filled into, if any. Buckets with a duration of zero
+        are ignored and not included in the event.
+
+        Args:
+            group_id: The group of the buckets to fill into.
+            slots: The slots of the buckets inside the group.
+            amounts: The amount to fill into each bucket.
+
+        Raises:
+            AssertionError: If the number of slots and amounts differ.
+            AssertionError: If the number of slots exceeds the maximum batch size.
+            AssertionError: If any bucket is unknown.
+        """
+        self._check_batch(slots.length, amounts.length)
+
+        filled_slots = DynamicArray[ARC4UInt64]()
+        filled_amounts = DynamicArray[ARC4UInt256]()
+        for idx in urange(slots.length):
+            slot = slots[idx]
+            filled, fill_amount = self._fill_into_bucket(group_id, slot.native, amounts[idx])
+            if filled:
+                filled_slots.append(slot)
+                filled_amounts.append(fill_amount)
+        if filled_slots.length:
+            emit(GroupBucketsFilled(group_id, filled_slots.copy(), filled_amounts.copy()))
+
+    @subroutine
+    def _consume_from_bucket(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> bool:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(group_id, slot)
+
+        # ignore if duration is zero
+        if not rate_limit_bucket.duration.native:
+            return False
+
+        # ensure there is enough capacity
+        assert amount <= rate_limit_bucket.current_capacity, "Insufficient capacity to consume"
+
+        # consume amount
+        new_capacity = rate_limit_bucket.current_capacity.native - amount.native
+        rate_limit_bucket.current_capacity = ARC4UInt256(new_capacity)
+        self._set_bucket(group_id, slot, rate_limit_bucket)
+        return True
+
+    @subroutine
+    def _fill_into_bucket(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> tuple[bool, ARC4UInt256]:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(group_id, slot)
+
+        # ignore if duration is zero
+        if not rate_limit_bucket.duration.native:
+            return False, ARC4UInt256(0)
+
+        # fill amount without exceeding limit
+        max_fill_amount = rate_limit_bucket.limit.native - rate_limit_bucket.current_capacity.native
+        fill_amount = amount.native if amount.native < max_fill_amount else max_fill_amount
+        new_capacity = rate_limit_bucket.current_capacity.native + fill_amount
+        rate_limit_bucket.current_capacity = ARC4UInt256(new_capacity)
+        self._set_bucket(group_id, slot, rate_limit_bucket)
+        return True, ARC4UInt256(fill_amount)
+
+    @subroutine
+    def _check_batch(self, num_slots: UInt64, num_amounts: UInt64) -> None:
+        assert num_slots == num_amounts, "Mismatched buckets and amounts"
+        assert num_slots <= MAX_GROUP_BATCH_SIZE, "Exceeds maximum batch size"
+
+    @subroutine(inline=False)
+    def _update_capacity(self, group_id: Bytes32, slot: UInt64) -> RateLimitBucket:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(group_id, slot)
+
+        # ignore if duration is zero
+        if rate_limit_bucket.duration.native:
+            self._set_bucket(group_id, slot, rate_limit_bucket)
+        return rate_limit_bucket
+
+    @subroutine
+    def _get_updated_bucket(self, group_id: Bytes32, slot: UInt64) -> RateLimitBucket:
+        # fails if bucket is unknown
+        return refill_bucket(self._get_bucket(group_id, slot))
+
+    @subroutine
+    def _check_bucket_known(self, group_id: Bytes32, slot: UInt64) -> None:
+        assert slot < self._get_group_size(group_id), "Unknown bucket"
+
+    @subroutine
+    def _get_bucket(self, group_id: Bytes32, slot: UInt64) -> RateLimitBucket:
+        self._check_bucket_known(group_id, slot)
+        encoded = op.Box.extract(self._get_group_key(group_id), slot * BUCKET_SIZE, BUCKET_SIZE)
+        return RateLimitBucket.from_bytes(encoded)
+
+    @subroutine
+    def _set_bucket(self, group_id: Bytes32, slot: UInt64, rate_limit_bucket: RateLimitBucket) -> None:
+        op.Box.replace(self._get_group_key(group_id), slot * BUCKET_SIZE, rate_limit_bucket.bytes)
+
+    @subroutine
+    def _get_group_size(self, group_id: Bytes32) -> UInt64:
+        box_length, exists = op.Box.length(self._get_group_key(group_id))
+        return box_length // BUCKET_SIZE if exists else UInt64(0)
+
+    @subroutine
+    def _get_group_key(self, group_id: Bytes32) -> Bytes:
+        return self.rate_limit_groups.key_prefix + group_id.bytes
@@ -1,5 +1,5 @@
-from algopy import BigUInt, BoxMap, Global, UInt64, subroutine, op
-from algopy.arc4 import Bool, Struct, UInt256, abimethod, emit
+from algopy import BigUInt, BoxMap, Global, UInt64, subroutine, op, urange
+from algopy.arc4 import Bool, DynamicArray, Struct, UInt256, abimethod, emit
 
 from ..types import ARC4UInt64, ARC4UInt256, Bytes32
 from .interfaces.IRateLimiter import (
@@ -9,9 +9,14 @@ from .interfaces.IRateLimiter import (
     BucketRateLimitUpdated,
     BucketRateDurationUpdated,
     BucketConsumed,
-    BucketFilled
+    BucketFilled,
+    BucketsConsumed,
+    BucketsFilled
 )
 
+# maximum number of buckets in a batch so the aggregated event fits in a single 1024 byte log
+MAX_BATCH_SIZE = 15
+
 # Structs
 class RateLimitBucket(Struct):
     limit: ARC4UInt256
@@ -20,17 +25,47 @@ class RateLimitBucket(Struct):
     last_updated: ARC4UInt64
 
 
+@subroutine
+def refill_bucket(rate_limit_bucket: RateLimitBucket) -> RateLimitBucket:
+    """Returns the bucket with its capacity refilled up to the current time. Does not persist the bucket.
+
+    Args:
+        rate_limit_bucket: The bucket to refill.
+    """
+    refilled_bucket = rate_limit_bucket.copy()
+
+    # ignore if duration is zero
+    if not refilled_bucket.duration.native:
+        return refilled_bucket
+
+    # increase capacity by fill rate of <limit> per <duration> without exceeding limit
+    time_delta = Global.latest_timestamp - refilled_bucket.last_updated.native
+    new_capacity_without_max = refilled_bucket.current_capacity.native + (
+            (refilled_bucket.limit.native * time_delta) // refilled_bucket.duration.native
+    )
+
+    # update capacity and last updated timestamp
+    refilled_bucket.current_capacity = refilled_bucket.limit \
+        if new_capacity_without_max > refilled_bucket.limit else ARC4UInt256(new_capacity_without_max)
+    refilled_bucket.last_updated = ARC4UInt64(Global.latest_timestamp)
+    return refilled_bucket
+
+
 class RateLimiter(IRateLimiter):
     """Contract module that allows children to implement rate limiting mechanisms.
 
     The amounts used are in type uint256 (despite the extra opcode cost) to support more generic use cases.
 
     Buckets are referred to by their `Bytes32` identifier. These should be exposed in the external API and be unique.
-    The best way to achieve this is by using readonly ABI methods with hash digests:
+    The best way to achieve this is by using readonly ABI methods with hash digests. To avoid hashing on every call, the
+    digest can be precomputed as a module constant with `python -m scripts.identifiers --bucket INBOUND`:
     ```python
+    # keccak256("INBOUND")
+    INBOUND_BUCKET = b"\\x..."
+
     @abimethod(readonly=True)
     def inbound_bucket_id(self) -> Bytes32:
-        return Bytes32.from_bytes(op.keccak256(b"INBOUND"))
+        return Bytes32.from_bytes(INBOUND_BUCKET)
     ```
 
     A rate limit is defined as a total amount to consume with a defined length of time. The RateLimiter can have
@@ -52,10 +87,10 @@ class RateLimiter(IRateLimiter):
             AssertionError: If the bucket is unknown.
         """
         # fails if bucket is unknown
-        self._update_capacity(bucket_id)
+        rate_limit_bucket = self._update_capacity(bucket_id)
 
         # return capacity now that's updated to current time
-        return self.rate_limit_buckets[bucket_id].current_capacity
+        return rate_limit_bucket.current_capacity
 
     @abimethod(readonly=True)
     def has_capacity(self, bucket_id: Bytes32, amount: UInt256) -> Bool:
@@ -69,10 +104,9 @@ class RateLimiter(IRateLimiter):
             AssertionError: If the bucket is unknown.
         """
         # fails if bucket is unknown
-        self._update_capacity(bucket_id)
+        rate_limit_bucket = self._update_capacity(bucket_id)
 
         # ignore if duration is zero
-        rate_limit_bucket = self._get_bucket(bucket_id)
         if not rate_limit_bucket.duration.native:
             return Bool(True)
 
@@ -89,8 +123,7 @@ class RateLimiter(IRateLimiter):
         Raises:
             AssertionError: If the bucket is unknown.
         """
-        self._check_bucket_known(bucket_id)
-        return self.rate_limit_buckets[bucket_id].limit
+        return self._get_bucket(bucket_id).limit
 
     @abimethod(readonly=True)
     def get_rate_duration(self, bucket_id: Bytes32) -> UInt64:
@@ -102,8 +135,7 @@ class RateLimiter(IRateLimiter):
         Raises:
             AssertionError: If the bucket is unknown.
         """
-        self._check_bucket_known(bucket_id)
-        return self.rate_limit_buckets[bucket_id].duration.native
+        return self._get_bucket(bucket_id).duration.native
 
     @subroutine
     def _add_bucket(self, bucket_id: Bytes32, limit: UInt256, duration: UInt64) -> None:
@@ -153,10 +185,9 @@ class RateLimiter(IRateLimiter):
             AssertionError: If the bucket is unknown.
         """
         # fails if bucket is unknown
-        self._update_capacity(bucket_id)
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
 
         # increase or decrease capacity by change in limit
-        rate_limit_bucket = self._get_bucket(bucket_id)
         if new_limit.native < rate_limit_bucket.limit.native:
             # if reducing limit then decrease capacity by difference
             diff = rate_limit_bucket.limit.native - new_limit.native
@@ -166,10 +197,11 @@ class RateLimiter(IRateLimiter):
             # if increasing limit then increase capacity by difference
             diff = new_limit.native - rate_limit_bucket.limit.native
             new_capacity = rate_limit_bucket.current_capacity.native + diff
-        self.rate_limit_buckets[bucket_id].current_capacity = ARC4UInt256(new_capacity)
+        rate_limit_bucket.current_capacity = ARC4UInt256(new_capacity)
 
         # update limit
-        self.rate_limit_buckets[bucket_id].limit = new_limit
+        rate_limit_bucket.limit = new_limit
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
         emit(BucketRateLimitUpdated(bucket_id, new_limit))
 
     @subroutine
@@ -184,10 +216,11 @@ class RateLimiter(IRateLimiter):
             AssertionError: If the bucket is unknown.
         """
         # fails if bucket is unknown
-        self._update_capacity(bucket_id)
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
 
         # update duration
-        self.rate_limit_buckets[bucket_id].duration = ARC4UInt64(new_duration)
+        rate_limit_bucket.duration = ARC4UInt64(new_duration)
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
         emit(BucketRateDurationUpdated(bucket_id, ARC4UInt64(new_duration)))
 
     @subroutine(inline=False)
@@ -202,21 +235,8 @@ class RateLimiter(IRateLimiter):
             AssertionError: If the bucket is unknown.
             AssertionError: If there is insufficient capacity.
         """
-        # fails if bucket is unknown
-        self._update_capacity(bucket_id)
-
-        # ignore if duration is zero
-        rate_limit_bucket = self._get_bucket(bucket_id)
-        if not rate_limit_bucket.duration.native:
-            return
-
-        # ensure there is enough capacity
-        assert amount <= rate_limit_bucket.current_capacity, "Insufficient capacity to consume"
-
-        # consume amount
-        new_capacity = rate_limit_bucket.current_capacity.native - amount.native
-        self.rate_limit_buckets[bucket_id].current_capacity = ARC4UInt256(new_capacity)
-        emit(BucketConsumed(bucket_id, amount))
+        if self._consume_from_bucket(bucket_id, amount):
+            emit(BucketConsumed(bucket_id, amount))
 
     @subroutine(inline=False)
     def _fill_amount(self, bucket_id: Bytes32, amount: UInt256) -> None:
@@ -229,40 +249,127 @@ class RateLimiter(IRateLimiter):
         Raises:
             AssertionError: If the bucket is unknown.
         """
+        filled, fill_amount = self._fill_into_bucket(bucket_id, amount)
+        if filled:
+            emit(BucketFilled(bucket_id, fill_amount))
+
+    @subroutine(inline=False)
+    def _consume_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt256]) -> None:
+        """Consumes an amount inside each of multiple buckets e.g. a global bucket and a per-asset bucket.
+
+        Emits a single BucketsConsumed event for the buckets consumed from instead of a BucketConsumed event per
+        bucket. Buckets with a duration of zero are ignored and not included in the event, which isn't emitted if no
+        bucket is consumed from. The same bucket may appear more than once, in which case the amounts are consumed one
+        after another. If there is insufficient capacity in any bucket then the whole transaction fails so either all
+        the amounts are consumed or none are.
+
+        Args:
+            bucket_ids: The buckets to consume from.
+            amounts: The amount to consume from each bucket.
+
+        Raises:
+            AssertionError: If the number of buckets and amounts differ.
+            AssertionError: If the number of buckets exceeds the maximum batch size.
+            AssertionError: If any bucket is unknown.
+            AssertionError: If there is insufficient capacity in any bucket.
+        """
+        self._check_batch(bucket_ids.length, amounts.length)
+
+        consumed_bucket_ids = DynamicArray[Bytes32]()
+        consumed_amounts = DynamicArray[ARC4UInt256]()
+        for idx in urange(bucket_ids.length):
+            bucket_id = bucket_ids[idx].copy()
+            amount = amounts[idx]
+            if self._consume_from_bucket(bucket_id, amount):
+                consumed_bucket_ids.append(bucket_id.copy())
+                consumed_amounts.append(amount)
+        if consumed_bucket_ids.length:
+            emit(BucketsConsumed(consumed_bucket_ids.copy(), consumed_amounts.copy()))
+
+    @subroutine(inline=False)
+    def _fill_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt256]) -> None:
+        """Fills an amount inside each of multiple buckets. Will not exceed the buckets' limits.
+
+        Emits a single BucketsFilled event for the buckets filled into instead of a BucketFilled event per bucket.
+        Buckets with a duration of zero are ignored and not included in the event, which isn't emitted if no bucket is
+        filled into.
+
+        Args:
+            bucket_ids: The buckets to fill into.
+            amounts: The amount to fill into each bucket.
+
+        Raises:
+            AssertionError: If the number of buckets and amounts differ.
+            AssertionError: If the number of buckets exceeds the maximum batch size.
+            AssertionError: If any bucket is unknown.
+        """
+        self._check_batch(bucket_ids.length, amounts.length)
+
+        filled_bucket_ids = DynamicArray[Bytes32]()
+        filled_amounts = DynamicArray[ARC4UInt256]()
+        for idx in urange(bucket_ids.length):
+            bucket_id = bucket_ids[idx].copy()
+            filled, fill_amount = self._fill_into_bucket(bucket_id, amounts[idx])
+            if filled:
+                filled_bucket_ids.append(bucket_id.copy())
+                filled_amounts.append(fill_amount)
+        if filled_bucket_ids.length:
+            emit(BucketsFilled(filled_bucket_ids.copy(), filled_amounts.copy()))
+
+    @subroutine
+    def _consume_from_bucket(self, bucket_id: Bytes32, amount: UInt256) -> bool:
         # fails if bucket is unknown
-        self._update_capacity(bucket_id)
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
 
         # ignore if duration is zero
-        rate_limit_bucket = self._get_bucket(bucket_id)
         if not rate_limit_bucket.duration.native:
-            return
+            return False
+
+        # ensure there is enough capacity
+        assert amount <= rate_limit_bucket.current_capacity, "Insufficient capacity to consume"
+
+        # consume amount
+        new_capacity = rate_limit_bucket.current_capacity.native - amount.native
+        rate_limit_bucket.current_capacity = ARC4UInt256(new_capacity)
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        return True
+
+    @subroutine
+    def _fill_into_bucket(self, bucket_id: Bytes32, amount: UInt256) -> tuple[bool, ARC4UInt256]:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
+
+        # ignore if duration is zero
+        if not rate_limit_bucket.duration.native:
+            return False, ARC4UInt256(0)
 
         # fill amount without exceeding limit
         max_fill_amount = rate_limit_bucket.limit.native - rate_limit_bucket.current_capacity.native
         fill_amount = amount.native if amount.native < max_fill_amount else max_fill_amount
         new_capacity = rate_limit_bucket.current_capacity.native + fill_amount
-        self.rate_limit_buckets[bucket_id].current_capacity = ARC4UInt256(new_capacity)
-        emit(BucketFilled(bucket_id, ARC4UInt256(fill_amount)))
+        rate_limit_bucket.current_capacity = ARC4UInt256(new_capacity)
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        return True, ARC4UInt256(fill_amount)
+
+    @subroutine
+    def _check_batch(self, num_buckets: UInt64, num_amounts: UInt64) -> None:
+        assert num_buckets == num_amounts, "Mismatched buckets and amounts"
+        assert num_buckets <= MAX_BATCH_SIZE, "Exceeds maximum batch size"
 
     @subroutine(inline=False)
-    def _update_capacity(self, bucket_id: Bytes32) -> None:
+    def _update_capacity(self, bucket_id: Bytes32) -> RateLimitBucket:
         # fails if bucket is unknown
-        rate_limit_bucket = self._get_bucket(bucket_id)
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
 
         # ignore if duration is zero
-        if not rate_limit_bucket.duration.native:
-            return
-
-        # increase capacity by fill rate of <limit> per <duration> without exceeding limit
-        time_delta = Global.latest_timestamp - rate_limit_bucket.last_updated.native
-        new_capacity_without_max = rate_limit_bucket.current_capacity.native + (
-                (rate_limit_bucket.limit.native * time_delta) // rate_limit_bucket.duration.native
-        )
+        if rate_limit_bucket.duration.native:
+            self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        return rate_limit_bucket
 
-        # update capacity and last updated timestamp
-        self.rate_limit_buckets[bucket_id].current_capacity = rate_limit_bucket.limit \
-            if new_capacity_without_max > rate_limit_bucket.limit else ARC4UInt256(new_capacity_without_max)
-        self.rate_limit_buckets[bucket_id].last_updated = ARC4UInt64(Global.latest_timestamp)
+    @subroutine
+    def _get_updated_bucket(self, bucket_id: Bytes32) -> RateLimitBucket:
+        # fails if bucket is unknown
+        return refill_bucket(self._get_bucket(bucket_id))
 
     @subroutine
     def _check_bucket_known(self, bucket_id: Bytes32) -> None:
@@ -270,5 +377,7 @@ class RateLimiter(IRateLimiter):
 
     @subroutine
     def _get_bucket(self, bucket_id: Bytes32) -> RateLimitBucket:
-        self._check_bucket_known(bucket_id)
-        return self.rate_limit_buckets[bucket_id]
+        # read the box directly as a mutable struct can't be unpacked from the result of maybe
+        bucket_bytes, exists = op.Box.get(self.rate_limit_buckets.key_prefix + bucket_id.bytes)
+        assert exists, "Unknown bucket"
+        return RateLimitBucket.from_bytes(bucket_bytes)
@@ -0,0 +1,389 @@
+from algopy import BoxMap, Global, UInt64, subroutine, op, urange
+from algopy.arc4 import Bool, DynamicArray, Struct, UInt256, abimethod, emit
+
+from ..types import ARC4UInt64, ARC4UInt256, Bytes32
+from .interfaces.IRateLimiter import (
+    IRateLimiter,
+    BucketAdded,
+    BucketRemoved,
+    BucketRateLimitUpdated,
+    BucketRateDurationUpdated,
+    BucketConsumed,
+    BucketFilled,
+    BucketsConsumed,
+    BucketsFilled
+)
+from .RateLimiter import MAX_BATCH_SIZE
+
+# Structs
+class RateLimitBucketUInt64(Struct):
+    limit: ARC4UInt64
+    current_capacity: ARC4UInt64
+    duration: ARC4UInt64
+    last_updated: ARC4UInt64
+
+
+class RateLimiterUInt64(IRateLimiter):
+    """Variant of the RateLimiter contract module for amounts which always fit in uint64 e.g. ALGO and ASA amounts.
+
+    The bucket limit and capacity are stored as uint64, shrinking each bucket from 80 to 32 bytes, and the refill
+    arithmetic uses the native `mulw` and `divw` opcodes instead of the more expensive byte math. The external API and
+    the events emitted are the same as RateLimiter so clients can use either. Amounts passed to the external API which
+    do not fit in uint64 are handled as exceeding any capacity.
+
+    Buckets are referred to by their `Bytes32` identifier. These should be exposed in the external API and be unique.
+    The best way to achieve this is by using readonly ABI methods with hash digests. To avoid hashing on every call, the
+    digest can be precomputed as a module constant with `python -m scripts.identifiers --bucket INBOUND`:
+    ```python
+    # keccak256("INBOUND")
+    INBOUND_BUCKET = b"\\x..."
+
+    @abimethod(readonly=True)
+    def inbound_bucket_id(self) -> Bytes32:
+        return Bytes32.from_bytes(INBOUND_BUCKET)
+    ```
+
+    A rate limit is defined as a total amount to consume with a defined length of time. The RateLimiterUInt64 can have
+    multiple buckets with different parameters e.g. one bucket for inbound requests and one bucket for outbound
+    requests. A duration of zero is interpreted to mean an infinite bucket.
+    """
+    def __init__(self) -> None:
+        # bucket id -> bucket
+        self.rate_limit_buckets = BoxMap(Bytes32, RateLimitBucketUInt64, key_prefix=b"rate_limit_buckets_")
+
+    @abimethod(readonly=True)
+    def get_current_capacity(self, bucket_id: Bytes32) -> UInt256:
+        """Returns the current capacity of the bucket were it to be updated.
+
+        Args:
+            bucket_id: The bucket to get the current capacity for.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._update_capacity(bucket_id)
+
+        # return capacity now that's updated to current time
+        return ARC4UInt256(rate_limit_bucket.current_capacity.native)
+
+    @abimethod(readonly=True)
+    def has_capacity(self, bucket_id: Bytes32, amount: UInt256) -> Bool:
+        """Returns whether there's sufficient capacity inside bucket for amount.
+
+        Args:
+            bucket_id: The bucket to consume from.
+            amount: The amount to consume.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._update_capacity(bucket_id)
+
+        # ignore if duration is zero
+        if not rate_limit_bucket.duration.native:
+            return Bool(True)
+
+        # ensure there is enough capacity
+        if not self._fits_uint64(amount):
+            return Bool(False)
+        return Bool(op.extract_uint64(amount.bytes, 24) <= rate_limit_bucket.current_capacity.native)
+
+    @abimethod(readonly=True)
+    def get_rate_limit(self, bucket_id: Bytes32) -> UInt256:
+        """Returns the rate limit of the bucket
+
+        Args:
+            bucket_id: The bucket to get the rate limit of
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        return ARC4UInt256(self._get_bucket(bucket_id).limit.native)
+
+    @abimethod(readonly=True)
+    def get_rate_duration(self, bucket_id: Bytes32) -> UInt64:
+        """Returns the rate duration of the bucket
+
+        Args:
+            bucket_id: The bucket to get the rate duration of
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        return self._get_bucket(bucket_id).duration.native
+
+    @subroutine
+    def _add_bucket(self, bucket_id: Bytes32, limit: UInt64, duration: UInt64) -> None:
+        """Creates a new bucket with the specified parameters.
+
+        Args:
+            bucket_id: The bucket identifier.
+            limit: The maximum capacity during the duration time.
+            duration: The equivalent time to fully replenish the bucket.
+
+        Raises:
+            AssertionError: If the bucket already exists.
+        """
+        assert bucket_id not in self.rate_limit_buckets, "Bucket already exists"
+        self.rate_limit_buckets[bucket_id] = RateLimitBucketUInt64(
+            limit=ARC4UInt64(limit),
+            current_capacity=ARC4UInt64(limit),
+            duration=ARC4UInt64(duration),
+            last_updated=ARC4UInt64(Global.latest_timestamp)
+        )
+        emit(BucketAdded(bucket_id, ARC4UInt256(limit), ARC4UInt64(duration)))
+
+    @subroutine
+    def _remove_bucket(self, bucket_id: Bytes32) -> None:
+        """Removes an existing bucket.
+
+        Args:
+            bucket_id: The bucket identifier.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        self._check_bucket_known(bucket_id)
+
+        del self.rate_limit_buckets[bucket_id]
+        emit(BucketRemoved(bucket_id))
+
+    @subroutine
+    def _update_rate_limit(self, bucket_id: Bytes32, new_limit: UInt64) -> None:
+        """Update rate limit of existing bucket.
+
+        Args:
+            bucket_id: The bucket to update.
+            new_limit: The new limit to set.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
+
+        # increase or decrease capacity by change in limit
+        if new_limit < rate_limit_bucket.limit.native:
+            # if reducing limit then decrease capacity by difference
+            diff = rate_limit_bucket.limit.native - new_limit
+            new_capacity = rate_limit_bucket.current_capacity.native - diff \
+                if rate_limit_bucket.current_capacity.native > diff else UInt64(0)
+        else:
+            # if increasing limit then increase capacity by difference
+            diff = new_limit - rate_limit_bucket.limit.native
+            new_capacity = rate_limit_bucket.current_capacity.native + diff
+        rate_limit_bucket.current_capacity = ARC4UInt64(new_capacity)
+
+        # update limit
+        rate_limit_bucket.limit = ARC4UInt64(new_limit)
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        emit(BucketRateLimitUpdated(bucket_id, ARC4UInt256(new_limit)))
+
+    @subroutine
+    def _update_rate_duration(self, bucket_id: Bytes32, new_duration: UInt64) -> None:
+        """Update duration of existing bucket.
+
+        Args:
+            bucket_id: The bucket to update.
+            new_duration: The new duration to set.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
+
+        # update duration
+        rate_limit_bucket.duration = ARC4UInt64(new_duration)
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        emit(BucketRateDurationUpdated(bucket_id, ARC4UInt64(new_duration)))
+
+    @subroutine(inline=False)
+    def _consume_amount(self, bucket_id: Bytes32, amount: UInt64) -> None:
+        """Consumes an amount inside a bucket.
+
+        Args:
+            bucket_id: The bucket to consume from.
+            amount: The amount to consume.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+            AssertionError: If there is insufficient capacity.
+        """
+        if self._consume_from_bucket(bucket_id, amount):
+            emit(BucketConsumed(bucket_id, ARC4UInt256(amount)))
+
+    @subroutine(inline=False)
+    def _fill_amount(self, bucket_id: Bytes32, amount: UInt64) -> None:
+        """Fills an amount inside a bucket. Will not exceed the bucket's limit.
+
+        Args:
+            bucket_id: The bucket to fill into.
+            amount: The amount to fill.
+
+        Raises:
+            AssertionError: If the bucket is unknown.
+        """
+        filled, fill_amount = self._fill_into_bucket(bucket_id, amount)
+        if filled:
+            emit(BucketFilled(bucket_id, ARC4UInt256(fill_amount)))
+
+    @subroutine(inline=False)
+    def _consume_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt64]) -> None:
+        """Consumes an amount inside each of multiple buckets e.g. a global bucket and a per-asset bucket.
+
+        Emits a single BucketsConsumed event for the buckets consumed from instead of a BucketConsumed event per
+        bucket. Buckets with a duration of zero are ignored and not included in the event, which isn't emitted if no
+        bucket is consumed from. The same bucket may appear more than once, in which case the amounts are consumed one
+        after another. If there is insufficient capacity in any bucket then the whole transaction fails so either all
+        the amounts are consumed or none are.
+
+        Args:
+            bucket_ids: The buckets to consume from.
+            amounts: The amount to consume from each bucket.
+
+        Raises:
+            AssertionError: If the number of buckets and amounts differ.
+            AssertionError: If the number of buckets exceeds the maximum batch size.
+            AssertionError: If any bucket is unknown.
+            AssertionError: If there is insufficient capacity in any bucket.
+        """
+        self._check_batch(bucket_ids.length, amounts.length)
+
+        consumed_bucket_ids = DynamicArray[Bytes32]()
+        consumed_amounts = DynamicArray[ARC4UInt256]()
+        for idx in urange(bucket_ids.length):
+            bucket_id = bucket_ids[idx].copy()
+            amount = amounts[idx].native
+            if self._consume_from_bucket(bucket_id, amount):
+                consumed_bucket_ids.append(bucket_id.copy())
+                consumed_amounts.append(ARC4UInt256(amount))
+        if consumed_bucket_ids.length:
+            emit(BucketsConsumed(consumed_bucket_ids.copy(), consumed_amounts.copy()))
+
+    @subroutine(inline=False)
+    def _fill_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt64]) -> None:
+        """Fills an amount inside each of multiple buckets. Will not exceed the buckets' limits.
+
+        Emits a single BucketsFilled event for the buckets filled into instead of a BucketFilled event per bucket.
+        Buckets with a duration of zero are ignored and not included in the event, which isn't emitted if no bucket is
+        filled into.
+
+        Args:
+            bucket_ids: The buckets to fill into.
+            amounts: The amount to fill into each bucket.
+
+        Raises:
+            AssertionError: If the number of buckets and amounts differ.
+            AssertionError: If the number of buckets exceeds the maximum batch size.
+            AssertionError: If any bucket is unknown.
+        """
+        self._check_batch(bucket_ids.length, amounts.length)
+
+        filled_bucket_ids = DynamicArray[Bytes32]()
+        filled_amounts = DynamicArray[ARC4UInt256]()
+        for idx in urange(bucket_ids.length):
+            bucket_id = bucket_ids[idx].copy()
+            filled, fill_amount = self._fill_into_bucket(bucket_id, amounts[idx].native)
+            if filled:
+                filled_bucket_ids.append(bucket_id.copy())
+                filled_amounts.append(ARC4UInt256(fill_amount))
+        if filled_bucket_ids.length:
+            emit(BucketsFilled(filled_bucket_ids.copy(), filled_amounts.copy()))
+
+    @subroutine
+    def _consume_from_bucket(self, bucket_id: Bytes32, amount: UInt64) -> bool:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
+
+        # ignore if duration is zero
+        if not rate_limit_bucket.duration.native:
+            return False
+
+        # ensure there is enough capacity
+        assert amount <= rate_limit_bucket.current_capacity.native, "Insufficient capacity to consume"
+
+        # consume amount
+        new_capacity = rate_limit_bucket.current_capacity.native - amount
+        rate_limit_bucket.current_capacity = ARC4UInt64(new_capacity)
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        return True
+
+    @subroutine
+    def _fill_into_bucket(self, bucket_id: Bytes32, amount: UInt64) -> tuple[bool, UInt64]:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
+
+        # ignore if duration is zero
+        if not rate_limit_bucket.duration.native:
+            return False, UInt64(0)
+
+        # fill amount without exceeding limit
+        max_fill_amount = rate_limit_bucket.limit.native - rate_limit_bucket.current_capacity.native
+        fill_amount = amount if amount < max_fill_amount else max_fill_amount
+        new_capacity = rate_limit_bucket.current_capacity.native + fill_amount
+        rate_limit_bucket.current_capacity = ARC4UInt64(new_capacity)
+        self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        return True, fill_amount
+
+    @subroutine
+    def _check_batch(self, num_buckets: UInt64, num_amounts: UInt64) -> None:
+        assert num_buckets == num_amounts, "Mismatched buckets and amounts"
+        assert num_buckets <= MAX_BATCH_SIZE, "Exceeds maximum batch size"
+
+    @subroutine(inline=False)
+    def _update_capacity(self, bucket_id: Bytes32) -> RateLimitBucketUInt64:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_updated_bucket(bucket_id)
+
+        # ignore if duration is zero
+        if rate_limit_bucket.duration.native:
+            self.rate_limit_buckets[bucket_id] = rate_limit_bucket.copy()
+        return rate_limit_bucket
+
+    @subroutine
+    def _get_updated_bucket(self, bucket_id: Bytes32) -> RateLimitBucketUInt64:
+        # fails if bucket is unknown
+        rate_limit_bucket = self._get_bucket(bucket_id)
+
+        # ignore if duration is zero
+        if rate_limit_bucket.duration.native:
+            # increase capacity by fill rate of <limit> per <duration> without exceeding limit
+            time_delta = Global.latest_timestamp - rate_limit_bucket.last_updated.native
+            rate_limit_bucket.current_capacity = ARC4UInt64(self._refill_capacity(
+                rate_limit_bucket.limit.native,
+                rate_limit_bucket.current_capacity.native,
+                time_delta,
+                rate_limit_bucket.duration.native
+            ))
+            rate_limit_bucket.last_updated = ARC4UInt64(Global.latest_timestamp)
+        return rate_limit_bucket
+
+    @subroutine
+    def _refill_capacity(self, limit: UInt64, current_capacity: UInt64, time_delta: UInt64, duration: UInt64) -> UInt64:
+        # capacity + (limit * time_delta) // duration capped at limit, with the product computed in 128 bits
+        if current_capacity >= limit:
+            return limit
+        product_high, product_low = op.mulw(limit, time_delta)
+        if product_high >= duration:
+            # quotient doesn't fit in uint64 so certainly exceeds limit
+            return limit
+        fill_amount = op.divw(product_high, product_low, duration)
+        return limit if fill_amount >= limit - current_capacity else current_capacity + fill_amount
+
+    @subroutine
+    def _fits_uint64(self, amount: UInt256) -> bool:
+        return op.extract(amount.bytes, 0, 24) == op.bzero(24)
+
+    @subroutine
+    def _check_bucket_known(self, bucket_id: Bytes32) -> None:
+        assert bucket_id in self.rate_limit_buckets, "Unknown bucket"
+
+    @subroutine
+    def _get_bucket(self, bucket_id: Bytes32) -> RateLimitBucketUInt64:
+        # read the box directly as a mutable struct can't be unpacked from the result of maybe
+        bucket_bytes, exists = op.Box.get(self.rate_limit_buckets.key_prefix + bucket_id.bytes)
+        assert exists, "Unknown bucket"
+        return RateLimitBucketUInt64.from_bytes(bucket_bytes)
@@ -0,0 +1,68 @@
+from algopy import Bytes, UInt64, op, subroutine
+from algopy.arc4 import Bool, DynamicArray
+
+from ..types import ARC4UInt16, ARC4UInt64
+from . import BoxUInt64SetLib
+
+
+"""Library for a set of UInt64 values spread across multiple boxes. Implemented using BoxUInt64SetLib for each shard.
+
+An item is stored in the shard `item % num_shards`, in the box with key `box_prefix + uint16(shard)`. An operation only
+touches the box of the shard the item belongs to, so the transaction only needs the box references for that one shard.
+Modulo sharding spreads sequential identifiers such as asset and application ids evenly across the shards.
+
+The number of shards must be fixed for the lifetime of the set since changing it would move items to other shards.
+
+Members can be read shard by shard using {get_page}, which returns at most 127 items so the encoded page fits inside an
+ABI return value. Readers request pages from index zero until a page has fewer items than requested, then move on to
+the next shard.
+
+Note supports up to 4096 items per shard because a box cannot exceed 32768 bytes.
+"""
+# byte length of an encoded item
+ITEM_SIZE = 8
+# maximum number of items which fit inside a single ABI return value (1024 byte log minus prefix and length)
+MAX_PAGE_SIZE = 127
+
+
+@subroutine
+def get_shard(item: UInt64, num_shards: UInt64) -> UInt64:
+    assert num_shards, "Number of shards must be non-zero"
+    return item % num_shards
+
+@subroutine
+def get_shard_key(box_prefix: Bytes, shard: UInt64) -> Bytes:
+    return box_prefix + ARC4UInt16(shard).bytes
+
+@subroutine
+def shard_length(box_prefix: Bytes, shard: UInt64) -> UInt64:
+    return BoxUInt64SetLib.length(get_shard_key(box_prefix, shard))
+
+@subroutine
+def has_item(to_search: UInt64, box_prefix: Bytes, num_shards: UInt64) -> Bool:
+    shard_key = get_shard_key(box_prefix, get_shard(to_search, num_shards))
+    return BoxUInt64SetLib.has_item(to_search, shard_key)
+
+@subroutine
+def add_item(to_add: UInt64, box_prefix: Bytes, num_shards: UInt64) -> Bool:
+    shard_key = get_shard_key(box_prefix, get_shard(to_add, num_shards))
+    return BoxUInt64SetLib.add_item(to_add, shard_key)
+
+@subroutine
+def remove_item(to_remove: UInt64, box_prefix: Bytes, num_shards: UInt64) -> Bool:
+    shard_key = get_shard_key(box_prefix, get_shard(to_remove, num_shards))
+    return BoxUInt64SetLib.remove_item(to_remove, shard_key)
+
+@subroutine
+def get_page(box_prefix: Bytes, shard: UInt64, start: UInt64, max_items: UInt64) -> DynamicArray[ARC4UInt64]:
+    # clamp page to the items available
+    num_items = shard_length(box_prefix, shard)
+    if start >= num_items:
+        return DynamicArray[ARC4UInt64]()
+    page_size = max_items if max_items < MAX_PAGE_SIZE else UInt64(MAX_PAGE_SIZE)
+    if page_size > num_items - start:
+        page_size = num_items - start
+
+    # read the items with a single box extract as they are already encoded
+    page = op.Box.extract(get_shard_key(box_prefix, shard), start * ITEM_SIZE, page_size * ITEM_SIZE)
+    return DynamicArray[ARC4UInt64].from_bytes(ARC4UInt16(page_size).bytes + page)
@@ -0,0 +1,86 @@
+from algopy import Bytes, UInt64, op, subroutine
+from algopy.arc4 import Bool, DynamicArray
+from typing import Tuple
+
+from ..types import ARC4UInt16, ARC4UInt64
+
+
+"""Library for a sorted set of UInt64 values. Implemented using dynamic arrays kept in ascending order.
+
+Shares the interface of UInt64SetLib but locates items with a binary search over the encoded array, so lookups cost
+O(log n) rather than O(n). Items are inserted and removed by splicing the 8 bytes of the item into or out of the encoded
+array instead of rebuilding it item by item.
+
+The arrays passed in must have been built with this library (or otherwise be in strictly ascending order).
+
+Note only supports up to 511 items because item on stack cannot exceed 4098 bytes.
+"""
+# byte length of the dynamic array length prefix
+LENGTH_SIZE = 2
+# byte length of an encoded item
+ITEM_SIZE = 8
+
+
+@subroutine
+def _item_offset(idx: UInt64) -> UInt64:
+    return LENGTH_SIZE + idx * ITEM_SIZE
+
+@subroutine
+def _lower_bound(value: UInt64, encoded: Bytes) -> UInt64:
+    # index of the first item which is greater than or equal to value, or the length if there is none
+    low = UInt64(0)
+    high = op.extract_uint16(encoded, 0)
+    while low < high:
+        mid = (low + high) // 2
+        if op.extract_uint64(encoded, _item_offset(mid)) < value:
+            low = mid + 1
+        else:
+            high = mid
+    return low
+
+@subroutine
+def _is_item_at(value: UInt64, idx: UInt64, encoded: Bytes) -> bool:
+    if idx >= op.extract_uint16(encoded, 0):
+        return False
+    return op.extract_uint64(encoded, _item_offset(idx)) == value
+
+@subroutine
+def has_item(to_search: UInt64, items: DynamicArray[ARC4UInt64]) -> Bool:
+    encoded = items.bytes
+    idx = _lower_bound(to_search, encoded)
+    return Bool(_is_item_at(to_search, idx, encoded))
+
+@subroutine
+def add_item(to_add: UInt64, items: DynamicArray[ARC4UInt64]) -> Tuple[Bool, DynamicArray[ARC4UInt64]]:
+    # check if already added in which case skip
+    encoded = items.bytes
+    idx = _lower_bound(to_add, encoded)
+    if _is_item_at(to_add, idx, encoded):
+        return Bool(False), items.copy()
+
+    # if here then item is not present so must be inserted at its sorted position
+    offset = _item_offset(idx)
+    new_encoded = (
+        ARC4UInt16(items.length + 1).bytes
+        + op.substring(encoded, LENGTH_SIZE, offset)
+        + op.itob(to_add)
+        + op.substring(encoded, offset, encoded.length)
+    )
+    return Bool(True), DynamicArray[ARC4UInt64].from_bytes(new_encoded)
+
+@subroutine
+def remove_item(to_remove: UInt64, items: DynamicArray[ARC4UInt64]) -> Tuple[Bool, DynamicArray[ARC4UInt64]]:
+    encoded = items.bytes
+    idx = _lower_bound(to_remove, encoded)
+    if not _is_item_at(to_remove, idx, encoded):
+        # if here then item is not present
+        return Bool(False), items.copy()
+
+    # cut the item out, keeping the remaining items in order
+    offset = _item_offset(idx)
+    new_encoded = (
+        ARC4UInt16(items.length - 1).bytes
+        + op.substring(encoded, LENGTH_SIZE, offset)
+        + op.substring(encoded, offset + ITEM_SIZE, encoded.length)
+    )
+    return Bool(True), DynamicArray[ARC4UInt64].from_bytes(new_encoded)
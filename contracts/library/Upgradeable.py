@@ -4,6 +4,7 @@ from algopy.arc4 import Struct, abimethod, emit
 
 from ..types import ARC4UInt64, Bytes16, Bytes32
 from .AccessControl import AccessControl
+from .identifiers import UPGRADEABLE_ADMIN_ROLE
 from .Initialisable import Initialisable
 from .interfaces.IUpgradeable import IUpgradeable, UpgradeScheduled, UpgradeCancelled, UpgradeCompleted
 
@@ -26,6 +27,26 @@ class MinimumUpgradeDelayChange(Struct):
     timestamp: ARC4UInt64
 
 
+@subroutine
+def get_program_sha256() -> Bytes32:
+    """Returns the SHA256 of the programs the current transaction updates the application to.
+
+    Each page is hashed directly from the transaction field and only its 32 byte digest is appended, so the buffer
+    hashed at the end is at most 13 + 32 * 4 bytes. As sha256 has a flat opcode cost, the whole computation costs
+    roughly 50 opcodes per page and stays well within the budget of a single app call for the largest programs.
+
+    Returns:
+        The program SHA256 as documented in Upgradeable
+    """
+    program = Bytes(b"approval")
+    for page_index in urange(Txn.num_approval_program_pages):
+        program += op.sha256(Txn.approval_program_pages(page_index))
+    program += Bytes(b"clear")
+    for page_index in urange(Txn.num_clear_state_program_pages):
+        program += op.sha256(Txn.clear_state_program_pages(page_index))
+    return Bytes32.from_bytes(op.sha256(program))
+
+
 class Upgradeable(IUpgradeable, AccessControl, Initialisable, ABC):
     """Contract module that allows children to implement scheduled upgrade mechanisms.
 
@@ -154,13 +175,7 @@ class Upgradeable(IUpgradeable, AccessControl, Initialisable, ABC):
         assert Global.latest_timestamp >= scheduled_contract_upgrade.timestamp, "Schedule complete ts not met"
 
         # check we are upgrading to same contract
-        program = Bytes(b"approval")
-        for page_index in urange(Txn.num_approval_program_pages):
-            program += op.sha256(Txn.approval_program_pages(page_index))
-        program += Bytes(b"clear")
-        for page_index in urange(Txn.num_clear_state_program_pages):
-            program += op.sha256(Txn.clear_state_program_pages(page_index))
-        program_sha256 = Bytes32.from_bytes(op.sha256(program))
+        program_sha256 = get_program_sha256()
         assert scheduled_contract_upgrade.program_sha256 == program_sha256, "Invalid program SHA256"
 
         # reset to new contract version
@@ -172,12 +187,12 @@ class Upgradeable(IUpgradeable, AccessControl, Initialisable, ABC):
 
     @abimethod(readonly=True)
     def upgradable_admin_role(self) -> Bytes16:
-        """Returns the role identifier for the upgradeable admin role
+        """Returns the role identifier for the upgradeable admin role, keccak256("UPGRADEABLE_ADMIN")[:16]
 
         Returns:
             Role bytes of length 16
         """
-        return Bytes16.from_bytes(op.extract(op.keccak256(b"UPGRADEABLE_ADMIN"), 0, 16))
+        return Bytes16.from_bytes(UPGRADEABLE_ADMIN_ROLE)
 
     @abimethod(readonly=True)
     def get_active_min_upgrade_delay(self) -> UInt64:
@@ -0,0 +1,88 @@
+from abc import ABC
+from algopy import Bytes, Global, Txn, TransactionType, UInt64, op, subroutine, urange
+from algopy.arc4 import Address, Bool
+
+from ...types import Bytes16
+from ..AccessControl import AccessControl
+
+# scratch slot holding the revocation count (plus one) at which the roles in the transaction were checked
+CACHE_REVOCATIONS_SLOT = 200
+# scratch slot holding the concatenated roles of the transaction sender which were checked
+CACHE_ROLES_SLOT = 201
+# byte length of a role
+ROLE_SIZE = 16
+
+
+class AccessControlWithGroupCache(AccessControl, ABC, scratch_slots=(CACHE_REVOCATIONS_SLOT, CACHE_ROLES_SLOT)):
+    """Extension to AccessControl Contract which caches successful sender role checks for the rest of the group.
+
+    When {_check_sender_role} succeeds, the role is recorded in the scratch space of the transaction. A later
+    transaction in the same group which calls this application from the same sender finds the record with `gloadss`
+    and skips reading the role boxes, so only the first call in the group needs the box references.
+
+    The cache is invalidated by revocations. Every revoke increments a global counter and a record is only trusted if
+    it was made at the current count, so once any role is revoked (by any transaction, including inner transactions)
+    all roles are checked against the boxes again. Granting roles does not invalidate the cache as it cannot make a
+    successful check fail.
+
+    The scratch slots 200 and 201 are reserved and must not be used by the child contract.
+    """
+    def __init__(self) -> None:
+        AccessControl.__init__(self)
+        # number of roles revoked, used to invalidate cached role checks
+        self.role_revocations = UInt64(0)
+
+    @subroutine
+    def _check_sender_role(self, role: Bytes16) -> None:
+        if self._is_sender_role_cached(role):
+            return
+
+        self._check_role(role, Address(Txn.sender))
+        self._cache_sender_role(role)
+
+    @subroutine
+    def _revoke_role(self, role: Bytes16, account: Address) -> Bool:
+        revoked = super()._revoke_role(role, account)
+        if revoked:
+            self.role_revocations += 1
+        return revoked
+
+    @subroutine
+    def _is_sender_role_cached(self, role: Bytes16) -> bool:
+        # zero is the initial value of every scratch slot so offset the count by one
+        revocations = self.role_revocations + 1
+
+        # check current transaction
+        if op.Scratch.load_uint64(CACHE_REVOCATIONS_SLOT) == revocations:
+            if self._contains_role_bytes(op.Scratch.load_bytes(CACHE_ROLES_SLOT), role):
+                return True
+
+        # check earlier calls to this application from the same sender
+        for group_index in urange(Txn.group_index):
+            if (
+                op.GTxn.type_enum(group_index) == TransactionType.ApplicationCall
+                and op.GTxn.application_id(group_index) == Global.current_application_id
+                and op.GTxn.sender(group_index) == Txn.sender
+                and op.gload_uint64(group_index, CACHE_REVOCATIONS_SLOT) == revocations
+            ):
+                if self._contains_role_bytes(op.gload_bytes(group_index, CACHE_ROLES_SLOT), role):
+                    return True
+        return False
+
+    @subroutine
+    def _cache_sender_role(self, role: Bytes16) -> None:
+        # start a new record if there is none or it was made before a revocation
+        revocations = self.role_revocations + 1
+        roles = Bytes()
+        if op.Scratch.load_uint64(CACHE_REVOCATIONS_SLOT) == revocations:
+            roles = op.Scratch.load_bytes(CACHE_ROLES_SLOT)
+
+        op.Scratch.store(CACHE_REVOCATIONS_SLOT, revocations)
+        op.Scratch.store(CACHE_ROLES_SLOT, roles + role.bytes)
+
+    @subroutine
+    def _contains_role_bytes(self, roles: Bytes, role: Bytes16) -> bool:
+        for offset in urange(0, roles.length, ROLE_SIZE):
+            if op.extract(roles, offset, ROLE_SIZE) == role.bytes:
+                return True
+        return False
@@ -0,0 +1,133 @@
+from abc import ABC
+from algopy import BigUInt, BoxMap, Bytes, Txn, op, subroutine, urange
+from algopy.arc4 import Address, Bool, DynamicArray, Struct, abimethod, emit
+
+from ...types import Bytes16, Bytes32
+from ..AccessControl import AccessControl
+
+# domain separation prefixes so a leaf can never be passed off as an inner node or vice versa
+MERKLE_LEAF_PREFIX = b"\x00"
+MERKLE_NODE_PREFIX = b"\x01"
+
+# Events
+class RoleMerkleRootUpdated(Struct):
+    role: Bytes16
+    root: Bytes32
+    sender: Address
+
+
+class AccessControlWithMerkleRoles(AccessControl, ABC):
+    """Extension to AccessControl Contract which allows the members of a role to be committed to by a Merkle root.
+
+    Roles with very many members, e.g. an allowlist, would need a box per member with AccessControl. Instead, the role
+    admin can set the root of a Merkle tree of the members with {set_merkle_root} which uses a single box regardless
+    of the number of members. An account then proves it has the role by passing its Merkle proof to
+    {has_role_with_proof}, or to {_check_sender_role_with_proof} or {_check_role_with_proof} in a child contract:
+    ```python
+    @abimethod
+    def relay(self, proof: DynamicArray[Bytes32]) -> None:
+        self._check_sender_role_with_proof(RELAYER_ROLE, proof)
+        ...
+    ```
+
+    The tree uses sha256 with sorted pairs so proofs don't need the position of the leaf:
+     - leaf = sha256(0x00 + address)
+     - node = sha256(0x01 + min(left, right) + max(left, right))
+    A node without a sibling is carried up to the next level unchanged. The script `scripts/merkle.py` builds the root
+    and proofs from a list of addresses.
+
+    Accounts granted the role through {grant_role} still have it, and are checked if the proof doesn't verify. Each
+    level of a proof costs roughly 50 opcodes, so a proof for a tree of more than a few thousand members needs its
+    opcode budget increased, e.g. by grouping with additional app calls.
+    """
+    def __init__(self) -> None:
+        AccessControl.__init__(self)
+        # role -> merkle root of members
+        self.merkle_roots = BoxMap(Bytes16, Bytes32, key_prefix=b"merkle_roots_")
+
+    @abimethod
+    def set_merkle_root(self, role: Bytes16, root: Bytes32) -> None:
+        """Sets the Merkle root of the members of a role. A zero root removes it.
+
+        Args:
+            role: The role to set the root of
+            root: The Merkle root of the members
+
+        Raises:
+            AssertionError: If the sender doesn't have role's admin role.
+        """
+        self._check_sender_role(self.get_role_admin(role))
+        self._set_merkle_root(role, root)
+
+    @abimethod(readonly=True)
+    def get_merkle_root(self, role: Bytes16) -> Bytes32:
+        """Returns the Merkle root of the members of a role
+
+        Args:
+            role: The role to get the root of
+
+        Returns:
+            The Merkle root, or empty bytes of length 32 if not set
+        """
+        return self.merkle_roots.get(role, default=Bytes32.from_bytes(op.bzero(32)))
+
+    @abimethod(readonly=True)
+    def has_role_with_proof(self, role: Bytes16, account: Address, proof: DynamicArray[Bytes32]) -> Bool:
+        """Returns whether the account is a member of a role's Merkle tree or has been granted the role
+
+        Args:
+            role: The role to check
+            account: The account to check
+            proof: The sibling nodes from the leaf of the account up to the root
+
+        Returns:
+            Whether the account has the role
+        """
+        return Bool(self._has_role_with_proof(role, account, proof))
+
+    @subroutine
+    def _set_merkle_root(self, role: Bytes16, root: Bytes32) -> None:
+        """Sets the Merkle root of the members of a role. A zero root removes it.
+
+        Args:
+            role: The role to set the root of
+            root: The Merkle root of the members
+        """
+        if root.bytes == op.bzero(32):
+            if role in self.merkle_roots:
+                del self.merkle_roots[role]
+        else:
+            self.merkle_roots[role] = root.copy()
+        emit(RoleMerkleRootUpdated(role, root, Address(Txn.sender)))
+
+    @subroutine
+    def _check_sender_role_with_proof(self, role: Bytes16, proof: DynamicArray[Bytes32]) -> None:
+        self._check_role_with_proof(role, Address(Txn.sender), proof)
+
+    @subroutine
+    def _check_role_with_proof(self, role: Bytes16, account: Address, proof: DynamicArray[Bytes32]) -> None:
+        assert self._has_role_with_proof(role, account, proof), "Access control unauthorised account"
+
+    @subroutine
+    def _has_role_with_proof(self, role: Bytes16, account: Address, proof: DynamicArray[Bytes32]) -> bool:
+        # verify proof first so members of the tree don't need the box reference of their grant
+        # the root is read from the box directly as a static array can't be unpacked from the result of maybe
+        root, exists = op.Box.get(self.merkle_roots.key_prefix + role.bytes)
+        is_member = exists and self._compute_merkle_root(self._merkle_leaf(account), proof) == root
+        return is_member or self._has_role(role, account)
+
+    @subroutine
+    def _merkle_leaf(self, account: Address) -> Bytes:
+        return op.sha256(MERKLE_LEAF_PREFIX + account.bytes)
+
+    @subroutine
+    def _compute_merkle_root(self, leaf: Bytes, proof: DynamicArray[Bytes32]) -> Bytes:
+        node = leaf
+        for idx in urange(proof.length):
+            sibling = proof[idx].bytes
+            # equal length bytes so comparing as big-endian integers orders them lexicographically
+            if BigUInt.from_bytes(node) < BigUInt.from_bytes(sibling):
+                node = op.sha256(MERKLE_NODE_PREFIX + node + sibling)
+            else:
+                node = op.sha256(MERKLE_NODE_PREFIX + sibling + node)
+        return node
@@ -0,0 +1,162 @@
+from abc import ABC
+from algopy import Bytes, Global, Txn, UInt64, op, subroutine, urange
+from algopy.arc4 import Address, Bool, abimethod, emit
+
+from ...types import Bytes16
+from ..AccessControl import AccessControl
+from ..interfaces.IAccessControl import RoleAdminChanged, RoleGranted, RoleRevoked
+
+# prefix of the global state key of a pinned role, followed by the role
+PINNED_ROLE_KEY_PREFIX = b"pinned_role_"
+# prefix of the global state key of the admin role of a pinned role, followed by the role, only set if not the default
+PINNED_ROLE_ADMIN_KEY_PREFIX = b"pinned_role_admin_"
+# byte length of an address
+ADDRESS_SIZE = 32
+# maximum number of holders of a pinned role so the key (28 bytes) and value fit in the 128 byte global state limit
+MAX_PINNED_ROLE_HOLDERS = 3
+
+
+class AccessControlWithPinnedRoles(AccessControl, ABC):
+    """Extension to AccessControl Contract which stores the holders of selected roles in global state.
+
+    Roles which are checked on nearly every privileged call, e.g. the default admin role or the upgradable admin role,
+    can be pinned with {_pin_role}. The holders of a pinned role (at most three) are stored concatenated in a global
+    state value keyed by `pinned_role_` + role instead of a box per holder. Checking a pinned role therefore reads no
+    boxes, so clients don't need to pass any box references for it. The admin role of a pinned role is kept in global
+    state too, under `pinned_role_admin_` + role if it isn't the default admin role, so granting and revoking a pinned
+    role reads no role box. Only checking the sender has the admin role reads a box, unless that role is pinned too.
+
+    Pinned roles can only be granted permanently, not with {grant_role_until}.
+
+    A role must be pinned before it is first granted, since the holders already stored in boxes cannot be moved. The
+    recommended place to do so is the `initialise()` ABI method. Pinned roles cannot be unpinned.
+
+    Each pinned role uses a global bytes slot, plus another if its admin role is changed with {_set_role_admin}, which
+    are not assigned through `self.`, so the child contract must declare enough slots with `state_totals`:
+    ```python
+    class MyContract(AccessControlWithPinnedRoles, state_totals=StateTotals(global_bytes=2)):
+        ...
+    ```
+    """
+    def __init__(self) -> None:
+        AccessControl.__init__(self)
+
+    @abimethod(readonly=True)
+    def is_role_pinned(self, role: Bytes16) -> Bool:
+        """Returns whether the holders of a role are stored in global state
+
+        Args:
+            role: The role to check
+
+        Returns:
+            Whether the role is pinned
+        """
+        return Bool(self._get_pinned_role_holders(role)[1])
+
+    @abimethod(readonly=True)
+    def get_role_admin(self, role: Bytes16) -> Bytes16:
+        """Returns the admin role that controls a role, read from global state if the role is pinned
+
+        Args:
+            role: The role to get its admin of
+
+        Returns:
+            The role admin
+        """
+        admin_role = self.default_admin_role()
+        if self._get_pinned_role_holders(role)[1]:
+            pinned_admin_role, exists = op.AppGlobal.get_ex_bytes(
+                Global.current_application_id, self._pinned_role_admin_key(role)
+            )
+            if exists:
+                admin_role = Bytes16.from_bytes(pinned_admin_role)
+        else:
+            # pass a copy as puyapy 4.4.2 fails to compile the role being passed on after the branch above
+            admin_role = super().get_role_admin(role.copy())
+        return admin_role
+
+    @subroutine
+    def _pin_role(self, role: Bytes16) -> None:
+        """Pins a role so its holders are stored in global state.
+
+        Args:
+            role: The role to pin
+
+        Raises:
+            AssertionError: If the role is already pinned.
+            AssertionError: If the role has been used before.
+        """
+        assert not self._get_pinned_role_holders(role)[1], "Role already pinned"
+        assert role not in self.roles, "Role already in use"
+        op.AppGlobal.put(self._pinned_role_key(role), Bytes())
+
+    @subroutine
+    def _has_role(self, role: Bytes16, account: Address) -> bool:
+        holders, pinned = self._get_pinned_role_holders(role)
+        if pinned:
+            return self._find_holder(holders, account) < holders.length
+        return super()._has_role(role, account)
+
+    @subroutine
+    def _grant_role(self, role: Bytes16, account: Address) -> Bool:
+        holders, pinned = self._get_pinned_role_holders(role)
+        if not pinned:
+            return super()._grant_role(role, account)
+
+        # grant role to account if it doesn't have
+        if self._find_holder(holders, account) < holders.length:
+            return Bool(False)
+        assert holders.length < MAX_PINNED_ROLE_HOLDERS * ADDRESS_SIZE, "Pinned role holders full"
+        op.AppGlobal.put(self._pinned_role_key(role), holders + account.bytes)
+        emit(RoleGranted(role, account, Address(Txn.sender)))
+        return Bool(True)
+
+    @subroutine
+    def _grant_role_until(self, role: Bytes16, account: Address, expiry: UInt64) -> Bool:
+        # the holders of a pinned role have no expiry
+        assert not self._get_pinned_role_holders(role)[1], "Pinned role cannot expire"
+        return super()._grant_role_until(role, account, expiry)
+
+    @subroutine
+    def _revoke_role(self, role: Bytes16, account: Address) -> Bool:
+        holders, pinned = self._get_pinned_role_holders(role)
+        if not pinned:
+            return super()._revoke_role(role, account)
+
+        # revoke role from account if it does have
+        offset = self._find_holder(holders, account)
+        if offset == holders.length:
+            return Bool(False)
+        new_holders = op.substring(holders, 0, offset) + op.substring(holders, offset + ADDRESS_SIZE, holders.length)
+        op.AppGlobal.put(self._pinned_role_key(role), new_holders)
+        emit(RoleRevoked(role, account, Address(Txn.sender)))
+        return Bool(True)
+
+    @subroutine(inline=False)
+    def _set_role_admin(self, role: Bytes16, admin_role: Bytes16) -> None:
+        if self._get_pinned_role_holders(role)[1]:
+            previous_role_admin = self.get_role_admin(role)
+            op.AppGlobal.put(self._pinned_role_admin_key(role), admin_role.bytes)
+            emit(RoleAdminChanged(role, previous_role_admin, admin_role))
+        else:
+            super()._set_role_admin(role, admin_role)
+
+    @subroutine
+    def _get_pinned_role_holders(self, role: Bytes16) -> tuple[Bytes, bool]:
+        return op.AppGlobal.get_ex_bytes(Global.current_application_id, self._pinned_role_key(role))
+
+    @subroutine
+    def _pinned_role_key(self, role: Bytes16) -> Bytes:
+        return PINNED_ROLE_KEY_PREFIX + role.bytes
+
+    @subroutine
+    def _pinned_role_admin_key(self, role: Bytes16) -> Bytes:
+        return PINNED_ROLE_ADMIN_KEY_PREFIX + role.bytes
+
+    @subroutine
+    def _find_holder(self, holders: Bytes, account: Address) -> UInt64:
+        # byte offset of the account in the holders, or the length of the holders if it is not present
+        for offset in urange(0, holders.length, ADDRESS_SIZE):
+            if op.extract(holders, offset, ADDRESS_SIZE) == account.bytes:
+                return offset
+        return holders.length
@@ -0,0 +1,7 @@
+"""Role and bucket identifiers of the library, precomputed so they are compiled as byte constants.
+
+Each constant equals the hash digest documented next to it. Rather than calling `op.keccak256` on every use, which
+costs 130 opcodes, the digest is computed ahead of time by `python -m scripts.identifiers` and checked by its tests.
+"""
+# keccak256("UPGRADEABLE_ADMIN")[:16]
+UPGRADEABLE_ADMIN_ROLE = b"\xcf\x8c\xd3\x27\xb8\xa2\xe8\xe0\x51\x2a\x39\x6d\xba\x9f\x00\x7b"
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from algopy import ARC4Contract
 from algopy.arc4 import Address, Bool, Struct, abimethod
 
-from ...types import Bytes16
+from ...types import ARC4UInt64, Bytes16
 
 
 # Events
@@ -21,6 +21,11 @@ class RoleRevoked(Struct):
     account: Address
     sender: Address
 
+class RoleExpiryUpdated(Struct):
+    role: Bytes16
+    account: Address
+    expiry: ARC4UInt64
+
 
 class IAccessControl(ARC4Contract, ABC):
     @abstractmethod
@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from algopy import ARC4Contract, UInt64
+from algopy.arc4 import Bool, DynamicArray, Struct, UInt256, abimethod
+
+from ...types import ARC4UInt64, ARC4UInt256, Bytes32
+
+
+# Events
+class GroupBucketAdded(Struct):
+    group_id: Bytes32
+    slot: ARC4UInt64
+    limit: ARC4UInt256
+    duration: ARC4UInt64
+
+class BucketGroupRemoved(Struct):
+    group_id: Bytes32
+
+class GroupBucketRateLimitUpdated(Struct):
+    group_id: Bytes32
+    slot: ARC4UInt64
+    limit: ARC4UInt256
+
+class GroupBucketRateDurationUpdated(Struct):
+    group_id: Bytes32
+    slot: ARC4UInt64
+    duration: ARC4UInt64
+
+class GroupBucketConsumed(Struct):
+    group_id: Bytes32
+    slot: ARC4UInt64
+    amount: ARC4UInt256
+
+class GroupBucketFilled(Struct):
+    group_id: Bytes32
+    slot: ARC4UInt64
+    amount: ARC4UInt256
+
+class GroupBucketsConsumed(Struct):
+    group_id: Bytes32
+    slots: DynamicArray[ARC4UInt64]
+    amounts: DynamicArray[ARC4UInt256]
+
+class GroupBucketsFilled(Struct):
+    group_id: Bytes32
+    slots: DynamicArray[ARC4UInt64]
+    amounts: DynamicArray[ARC4UInt256]
+
+
+
+class IPackedRateLimiter(ARC4Contract, ABC):
+    @abstractmethod
+    @abimethod(readonly=True)
+    def get_current_capacity(self, group_id: Bytes32, slot: UInt64) -> UInt256:
+        pass
+
+    @abstractmethod
+    @abimethod(readonly=True)
+    def has_capacity(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> Bool:
+        pass
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from algopy import ARC4Contract
-from algopy.arc4 import Bool, Struct, UInt256, abimethod
+from algopy.arc4 import Bool, DynamicArray, Struct, UInt256, abimethod
 
 from ...types import ARC4UInt64, ARC4UInt256, Bytes32
 
@@ -30,6 +30,14 @@ class BucketFilled(Struct):
     bucket_id: Bytes32
     amount: ARC4UInt256
 
+class BucketsConsumed(Struct):
+    bucket_ids: DynamicArray[Bytes32]
+    amounts: DynamicArray[ARC4UInt256]
+
+class BucketsFilled(Struct):
+    bucket_ids: DynamicArray[Bytes32]
+    amounts: DynamicArray[ARC4UInt256]
+
 
 
 class IRateLimiter(ARC4Contract, ABC):
@@ -0,0 +1,40 @@
+from algopy import Bytes, UInt64, ensure_budget, op
+from algopy.arc4 import ARC4Contract, Bool, abimethod
+
+from .. import BitmapUInt64SetLib
+
+
+class BitmapUInt64SetLibExposed(ARC4Contract):
+    @abimethod(readonly=True)
+    def popcount(self) -> UInt64:
+        return BitmapUInt64SetLib.popcount(Bytes(b"uint64_set"))
+
+    @abimethod(readonly=True)
+    def capacity(self) -> UInt64:
+        return BitmapUInt64SetLib.capacity(Bytes(b"uint64_set"))
+
+    @abimethod(readonly=True)
+    def has_item(self, to_search: UInt64) -> Bool:
+        return BitmapUInt64SetLib.has_item(to_search, Bytes(b"uint64_set"))
+
+    @abimethod
+    def reset(self) -> None:
+        op.Box.delete(b"uint64_set")
+
+    @abimethod
+    def add_item(self, to_add: UInt64) -> Bool:
+        return BitmapUInt64SetLib.add_item(to_add, Bytes(b"uint64_set"))
+
+    @abimethod
+    def remove_item(self, to_remove: UInt64) -> Bool:
+        return BitmapUInt64SetLib.remove_item(to_remove, Bytes(b"uint64_set"))
+
+    @abimethod
+    def add_range(self, start: UInt64, end: UInt64) -> UInt64:
+        ensure_budget(10000)
+        return BitmapUInt64SetLib.add_range(start, end, Bytes(b"uint64_set"))
+
+    @abimethod
+    def remove_range(self, start: UInt64, end: UInt64) -> UInt64:
+        ensure_budget(10000)
+        return BitmapUInt64SetLib.remove_range(start, end, Bytes(b"uint64_set"))
@@ -0,0 +1,30 @@
+from algopy import Bytes, UInt64, op
+from algopy.arc4 import ARC4Contract, Bool, abimethod
+
+from .. import BoxUInt64SetLib
+
+
+class BoxUInt64SetLibExposed(ARC4Contract):
+    @abimethod(readonly=True)
+    def length(self) -> UInt64:
+        return BoxUInt64SetLib.length(Bytes(b"uint64_set"))
+
+    @abimethod(readonly=True)
+    def get_item(self, idx: UInt64) -> UInt64:
+        return BoxUInt64SetLib.get_item(Bytes(b"uint64_set"), idx)
+
+    @abimethod(readonly=True)
+    def has_item(self, to_search: UInt64) -> Bool:
+        return BoxUInt64SetLib.has_item(to_search, Bytes(b"uint64_set"))
+
+    @abimethod
+    def reset(self) -> None:
+        op.Box.delete(b"uint64_set")
+
+    @abimethod
+    def add_item(self, to_add: UInt64) -> Bool:
+        return BoxUInt64SetLib.add_item(to_add, Bytes(b"uint64_set"))
+
+    @abimethod
+    def remove_item(self, to_remove: UInt64) -> Bool:
+        return BoxUInt64SetLib.remove_item(to_remove, Bytes(b"uint64_set"))
@@ -1,4 +1,4 @@
-from algopy.arc4 import Address, abimethod
+from algopy.arc4 import Address, DynamicArray, abimethod
 
 from ...types import Bytes16
 from ..AccessControl import AccessControl
@@ -25,3 +25,19 @@ class MockAccessControl(AccessControl, Initialisable):
     @abimethod
     def check_role(self, role: Bytes16, account: Address) -> None:
         self._check_role(role, account)
+
+    @abimethod
+    def check_sender_any_role(self, roles: DynamicArray[Bytes16]) -> None:
+        self._check_sender_any_role(roles)
+
+    @abimethod
+    def check_any_role(self, roles: DynamicArray[Bytes16], account: Address) -> None:
+        self._check_any_role(roles, account)
+
+    @abimethod
+    def check_sender_all_roles(self, roles: DynamicArray[Bytes16]) -> None:
+        self._check_sender_all_roles(roles)
+
+    @abimethod
+    def check_all_roles(self, roles: DynamicArray[Bytes16], account: Address) -> None:
+        self._check_all_roles(roles, account)
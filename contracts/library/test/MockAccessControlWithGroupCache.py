@@ -0,0 +1,23 @@
+from algopy.arc4 import Address, Bool, abimethod
+
+from ...types import Bytes16
+from ..extensions.AccessControlWithGroupCache import AccessControlWithGroupCache
+from ..Initialisable import Initialisable
+
+class MockAccessControlWithGroupCache(AccessControlWithGroupCache, Initialisable):
+    def __init__(self) -> None:
+        AccessControlWithGroupCache.__init__(self)
+        Initialisable.__init__(self)
+
+    @abimethod
+    def initialise(self, admin: Address) -> None: # type: ignore[override]
+        super().initialise()
+        self._grant_role(self.default_admin_role(), admin)
+
+    @abimethod
+    def check_sender_role(self, role: Bytes16) -> None:
+        self._check_sender_role(role)
+
+    @abimethod
+    def is_sender_role_cached(self, role: Bytes16) -> Bool:
+        return Bool(self._is_sender_role_cached(role))
@@ -0,0 +1,23 @@
+from algopy.arc4 import Address, DynamicArray, abimethod
+
+from ...types import Bytes16, Bytes32
+from ..extensions.AccessControlWithMerkleRoles import AccessControlWithMerkleRoles
+from ..Initialisable import Initialisable
+
+class MockAccessControlWithMerkleRoles(AccessControlWithMerkleRoles, Initialisable):
+    def __init__(self) -> None:
+        AccessControlWithMerkleRoles.__init__(self)
+        Initialisable.__init__(self)
+
+    @abimethod
+    def initialise(self, admin: Address) -> None: # type: ignore[override]
+        super().initialise()
+        self._grant_role(self.default_admin_role(), admin)
+
+    @abimethod
+    def check_sender_role_with_proof(self, role: Bytes16, proof: DynamicArray[Bytes32]) -> None:
+        self._check_sender_role_with_proof(role, proof)
+
+    @abimethod
+    def check_role_with_proof(self, role: Bytes16, account: Address, proof: DynamicArray[Bytes32]) -> None:
+        self._check_role_with_proof(role, account, proof)
@@ -0,0 +1,33 @@
+from algopy import StateTotals
+from algopy.arc4 import Address, abimethod
+
+from ...types import Bytes16
+from ..extensions.AccessControlWithPinnedRoles import AccessControlWithPinnedRoles
+from ..Initialisable import Initialisable
+
+class MockAccessControlWithPinnedRoles(
+    AccessControlWithPinnedRoles,
+    Initialisable,
+    state_totals=StateTotals(global_bytes=3),
+):
+    def __init__(self) -> None:
+        AccessControlWithPinnedRoles.__init__(self)
+        Initialisable.__init__(self)
+
+    @abimethod
+    def initialise(self, admin: Address) -> None: # type: ignore[override]
+        super().initialise()
+        self._pin_role(self.default_admin_role())
+        self._grant_role(self.default_admin_role(), admin)
+
+    @abimethod
+    def pin_role(self, role: Bytes16) -> None:
+        self._pin_role(role)
+
+    @abimethod
+    def check_sender_role(self, role: Bytes16) -> None:
+        self._check_sender_role(role)
+
+    @abimethod
+    def set_role_admin(self, role: Bytes16, admin_role: Bytes16) -> None:
+        self._set_role_admin(role, admin_role)
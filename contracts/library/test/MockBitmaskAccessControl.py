@@ -0,0 +1,32 @@
+from algopy import UInt64
+from algopy.arc4 import Address, Bool, abimethod
+
+from ...types import Bytes16
+from ..BitmaskAccessControl import BitmaskAccessControl
+from ..Initialisable import Initialisable
+
+class MockBitmaskAccessControl(BitmaskAccessControl, Initialisable):
+    def __init__(self) -> None:
+        BitmaskAccessControl.__init__(self)
+        Initialisable.__init__(self)
+
+    @abimethod
+    def initialise(self, admin: Address) -> None: # type: ignore[override]
+        super().initialise()
+        self._grant_role(self.default_admin_role(), admin)
+
+    @abimethod
+    def set_role_admin(self, role: Bytes16, admin_role: Bytes16) -> None:
+        self._set_role_admin(role, admin_role)
+
+    @abimethod
+    def check_sender_role(self, role: Bytes16) -> None:
+        self._check_sender_role(role)
+
+    @abimethod
+    def check_role(self, role: Bytes16, account: Address) -> None:
+        self._check_role(role, account)
+
+    @abimethod(readonly=True)
+    def has_roles_mask(self, mask: UInt64, account: Address) -> Bool:
+        return Bool(self._has_roles_mask(mask, account))
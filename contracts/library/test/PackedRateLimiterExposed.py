@@ -0,0 +1,70 @@
+from algopy import Global, UInt64
+from algopy.arc4 import DynamicArray, UInt256, abimethod
+
+from ...types import ARC4UInt64, ARC4UInt256, Bytes32
+from ..PackedRateLimiter import PackedRateLimiter
+from ..RateLimiter import RateLimitBucket
+
+
+class PackedRateLimiterExposed(PackedRateLimiter):
+    @abimethod
+    def set_current_capacity(self, group_id: Bytes32, slot: UInt64, capacity: UInt256) -> None:
+        """Strictly for testing purposes. No check to ensure capacity doesn't exceed limit."""
+        rate_limit_bucket = self._get_bucket(group_id, slot)
+        rate_limit_bucket.current_capacity = capacity
+        rate_limit_bucket.last_updated = ARC4UInt64(Global.latest_timestamp)
+        self._set_bucket(group_id, slot, rate_limit_bucket)
+
+    @abimethod
+    def add_bucket(self, group_id: Bytes32, limit: UInt256, duration: UInt64) -> UInt64:
+        return self._add_bucket(group_id, limit, duration)
+
+    @abimethod
+    def remove_group(self, group_id: Bytes32) -> None:
+        self._remove_group(group_id)
+
+    @abimethod
+    def update_rate_limit(self, group_id: Bytes32, slot: UInt64, new_limit: UInt256) -> None:
+        self._update_rate_limit(group_id, slot, new_limit)
+
+    @abimethod
+    def update_rate_duration(self, group_id: Bytes32, slot: UInt64, new_duration: UInt64) -> None:
+        self._update_rate_duration(group_id, slot, new_duration)
+
+    @abimethod
+    def consume_amount(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> None:
+        self._consume_amount(group_id, slot, amount)
+
+    @abimethod
+    def fill_amount(self, group_id: Bytes32, slot: UInt64, amount: UInt256) -> None:
+        self._fill_amount(group_id, slot, amount)
+
+    @abimethod
+    def consume_amounts(
+        self,
+        group_id: Bytes32,
+        slots: DynamicArray[ARC4UInt64],
+        amounts: DynamicArray[ARC4UInt256]
+    ) -> None:
+        self._consume_amounts(group_id, slots, amounts)
+
+    @abimethod
+    def fill_amounts(
+        self,
+        group_id: Bytes32,
+        slots: DynamicArray[ARC4UInt64],
+        amounts: DynamicArray[ARC4UInt256]
+    ) -> None:
+        self._fill_amounts(group_id, slots, amounts)
+
+    @abimethod
+    def update_capacity(self, group_id: Bytes32, slot: UInt64) -> None:
+        self._update_capacity(group_id, slot)
+
+    @abimethod
+    def check_bucket_known(self, group_id: Bytes32, slot: UInt64) -> None:
+        self._check_bucket_known(group_id, slot)
+
+    @abimethod(readonly=True)
+    def get_bucket(self, group_id: Bytes32, slot: UInt64) -> RateLimitBucket:
+        return self._get_bucket(group_id, slot)
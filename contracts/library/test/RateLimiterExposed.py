@@ -1,7 +1,7 @@
 from algopy import Global, UInt64
-from algopy.arc4 import Bool, UInt256, abimethod
+from algopy.arc4 import Bool, DynamicArray, UInt256, abimethod
 
-from ...types import ARC4UInt64, Bytes32
+from ...types import ARC4UInt64, ARC4UInt256, Bytes32
 from ..RateLimiter import RateLimiter, RateLimitBucket
 
 
@@ -38,6 +38,14 @@ class RateLimiterExposed(RateLimiter):
     def fill_amount(self, bucket_id: Bytes32, amount: UInt256) -> None:
         self._fill_amount(bucket_id, amount)
 
+    @abimethod
+    def consume_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt256]) -> None:
+        self._consume_amounts(bucket_ids, amounts)
+
+    @abimethod
+    def fill_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt256]) -> None:
+        self._fill_amounts(bucket_ids, amounts)
+
     @abimethod
     def update_capacity(self, bucket_id: Bytes32) -> None:
         self._update_capacity(bucket_id)
@@ -0,0 +1,59 @@
+from algopy import Global, UInt64
+from algopy.arc4 import DynamicArray, abimethod
+
+from ...types import ARC4UInt64, Bytes32
+from ..RateLimiterUInt64 import RateLimiterUInt64, RateLimitBucketUInt64
+
+
+class RateLimiterUInt64Exposed(RateLimiterUInt64):
+    @abimethod
+    def set_current_capacity(self, bucket_id: Bytes32, capacity: UInt64) -> None:
+        """Strictly for testing purposes. No check to ensure capacity doesn't exceed limit."""
+        self._check_bucket_known(bucket_id)
+
+        self.rate_limit_buckets[bucket_id].current_capacity = ARC4UInt64(capacity)
+        self.rate_limit_buckets[bucket_id].last_updated = ARC4UInt64(Global.latest_timestamp)
+
+    @abimethod
+    def add_bucket(self, bucket_id: Bytes32, limit: UInt64, duration: UInt64) -> None:
+        self._add_bucket(bucket_id, limit, duration)
+
+    @abimethod
+    def remove_bucket(self, bucket_id: Bytes32) -> None:
+        self._remove_bucket(bucket_id)
+
+    @abimethod
+    def update_rate_limit(self, bucket_id: Bytes32, new_limit: UInt64) -> None:
+        self._update_rate_limit(bucket_id, new_limit)
+
+    @abimethod
+    def update_rate_duration(self, bucket_id: Bytes32, new_duration: UInt64) -> None:
+        self._update_rate_duration(bucket_id, new_duration)
+
+    @abimethod
+    def consume_amount(self, bucket_id: Bytes32, amount: UInt64) -> None:
+        self._consume_amount(bucket_id, amount)
+
+    @abimethod
+    def fill_amount(self, bucket_id: Bytes32, amount: UInt64) -> None:
+        self._fill_amount(bucket_id, amount)
+
+    @abimethod
+    def consume_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt64]) -> None:
+        self._consume_amounts(bucket_ids, amounts)
+
+    @abimethod
+    def fill_amounts(self, bucket_ids: DynamicArray[Bytes32], amounts: DynamicArray[ARC4UInt64]) -> None:
+        self._fill_amounts(bucket_ids, amounts)
+
+    @abimethod
+    def update_capacity(self, bucket_id: Bytes32) -> None:
+        self._update_capacity(bucket_id)
+
+    @abimethod
+    def check_bucket_known(self, bucket_id: Bytes32) -> None:
+        self._check_bucket_known(bucket_id)
+
+    @abimethod(readonly=True)
+    def get_bucket(self, bucket_id: Bytes32) -> RateLimitBucketUInt64:
+        return self._get_bucket(bucket_id)
@@ -0,0 +1,42 @@
+from algopy import Bytes, UInt64, op
+from algopy.arc4 import ARC4Contract, Bool, DynamicArray, abimethod
+
+from ...types import ARC4UInt64
+from .. import ShardedUInt64SetLib
+
+BOX_PREFIX = b"uint64_set_"
+NUM_SHARDS = 4
+
+
+class ShardedUInt64SetLibExposed(ARC4Contract):
+    @abimethod(readonly=True)
+    def num_shards(self) -> UInt64:
+        return UInt64(NUM_SHARDS)
+
+    @abimethod(readonly=True)
+    def get_shard(self, item: UInt64) -> UInt64:
+        return ShardedUInt64SetLib.get_shard(item, UInt64(NUM_SHARDS))
+
+    @abimethod(readonly=True)
+    def shard_length(self, shard: UInt64) -> UInt64:
+        return ShardedUInt64SetLib.shard_length(Bytes(BOX_PREFIX), shard)
+
+    @abimethod(readonly=True)
+    def get_page(self, shard: UInt64, start: UInt64, max_items: UInt64) -> DynamicArray[ARC4UInt64]:
+        return ShardedUInt64SetLib.get_page(Bytes(BOX_PREFIX), shard, start, max_items)
+
+    @abimethod(readonly=True)
+    def has_item(self, to_search: UInt64) -> Bool:
+        return ShardedUInt64SetLib.has_item(to_search, Bytes(BOX_PREFIX), UInt64(NUM_SHARDS))
+
+    @abimethod
+    def reset_shard(self, shard: UInt64) -> None:
+        op.Box.delete(ShardedUInt64SetLib.get_shard_key(Bytes(BOX_PREFIX), shard))
+
+    @abimethod
+    def add_item(self, to_add: UInt64) -> Bool:
+        return ShardedUInt64SetLib.add_item(to_add, Bytes(BOX_PREFIX), UInt64(NUM_SHARDS))
+
+    @abimethod
+    def remove_item(self, to_remove: UInt64) -> Bool:
+        return ShardedUInt64SetLib.remove_item(to_remove, Bytes(BOX_PREFIX), UInt64(NUM_SHARDS))
@@ -0,0 +1,17 @@
+from algopy import Global, Txn
+from algopy.arc4 import Address, abimethod
+
+from ..PackedUpgradeable import PackedUpgradeable
+
+
+class SimplePackedUpgradeable(PackedUpgradeable):
+    def __init__(self) -> None:
+        PackedUpgradeable.__init__(self)
+
+    @abimethod
+    def initialise(self, admin: Address) -> None: # type: ignore[override]
+        assert Txn.sender == Global.creator_address, "Caller must be the contract creator"
+        PackedUpgradeable.initialise(self)
+
+        self._grant_role(self.default_admin_role(), admin)
+        self._grant_role(self.upgradable_admin_role(), admin)
@@ -0,0 +1,42 @@
+from algopy import Box, UInt64
+from algopy.arc4 import ARC4Contract, Bool, DynamicArray, abimethod
+
+from ...types import ARC4UInt64
+from .. import SortedUInt64SetLib
+
+
+class SortedUInt64SetLibExposed(ARC4Contract):
+    def __init__(self) -> None:
+        self.uint64_set = Box(DynamicArray[ARC4UInt64], key="uint64_set")
+
+    @abimethod(readonly=True)
+    def dynamic_has_item(self, to_search: UInt64) -> Bool:
+        return SortedUInt64SetLib.has_item(to_search, self.uint64_set.value.copy())
+
+    @abimethod
+    def dynamic_reset(self) -> None:
+        self.uint64_set.value = DynamicArray[ARC4UInt64]()
+
+    @abimethod
+    def dynamic_add_item(self, to_add: UInt64) -> Bool:
+        added, new_items = SortedUInt64SetLib.add_item(to_add, self.uint64_set.value.copy())
+        self.uint64_set.value = new_items.copy()
+        return added
+
+    @abimethod
+    def dynamic_remove_item(self, to_remove: UInt64) -> Bool:
+        removed, new_items = SortedUInt64SetLib.remove_item(to_remove, self.uint64_set.value.copy())
+        self.uint64_set.value = new_items.copy()
+        return removed
+
+    @abimethod(readonly=True)
+    def has_item(self, to_search: UInt64, items: DynamicArray[ARC4UInt64]) -> Bool:
+        return SortedUInt64SetLib.has_item(to_search, items)
+
+    @abimethod(readonly=True)
+    def add_item(self, to_add: UInt64, items: DynamicArray[ARC4UInt64]) -> tuple[Bool, DynamicArray[ARC4UInt64]]:
+        return SortedUInt64SetLib.add_item(to_add, items)
+
+    @abimethod(readonly=True)
+    def remove_item(self, to_remove: UInt64, items: DynamicArray[ARC4UInt64]) -> tuple[Bool, DynamicArray[ARC4UInt64]]:
+        return SortedUInt64SetLib.remove_item(to_remove, items)
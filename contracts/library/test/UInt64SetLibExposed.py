@@ -1,6 +1,5 @@
 from algopy import Box, UInt64, ensure_budget
 from algopy.arc4 import ARC4Contract, Bool, DynamicArray, abimethod
-from typing import Tuple
 
 from ...types import ARC4UInt64
 from .. import UInt64SetLib
@@ -37,9 +36,9 @@ class UInt64SetLibExposed(ARC4Contract):
         return UInt64SetLib.has_item(to_search, items)
 
     @abimethod(readonly=True)
-    def add_item(self, to_add: UInt64, items: DynamicArray[ARC4UInt64]) -> Tuple[Bool, DynamicArray[ARC4UInt64]]:
+    def add_item(self, to_add: UInt64, items: DynamicArray[ARC4UInt64]) -> tuple[Bool, DynamicArray[ARC4UInt64]]:
         return UInt64SetLib.add_item(to_add, items)
 
     @abimethod(readonly=True)
-    def remove_item(self, to_remove: UInt64, items: DynamicArray[ARC4UInt64]) -> Tuple[Bool, DynamicArray[ARC4UInt64]]:
+    def remove_item(self, to_remove: UInt64, items: DynamicArray[ARC4UInt64]) -> tuple[Bool, DynamicArray[ARC4UInt64]]:
         return UInt64SetLib.remove_item(to_remove, items)
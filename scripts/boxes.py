@@ -0,0 +1,90 @@
+"""Computes the box keys of the library contracts, e.g. to pass as box references from deployment tooling.
+
+Mirrors the helpers in tests/utils/boxes.ts. Roles can be given as their 16 byte identifier or their name, and
+addresses as their 32 byte public key or their encoded form. Keys for many roles, buckets or addresses can be
+computed in bulk with the plural functions, deriving the identifier of each role name only once.
+"""
+from collections.abc import Iterable
+
+from algosdk import encoding
+
+from .identifiers import BUCKET_SIZE, ROLE_SIZE, get_role_id
+
+ADDRESS_SIZE = 32
+
+ROLE_PREFIX = b"role_"
+ADDRESS_ROLES_PREFIX = b"address_roles_"
+BUCKET_PREFIX = b"rate_limit_buckets_"
+BUCKET_GROUP_PREFIX = b"rate_limit_groups_"
+MERKLE_ROOT_PREFIX = b"merkle_roots_"
+
+
+def _role_bytes(role: bytes | str) -> bytes:
+    role_id = get_role_id(role) if isinstance(role, str) else role
+    if len(role_id) != ROLE_SIZE:
+        raise ValueError("Role must be 16 bytes")
+    return role_id
+
+
+def _address_bytes(address: bytes | str) -> bytes:
+    public_key = encoding.decode_address(address) if isinstance(address, str) else address
+    if len(public_key) != ADDRESS_SIZE:
+        raise ValueError("Address must be 32 bytes")
+    return public_key
+
+
+def _bucket_bytes(bucket_id: bytes) -> bytes:
+    if len(bucket_id) != BUCKET_SIZE:
+        raise ValueError("Bucket id must be 32 bytes")
+    return bucket_id
+
+
+# AccessControl
+def get_role_box_key(role: bytes | str) -> bytes:
+    return ROLE_PREFIX + _role_bytes(role)
+
+
+def get_address_roles_box_key(role: bytes | str, address: bytes | str) -> bytes:
+    return ADDRESS_ROLES_PREFIX + _role_bytes(role) + _address_bytes(address)
+
+
+def get_role_box_keys(roles: Iterable[bytes | str]) -> list[bytes]:
+    return [get_role_box_key(role) for role in roles]
+
+
+def get_address_roles_box_keys(role: bytes | str, addresses: Iterable[bytes | str]) -> list[bytes]:
+    """Returns the keys of the boxes recording whether each address has the role."""
+    prefix = ADDRESS_ROLES_PREFIX + _role_bytes(role)
+    return [prefix + _address_bytes(address) for address in addresses]
+
+
+# RateLimiter
+def get_bucket_box_key(bucket_id: bytes) -> bytes:
+    return BUCKET_PREFIX + _bucket_bytes(bucket_id)
+
+
+def get_bucket_box_keys(bucket_ids: Iterable[bytes]) -> list[bytes]:
+    return [get_bucket_box_key(bucket_id) for bucket_id in bucket_ids]
+
+
+# ShardedUInt64SetLib
+def get_shard_box_key(box_prefix: bytes | str, shard: int) -> bytes:
+    prefix = box_prefix.encode() if isinstance(box_prefix, str) else box_prefix
+    return prefix + shard.to_bytes(2, "big")
+
+
+# PackedRateLimiter
+def get_bucket_group_box_key(group_id: bytes) -> bytes:
+    if len(group_id) != BUCKET_SIZE:
+        raise ValueError("Group id must be 32 bytes")
+    return BUCKET_GROUP_PREFIX + group_id
+
+
+# BitmaskAccessControl
+def get_address_roles_mask_box_key(address: bytes | str) -> bytes:
+    return ADDRESS_ROLES_PREFIX + _address_bytes(address)
+
+
+# AccessControlWithMerkleRoles
+def get_merkle_root_box_key(role: bytes | str) -> bytes:
+    return MERKLE_ROOT_PREFIX + _role_bytes(role)
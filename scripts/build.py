@@ -0,0 +1,243 @@
+"""Compiles the contracts once each, in parallel, skipping those unchanged since the last build.
+
+Each source file is compiled in a single pass which outputs the TEAL, bytecode, source maps and ARC-56 spec together,
+in place of the separate `npm run teal` and `npm run arc56` compilations. The TEAL, bytecode and source maps are
+written to specs/teal and the ARC-56 specs to specs/arc56, as before.
+
+A source file is only recompiled if the hash of it and the local modules it imports (transitively), the compiler
+version and the compile flags differs from the last build, recorded in specs/.build_cache.json. So a change to
+RateLimiter.py recompiles the contracts which import it but not e.g. LargeContractToUpgradeTo.
+
+Build the contracts:
+    python -m scripts.build
+
+Recompile every contract regardless of the cache:
+    python -m scripts.build --force
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_CONTRACTS_DIR = Path(__file__).parents[1] / "contracts"
+DEFAULT_SPECS_DIR = Path(__file__).parents[1] / "specs"
+CACHE_FILE_NAME = ".build_cache.json"
+
+COMPILE_COMMAND = ("algokit", "compile", "py")
+COMPILE_FLAGS = (
+    "--target-avm-version", "11",
+    "--optimization-level", "2",
+    "--output-teal",
+    "--output-bytecode",
+    "--output-source-map",
+    "--output-arc56",
+    "--no-output-arc32",
+    "--no-output-client",
+)
+
+# subdirectory of the specs directory each output is written to, by file suffix, all others go to "teal"
+OUTPUT_SUBDIRS = {".arc56.json": "arc56"}
+DEFAULT_OUTPUT_SUBDIR = "teal"
+
+
+@dataclass
+class BuildResult:
+    compiled: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    # sources of the last build which no longer exist or no longer define a contract
+    removed: list[str] = field(default_factory=list)
+
+
+def _module_path(package_dir: Path, module: str) -> Path | None:
+    path = package_dir.joinpath(*module.split("."))
+    for candidate in (path.with_suffix(".py"), path / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def get_local_imports(path: Path, root: Path) -> set[Path]:
+    """Returns the modules within the root package which the source file imports directly.
+
+    Both relative imports and absolute imports of the root package are resolved, including the `__init__.py` of
+    each imported package. Imports of other packages e.g. algopy are ignored.
+    """
+    tree = ast.parse(path.read_text(), filename=str(path))
+    imports: set[Path] = set()
+
+    def add(package_dir: Path, module: str | None, names: list[str]) -> None:
+        base = _module_path(package_dir, module) if module else package_dir / "__init__.py"
+        if base is not None and base.is_file():
+            imports.add(base)
+        # "from package import module" imports the module itself
+        if base is not None and base.name == "__init__.py":
+            for name in names:
+                submodule = _module_path(base.parent, name)
+                if submodule is not None:
+                    imports.add(submodule)
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            names = [alias.name for alias in node.names]
+            if node.level:
+                package_dir = path.parent.parents[node.level - 2] if node.level > 1 else path.parent
+                add(package_dir, node.module, names)
+            elif node.module and node.module.split(".")[0] == root.name:
+                add(root.parent, node.module, names)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.split(".")[0] == root.name:
+                    add(root.parent, alias.name, [])
+    # importing a module runs the `__init__.py` of each package it is in, as does the source file itself
+    root = root.resolve()
+    modules = {module.resolve() for module in imports if module.resolve().is_relative_to(root)}
+    for module in [*modules, path.resolve()]:
+        modules.update(init for parent in module.parents if parent.is_relative_to(root)
+                       if (init := parent / "__init__.py").is_file())
+    return modules
+
+
+def get_source_tree(path: Path, root: Path) -> list[Path]:
+    """Returns the source file and every local module it imports, directly or indirectly, sorted."""
+    seen = {path.resolve()}
+    to_visit = [path.resolve()]
+    while to_visit:
+        for module in get_local_imports(to_visit.pop(), root):
+            if module not in seen:
+                seen.add(module)
+                to_visit.append(module)
+    return sorted(seen)
+
+
+def hash_build_inputs(sources: Sequence[Path], root: Path, compiler_version: str, flags: Sequence[str]) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(compiler_version.encode())
+    for flag in flags:
+        hasher.update(b"\0" + flag.encode())
+    for source in sources:
+        hasher.update(b"\0" + source.relative_to(root.resolve()).as_posix().encode() + b"\0")
+        hasher.update(source.read_bytes())
+    return hasher.hexdigest()
+
+
+def defines_contract(path: Path) -> bool:
+    """Returns whether the source file defines a class which may be a contract, i.e. isn't just structs."""
+    tree = ast.parse(path.read_text(), filename=str(path))
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = {ast.unparse(base) for base in node.bases}
+            if not bases <= {"Struct", "arc4.Struct", "ABC"}:
+                return True
+    return False
+
+
+def get_compiler_version(command: Sequence[str]) -> str:
+    return subprocess.run([*command, "--version"], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def get_output_subdir(name: str) -> str:
+    for suffix, subdir in OUTPUT_SUBDIRS.items():
+        if name.endswith(suffix):
+            return subdir
+    return DEFAULT_OUTPUT_SUBDIR
+
+
+def compile_source(path: Path, command: Sequence[str], flags: Sequence[str], specs_dir: Path) -> list[str]:
+    """Compiles a source file and moves its outputs into the specs directory. Returns the output paths written."""
+    with tempfile.TemporaryDirectory() as out_dir:
+        result = subprocess.run([*command, *flags, "--out-dir", out_dir, str(path)], capture_output=True, text=True)
+        if result.returncode:
+            raise RuntimeError(result.stdout + result.stderr)
+
+        outputs = []
+        for output in sorted(Path(out_dir).rglob("*")):
+            if output.is_file():
+                relative = Path(get_output_subdir(output.name)) / output.name
+                (specs_dir / relative.parent).mkdir(parents=True, exist_ok=True)
+                shutil.move(output, specs_dir / relative)
+                outputs.append(relative.as_posix())
+        return outputs
+
+
+def build(
+    contracts_dir: Path = DEFAULT_CONTRACTS_DIR,
+    specs_dir: Path = DEFAULT_SPECS_DIR,
+    command: Sequence[str] = COMPILE_COMMAND,
+    flags: Sequence[str] = COMPILE_FLAGS,
+    jobs: int | None = None,
+    force: bool = False,
+) -> BuildResult:
+    cache_path = specs_dir / CACHE_FILE_NAME
+    cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+    compiler_version = get_compiler_version(command)
+
+    # hash every source up front as it's cheap compared to compiling
+    to_compile: dict[str, tuple[Path, str]] = {}
+    result = BuildResult()
+    for path in sorted(contracts_dir.rglob("*.py")):
+        if not defines_contract(path):
+            continue
+        name = path.relative_to(contracts_dir).as_posix()
+        digest = hash_build_inputs(get_source_tree(path, contracts_dir), contracts_dir, compiler_version, flags)
+        entry = cache.get(name)
+        is_built = entry and all((specs_dir / output).exists() for output in entry["outputs"])
+        if is_built and entry["hash"] == digest and not force:
+            result.skipped.append(name)
+        else:
+            to_compile[name] = (path, digest)
+
+    # remove the outputs of sources which were deleted or renamed, so stale specs don't feed the clients and reports
+    result.removed = sorted(set(cache) - set(to_compile) - set(result.skipped))
+    # and of those being recompiled in case the contract they define was renamed
+    for name in [*result.removed, *to_compile]:
+        for output in cache.pop(name, {}).get("outputs", []):
+            (specs_dir / output).unlink(missing_ok=True)
+
+    # the compiler runs in a subprocess so threads are enough to compile in parallel
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        futures = {
+            name: executor.submit(compile_source, path, command, flags, specs_dir)
+            for name, (path, _) in to_compile.items()
+        }
+        for name, future in futures.items():
+            try:
+                cache[name] = {"hash": to_compile[name][1], "outputs": future.result()}
+                result.compiled.append(name)
+            except RuntimeError as error:
+                result.failed[name] = str(error)
+
+    specs_dir.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n")
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contracts-dir", type=Path, default=DEFAULT_CONTRACTS_DIR, help="directory of contracts")
+    parser.add_argument("--specs-dir", type=Path, default=DEFAULT_SPECS_DIR, help="directory to write outputs to")
+    parser.add_argument("--jobs", "-j", type=int, help="number of parallel compilations, defaults to CPU count")
+    parser.add_argument("--force", action="store_true", help="recompile every contract regardless of the cache")
+    args = parser.parse_args(argv)
+
+    result = build(args.contracts_dir, args.specs_dir, jobs=args.jobs, force=args.force)
+    print(
+        f"Compiled {len(result.compiled)}, unchanged {len(result.skipped)}, failed {len(result.failed)}, "
+        f"removed {len(result.removed)}"
+    )
+    for name, error in result.failed.items():
+        print(f"Failed to compile {name}:\n{error}", file=sys.stderr)
+    return int(bool(result.failed))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
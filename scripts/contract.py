@@ -0,0 +1,51 @@
+"""Computes the program SHA256 which Upgradeable checks when completing an upgrade.
+
+Mirrors `calculateProgramSha256` in tests/utils/contract.ts:
+    program_sha256 = sha256("approval" + sha256(approval_page_0) + ... + "clear" + sha256(clear_page_0) + ...)
+
+Print the program SHA256 of compiled programs to schedule an upgrade with:
+    python -m scripts.contract approval.bin clear.bin
+"""
+import argparse
+import hashlib
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+# byte length of a program page in an application call transaction
+PAGE_SIZE = 4096
+
+
+def _page_digests(program: bytes | bytearray | memoryview) -> Iterator[bytes]:
+    # slicing a memoryview references the program rather than copying each page
+    view = memoryview(program)
+    for offset in range(0, len(view), PAGE_SIZE):
+        yield hashlib.sha256(view[offset:offset + PAGE_SIZE]).digest()
+
+
+def calculate_program_sha256(
+    approval_program: bytes | bytearray | memoryview,
+    clear_state_program: bytes | bytearray | memoryview,
+) -> bytes:
+    """Returns the SHA256 of the programs as scheduled with `schedule_contract_upgrade`."""
+    hasher = hashlib.sha256(b"approval")
+    for digest in _page_digests(approval_program):
+        hasher.update(digest)
+    hasher.update(b"clear")
+    for digest in _page_digests(clear_state_program):
+        hasher.update(digest)
+    return hasher.digest()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("approval", type=Path, help="compiled approval program")
+    parser.add_argument("clear", type=Path, help="compiled clear state program")
+    args = parser.parse_args(argv)
+
+    print(calculate_program_sha256(args.approval.read_bytes(), args.clear.read_bytes()).hex())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Decodes large numbers of the fixed width ARC-28 events logged by the library contracts with NumPy.
+
+Logs are held in a LogBuffer, one contiguous byte buffer with the offset of each log, which can be saved and memory
+mapped back. The logs are grouped by their 4 byte selector and each group of a fixed width event is copied out of
+the buffer and viewed as a structured array in one go, rather than decoding each log in Python.
+
+The events and their selectors are read from the `events` of the ARC-56 specs output by `npm run pre-build`. Fields
+are decoded as:
+    byte[N], address  uint8 array of shape (N,)
+    uint8 to uint64   big-endian unsigned integer
+    uint256           "hi" and "lo" 128 bit halves, each two big-endian uint64 words, see `uint256_to_int`
+
+Events with a dynamic field e.g. BucketsConsumed are left undecoded, use `scripts.events.decode_event` for those.
+
+Print the number of each event in logs saved with `LogBuffer.save`:
+    python -m scripts.event_decoder logs/
+"""
+import argparse
+import json
+import re
+import sys
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .events import SELECTOR_SIZE, get_selector
+
+DEFAULT_SPECS_DIR = Path(__file__).parents[1] / "specs" / "arc56"
+
+# a uint256 split into its most and least significant 128 bits, each as two big-endian uint64 words
+UINT256_DTYPE = np.dtype([("hi", ">u8", (2,)), ("lo", ">u8", (2,))])
+
+_BYTES_PATTERN = re.compile(r"^byte\[(?P<size>\d+)\]$")
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    name: str
+    signature: str
+    selector: bytes
+    # None if the event has a dynamic field
+    dtype: np.dtype | None
+
+
+@dataclass(frozen=True)
+class DecodedEvents:
+    # index of each decoded log in the LogBuffer
+    indices: np.ndarray
+    records: np.ndarray
+
+
+def _field_dtype(arc4_type: str) -> np.dtype | None:
+    if arc4_type == "address":
+        return np.dtype(("u1", (32,)))
+    match = _BYTES_PATTERN.match(arc4_type)
+    if match:
+        return np.dtype(("u1", (int(match["size"]),)))
+    if arc4_type == "uint256":
+        return UINT256_DTYPE
+    if arc4_type in ("uint8", "uint16", "uint32", "uint64"):
+        return np.dtype(f">u{int(arc4_type[4:]) // 8}")
+    return None
+
+
+def get_event_dtype(arc4_types: Iterable[tuple[str, str]]) -> np.dtype | None:
+    """Returns the packed structured dtype of an event given the (name, type) of its fields, None if not fixed width."""
+    fields = []
+    for name, arc4_type in arc4_types:
+        dtype = _field_dtype(arc4_type)
+        if dtype is None:
+            return None
+        fields.append((name, dtype))
+    return np.dtype(fields)
+
+
+def load_event_specs(specs_dir: Path = DEFAULT_SPECS_DIR) -> dict[bytes, EventSpec]:
+    """Returns the events declared in the ARC-56 specs by selector. Events shared by contracts are only listed once."""
+    specs: dict[bytes, EventSpec] = {}
+    for path in sorted(specs_dir.glob("*.arc56.json")):
+        for event in json.loads(path.read_text()).get("events", []):
+            fields = [(arg.get("name") or f"arg{idx}", arg["type"]) for idx, arg in enumerate(event["args"])]
+            signature = f"{event['name']}({','.join(arc4_type for _, arc4_type in fields)})"
+            selector = get_selector(signature)
+            if selector not in specs:
+                specs[selector] = EventSpec(event["name"], signature, selector, get_event_dtype(fields))
+    return specs
+
+
+class LogBuffer:
+    """Logs stored back to back in one uint8 array, log `i` being `data[offsets[i]:offsets[i + 1]]`."""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx: int) -> bytes:
+        return self.data[self.offsets[idx]:self.offsets[idx + 1]].tobytes()
+
+    @classmethod
+    def from_logs(cls, logs: Iterable[bytes]) -> "LogBuffer":
+        logs = list(logs)
+        offsets = np.zeros(len(logs) + 1, dtype=np.int64)
+        np.cumsum([len(log) for log in logs], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(logs), dtype=np.uint8), offsets)
+
+    def save(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "offsets.npy", self.offsets)
+        self.data.tofile(directory / "data.bin")
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "LogBuffer":
+        """Loads logs saved with `save`, memory mapped by default so they are only read as they are decoded."""
+        if mmap:
+            return cls(np.memmap(directory / "data.bin", dtype=np.uint8, mode="r"),
+                       np.load(directory / "offsets.npy", mmap_mode="r"))
+        return cls(np.fromfile(directory / "data.bin", dtype=np.uint8), np.load(directory / "offsets.npy"))
+
+
+def _gather(data: np.ndarray, starts: np.ndarray, width: int) -> np.ndarray:
+    # copy the `width` bytes from each start into a contiguous (starts, width) array, indexing a strided view of
+    # every window of the buffer rather than building an index per byte
+    if not len(starts):
+        return np.empty((0, width), dtype=np.uint8)
+    return np.lib.stride_tricks.sliding_window_view(data, width)[starts]
+
+
+def get_selectors(logs: LogBuffer) -> np.ndarray:
+    """Returns the selector of each log as a uint32, logs shorter than a selector are given 0."""
+    starts, lengths = logs.offsets[:-1], np.diff(logs.offsets)
+    selectors = np.zeros(len(logs), dtype=np.uint32)
+    has_selector = lengths >= SELECTOR_SIZE
+    selectors[has_selector] = _gather(logs.data, starts[has_selector], SELECTOR_SIZE).view(">u4").ravel()
+    return selectors
+
+
+def decode_logs(logs: LogBuffer, specs: Mapping[bytes, EventSpec]) -> dict[str, DecodedEvents]:
+    """Decodes the logs of each fixed width event in the specs, keyed by event name.
+
+    Logs of other events, or whose length doesn't match their event, are skipped.
+    """
+    selectors = get_selectors(logs)
+    starts, lengths = logs.offsets[:-1], np.diff(logs.offsets)
+
+    decoded = {}
+    for selector, spec in specs.items():
+        if spec.dtype is None:
+            continue
+        width = spec.dtype.itemsize
+        indices = np.flatnonzero(
+            (selectors == int.from_bytes(selector, "big")) & (lengths == SELECTOR_SIZE + width)
+        )
+        # the bodies are gathered into one contiguous block which is reinterpreted as the event structs
+        rows = _gather(logs.data, starts[indices] + SELECTOR_SIZE, width)
+        decoded[spec.name] = DecodedEvents(indices, rows.view(spec.dtype).reshape(-1))
+    return decoded
+
+
+def uint256_to_int(values: np.ndarray) -> np.ndarray:
+    """Returns the exact value of uint256 fields as an array of Python ints."""
+    words = np.concatenate([values["hi"], values["lo"]], axis=-1).astype(object)
+    return ((words[..., 0] << 192) | (words[..., 1] << 128) | (words[..., 2] << 64) | words[..., 3])
+
+
+def uint256_to_float(values: np.ndarray) -> np.ndarray:
+    """Returns the approximate value of uint256 fields as float64, e.g. to aggregate amounts."""
+    words = np.concatenate([values["hi"], values["lo"]], axis=-1).astype(np.float64)
+    return words @ np.array([2.0**192, 2.0**128, 2.0**64, 1.0])
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("logs", type=Path, help="directory of logs saved with LogBuffer.save")
+    parser.add_argument("--specs-dir", type=Path, default=DEFAULT_SPECS_DIR, help="directory of ARC-56 specs")
+    args = parser.parse_args(argv)
+
+    specs = load_event_specs(args.specs_dir)
+    if not specs:
+        print(f"No events in the ARC-56 specs in {args.specs_dir}, run `npm run pre-build` first", file=sys.stderr)
+        return 1
+    logs = LogBuffer.load(args.logs)
+    decoded = decode_logs(logs, specs)
+    for name, events in sorted(decoded.items()):
+        print(f"{name}: {len(events.indices)}")
+    print(f"Undecoded: {len(logs) - sum(len(events.indices) for events in decoded.values())}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
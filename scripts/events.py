@@ -0,0 +1,116 @@
+"""Encodes and decodes the ARC-28 events emitted by the library contracts.
+
+An event is logged as the 4 byte selector, the first 4 bytes of sha512_256 of its signature e.g.
+"RoleGranted(byte[16],address,address)", followed by the ARC-4 encoding of its struct. The fields of each event
+mirror the structs in contracts/library/interfaces.
+"""
+from dataclasses import dataclass
+from typing import Any
+
+from Cryptodome.Hash import SHA512
+
+SELECTOR_SIZE = 4
+
+# event name -> (field name, ARC-4 type) of each field of its struct
+EVENT_FIELDS: dict[str, tuple[tuple[str, str], ...]] = {
+    # IAccessControl
+    "RoleAdminChanged": (("role", "byte[16]"), ("prev_admin_role", "byte[16]"), ("new_admin_role", "byte[16]")),
+    "RoleGranted": (("role", "byte[16]"), ("account", "address"), ("sender", "address")),
+    "RoleRevoked": (("role", "byte[16]"), ("account", "address"), ("sender", "address")),
+    "RoleExpiryUpdated": (("role", "byte[16]"), ("account", "address"), ("expiry", "uint64")),
+    # IRateLimiter
+    "BucketAdded": (("bucket_id", "byte[32]"), ("limit", "uint256"), ("duration", "uint64")),
+    "BucketRemoved": (("bucket_id", "byte[32]"),),
+    "BucketRateLimitUpdated": (("bucket_id", "byte[32]"), ("limit", "uint256")),
+    "BucketRateDurationUpdated": (("bucket_id", "byte[32]"), ("duration", "uint64")),
+    "BucketConsumed": (("bucket_id", "byte[32]"), ("amount", "uint256")),
+    "BucketFilled": (("bucket_id", "byte[32]"), ("amount", "uint256")),
+    "BucketsConsumed": (("bucket_ids", "byte[32][]"), ("amounts", "uint256[]")),
+    "BucketsFilled": (("bucket_ids", "byte[32][]"), ("amounts", "uint256[]")),
+    # IUpgradeable
+    "UpgradeScheduled": (("program_sha256", "byte[32]"), ("timestamp", "uint64")),
+    "UpgradeCancelled": (("timestamp", "uint64"),),
+    "UpgradeCompleted": (("program_sha256", "byte[32]"), ("version", "uint64")),
+}
+
+
+@dataclass(frozen=True)
+class Event:
+    name: str
+    args: dict[str, Any]
+
+
+def get_event_signature(name: str) -> str:
+    return f"{name}({','.join(arc4_type for _, arc4_type in EVENT_FIELDS[name])})"
+
+
+def get_selector(signature: str) -> bytes:
+    return SHA512.new(signature.encode(), truncate="256").digest()[:SELECTOR_SIZE]
+
+
+EVENT_SELECTORS: dict[bytes, str] = {get_selector(get_event_signature(name)): name for name in EVENT_FIELDS}
+
+
+def _static_size(arc4_type: str) -> int:
+    if arc4_type == "address":
+        return 32
+    if arc4_type.startswith("uint"):
+        return int(arc4_type.removeprefix("uint")) // 8
+    if arc4_type.startswith("byte[") and arc4_type.endswith("]"):
+        return int(arc4_type[5:-1])
+    raise ValueError(f"Unsupported type {arc4_type}")
+
+
+def _decode_static(arc4_type: str, data: bytes) -> Any:
+    return int.from_bytes(data, "big") if arc4_type.startswith("uint") else bytes(data)
+
+
+def _encode_static(arc4_type: str, value: Any) -> bytes:
+    size = _static_size(arc4_type)
+    data = value.to_bytes(size, "big") if arc4_type.startswith("uint") else bytes(value)
+    if len(data) != size:
+        raise ValueError(f"Expected {size} bytes for {arc4_type}")
+    return data
+
+
+def decode_event(log: bytes) -> Event | None:
+    """Returns the decoded event, or None if the log is not one of the library events."""
+    name = EVENT_SELECTORS.get(bytes(log[:SELECTOR_SIZE]))
+    if name is None:
+        return None
+
+    data, offset, args = memoryview(log)[SELECTOR_SIZE:], 0, {}
+    for field_name, arc4_type in EVENT_FIELDS[name]:
+        if arc4_type.endswith("[]"):
+            # dynamic array, the head holds the offset of its length prefixed elements
+            element_type = arc4_type[:-2]
+            element_size = _static_size(element_type)
+            start = int.from_bytes(data[offset:offset + 2], "big")
+            length = int.from_bytes(data[start:start + 2], "big")
+            elements = data[start + 2:start + 2 + length * element_size]
+            args[field_name] = [
+                _decode_static(element_type, elements[idx:idx + element_size])
+                for idx in range(0, length * element_size, element_size)
+            ]
+            offset += 2
+        else:
+            size = _static_size(arc4_type)
+            args[field_name] = _decode_static(arc4_type, data[offset:offset + size])
+            offset += size
+    return Event(name, args)
+
+
+def encode_event(name: str, **args: Any) -> bytes:
+    """Returns the log of the event as emitted by the contracts, e.g. to build fixtures."""
+    head, tail = b"", b""
+    fields = EVENT_FIELDS[name]
+    head_size = sum(2 if arc4_type.endswith("[]") else _static_size(arc4_type) for _, arc4_type in fields)
+    for field_name, arc4_type in fields:
+        if arc4_type.endswith("[]"):
+            elements = args[field_name]
+            head += (head_size + len(tail)).to_bytes(2, "big")
+            tail += len(elements).to_bytes(2, "big")
+            tail += b"".join(_encode_static(arc4_type[:-2], element) for element in elements)
+        else:
+            head += _encode_static(arc4_type, args[field_name])
+    return get_selector(get_event_signature(name)) + head + tail
@@ -0,0 +1,109 @@
+"""Generates role and bucket identifiers as byte constants for use in contracts.
+
+Roles are the first 16 bytes of the keccak256 digest of their name and buckets are the full 32 byte digest, matching
+the convention documented in AccessControl and RateLimiter. Emitting them as constants means the contract pushes the
+precomputed bytes instead of hashing the name on every call.
+
+Print constants for the given names:
+    python -m scripts.identifiers --role MY_ROLE --bucket INBOUND
+
+Check the constants in a module still match the names in their comments:
+    python -m scripts.identifiers --check contracts/library/identifiers.py
+"""
+import argparse
+import ast
+import re
+import sys
+from functools import cache
+from pathlib import Path
+
+from Cryptodome.Hash import keccak
+
+ROLE_SIZE = 16
+BUCKET_SIZE = 32
+
+# matches a "# keccak256("<name>")[:<size>]" comment followed by a "<CONSTANT> = b"..."" assignment
+_CONSTANT_PATTERN = re.compile(
+    r'^# keccak256\("(?P<name>[^"]*)"\)(?:\[:(?P<size>\d+)\])?\n(?P<constant>\w+) = (?P<value>b"[^"\n]*")$',
+    re.MULTILINE,
+)
+
+
+def keccak256(data: bytes) -> bytes:
+    return keccak.new(digest_bits=256, data=data).digest()
+
+
+@cache
+def get_identifier(name: str, size: int) -> bytes:
+    """Returns the identifier for a name, the first `size` bytes of its keccak256 digest. Memoized as tooling derives
+    the same few names many times, e.g. when computing the box keys of every holder of a role."""
+    if not 0 < size <= BUCKET_SIZE:
+        raise ValueError(f"Invalid identifier size {size}")
+    return keccak256(name.encode())[:size]
+
+
+def get_role_id(name: str) -> bytes:
+    return get_identifier(name, ROLE_SIZE)
+
+
+def get_bucket_id(name: str) -> bytes:
+    return get_identifier(name, BUCKET_SIZE)
+
+
+def to_bytes_literal(value: bytes) -> str:
+    # escape every byte so the literal is unambiguous and stable across formatters
+    return 'b"' + "".join(f"\\x{byte:02x}" for byte in value) + '"'
+
+
+def format_constant(name: str, size: int, constant: str | None = None) -> str:
+    """Returns the source of a module constant for the identifier, documented with how it is derived."""
+    suffix = "" if size == BUCKET_SIZE else f"[:{size}]"
+    constant = constant or name.upper()
+    return f'# keccak256("{name}"){suffix}\n{constant} = {to_bytes_literal(get_identifier(name, size))}'
+
+
+def check_module(source: str) -> list[str]:
+    """Returns the constants in the module source whose value does not match their documented name.
+
+    Raises:
+        ValueError: If the source has no identifier constants, e.g. they were moved, so nothing would be checked.
+    """
+    matches = list(_CONSTANT_PATTERN.finditer(source))
+    if not matches:
+        raise ValueError("No identifier constants found")
+    mismatched = []
+    for match in matches:
+        size = int(match["size"]) if match["size"] else BUCKET_SIZE
+        if ast.literal_eval(match["value"]) != get_identifier(match["name"], size):
+            mismatched.append(match["constant"])
+    return mismatched
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--role", action="append", default=[], help="name of a role (16 byte identifier)")
+    parser.add_argument("--bucket", action="append", default=[], help="name of a bucket (32 byte identifier)")
+    parser.add_argument("--check", action="append", default=[], type=Path, help="module of constants to check")
+    args = parser.parse_args(argv)
+
+    constants = [format_constant(name, ROLE_SIZE, f"{name.upper()}_ROLE") for name in args.role]
+    constants += [format_constant(name, BUCKET_SIZE, f"{name.upper()}_BUCKET") for name in args.bucket]
+    if constants:
+        print("\n".join(constants))
+
+    exit_code = 0
+    for path in args.check:
+        try:
+            mismatched = check_module(path.read_text())
+        except ValueError as error:
+            print(f"{path}: {error}", file=sys.stderr)
+            exit_code = 1
+            continue
+        for constant in mismatched:
+            print(f"{path}: {constant} does not match its name", file=sys.stderr)
+        exit_code = exit_code or int(bool(mismatched))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""Indexes the roles, rate limit buckets and scheduled upgrade of a library contract from its events.
+
+The index is built once from a snapshot of the application's boxes, then kept up to date by applying the events the
+application logs, so refreshing it costs one search of the new transactions rather than fetching every box again.
+The position of the last applied log is checkpointed with the index so a restarted indexer resumes where it left
+off, and logs at or before the checkpoint are skipped rather than applied twice.
+
+Buckets are refilled with the same integer formula as `refill_bucket` in RateLimiter, using the timestamp of the
+block before the one the log is in, as that is the `Global.latest_timestamp` the contract saw. Calls which update a
+bucket's capacity without emitting an event, i.e. `get_current_capacity` or `has_capacity` sent in a transaction
+rather than simulated, round down at a different point in time so can make the indexed capacity differ slightly.
+
+Sync the index saved in a file, creating it from a box snapshot if it doesn't exist:
+    python -m scripts.indexer --app-id 1234 --state index.json
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from algosdk.v2client.algod import AlgodClient
+from algosdk.v2client.indexer import IndexerClient
+
+from .boxes import ADDRESS_ROLES_PREFIX, ADDRESS_SIZE, BUCKET_PREFIX, ROLE_PREFIX
+from .events import decode_event
+from .identifiers import BUCKET_SIZE, ROLE_SIZE
+
+DEFAULT_ADMIN_ROLE = bytes(ROLE_SIZE)
+
+# value of the box of a permanent grant, a grant which expires holds its 8 byte expiry instead
+PERMANENT_GRANT = b"\x80"
+
+# log index of a checkpoint which covers a whole round
+END_OF_ROUND = 2**32
+
+
+@dataclass(frozen=True, order=True)
+class Checkpoint:
+    round: int
+    intra_round_offset: int
+    log_index: int
+
+
+@dataclass(frozen=True)
+class LogRecord:
+    round: int
+    intra_round_offset: int
+    log_index: int
+    # Global.latest_timestamp when the log was emitted i.e. the timestamp of the previous block
+    timestamp: int
+    log: bytes
+
+    @property
+    def position(self) -> Checkpoint:
+        return Checkpoint(self.round, self.intra_round_offset, self.log_index)
+
+
+@dataclass
+class Bucket:
+    limit: int
+    current_capacity: int
+    duration: int
+    last_updated: int
+
+    @classmethod
+    def from_box(cls, value: bytes) -> "Bucket":
+        return cls(
+            int.from_bytes(value[0:32], "big"),
+            int.from_bytes(value[32:64], "big"),
+            int.from_bytes(value[64:72], "big"),
+            int.from_bytes(value[72:80], "big"),
+        )
+
+    def refill(self, timestamp: int) -> None:
+        """Refills the capacity up to the timestamp, as `refill_bucket` in RateLimiter."""
+        if not self.duration:
+            return
+        new_capacity = self.current_capacity + (self.limit * (timestamp - self.last_updated)) // self.duration
+        self.current_capacity = min(new_capacity, self.limit)
+        self.last_updated = timestamp
+
+
+@dataclass
+class StateIndex:
+    # role -> admin role, roles without an entry are administered by the default admin role
+    role_admins: dict[bytes, bytes] = field(default_factory=dict)
+    # (role, address) -> expiry timestamp of the grant, zero if permanent
+    grants: dict[tuple[bytes, bytes], int] = field(default_factory=dict)
+    buckets: dict[bytes, Bucket] = field(default_factory=dict)
+    # (program sha256, timestamp) of the scheduled upgrade, if known to be scheduled
+    scheduled_upgrade: tuple[bytes, int] | None = None
+    version: int | None = None
+    checkpoint: Checkpoint | None = None
+
+    @classmethod
+    def from_boxes(cls, boxes: Mapping[bytes, bytes], round: int) -> "StateIndex":
+        """Returns the index of a snapshot of the application's boxes, all read at the given round."""
+        index = cls(checkpoint=Checkpoint(round, END_OF_ROUND, END_OF_ROUND))
+        for key, value in boxes.items():
+            role_address = key.removeprefix(ADDRESS_ROLES_PREFIX)
+            if key.startswith(ADDRESS_ROLES_PREFIX) and len(role_address) == ROLE_SIZE + ADDRESS_SIZE:
+                if value != PERMANENT_GRANT and len(value) != 8:
+                    # revoked grant written as false
+                    continue
+                expiry = 0 if value == PERMANENT_GRANT else int.from_bytes(value, "big")
+                index.grants[(role_address[:ROLE_SIZE], role_address[ROLE_SIZE:])] = expiry
+            elif key.startswith(ROLE_PREFIX) and len(key) == len(ROLE_PREFIX) + ROLE_SIZE:
+                index.role_admins[key[len(ROLE_PREFIX):]] = value
+            elif key.startswith(BUCKET_PREFIX) and len(key) == len(BUCKET_PREFIX) + BUCKET_SIZE:
+                index.buckets[key[len(BUCKET_PREFIX):]] = Bucket.from_box(value)
+        return index
+
+    # queries
+    def get_role_admin(self, role: bytes) -> bytes:
+        return self.role_admins.get(role, DEFAULT_ADMIN_ROLE)
+
+    def has_role(self, role: bytes, address: bytes, timestamp: int) -> bool:
+        expiry = self.grants.get((role, address))
+        return expiry is not None and (expiry == 0 or timestamp < expiry)
+
+    def get_role_holders(self, role: bytes, timestamp: int) -> list[bytes]:
+        return sorted(address for (grant_role, address) in self.grants if grant_role == role
+                      and self.has_role(role, address, timestamp))
+
+    def get_current_capacity(self, bucket_id: bytes, timestamp: int) -> int:
+        bucket = Bucket(**asdict(self.buckets[bucket_id]))
+        bucket.refill(timestamp)
+        return bucket.current_capacity
+
+    # updates
+    def apply(self, record: LogRecord) -> bool:
+        """Applies the event of the log. Returns False if the log was already applied or isn't a library event."""
+        if self.checkpoint is not None and record.position <= self.checkpoint:
+            return False
+        self.checkpoint = record.position
+
+        event = decode_event(record.log)
+        if event is None:
+            return False
+        args = event.args
+        match event.name:
+            case "RoleAdminChanged":
+                self.role_admins[args["role"]] = args["new_admin_role"]
+            case "RoleGranted":
+                self.role_admins.setdefault(args["role"], DEFAULT_ADMIN_ROLE)
+                self.grants[(args["role"], args["account"])] = 0
+            case "RoleExpiryUpdated":
+                self.grants[(args["role"], args["account"])] = args["expiry"]
+            case "RoleRevoked":
+                self.grants.pop((args["role"], args["account"]), None)
+            case "BucketAdded":
+                bucket = Bucket(args["limit"], args["limit"], args["duration"], record.timestamp)
+                self.buckets[args["bucket_id"]] = bucket
+            case "BucketRemoved":
+                self.buckets.pop(args["bucket_id"], None)
+            case "BucketRateLimitUpdated":
+                self._update_rate_limit(args["bucket_id"], args["limit"], record.timestamp)
+            case "BucketRateDurationUpdated":
+                bucket = self._get_updated_bucket(args["bucket_id"], record.timestamp)
+                bucket.duration = args["duration"]
+            case "BucketConsumed":
+                self._get_updated_bucket(args["bucket_id"], record.timestamp).current_capacity -= args["amount"]
+            case "BucketFilled":
+                self._get_updated_bucket(args["bucket_id"], record.timestamp).current_capacity += args["amount"]
+            case "BucketsConsumed":
+                for bucket_id, amount in zip(args["bucket_ids"], args["amounts"]):
+                    self._get_updated_bucket(bucket_id, record.timestamp).current_capacity -= amount
+            case "BucketsFilled":
+                for bucket_id, amount in zip(args["bucket_ids"], args["amounts"]):
+                    self._get_updated_bucket(bucket_id, record.timestamp).current_capacity += amount
+            case "UpgradeScheduled":
+                self.scheduled_upgrade = (args["program_sha256"], args["timestamp"])
+            case "UpgradeCancelled":
+                self.scheduled_upgrade = None
+            case "UpgradeCompleted":
+                self.scheduled_upgrade = None
+                self.version = args["version"]
+        return True
+
+    def apply_records(self, records: Iterable[LogRecord]) -> int:
+        """Applies the logs in the order they were emitted. Returns the number of events applied."""
+        return sum(self.apply(record) for record in records)
+
+    def _get_updated_bucket(self, bucket_id: bytes, timestamp: int) -> Bucket:
+        bucket = self.buckets[bucket_id]
+        bucket.refill(timestamp)
+        return bucket
+
+    def _update_rate_limit(self, bucket_id: bytes, new_limit: int, timestamp: int) -> None:
+        # as `_update_rate_limit` in RateLimiter, the capacity changes by the change in limit
+        bucket = self._get_updated_bucket(bucket_id, timestamp)
+        if new_limit < bucket.limit:
+            diff = bucket.limit - new_limit
+            bucket.current_capacity = bucket.current_capacity - diff if bucket.current_capacity > diff else 0
+        else:
+            bucket.current_capacity += new_limit - bucket.limit
+        bucket.limit = new_limit
+
+    # persistence
+    def to_json(self) -> dict:
+        return {
+            "role_admins": {role.hex(): admin.hex() for role, admin in self.role_admins.items()},
+            "grants": [[role.hex(), address.hex(), expiry] for (role, address), expiry in self.grants.items()],
+            "buckets": {bucket_id.hex(): asdict(bucket) for bucket_id, bucket in self.buckets.items()},
+            "scheduled_upgrade": None if self.scheduled_upgrade is None else [
+                self.scheduled_upgrade[0].hex(), self.scheduled_upgrade[1]
+            ],
+            "version": self.version,
+            "checkpoint": None if self.checkpoint is None else asdict(self.checkpoint),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "StateIndex":
+        scheduled_upgrade = data["scheduled_upgrade"]
+        return cls(
+            role_admins={bytes.fromhex(role): bytes.fromhex(admin) for role, admin in data["role_admins"].items()},
+            grants={(bytes.fromhex(role), bytes.fromhex(address)): expiry for role, address, expiry in data["grants"]},
+            buckets={bytes.fromhex(bucket_id): Bucket(**bucket) for bucket_id, bucket in data["buckets"].items()},
+            scheduled_upgrade=None if scheduled_upgrade is None else (
+                bytes.fromhex(scheduled_upgrade[0]), scheduled_upgrade[1]
+            ),
+            version=data["version"],
+            checkpoint=None if data["checkpoint"] is None else Checkpoint(**data["checkpoint"]),
+        )
+
+    def save(self, path: Path) -> None:
+        # write then rename so a crash mid write leaves the previous checkpoint intact
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.to_json(), indent=2, sort_keys=True) + "\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "StateIndex":
+        return cls.from_json(json.loads(path.read_text()))
+
+
+def fetch_box_snapshot(algod_client: AlgodClient, app_id: int, max_attempts: int = 5) -> tuple[dict[bytes, bytes], int]:
+    """Returns the value of every box of the application and the round they were all read at.
+
+    Boxes are read one at a time so the snapshot is retried if a new round is confirmed part way through.
+    """
+    for _ in range(max_attempts):
+        names = [base64.b64decode(box["name"]) for box in algod_client.application_boxes(app_id)["boxes"]]
+        boxes, rounds = {}, set()
+        for name in names:
+            box = algod_client.application_box_by_name(app_id, name)
+            boxes[name] = base64.b64decode(box["value"])
+            rounds.add(box["round"])
+        if len(rounds) <= 1:
+            return boxes, rounds.pop() if rounds else algod_client.status()["last-round"]
+    raise RuntimeError(f"Boxes changed during each of {max_attempts} snapshot attempts")
+
+
+def _iter_app_logs(txn: dict, app_id: int) -> Iterator[bytes]:
+    # logs of the application call and its inner transactions, in the order they were emitted
+    if txn.get("application-transaction", {}).get("application-id") == app_id:
+        yield from (base64.b64decode(log) for log in txn.get("logs", []))
+    for inner_txn in txn.get("inner-txns", []):
+        yield from _iter_app_logs(inner_txn, app_id)
+
+
+def fetch_log_records(indexer_client: IndexerClient, app_id: int, min_round: int) -> Iterator[LogRecord]:
+    """Yields the logs of the application from the given round onwards, in the order they were emitted."""
+    timestamps: dict[int, int] = {}
+    next_page = None
+    while True:
+        response = indexer_client.search_transactions(application_id=app_id, min_round=min_round, next_page=next_page)
+        for txn in response["transactions"]:
+            round_ = txn["confirmed-round"]
+            if round_ not in timestamps:
+                timestamps[round_] = indexer_client.block_info(round_num=round_ - 1)["timestamp"]
+            for log_index, log in enumerate(_iter_app_logs(txn, app_id)):
+                yield LogRecord(round_, txn["intra-round-offset"], log_index, timestamps[round_], log)
+        next_page = response.get("next-token")
+        if not next_page or not response["transactions"]:
+            return
+
+
+def sync(index: StateIndex, indexer_client: IndexerClient, app_id: int) -> int:
+    """Applies the logs since the checkpoint of the index. Returns the number of events applied."""
+    min_round = index.checkpoint.round if index.checkpoint is not None else 0
+    return index.apply_records(fetch_log_records(indexer_client, app_id, min_round))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-id", type=int, required=True, help="application to index")
+    parser.add_argument("--state", type=Path, required=True, help="file the index and its checkpoint are saved to")
+    parser.add_argument("--algod-url", default="http://localhost:4001", help="algod to snapshot the boxes from")
+    parser.add_argument("--algod-token", default="a" * 64)
+    parser.add_argument("--indexer-url", default="http://localhost:8980", help="indexer to search the logs of")
+    parser.add_argument("--indexer-token", default="")
+    args = parser.parse_args(argv)
+
+    if args.state.exists():
+        index = StateIndex.load(args.state)
+    else:
+        boxes, round_ = fetch_box_snapshot(AlgodClient(args.algod_token, args.algod_url), args.app_id)
+        index = StateIndex.from_boxes(boxes, round_)
+        print(f"Snapshot of {len(boxes)} boxes at round {round_}")
+
+    applied = sync(index, IndexerClient(args.indexer_token, args.indexer_url), args.app_id)
+    index.save(args.state)
+    print(f"Applied {applied} events, checkpoint {index.checkpoint}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Builds the Merkle root and proofs of the members of a role for AccessControlWithMerkleRoles.
+
+The tree matches the verification in the contract: leaves are sha256(0x00 + address), inner nodes are
+sha256(0x01 + min(left, right) + max(left, right)) and a node without a sibling is carried up unchanged.
+
+Print the root and the proof of every address listed (one per line) in a file as JSON:
+    python -m scripts.merkle members.txt
+"""
+import argparse
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from algosdk import encoding
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def get_leaf(address: str) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + encoding.decode_address(address)).digest()
+
+
+def hash_pair(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + min(left, right) + max(left, right)).digest()
+
+
+def build_levels(leaves: list[bytes]) -> list[list[bytes]]:
+    """Returns the levels of the tree from the leaves up to the root."""
+    if not leaves:
+        raise ValueError("No leaves")
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [hash_pair(level[idx], level[idx + 1]) for idx in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def get_proof(levels: list[list[bytes]], index: int) -> list[bytes]:
+    """Returns the sibling nodes from the leaf at the index up to the root."""
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append(level[sibling])
+        index //= 2
+    return proof
+
+
+def verify_proof(root: bytes, leaf: bytes, proof: list[bytes]) -> bool:
+    node = leaf
+    for sibling in proof:
+        node = hash_pair(node, sibling)
+    return node == root
+
+
+def build_tree(addresses: list[str]) -> tuple[bytes, dict[str, list[bytes]]]:
+    """Returns the root and the proof of each address. Duplicate addresses are included once."""
+    addresses = list(dict.fromkeys(addresses))
+    levels = build_levels([get_leaf(address) for address in addresses])
+    return levels[-1][0], {address: get_proof(levels, index) for index, address in enumerate(addresses)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("members", type=Path, help="file with an address on each line")
+    args = parser.parse_args(argv)
+
+    addresses = [line.strip() for line in args.members.read_text().splitlines() if line.strip()]
+    root, proofs = build_tree(addresses)
+    output = {
+        "root": root.hex(),
+        "proofs": {address: [node.hex() for node in proof] for address, proof in proofs.items()},
+    }
+    print(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Replays historical traffic against candidate RateLimiter bucket parameters, all candidates at once with NumPy.
+
+Each candidate (limit, duration) is a separate bucket which sees the same consumes and fills, in order, with exactly
+the integer arithmetic of RateLimiter:
+- the capacity is refilled by `limit * time_delta // duration`, capped at `limit`, on each consume or fill
+- a consume of more than the refilled capacity is rejected, and as the transaction fails the bucket is unchanged
+- a fill adds at most `limit - capacity`
+- a bucket with a duration of zero is unlimited and never updated
+
+The replay steps through the traffic in time order, updating every candidate with each step, so its cost grows with
+the length of the traffic but barely with the number of candidates. Arithmetic is done in int64 when the largest
+intermediate value fits, otherwise with Python ints in object arrays.
+
+Buckets start either newly added, full at the first timestamp, or from the existing bucket with the candidate
+parameters applied as `_update_rate_limit` then `_update_rate_duration` would, so a lower limit reduces the capacity
+by the difference.
+
+Print the rejections and time at capacity of candidates for traffic in a CSV file of timestamp,amount rows, where
+a negative amount is a fill:
+    python -m scripts.rate_limit_simulator traffic.csv --limit 1000 2000 --duration 3600 86400
+"""
+import argparse
+import csv
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .indexer import Bucket
+
+# largest intermediate value computed in int64, leaving headroom below 2^63 for the additions
+_INT64_SAFE_MAX = 2**62
+
+
+@dataclass
+class SimulationResult:
+    limits: np.ndarray
+    durations: np.ndarray
+    accepted: np.ndarray
+    rejected: np.ndarray
+    rejected_amount: np.ndarray
+    # seconds the bucket was full so any refill was wasted, always 0 for a duration of zero
+    time_at_capacity: np.ndarray
+    final_capacity: np.ndarray
+    final_last_updated: np.ndarray
+    # (candidates, consumes and fills) whether each was accepted, if recorded
+    outcomes: np.ndarray | None = None
+
+
+def _ceil_div(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return -(-numerator // denominator)
+
+
+def _get_dtype(*maxima: int) -> np.dtype:
+    return np.dtype(np.int64) if max(maxima) < _INT64_SAFE_MAX else np.dtype(object)
+
+
+def _refill(capacity, last_updated, limits, durations, safe_durations, timestamp):
+    # refill_bucket in RateLimiter, a duration of zero leaves the bucket as it is
+    refilled = np.minimum(capacity + (limits * (timestamp - last_updated)) // safe_durations, limits)
+    is_limited = durations != 0
+    return np.where(is_limited, refilled, capacity), np.where(is_limited, timestamp, last_updated)
+
+
+def simulate(
+    timestamps: Sequence[int] | np.ndarray,
+    amounts: Sequence[int] | np.ndarray,
+    limits: Sequence[int] | np.ndarray,
+    durations: Sequence[int] | np.ndarray,
+    initial: Bucket | None = None,
+    start_timestamp: int | None = None,
+    end_timestamp: int | None = None,
+    record_outcomes: bool = False,
+) -> SimulationResult:
+    """Replays the traffic against a bucket for each candidate limit and duration.
+
+    Args:
+        timestamps: The `Global.latest_timestamp` of each consume or fill, in non-decreasing order.
+        amounts: The amount of each consume, or the negated amount of each fill.
+        limits: The limit of each candidate.
+        durations: The duration of each candidate, in seconds.
+        initial: The existing bucket to update to the candidate parameters, else each bucket is added full.
+        start_timestamp: When the bucket is added or updated, defaults to the first timestamp.
+        end_timestamp: When the time at capacity is measured to, defaults to the last timestamp.
+        record_outcomes: Whether to return whether each consume or fill was accepted by each candidate.
+
+    Raises:
+        ValueError: If the traffic or candidates are malformed.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    amounts_list = [int(amount) for amount in amounts]
+    limits_list, durations_list = [int(limit) for limit in limits], [int(duration) for duration in durations]
+    if len(timestamps) != len(amounts_list):
+        raise ValueError("Mismatched timestamps and amounts")
+    if len(limits_list) != len(durations_list):
+        raise ValueError("Mismatched limits and durations")
+    if len(timestamps) and np.any(np.diff(timestamps) < 0):
+        raise ValueError("Timestamps must be in non-decreasing order")
+    if min(limits_list + durations_list, default=0) < 0:
+        raise ValueError("Limits and durations must be non-negative")
+
+    start = int(start_timestamp if start_timestamp is not None else (timestamps[0] if len(timestamps) else 0))
+    end = int(end_timestamp if end_timestamp is not None else (timestamps[-1] if len(timestamps) else start))
+    last_updated_min = min(start, initial.last_updated) if initial is not None else start
+    max_limit = max(limits_list + ([initial.limit] if initial else []), default=0)
+    max_span = max(end, int(timestamps[-1]) if len(timestamps) else 0) - last_updated_min
+    dtype = _get_dtype(
+        max_limit * max(max_span, max(durations_list, default=0), 1),
+        max((abs(amount) for amount in amounts_list), default=0) + max_limit,
+    )
+
+    limits_array = np.array(limits_list, dtype=dtype)
+    durations_array = np.array(durations_list, dtype=dtype)
+    safe_durations = np.where(durations_array == 0, 1, durations_array).astype(dtype)
+    safe_limits = np.where(limits_array == 0, 1, limits_array).astype(dtype)
+    count = len(limits_list)
+
+    if initial is None:
+        # _add_bucket
+        capacity = limits_array.copy()
+        last_updated = np.full(count, start, dtype=dtype)
+    else:
+        # _update_rate_limit: refill with the existing parameters then change the capacity by the change in limit
+        old_limits = np.full(count, initial.limit, dtype=dtype)
+        old_durations = np.full(count, initial.duration, dtype=dtype)
+        capacity, last_updated = _refill(
+            np.full(count, initial.current_capacity, dtype=dtype), np.full(count, initial.last_updated, dtype=dtype),
+            old_limits, old_durations, np.where(old_durations == 0, 1, old_durations).astype(dtype), start,
+        )
+        decrease = old_limits - limits_array
+        capacity = np.where(
+            limits_array < old_limits,
+            np.where(capacity > decrease, capacity - decrease, 0),
+            capacity + (limits_array - old_limits),
+        ).astype(dtype)
+        # _update_rate_duration: refill with the new limit and existing duration, a no-op at the same timestamp
+        # unless the existing duration is zero, then change the duration
+        capacity, last_updated = _refill(
+            capacity, last_updated, limits_array, old_durations,
+            np.where(old_durations == 0, 1, old_durations).astype(dtype), start,
+        )
+
+    accepted = np.zeros(count, dtype=np.int64)
+    rejected = np.zeros(count, dtype=np.int64)
+    # a running total over the whole traffic so kept exact rather than bounded like the bucket arithmetic
+    rejected_amount = np.zeros(count, dtype=object)
+    time_at_capacity = np.zeros(count, dtype=np.int64)
+    outcomes = np.zeros((count, len(amounts_list)), dtype=bool) if record_outcomes else None
+    is_limited = durations_array != 0
+
+    def add_time_at_capacity(from_timestamp: int, to_timestamp: int) -> None:
+        # full from when the refill reaches the limit, i.e. limit * delta >= (limit - capacity) * duration
+        full_from = last_updated + _ceil_div((limits_array - capacity) * durations_array, safe_limits)
+        full_for = to_timestamp - np.maximum(full_from, from_timestamp)
+        time_at_capacity[:] += np.where(is_limited, np.maximum(full_for, 0), 0).astype(np.int64)
+
+    previous = start
+    for idx, (timestamp, amount) in enumerate(zip(timestamps.tolist(), amounts_list)):
+        if timestamp > previous:
+            add_time_at_capacity(previous, timestamp)
+            previous = timestamp
+
+        refilled, refilled_at = _refill(
+            capacity, last_updated, limits_array, durations_array, safe_durations, timestamp
+        )
+        if amount < 0:
+            # _fill_into_bucket, never rejected
+            filled = refilled + np.minimum(-amount, limits_array - refilled)
+            capacity = np.where(is_limited, filled, capacity).astype(dtype)
+            last_updated = refilled_at.astype(dtype)
+            is_accepted = np.ones(count, dtype=bool)
+        else:
+            # _consume_from_bucket, a rejected consume leaves the bucket unchanged
+            is_accepted = ~is_limited | (amount <= refilled)
+            is_consumed = is_limited & is_accepted
+            capacity = np.where(is_consumed, refilled - amount, capacity).astype(dtype)
+            last_updated = np.where(is_consumed, refilled_at, last_updated).astype(dtype)
+            rejected_amount[~is_accepted] += amount
+        accepted += is_accepted
+        rejected += ~is_accepted
+        if outcomes is not None:
+            outcomes[:, idx] = is_accepted
+
+    if end > previous:
+        add_time_at_capacity(previous, end)
+
+    return SimulationResult(
+        limits_array, durations_array, accepted, rejected, rejected_amount, time_at_capacity, capacity, last_updated,
+        outcomes,
+    )
+
+
+def load_traffic(path: Path) -> tuple[np.ndarray, list[int]]:
+    """Returns the timestamps and amounts of a CSV file of timestamp,amount rows, sorted by timestamp."""
+    with path.open(newline="") as file:
+        rows = sorted((int(row[0]), int(row[1])) for row in csv.reader(file) if row and row[0].strip().isdigit())
+    return np.array([timestamp for timestamp, _ in rows], dtype=np.int64), [amount for _, amount in rows]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("traffic", type=Path, help="CSV file of timestamp,amount rows")
+    parser.add_argument("--limit", type=int, nargs="+", required=True, help="candidate limits")
+    parser.add_argument("--duration", type=int, nargs="+", required=True, help="candidate durations in seconds")
+    args = parser.parse_args(argv)
+
+    timestamps, amounts = load_traffic(args.traffic)
+    # every combination of the candidate limits and durations
+    limits = [limit for limit in args.limit for _ in args.duration]
+    durations = [duration for _ in args.limit for duration in args.duration]
+    result = simulate(timestamps, amounts, limits, durations)
+
+    span = max(int(timestamps[-1] - timestamps[0]), 1) if len(timestamps) else 1
+    print(f"{'limit':>24}  {'duration':>10}  {'rejected':>10}  {'at capacity':>11}")
+    for idx in range(len(limits)):
+        at_capacity = f"{100 * int(result.time_at_capacity[idx]) / span:.1f}%"
+        print(f"{limits[idx]:>24}  {durations[idx]:>10}  {int(result.rejected[idx]):>10}  {at_capacity:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,377 @@
+"""Reports the worst-case opcode cost of every ABI method and subroutine, and the program size, of compiled contracts.
+
+Reads the TEAL (and bytecode, if present) output by `npm run teal` and statically computes the most expensive path
+through each ABI method and subroutine, including the cost of the subroutines it calls. The jump back to the start
+of a loop is not followed, so the cost of a method or subroutine with a loop is flagged as it grows with the number
+of iterations.
+
+Print the report:
+    python -m scripts.teal_report
+
+Record the current costs as the baseline, and fail if any cost or program size has increased since:
+    python -m scripts.teal_report --update-baseline
+    python -m scripts.teal_report --check
+
+Checking without a baseline only prints a notice, so the check passes until the baseline is first recorded.
+"""
+import argparse
+import json
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_TEAL_DIR = Path(__file__).parents[1] / "specs" / "teal"
+DEFAULT_BASELINE = Path(__file__).parent / "teal_report_baseline.json"
+
+# byte length of a program page, a contract may use up to three extra pages
+PROGRAM_PAGE_SIZE = 2048
+
+# opcodes which cost more than one unit, all others cost one
+OPCODE_COSTS = {
+    "sha256": 35,
+    "keccak256": 130,
+    "sha512_256": 45,
+    "sha3_256": 130,
+    "ed25519verify": 1900,
+    "ed25519verify_bare": 1900,
+    "ecdsa_pk_recover": 2000,
+    "falcon_verify": 1700,
+    "vrf_verify": 5700,
+    "divmodw": 20,
+    "expw": 10,
+    "sqrt": 4,
+    "bsqrt": 40,
+    "b+": 10,
+    "b-": 10,
+    "b*": 20,
+    "b/": 20,
+    "b%": 20,
+    "b|": 6,
+    "b&": 6,
+    "b^": 6,
+    "b~": 4,
+    "json_ref": 25,
+}
+
+# (opcode, curve immediate) of opcodes whose cost depends on the curve. Those whose cost also grows with the size of
+# their input, ec_pairing_check, ec_multi_scalar_mul and mimc, are given their base cost as it isn't known statically
+CURVE_OPCODE_COSTS = {
+    ("ecdsa_verify", "Secp256k1"): 1700,
+    ("ecdsa_verify", "Secp256r1"): 2500,
+    ("ecdsa_pk_decompress", "Secp256k1"): 650,
+    ("ecdsa_pk_decompress", "Secp256r1"): 2400,
+    ("ec_add", "BN254g1"): 125,
+    ("ec_add", "BN254g2"): 170,
+    ("ec_add", "BLS12_381g1"): 205,
+    ("ec_add", "BLS12_381g2"): 290,
+    ("ec_scalar_mul", "BN254g1"): 1810,
+    ("ec_scalar_mul", "BN254g2"): 3430,
+    ("ec_scalar_mul", "BLS12_381g1"): 2950,
+    ("ec_scalar_mul", "BLS12_381g2"): 6530,
+    ("ec_pairing_check", "BN254g1"): 8000,
+    ("ec_pairing_check", "BN254g2"): 8000,
+    ("ec_pairing_check", "BLS12_381g1"): 13000,
+    ("ec_pairing_check", "BLS12_381g2"): 13000,
+    ("ec_multi_scalar_mul", "BN254g1"): 3600,
+    ("ec_multi_scalar_mul", "BN254g2"): 7200,
+    ("ec_multi_scalar_mul", "BLS12_381g1"): 6500,
+    ("ec_multi_scalar_mul", "BLS12_381g2"): 14850,
+    ("ec_subgroup_check", "BN254g1"): 20,
+    ("ec_subgroup_check", "BN254g2"): 3100,
+    ("ec_subgroup_check", "BLS12_381g1"): 1850,
+    ("ec_subgroup_check", "BLS12_381g2"): 2340,
+    ("ec_map_to", "BN254g1"): 630,
+    ("ec_map_to", "BN254g2"): 3300,
+    ("ec_map_to", "BLS12_381g1"): 1950,
+    ("ec_map_to", "BLS12_381g2"): 8150,
+    ("mimc", "BN254Mp110"): 10,
+    ("mimc", "BLS12_381Mp111"): 10,
+}
+
+# opcodes which end a basic block
+_JUMPS = {"b"}
+_CONDITIONAL_JUMPS = {"bz", "bnz", "switch", "match"}
+_TERMINATORS = {"return", "err", "retsub"}
+
+_LABEL_PATTERN = re.compile(r"^(?P<label>[^\s/\"]+):$")
+_METHOD_PATTERN = re.compile(r'method "(?P<signature>[^"]+)"')
+
+
+@dataclass
+class Instruction:
+    op: str
+    args: list[str]
+    comment: str
+
+
+@dataclass
+class Block:
+    label: str | None
+    instructions: list[Instruction] = field(default_factory=list)
+    successors: list[int] = field(default_factory=list)
+
+
+@dataclass
+class Cost:
+    cost: int
+    has_loop: bool = False
+
+
+def get_opcode_cost(instruction: Instruction) -> int:
+    if instruction.args and (instruction.op, instruction.args[0]) in CURVE_OPCODE_COSTS:
+        return CURVE_OPCODE_COSTS[(instruction.op, instruction.args[0])]
+    return OPCODE_COSTS.get(instruction.op, 1)
+
+
+def _split_comment(line: str) -> tuple[str, str]:
+    # find "//" outside of a string literal
+    in_string = escaped = False
+    for idx, char in enumerate(line):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif line.startswith("//", idx):
+            return line[:idx].strip(), line[idx + 2:].strip()
+    return line.strip(), ""
+
+
+class Program:
+    """A TEAL program split into basic blocks."""
+
+    def __init__(self, teal: str) -> None:
+        self.blocks: list[Block] = []
+        self.labels: dict[str, int] = {}
+
+        block = Block(None)
+        for line in teal.splitlines():
+            code, comment = _split_comment(line)
+            if not code or code.startswith("#pragma"):
+                continue
+            match = _LABEL_PATTERN.match(code)
+            if match:
+                block = self._start_block(block, match["label"])
+                continue
+            op, *args = code.split()
+            block.instructions.append(Instruction(op, args, comment))
+            if op in _JUMPS or op in _CONDITIONAL_JUMPS or op in _TERMINATORS:
+                block = self._start_block(block, None)
+        self._start_block(block, None)
+
+        # resolve successors now all labels are known
+        for idx, block in enumerate(self.blocks):
+            last = block.instructions[-1] if block.instructions else None
+            if last is not None and (last.op in _JUMPS or last.op in _CONDITIONAL_JUMPS):
+                block.successors = [self.labels[label] for label in last.args]
+            falls_through = last is None or (last.op not in _JUMPS and last.op not in _TERMINATORS)
+            if falls_through and idx + 1 < len(self.blocks):
+                block.successors.append(idx + 1)
+
+    def _start_block(self, block: Block, label: str | None) -> Block:
+        # reuse the current block if it is empty and unlabelled, i.e. a label straight after a jump
+        if block.instructions or block.label is not None:
+            self.blocks.append(block)
+            block = Block(label)
+        else:
+            block.label = label
+        if label is not None:
+            self.labels[label] = len(self.blocks)
+        return block
+
+    def get_abi_methods(self) -> dict[str, str]:
+        """Returns the label each ABI method is routed to, from the method selectors matched by the router."""
+        methods: dict[str, str] = {}
+        for block in self.blocks:
+            signatures: list[str] = []
+            for instruction in block.instructions:
+                if instruction.op in ("pushbytess", "pushbytes"):
+                    signatures = _METHOD_PATTERN.findall(instruction.comment)
+                elif instruction.op == "match" and signatures:
+                    methods.update(zip(signatures, instruction.args))
+                    signatures = []
+        return methods
+
+    def get_subroutines(self) -> list[str]:
+        """Returns the labels of the subroutines called in the program."""
+        return sorted({
+            instruction.args[0]
+            for block in self.blocks for instruction in block.instructions if instruction.op == "callsub"
+        })
+
+
+class CostAnalysis:
+    """Computes the worst-case opcode cost from a label to the end of the program or subroutine."""
+
+    def __init__(self, program: Program) -> None:
+        self.program = program
+        self._costs: dict[str, Cost] = {}
+        self._subroutine_costs: dict[str, Cost] = {}
+        self._in_progress: set[str] = set()
+
+    def get_subroutine_cost(self, label: str) -> Cost:
+        if label in self._subroutine_costs:
+            return self._subroutine_costs[label]
+        if label in self._in_progress:
+            # recursive call, only counted once
+            return Cost(0, has_loop=True)
+        self._in_progress.add(label)
+        cost = self.get_cost(label)
+        self._in_progress.discard(label)
+        self._subroutine_costs[label] = cost
+        return cost
+
+    def get_cost(self, label: str) -> Cost:
+        if label not in self._costs:
+            self._costs[label] = self._compute_cost(label)
+        return self._costs[label]
+
+    def _compute_cost(self, label: str) -> Cost:
+        blocks = self.program.blocks
+        entry = self.program.labels[label]
+
+        # order the reachable blocks so each comes after all of its successors, ignoring the back edges of loops
+        order: list[int] = []
+        state: dict[int, int] = {entry: 0}  # 0 = on stack, 1 = done
+        stack = [(entry, iter(blocks[entry].successors))]
+        has_loop = False
+        while stack:
+            idx, successors = stack[-1]
+            successor = next(successors, None)
+            if successor is None:
+                stack.pop()
+                state[idx] = 1
+                order.append(idx)
+            elif successor not in state:
+                state[successor] = 0
+                stack.append((successor, iter(blocks[successor].successors)))
+            elif state[successor] == 0:
+                has_loop = True
+
+        # longest path from each block, successors first
+        worst: dict[int, int] = {}
+        for idx in order:
+            block_cost = 0
+            for instruction in blocks[idx].instructions:
+                if instruction.op == "callsub":
+                    callee = self.get_subroutine_cost(instruction.args[0])
+                    block_cost += 1 + callee.cost
+                    has_loop = has_loop or callee.has_loop
+                else:
+                    block_cost += get_opcode_cost(instruction)
+            worst[idx] = block_cost + max((worst[s] for s in blocks[idx].successors if s in worst), default=0)
+        return Cost(worst[entry], has_loop)
+
+
+def get_program_pages(approval_size: int, clear_size: int) -> int:
+    return math.ceil((approval_size + clear_size) / PROGRAM_PAGE_SIZE)
+
+
+def analyse_contract(teal_dir: Path, name: str) -> dict:
+    """Returns the report of a compiled contract, given the directory of its `<name>.approval.teal` file."""
+    program = Program((teal_dir / f"{name}.approval.teal").read_text())
+    analysis = CostAnalysis(program)
+
+    report: dict = {"methods": {}, "subroutines": {}, "loops": []}
+    for signature, label in sorted(program.get_abi_methods().items()):
+        cost = analysis.get_cost(label)
+        report["methods"][signature] = cost.cost
+        if cost.has_loop:
+            report["loops"].append(signature)
+    for label in program.get_subroutines():
+        cost = analysis.get_subroutine_cost(label)
+        report["subroutines"][label] = cost.cost
+        if cost.has_loop:
+            report["loops"].append(label)
+
+    # program size is only known if the bytecode was output too
+    approval_bin, clear_bin = teal_dir / f"{name}.approval.bin", teal_dir / f"{name}.clear.bin"
+    if approval_bin.exists() and clear_bin.exists():
+        approval_size, clear_size = approval_bin.stat().st_size, clear_bin.stat().st_size
+        report["bytes"] = approval_size + clear_size
+        report["pages"] = get_program_pages(approval_size, clear_size)
+    return report
+
+
+def analyse(teal_dir: Path) -> dict[str, dict]:
+    names = sorted(path.name.removesuffix(".approval.teal") for path in teal_dir.glob("*.approval.teal"))
+    return {name: analyse_contract(teal_dir, name) for name in names}
+
+
+def find_regressions(report: dict[str, dict], baseline: dict[str, dict], tolerance: int = 0) -> list[str]:
+    """Returns a description of every cost or size which exceeds its baseline by more than the tolerance.
+
+    Contracts, methods and subroutines missing from the baseline are reported too, so they are recorded before their
+    cost can grow unchecked.
+    """
+    regressions = []
+    for name, contract in report.items():
+        if name not in baseline:
+            regressions.append(f"{name}: not in baseline")
+            continue
+        base = baseline[name]
+        for kind in ("methods", "subroutines"):
+            for key, cost in contract[kind].items():
+                base_cost = base.get(kind, {}).get(key)
+                if base_cost is None:
+                    regressions.append(f"{name} {key}: not in baseline, {cost} opcodes")
+                elif cost > base_cost + tolerance:
+                    regressions.append(f"{name} {key}: {base_cost} -> {cost} opcodes")
+        for key in ("bytes", "pages"):
+            if key in contract and key in base and contract[key] > base[key]:
+                regressions.append(f"{name} {key}: {base[key]} -> {contract[key]}")
+    return regressions
+
+
+def format_report(report: dict[str, dict], subroutines: bool = False) -> str:
+    lines = []
+    for name, contract in report.items():
+        size = f" ({contract['bytes']} bytes, {contract['pages']} pages)" if "bytes" in contract else ""
+        lines.append(f"{name}{size}")
+        rows = [(signature, cost) for signature, cost in contract["methods"].items()]
+        if subroutines:
+            rows += [(label, cost) for label, cost in contract["subroutines"].items()]
+        width = max((len(key) for key, _ in rows), default=0)
+        for key, cost in rows:
+            loop = " (loop)" if key in contract["loops"] else ""
+            lines.append(f"  {key.ljust(width)}  {cost:>6}{loop}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teal-dir", type=Path, default=DEFAULT_TEAL_DIR, help="directory of compiled TEAL")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="baseline file of costs")
+    parser.add_argument("--subroutines", action="store_true", help="include subroutines in the printed report")
+    parser.add_argument("--update-baseline", action="store_true", help="write the current costs to the baseline")
+    parser.add_argument("--check", action="store_true", help="fail if any cost has increased since the baseline")
+    parser.add_argument("--tolerance", type=int, default=0, help="opcodes a cost may increase by when checking")
+    args = parser.parse_args(argv)
+
+    report = analyse(args.teal_dir)
+    if not report:
+        print(f"No compiled TEAL in {args.teal_dir}, run `npm run teal` first", file=sys.stderr)
+        return 1
+    print(format_report(report, args.subroutines))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    if args.check:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}, run --update-baseline first to record one", file=sys.stderr)
+            return 1
+        regressions = find_regressions(report, json.loads(args.baseline.read_text()), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
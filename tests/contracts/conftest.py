@@ -0,0 +1,89 @@
+"""Fixtures to run the library contracts under the algorand-python-testing emulator, without a localnet.
+
+The emulator runs the contract code as Python in memory so the suite can be run in parallel with:
+    python -m pytest -n auto tests/contracts
+"""
+import abc
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager
+
+import pytest
+
+try:
+    import _algopy_testing.arc4
+    import _algopy_testing.models.contract
+    from algopy import Account, ARC4Contract, Contract, UInt64
+    from algopy_testing import AlgopyTestContext, algopy_testing_context
+except ImportError as error:
+    # fail the run rather than silently skip the suite, e.g. under `npm run test:python`
+    raise ImportError(
+        "The contract tests require algorand-python-testing on Python 3.12+, install requirements.txt"
+    ) from error
+
+# the interfaces are abstract contracts deriving from both ARC4Contract and ABC, which the emulator can't create as its
+# contract metaclass isn't an ABCMeta, so make it one and initialise the ABC state of the classes it already created
+_ContractMeta = type(Contract)
+if not issubclass(_ContractMeta, abc.ABCMeta):
+    _ContractMeta.__bases__ = (abc.ABCMeta,)
+    for _contract_class in (Contract, ARC4Contract):
+        abc._abc_init(_contract_class)
+
+
+def _has_create_methods(contract_class: type) -> bool:
+    # the emulator only looks for a create method on the contract class itself, not the classes it derives from
+    return any(_has_create_methods_in_class(base) for base in contract_class.__mro__)
+
+
+def _parameterize_type(type_: type, *params: type) -> type:
+    # the emulator parameterises a tuple of a single type, e.g. a struct of one field, with the type not a tuple of it
+    if isinstance(type_, type) and issubclass(type_, _algopy_testing.arc4.Tuple):
+        return type_[params]  # type: ignore[index]
+    return _emulator_parameterize_type(type_, *params)
+
+
+_has_create_methods_in_class = _algopy_testing.models.contract._has_create_methods
+_algopy_testing.models.contract._has_create_methods = _has_create_methods
+_emulator_parameterize_type = _algopy_testing.arc4._parameterize_type
+_algopy_testing.arc4._parameterize_type = _parameterize_type
+
+# timestamp each test starts at
+START_TIMESTAMP = 1_700_000_000
+
+
+class Clock:
+    """Controls `Global.latest_timestamp` in place of mining blocks with `advancePrevBlockTimestamp` on a localnet."""
+
+    def __init__(self, context: AlgopyTestContext) -> None:
+        self._context = context
+        self.set(START_TIMESTAMP)
+
+    @property
+    def now(self) -> int:
+        return self._timestamp
+
+    def set(self, timestamp: int) -> None:
+        self._timestamp = timestamp
+        self._context.ledger.patch_global_fields(latest_timestamp=UInt64(timestamp))
+
+    def advance(self, seconds: int) -> None:
+        self.set(self._timestamp + seconds)
+
+
+@pytest.fixture
+def context() -> Iterator[AlgopyTestContext]:
+    with algopy_testing_context() as ctx:
+        yield ctx
+
+
+@pytest.fixture
+def clock(context: AlgopyTestContext) -> Clock:
+    return Clock(context)
+
+
+@pytest.fixture
+def as_sender(context: AlgopyTestContext) -> Callable[[Account], AbstractContextManager]:
+    """Returns a function to call contract methods from an account within a `with` block."""
+    def _as_sender(account: Account) -> AbstractContextManager:
+        return context.txn.create_group(active_txn_overrides={"sender": account})
+    return _as_sender
+
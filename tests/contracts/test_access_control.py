@@ -0,0 +1,173 @@
+import pytest
+from algopy import UInt64, arc4
+
+from contracts.library.AccessControl import AddressRoleKey
+from contracts.library.test.MockAccessControl import MockAccessControl
+from contracts.types import Bytes16
+from scripts.identifiers import get_role_id
+
+DEFAULT_ADMIN_ROLE = Bytes16.from_bytes(bytes(16))
+ROLE = Bytes16.from_bytes(get_role_id("ROLE"))
+OTHER_ROLE = Bytes16.from_bytes(get_role_id("OTHER_ROLE"))
+
+
+@pytest.fixture
+def admin(context):
+    return context.any.account()
+
+
+@pytest.fixture
+def user(context):
+    return context.any.account()
+
+
+@pytest.fixture
+def contract(context, clock, admin):
+    contract = MockAccessControl()
+    contract.initialise(arc4.Address(admin))
+    return contract
+
+
+def has_role(contract, role, account) -> bool:
+    return contract.has_role(role, arc4.Address(account)).native
+
+
+def test_initialise_grants_default_admin_role(contract, admin, user):
+    assert has_role(contract, DEFAULT_ADMIN_ROLE, admin)
+    assert not has_role(contract, DEFAULT_ADMIN_ROLE, user)
+    assert contract.get_role_admin(ROLE) == DEFAULT_ADMIN_ROLE
+
+
+def test_grant_and_revoke_role(contract, as_sender, admin, user):
+    with as_sender(admin):
+        contract.grant_role(ROLE, arc4.Address(user))
+    assert has_role(contract, ROLE, user)
+
+    with as_sender(admin):
+        contract.revoke_role(ROLE, arc4.Address(user))
+    assert not has_role(contract, ROLE, user)
+
+
+def test_grant_role_fails_without_admin_role(contract, as_sender, user):
+    with pytest.raises(AssertionError, match="Access control unauthorised account"), as_sender(user):
+        contract.grant_role(ROLE, arc4.Address(user))
+
+
+def test_set_role_admin(contract, as_sender, admin, user):
+    contract.set_role_admin(ROLE, OTHER_ROLE)
+    assert contract.get_role_admin(ROLE) == OTHER_ROLE
+
+    # the default admin is no longer the admin of the role
+    with pytest.raises(AssertionError, match="Access control unauthorised account"), as_sender(admin):
+        contract.grant_role(ROLE, arc4.Address(user))
+
+    with as_sender(admin):
+        contract.grant_role(OTHER_ROLE, arc4.Address(user))
+    with as_sender(user):
+        contract.grant_role(ROLE, arc4.Address(user))
+    assert has_role(contract, ROLE, user)
+
+
+def test_grant_and_revoke_role_pairs(context, contract, as_sender, admin, user):
+    other_user = context.any.account()
+    contract.set_role_admin(OTHER_ROLE, ROLE)
+    pairs = arc4.DynamicArray[AddressRoleKey](
+        AddressRoleKey(ROLE, arc4.Address(user)),
+        AddressRoleKey(ROLE, arc4.Address(other_user)),
+        AddressRoleKey(OTHER_ROLE, arc4.Address(user)),
+    )
+
+    # ROLE is the admin of OTHER_ROLE, so the sender needs it as well as the default admin role
+    with pytest.raises(AssertionError, match="Access control unauthorised account"), as_sender(admin):
+        contract.grant_role_pairs(pairs)
+    with as_sender(admin):
+        contract.grant_role(ROLE, arc4.Address(admin))
+        contract.grant_role_pairs(pairs)
+    assert has_role(contract, ROLE, other_user)
+    assert has_role(contract, OTHER_ROLE, user)
+
+    with as_sender(admin):
+        contract.revoke_role_pairs(pairs)
+    assert not has_role(contract, ROLE, user)
+    assert not has_role(contract, ROLE, other_user)
+    assert not has_role(contract, OTHER_ROLE, user)
+
+
+def test_renounce_role(contract, as_sender, admin):
+    with as_sender(admin):
+        contract.renounce_role(DEFAULT_ADMIN_ROLE)
+    assert not has_role(contract, DEFAULT_ADMIN_ROLE, admin)
+
+
+def test_check_roles(contract, as_sender, admin, user):
+    with as_sender(admin):
+        contract.grant_role(ROLE, arc4.Address(user))
+    roles = arc4.DynamicArray[Bytes16](ROLE, OTHER_ROLE)
+
+    contract.check_role(ROLE, arc4.Address(user))
+    contract.check_any_role(roles, arc4.Address(user))
+    with pytest.raises(AssertionError, match="Access control unauthorised account"):
+        contract.check_all_roles(roles, arc4.Address(user))
+    with pytest.raises(AssertionError, match="Access control unauthorised account"):
+        contract.check_role(OTHER_ROLE, arc4.Address(user))
+
+    with as_sender(user):
+        contract.check_sender_role(ROLE)
+        contract.check_sender_any_role(roles)
+
+
+def test_check_all_roles_fails_for_no_roles(contract, as_sender, admin):
+    roles = arc4.DynamicArray[Bytes16]()
+    assert not contract.has_all_roles(roles, arc4.Address(admin)).native
+    with pytest.raises(AssertionError, match="Access control unauthorised account"):
+        contract.check_all_roles(roles, arc4.Address(admin))
+    with pytest.raises(AssertionError, match="Access control unauthorised account"), as_sender(admin):
+        contract.check_sender_all_roles(roles)
+
+
+def test_grant_role_until_expires_with_clock(contract, clock, as_sender, admin, user):
+    expiry = clock.now + 100
+    with as_sender(admin):
+        contract.grant_role_until(ROLE, arc4.Address(user), UInt64(expiry))
+    assert has_role(contract, ROLE, user)
+    assert contract.get_role_expiry(ROLE, arc4.Address(user)) == expiry
+
+    clock.advance(99)
+    assert has_role(contract, ROLE, user)
+    clock.advance(1)
+    assert not has_role(contract, ROLE, user)
+
+
+def test_grant_role_until_fails_if_expiry_not_in_future(contract, clock, as_sender, admin, user):
+    with pytest.raises(AssertionError, match="Expiry must be in the future"), as_sender(admin):
+        contract.grant_role_until(ROLE, arc4.Address(user), UInt64(clock.now))
+
+
+def test_grant_role_makes_expiring_grant_permanent(contract, clock, as_sender, admin, user):
+    with as_sender(admin):
+        contract.grant_role_until(ROLE, arc4.Address(user), UInt64(clock.now + 100))
+        contract.grant_role(ROLE, arc4.Address(user))
+    assert contract.get_role_expiry(ROLE, arc4.Address(user)) == 0
+
+    clock.advance(100)
+    assert has_role(contract, ROLE, user)
+
+
+def test_prune_expired(context, contract, clock, as_sender, admin, user):
+    other_user = context.any.account()
+    with as_sender(admin):
+        contract.grant_role_until(ROLE, arc4.Address(user), UInt64(clock.now + 100))
+        contract.grant_role_until(ROLE, arc4.Address(other_user), UInt64(clock.now + 200))
+
+    clock.advance(100)
+    accounts = arc4.DynamicArray[arc4.Address](arc4.Address(user), arc4.Address(other_user))
+    # only the expired grant is deleted
+    assert contract.prune_expired(ROLE, accounts) == 2_500 + 400 * (62 + 8)
+    assert not has_role(contract, ROLE, user)
+    assert has_role(contract, ROLE, other_user)
+
+
+def test_prune_expired_fails_when_exceeds_maximum_batch_size(contract, user):
+    accounts = arc4.DynamicArray[arc4.Address](*[arc4.Address(user)] * 13)
+    with pytest.raises(AssertionError, match="Exceeds maximum batch size"):
+        contract.prune_expired(ROLE, accounts)
@@ -0,0 +1,64 @@
+import pytest
+from algopy import UInt64, arc4
+
+from contracts.library.test.MockBitmaskAccessControl import MockBitmaskAccessControl
+from contracts.types import Bytes16
+from scripts.identifiers import get_role_id
+
+DEFAULT_ADMIN_ROLE = Bytes16.from_bytes(bytes(16))
+ROLE = Bytes16.from_bytes(get_role_id("ROLE"))
+OTHER_ROLE = Bytes16.from_bytes(get_role_id("OTHER_ROLE"))
+
+
+@pytest.fixture
+def admin(context):
+    return context.any.account()
+
+
+@pytest.fixture
+def user(context):
+    return context.any.account()
+
+
+@pytest.fixture
+def contract(context, clock, admin):
+    contract = MockBitmaskAccessControl()
+    contract.initialise(arc4.Address(admin))
+    return contract
+
+
+def has_role(contract, role, account) -> bool:
+    return contract.has_role(role, arc4.Address(account)).native
+
+
+def test_grant_and_revoke_role(contract, as_sender, admin, user):
+    with as_sender(admin):
+        contract.grant_role(ROLE, arc4.Address(user))
+        contract.grant_role(OTHER_ROLE, arc4.Address(user))
+    assert has_role(contract, ROLE, user)
+    assert contract.get_role_index(ROLE) == 1
+    assert contract.get_roles_mask(arc4.Address(user)) == 0b110
+
+    with as_sender(admin):
+        contract.revoke_role(ROLE, arc4.Address(user))
+    assert not has_role(contract, ROLE, user)
+    assert has_role(contract, OTHER_ROLE, user)
+
+
+def test_unknown_role(contract, user):
+    assert not has_role(contract, ROLE, user)
+    assert contract.get_role_admin(ROLE) == DEFAULT_ADMIN_ROLE
+    with pytest.raises(AssertionError, match="Unknown role"):
+        contract.get_role_index(ROLE)
+
+
+def test_has_roles_mask(contract, as_sender, admin, user):
+    with as_sender(admin):
+        contract.grant_role(ROLE, arc4.Address(user))
+    assert contract.has_roles_mask(UInt64(0b10), arc4.Address(user)).native
+    assert not contract.has_roles_mask(UInt64(0b11), arc4.Address(user)).native
+
+
+def test_has_roles_mask_is_false_when_empty(contract, admin, user):
+    assert not contract.has_roles_mask(UInt64(0), arc4.Address(admin)).native
+    assert not contract.has_roles_mask(UInt64(0), arc4.Address(user)).native
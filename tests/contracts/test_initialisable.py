@@ -0,0 +1,29 @@
+import pytest
+from algopy import UInt64
+
+from contracts.library.test.MockInitialisable import MockInitialisable
+
+
+def test_initialise(context):
+    contract = MockInitialisable()
+    assert not contract.is_initialised
+
+    contract.initialise(UInt64(5))
+    assert contract.is_initialised
+    assert contract.counter == 5
+
+
+def test_initialise_fails_when_already_initialised(context):
+    contract = MockInitialisable()
+    contract.initialise(UInt64(5))
+    with pytest.raises(AssertionError, match="Contract already initialised"):
+        contract.initialise(UInt64(6))
+
+
+def test_only_initialised(context):
+    contract = MockInitialisable()
+    with pytest.raises(AssertionError, match="Uninitialised contract"):
+        contract.can_only_be_called_when_initialised()
+
+    contract.initialise(UInt64(5))
+    contract.can_only_be_called_when_initialised()
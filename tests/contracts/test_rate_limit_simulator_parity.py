@@ -0,0 +1,70 @@
+import random
+
+import pytest
+from algopy import UInt64, arc4
+
+from contracts.library.test.RateLimiterExposed import RateLimiterExposed
+from contracts.types import Bytes32
+from scripts.indexer import Bucket
+from scripts.rate_limit_simulator import simulate
+
+START = 1_700_000_000
+
+# (limit, duration) of each candidate, one bucket each
+CANDIDATES = [(0, 3_600), (500, 0), (500, 3_601), (2_000, 3_600), (2_000, 86_400), (10**21, 86_400)]
+
+INITIAL = Bucket(5_000, 1_234, 3_600, START - 100)
+
+
+def get_bucket_id(idx: int) -> Bytes32:
+    return Bytes32.from_bytes(idx.to_bytes(32, "big"))
+
+
+def random_traffic(seed: int, count: int) -> tuple[list[int], list[int]]:
+    rng = random.Random(seed)
+    timestamps = sorted(START + rng.randrange(0, 2 * 86_400) for _ in range(count))
+    # one in five is a fill
+    amounts = [-rng.randrange(1_000) if rng.random() < 0.2 else rng.randrange(1_000) for _ in range(count)]
+    return timestamps, amounts
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+@pytest.mark.parametrize("initial", [None, INITIAL])
+def test_simulation_matches_contract(context, clock, seed, initial):
+    timestamps, amounts = random_traffic(seed, 60)
+    limits, durations = zip(*CANDIDATES)
+
+    contract = RateLimiterExposed()
+    for idx, (limit, duration) in enumerate(CANDIDATES):
+        bucket_id = get_bucket_id(idx)
+        if initial is None:
+            clock.set(timestamps[0])
+            contract.add_bucket(bucket_id, arc4.UInt256(limit), UInt64(duration))
+        else:
+            clock.set(initial.last_updated)
+            contract.add_bucket(bucket_id, arc4.UInt256(initial.limit), UInt64(initial.duration))
+            contract.set_current_capacity(bucket_id, arc4.UInt256(initial.current_capacity))
+            clock.set(timestamps[0])
+            contract.update_rate_limit(bucket_id, arc4.UInt256(limit))
+            contract.update_rate_duration(bucket_id, UInt64(duration))
+
+    outcomes = [[] for _ in CANDIDATES]
+    for timestamp, amount in zip(timestamps, amounts):
+        clock.set(timestamp)
+        for idx in range(len(CANDIDATES)):
+            if amount < 0:
+                contract.fill_amount(get_bucket_id(idx), arc4.UInt256(-amount))
+                outcomes[idx].append(True)
+                continue
+            try:
+                contract.consume_amount(get_bucket_id(idx), arc4.UInt256(amount))
+                outcomes[idx].append(True)
+            except AssertionError:
+                outcomes[idx].append(False)
+
+    result = simulate(timestamps, amounts, limits, durations, initial=initial, record_outcomes=True)
+    assert result.outcomes.tolist() == outcomes
+    for idx in range(len(CANDIDATES)):
+        bucket = contract.get_bucket(get_bucket_id(idx))
+        assert result.final_capacity[idx] == bucket.current_capacity.native
+        assert result.final_last_updated[idx] == bucket.last_updated.native
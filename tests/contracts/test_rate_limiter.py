@@ -0,0 +1,134 @@
+import pytest
+from algopy import UInt64, arc4
+
+from contracts.library.test.RateLimiterExposed import RateLimiterExposed
+from contracts.types import ARC4UInt256, Bytes32
+
+SECONDS_IN_DAY = 86_400
+
+BUCKET_ID = Bytes32.from_bytes(bytes(31) + b"\x01")
+OTHER_BUCKET_ID = Bytes32.from_bytes(bytes(31) + b"\x02")
+ZERO_DURATION_BUCKET_ID = Bytes32.from_bytes(bytes(31) + b"\x03")
+
+# 1000 of a token with 18 decimals
+LIMIT = 1000 * 10**18
+
+
+@pytest.fixture
+def contract(context, clock):
+    contract = RateLimiterExposed()
+    contract.add_bucket(BUCKET_ID, arc4.UInt256(LIMIT), UInt64(SECONDS_IN_DAY))
+    return contract
+
+
+def get_capacity(contract, bucket_id=BUCKET_ID) -> int:
+    return contract.get_current_capacity(bucket_id).native
+
+
+def test_add_bucket(contract, clock):
+    bucket = contract.get_bucket(BUCKET_ID)
+    assert bucket.limit.native == LIMIT
+    assert bucket.current_capacity.native == LIMIT
+    assert bucket.duration.native == SECONDS_IN_DAY
+    assert bucket.last_updated.native == clock.now
+    assert contract.get_rate_limit(BUCKET_ID).native == LIMIT
+    assert contract.get_rate_duration(BUCKET_ID) == SECONDS_IN_DAY
+
+
+def test_add_bucket_fails_if_already_exists(contract):
+    with pytest.raises(AssertionError, match="Bucket already exists"):
+        contract.add_bucket(BUCKET_ID, arc4.UInt256(LIMIT), UInt64(SECONDS_IN_DAY))
+
+
+def test_remove_bucket(contract):
+    contract.remove_bucket(BUCKET_ID)
+    with pytest.raises(AssertionError, match="Unknown bucket"):
+        contract.get_current_capacity(BUCKET_ID)
+    with pytest.raises(AssertionError, match="Unknown bucket"):
+        contract.remove_bucket(BUCKET_ID)
+
+
+def test_consume_amount(contract):
+    contract.consume_amount(BUCKET_ID, arc4.UInt256(LIMIT // 4))
+    assert get_capacity(contract) == LIMIT - LIMIT // 4
+    assert contract.has_capacity(BUCKET_ID, arc4.UInt256(LIMIT - LIMIT // 4)).native
+    assert not contract.has_capacity(BUCKET_ID, arc4.UInt256(LIMIT - LIMIT // 4 + 1)).native
+
+
+def test_consume_amount_fails_if_insufficient_capacity(contract):
+    with pytest.raises(AssertionError, match="Insufficient capacity to consume"):
+        contract.consume_amount(BUCKET_ID, arc4.UInt256(LIMIT + 1))
+
+
+def test_capacity_refills_over_time(contract, clock):
+    contract.consume_amount(BUCKET_ID, arc4.UInt256(LIMIT))
+    assert get_capacity(contract) == 0
+
+    clock.advance(SECONDS_IN_DAY // 4)
+    assert get_capacity(contract) == LIMIT // 4
+
+    # never exceeds the limit
+    clock.advance(SECONDS_IN_DAY)
+    assert get_capacity(contract) == LIMIT
+
+
+def test_fill_amount(contract, clock):
+    contract.consume_amount(BUCKET_ID, arc4.UInt256(LIMIT // 2))
+    contract.fill_amount(BUCKET_ID, arc4.UInt256(LIMIT // 4))
+    assert get_capacity(contract) == LIMIT - LIMIT // 4
+
+    # fills up to the limit
+    contract.fill_amount(BUCKET_ID, arc4.UInt256(LIMIT))
+    assert get_capacity(contract) == LIMIT
+
+
+def test_zero_duration_bucket_is_unlimited(contract, clock):
+    contract.add_bucket(ZERO_DURATION_BUCKET_ID, arc4.UInt256(0), UInt64(0))
+    assert contract.has_capacity(ZERO_DURATION_BUCKET_ID, arc4.UInt256(LIMIT)).native
+
+    contract.consume_amount(ZERO_DURATION_BUCKET_ID, arc4.UInt256(LIMIT))
+    assert get_capacity(contract, ZERO_DURATION_BUCKET_ID) == 0
+
+
+def test_update_rate_limit(contract, clock):
+    contract.consume_amount(BUCKET_ID, arc4.UInt256(LIMIT // 2))
+
+    # decreasing the limit decreases the capacity by the difference
+    contract.update_rate_limit(BUCKET_ID, arc4.UInt256(LIMIT // 4))
+    assert get_capacity(contract) == 0
+
+    # increasing the limit increases the capacity by the difference
+    contract.update_rate_limit(BUCKET_ID, arc4.UInt256(LIMIT))
+    assert get_capacity(contract) == LIMIT - LIMIT // 4
+    assert contract.get_rate_limit(BUCKET_ID).native == LIMIT
+
+
+def test_update_rate_duration_refills_at_old_rate_first(contract, clock):
+    contract.consume_amount(BUCKET_ID, arc4.UInt256(LIMIT))
+    clock.advance(SECONDS_IN_DAY // 2)
+
+    contract.update_rate_duration(BUCKET_ID, UInt64(SECONDS_IN_DAY * 2))
+    assert get_capacity(contract) == LIMIT // 2
+
+    clock.advance(SECONDS_IN_DAY // 2)
+    assert get_capacity(contract) == LIMIT // 2 + LIMIT // 4
+
+
+def test_consume_and_fill_amounts(contract, clock):
+    contract.add_bucket(OTHER_BUCKET_ID, arc4.UInt256(LIMIT), UInt64(SECONDS_IN_DAY))
+    bucket_ids = arc4.DynamicArray[Bytes32](BUCKET_ID, OTHER_BUCKET_ID)
+
+    contract.consume_amounts(bucket_ids, arc4.DynamicArray[ARC4UInt256](ARC4UInt256(1), ARC4UInt256(2)))
+    assert get_capacity(contract, BUCKET_ID) == LIMIT - 1
+    assert get_capacity(contract, OTHER_BUCKET_ID) == LIMIT - 2
+
+    contract.fill_amounts(bucket_ids, arc4.DynamicArray[ARC4UInt256](ARC4UInt256(1), ARC4UInt256(1)))
+    assert get_capacity(contract, BUCKET_ID) == LIMIT
+    assert get_capacity(contract, OTHER_BUCKET_ID) == LIMIT - 1
+
+
+def test_consume_amounts_fails_if_mismatched(contract):
+    bucket_ids = arc4.DynamicArray[Bytes32](BUCKET_ID)
+    amounts = arc4.DynamicArray[ARC4UInt256](ARC4UInt256(1), ARC4UInt256(1))
+    with pytest.raises(AssertionError, match="Mismatched buckets and amounts"):
+        contract.consume_amounts(bucket_ids, amounts)
@@ -0,0 +1,60 @@
+from algopy import UInt64, arc4
+
+from contracts.library.test.UInt64SetLibExposed import UInt64SetLibExposed
+from contracts.types import ARC4UInt64
+
+
+def to_items(*values: int) -> arc4.DynamicArray[ARC4UInt64]:
+    return arc4.DynamicArray[ARC4UInt64](*(ARC4UInt64(value) for value in values))
+
+
+def to_ints(items: arc4.DynamicArray[ARC4UInt64]) -> list[int]:
+    return [item.native for item in items]
+
+
+def test_has_item(context):
+    contract = UInt64SetLibExposed()
+    assert contract.has_item(UInt64(2), to_items(1, 2, 3)).native
+    assert not contract.has_item(UInt64(4), to_items(1, 2, 3)).native
+    assert not contract.has_item(UInt64(1), to_items()).native
+
+
+def test_add_item(context):
+    contract = UInt64SetLibExposed()
+    added, items = contract.add_item(UInt64(4), to_items(1, 2, 3))
+    assert added.native
+    assert to_ints(items) == [1, 2, 3, 4]
+
+    added, items = contract.add_item(UInt64(2), to_items(1, 2, 3))
+    assert not added.native
+    assert to_ints(items) == [1, 2, 3]
+
+
+def test_remove_item_moves_last_item(context):
+    contract = UInt64SetLibExposed()
+    removed, items = contract.remove_item(UInt64(1), to_items(1, 2, 3))
+    assert removed.native
+    assert to_ints(items) == [3, 2]
+
+    removed, items = contract.remove_item(UInt64(3), to_items(1, 2, 3))
+    assert removed.native
+    assert to_ints(items) == [1, 2]
+
+    removed, items = contract.remove_item(UInt64(4), to_items(1, 2, 3))
+    assert not removed.native
+    assert to_ints(items) == [1, 2, 3]
+
+
+def test_dynamic_set_in_box(context):
+    contract = UInt64SetLibExposed()
+    contract.dynamic_reset()
+
+    assert contract.dynamic_add_item(UInt64(7)).native
+    assert not contract.dynamic_add_item(UInt64(7)).native
+    assert contract.dynamic_add_item(UInt64(8)).native
+    assert contract.dynamic_has_item(UInt64(7)).native
+
+    assert contract.dynamic_remove_item(UInt64(7)).native
+    assert not contract.dynamic_remove_item(UInt64(7)).native
+    assert not contract.dynamic_has_item(UInt64(7)).native
+    assert to_ints(contract.uint64_set.value) == [8]
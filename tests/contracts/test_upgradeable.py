@@ -0,0 +1,111 @@
+import pytest
+from algopy import Bytes, UInt64, arc4
+
+from contracts.library.test.SimpleUpgradeable import SimpleUpgradeable
+from contracts.types import Bytes32
+from scripts.contract import calculate_program_sha256
+
+MIN_UPGRADE_DELAY = 3600
+
+# version 11, pushint 1
+APPROVAL_PROGRAM = bytes([0x0B, 0x81, 0x01])
+CLEAR_STATE_PROGRAM = bytes([0x0B, 0x81, 0x01])
+PROGRAM_SHA256 = Bytes32.from_bytes(calculate_program_sha256(APPROVAL_PROGRAM, CLEAR_STATE_PROGRAM))
+
+
+@pytest.fixture
+def admin(context):
+    # the contracts are created by the default sender
+    return context.default_sender
+
+
+@pytest.fixture
+def contract(context, clock, admin):
+    contract = SimpleUpgradeable()
+    contract.create(UInt64(MIN_UPGRADE_DELAY))
+    with context.txn.create_group(active_txn_overrides={"sender": admin}):
+        contract.initialise(arc4.Address(admin))
+    return contract
+
+
+@pytest.fixture
+def complete_upgrade(context, admin):
+    """Returns a function to complete the upgrade to the given programs."""
+    def _complete_upgrade(contract, approval: bytes = APPROVAL_PROGRAM, clear: bytes = CLEAR_STATE_PROGRAM) -> None:
+        overrides = {
+            "sender": admin,
+            "approval_program": [Bytes(approval)],
+            "clear_state_program": [Bytes(clear)],
+        }
+        with context.txn.create_group(active_txn_overrides=overrides):
+            contract.complete_contract_upgrade()
+    return _complete_upgrade
+
+
+def test_initialise_fails_if_not_creator(context):
+    contract = SimpleUpgradeable()
+    contract.create(UInt64(MIN_UPGRADE_DELAY))
+    with pytest.raises(AssertionError, match="Caller must be the contract creator"):
+        with context.txn.create_group(active_txn_overrides={"sender": context.any.account()}):
+            contract.initialise(arc4.Address(context.any.account()))
+
+
+def test_schedule_and_complete_upgrade(contract, clock, as_sender, admin, complete_upgrade):
+    timestamp = clock.now + MIN_UPGRADE_DELAY
+    with as_sender(admin):
+        contract.schedule_contract_upgrade(PROGRAM_SHA256, UInt64(timestamp))
+    assert contract.scheduled_contract_upgrade.value.timestamp.native == timestamp
+
+    with pytest.raises(AssertionError, match="Schedule complete ts not met"):
+        complete_upgrade(contract)
+
+    clock.set(timestamp)
+    complete_upgrade(contract)
+    assert contract.version == 2
+    assert not contract.is_initialised
+    assert not contract.scheduled_contract_upgrade.maybe()[1]
+
+
+def test_schedule_upgrade_fails_before_min_upgrade_delay(contract, clock, as_sender, admin):
+    with pytest.raises(AssertionError, match="Must schedule at least min upgrade delay time in future"):
+        with as_sender(admin):
+            contract.schedule_contract_upgrade(PROGRAM_SHA256, UInt64(clock.now + MIN_UPGRADE_DELAY - 1))
+
+
+def test_schedule_upgrade_fails_without_role(context, contract, clock, as_sender):
+    with pytest.raises(AssertionError, match="Access control unauthorised account"):
+        with as_sender(context.any.account()):
+            contract.schedule_contract_upgrade(PROGRAM_SHA256, UInt64(clock.now + MIN_UPGRADE_DELAY))
+
+
+def test_complete_upgrade_fails_if_program_differs(contract, clock, as_sender, admin, complete_upgrade):
+    with as_sender(admin):
+        contract.schedule_contract_upgrade(PROGRAM_SHA256, UInt64(clock.now + MIN_UPGRADE_DELAY))
+    clock.advance(MIN_UPGRADE_DELAY)
+
+    with pytest.raises(AssertionError, match="Invalid program SHA256"):
+        complete_upgrade(contract, approval=APPROVAL_PROGRAM + bytes([0x43]))
+
+
+def test_cancel_upgrade(contract, clock, as_sender, admin, complete_upgrade):
+    with as_sender(admin):
+        contract.schedule_contract_upgrade(PROGRAM_SHA256, UInt64(clock.now + MIN_UPGRADE_DELAY))
+        contract.cancel_contract_upgrade()
+        with pytest.raises(AssertionError, match="Upgrade not scheduled"):
+            contract.cancel_contract_upgrade()
+
+    clock.advance(MIN_UPGRADE_DELAY)
+    with pytest.raises(AssertionError, match="Upgrade not scheduled"):
+        complete_upgrade(contract)
+
+
+def test_update_min_upgrade_delay_takes_effect_at_timestamp(contract, clock, as_sender, admin):
+    timestamp = clock.now + MIN_UPGRADE_DELAY
+    with as_sender(admin):
+        contract.update_min_upgrade_delay(UInt64(60), UInt64(timestamp))
+    assert contract.get_active_min_upgrade_delay() == MIN_UPGRADE_DELAY
+
+    clock.set(timestamp)
+    assert contract.get_active_min_upgrade_delay() == 60
+    with as_sender(admin):
+        contract.schedule_contract_upgrade(PROGRAM_SHA256, UInt64(clock.now + 60))
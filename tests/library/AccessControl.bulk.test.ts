@@ -0,0 +1,257 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import type { Account, Address } from "algosdk";
+
+import { MockAccessControlClient, MockAccessControlFactory } from "../../specs/client/MockAccessControl.client.ts";
+import { getAddressRolesBoxKey, getRoleBoxKey } from "../utils/boxes.ts";
+import { getEventBytes, getRandomBytes } from "../utils/bytes.ts";
+
+describe("AccessControl bulk", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const ROLE = getRandomBytes(16);
+  const OTHER_ROLE = getRandomBytes(16);
+  const THIRD_ROLE = getRandomBytes(16);
+
+  let client: MockAccessControlClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let defaultAdmin: Address & Account & TransactionSignerAccount;
+  let otherAdmin: Address & Account & TransactionSignerAccount;
+  let users: (Address & Account & TransactionSignerAccount)[];
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    defaultAdmin = await generateAccount({ initialFunds: (100).algo() });
+    otherAdmin = await generateAccount({ initialFunds: (100).algo() });
+    users = await Promise.all(Array.from({ length: 4 }, () => generateAccount({ initialFunds: (1).algo() })));
+
+    const factory = algorand.client.getTypedAppFactory(MockAccessControlFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+    await client.send.initialise({
+      args: [defaultAdmin.toString()],
+      boxReferences: [
+        getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+        getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+      ],
+    });
+  });
+
+  describe("grant roles", () => {
+    test("fails when caller is not admin", async () => {
+      await expect(
+        client.send.grantRoles({
+          sender: users[0],
+          args: [ROLE, users.map((user) => user.toString())],
+          boxReferences: [getRoleBoxKey(ROLE), getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, users[0].publicKey)],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("fails when exceeds maximum batch size", async () => {
+      await expect(
+        client.send.grantRoles({
+          sender: defaultAdmin,
+          args: [ROLE, Array(13).fill(users[0].toString())],
+        }),
+      ).rejects.toThrow("Exceeds maximum batch size");
+    });
+
+    test("succeeds and emits event for each new grant", async () => {
+      // grant to first user beforehand so no event is emitted for it
+      await client.send.grantRole({
+        sender: defaultAdmin,
+        args: [ROLE, users[0].toString()],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(ROLE, users[0].publicKey),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+        ],
+      });
+
+      const res = await client.send.grantRoles({
+        sender: defaultAdmin,
+        args: [ROLE, users.map((user) => user.toString())],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+          ...users.map((user) => getAddressRolesBoxKey(ROLE, user.publicKey)),
+        ],
+      });
+      expect(res.confirmations[0].logs).toEqual(
+        users
+          .slice(1)
+          .map((user) =>
+            getEventBytes("RoleGranted(byte[16],address,address)", [ROLE, user.publicKey, defaultAdmin.publicKey]),
+          ),
+      );
+      for (const user of users) expect(await client.hasRole({ args: [ROLE, user.toString()] })).toBeTruthy();
+    });
+  });
+
+  describe("revoke roles", () => {
+    test("fails when caller is not admin", async () => {
+      await expect(
+        client.send.revokeRoles({
+          sender: users[0],
+          args: [ROLE, [users[1].toString()]],
+          boxReferences: [getRoleBoxKey(ROLE), getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, users[0].publicKey)],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("succeeds and emits event for each revoke", async () => {
+      const revoked = users.slice(0, 2);
+      const res = await client.send.revokeRoles({
+        sender: defaultAdmin,
+        args: [ROLE, revoked.map((user) => user.toString())],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+          ...revoked.map((user) => getAddressRolesBoxKey(ROLE, user.publicKey)),
+        ],
+      });
+      expect(res.confirmations[0].logs).toEqual(
+        revoked.map((user) =>
+          getEventBytes("RoleRevoked(byte[16],address,address)", [ROLE, user.publicKey, defaultAdmin.publicKey]),
+        ),
+      );
+      expect(await client.hasRole({ args: [ROLE, users[0].toString()] })).toBeFalsy();
+      expect(await client.hasRole({ args: [ROLE, users[1].toString()] })).toBeFalsy();
+      expect(await client.hasRole({ args: [ROLE, users[2].toString()] })).toBeTruthy();
+    });
+  });
+
+  describe("role pairs", () => {
+    beforeAll(async () => {
+      // other admin controls other role
+      await client.send.grantRole({
+        sender: defaultAdmin,
+        args: [OTHER_ROLE, otherAdmin.toString()],
+        boxReferences: [
+          getRoleBoxKey(OTHER_ROLE),
+          getAddressRolesBoxKey(OTHER_ROLE, otherAdmin.publicKey),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+        ],
+      });
+      await client.send.setRoleAdmin({ args: [ROLE, OTHER_ROLE], boxReferences: [getRoleBoxKey(ROLE)] });
+    });
+
+    test("grant fails when caller is missing admin role of any role", async () => {
+      await expect(
+        client.send.grantRolePairs({
+          sender: otherAdmin,
+          args: [
+            [
+              [ROLE, users[0].toString()],
+              [OTHER_ROLE, users[1].toString()],
+            ],
+          ],
+          boxReferences: [
+            getRoleBoxKey(ROLE),
+            getRoleBoxKey(OTHER_ROLE),
+            getAddressRolesBoxKey(OTHER_ROLE, otherAdmin.publicKey),
+            getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, otherAdmin.publicKey),
+            getAddressRolesBoxKey(ROLE, users[0].publicKey),
+          ],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("grant succeeds for repeated role", async () => {
+      const res = await client.send.grantRolePairs({
+        sender: otherAdmin,
+        args: [
+          [
+            [ROLE, users[0].toString()],
+            [ROLE, users[1].toString()],
+          ],
+        ],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(OTHER_ROLE, otherAdmin.publicKey),
+          getAddressRolesBoxKey(ROLE, users[0].publicKey),
+          getAddressRolesBoxKey(ROLE, users[1].publicKey),
+        ],
+      });
+      expect(res.confirmations[0].logs).toHaveLength(2);
+      expect(await client.hasRole({ args: [ROLE, users[0].toString()] })).toBeTruthy();
+      expect(await client.hasRole({ args: [ROLE, users[1].toString()] })).toBeTruthy();
+    });
+
+    test("grant succeeds for different roles sharing admin role", async () => {
+      const res = await client.send.grantRolePairs({
+        sender: defaultAdmin,
+        args: [
+          [
+            [OTHER_ROLE, users[2].toString()],
+            [THIRD_ROLE, users[3].toString()],
+          ],
+        ],
+        boxReferences: [
+          getRoleBoxKey(OTHER_ROLE),
+          getRoleBoxKey(THIRD_ROLE),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+          getAddressRolesBoxKey(OTHER_ROLE, users[2].publicKey),
+          getAddressRolesBoxKey(THIRD_ROLE, users[3].publicKey),
+        ],
+      });
+      expect(res.confirmations[0].logs).toHaveLength(2);
+      expect(await client.hasRole({ args: [OTHER_ROLE, users[2].toString()] })).toBeTruthy();
+      expect(await client.hasRole({ args: [THIRD_ROLE, users[3].toString()] })).toBeTruthy();
+    });
+
+    test("revoke fails atomically when caller is missing admin role of a later role", async () => {
+      await expect(
+        client.send.revokeRolePairs({
+          sender: defaultAdmin,
+          args: [
+            [
+              [OTHER_ROLE, otherAdmin.toString()],
+              [ROLE, users[0].toString()],
+            ],
+          ],
+          boxReferences: [
+            getRoleBoxKey(ROLE),
+            getRoleBoxKey(OTHER_ROLE),
+            getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+            getAddressRolesBoxKey(OTHER_ROLE, defaultAdmin.publicKey),
+            getAddressRolesBoxKey(OTHER_ROLE, otherAdmin.publicKey),
+          ],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+      expect(await client.hasRole({ args: [OTHER_ROLE, otherAdmin.toString()] })).toBeTruthy();
+    });
+
+    test("revoke succeeds for repeated role", async () => {
+      const res = await client.send.revokeRolePairs({
+        sender: otherAdmin,
+        args: [
+          [
+            [ROLE, users[0].toString()],
+            [ROLE, users[1].toString()],
+          ],
+        ],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(OTHER_ROLE, otherAdmin.publicKey),
+          getAddressRolesBoxKey(ROLE, users[0].publicKey),
+          getAddressRolesBoxKey(ROLE, users[1].publicKey),
+        ],
+      });
+      expect(res.confirmations[0].logs).toEqual(
+        [users[0], users[1]].map((user) =>
+          getEventBytes("RoleRevoked(byte[16],address,address)", [ROLE, user.publicKey, otherAdmin.publicKey]),
+        ),
+      );
+    });
+  });
+});
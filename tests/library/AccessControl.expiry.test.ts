@@ -0,0 +1,225 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import type { Account, Address } from "algosdk";
+
+import { MockAccessControlClient, MockAccessControlFactory } from "../../specs/client/MockAccessControl.client.ts";
+import { getAddressRolesBoxKey, getRoleBoxKey } from "../utils/boxes.ts";
+import { convertNumberToBytes, getEventBytes, getRandomBytes } from "../utils/bytes.ts";
+import { SECONDS_IN_DAY, advancePrevBlockTimestamp, getPrevBlockTimestamp } from "../utils/time.ts";
+
+describe("AccessControl expiry", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const ROLE = getRandomBytes(16);
+
+  // minimum balance of an address role box holding an expiry
+  const EXPIRING_GRANT_MIN_BALANCE = 2_500n + 400n * (62n + 8n);
+
+  let client: MockAccessControlClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let defaultAdmin: Address & Account & TransactionSignerAccount;
+  let users: (Address & Account & TransactionSignerAccount)[];
+
+  const adminBoxReferences = () => [
+    getRoleBoxKey(ROLE),
+    getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+  ];
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    defaultAdmin = await generateAccount({ initialFunds: (100).algo() });
+    users = await Promise.all(Array.from({ length: 3 }, () => generateAccount({ initialFunds: (1).algo() })));
+
+    const factory = algorand.client.getTypedAppFactory(MockAccessControlFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+    await client.send.initialise({
+      args: [defaultAdmin.toString()],
+      boxReferences: [
+        getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+        getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+      ],
+    });
+  });
+
+  describe("grant role until", () => {
+    test("fails when caller is not admin", async () => {
+      const expiry = (await getPrevBlockTimestamp(localnet)) + SECONDS_IN_DAY;
+      await expect(
+        client.send.grantRoleUntil({
+          sender: users[0],
+          args: [ROLE, users[0].toString(), expiry],
+          boxReferences: [getRoleBoxKey(ROLE), getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, users[0].publicKey)],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("fails when expiry is not in the future", async () => {
+      const expiry = await getPrevBlockTimestamp(localnet);
+      await expect(
+        client.send.grantRoleUntil({
+          sender: defaultAdmin,
+          args: [ROLE, users[0].toString(), expiry],
+          boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[0].publicKey)],
+        }),
+      ).rejects.toThrow("Expiry must be in the future");
+    });
+
+    test("succeeds and emits events", async () => {
+      const expiry = (await getPrevBlockTimestamp(localnet)) + SECONDS_IN_DAY;
+      const res = await client.send.grantRoleUntil({
+        sender: defaultAdmin,
+        args: [ROLE, users[0].toString(), expiry],
+        boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[0].publicKey)],
+      });
+      expect(res.confirmations[0].logs).toEqual([
+        getEventBytes("RoleGranted(byte[16],address,address)", [ROLE, users[0].publicKey, defaultAdmin.publicKey]),
+        getEventBytes("RoleExpiryUpdated(byte[16],address,uint64)", [ROLE, users[0].publicKey, expiry]),
+      ]);
+      expect(await client.hasRole({ args: [ROLE, users[0].toString()] })).toBeTruthy();
+      expect(await client.getRoleExpiry({ args: [ROLE, users[0].toString()] })).toEqual(expiry);
+
+      // the box holds the expiry rather than a bool
+      const addressRole = await client.state.box.addressesRoles.value({ role: ROLE, address: users[0].toString() });
+      expect(addressRole).toBeDefined();
+      expect(Uint8Array.from(addressRole!)).toEqual(convertNumberToBytes(expiry, 8));
+    });
+
+    test("updates expiry without granting again", async () => {
+      const expiry = (await getPrevBlockTimestamp(localnet)) + 2n * SECONDS_IN_DAY;
+      const res = await client.send.grantRoleUntil({
+        sender: defaultAdmin,
+        args: [ROLE, users[0].toString(), expiry],
+        boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[0].publicKey)],
+      });
+      expect(res.confirmations[0].logs).toEqual([
+        getEventBytes("RoleExpiryUpdated(byte[16],address,uint64)", [ROLE, users[0].publicKey, expiry]),
+      ]);
+      expect(await client.getRoleExpiry({ args: [ROLE, users[0].toString()] })).toEqual(expiry);
+    });
+
+    test("permanent grant removes expiry", async () => {
+      const res = await client.send.grantRole({
+        sender: defaultAdmin,
+        args: [ROLE, users[0].toString()],
+        boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[0].publicKey)],
+      });
+      expect(res.confirmations[0].logs).toEqual([
+        getEventBytes("RoleExpiryUpdated(byte[16],address,uint64)", [ROLE, users[0].publicKey, 0n]),
+      ]);
+      expect(await client.hasRole({ args: [ROLE, users[0].toString()] })).toBeTruthy();
+      expect(await client.getRoleExpiry({ args: [ROLE, users[0].toString()] })).toEqual(0n);
+    });
+  });
+
+  describe("expiry", () => {
+    test("role is no longer held once expired", async () => {
+      const expiry = (await getPrevBlockTimestamp(localnet)) + SECONDS_IN_DAY;
+      await client.send.grantRoleUntil({
+        sender: defaultAdmin,
+        args: [ROLE, users[1].toString(), expiry],
+        boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[1].publicKey)],
+      });
+      await client.send.checkRole({ args: [ROLE, users[1].toString()] });
+
+      await advancePrevBlockTimestamp(localnet, SECONDS_IN_DAY);
+      expect(await client.hasRole({ args: [ROLE, users[1].toString()] })).toBeFalsy();
+      await expect(client.send.checkRole({ args: [ROLE, users[1].toString()] })).rejects.toThrow(
+        "Access control unauthorised account",
+      );
+    });
+
+    test("revoking expired grant deletes box without event", async () => {
+      const res = await client.send.revokeRole({
+        sender: defaultAdmin,
+        args: [ROLE, users[1].toString()],
+        boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[1].publicKey)],
+      });
+      // the last log is the return value
+      expect(res.confirmations[0].logs!.slice(0, -1)).toEqual(
+        users
+          .slice(1)
+          .map((user) =>
+            getEventBytes("RoleRevoked(byte[16],address,address)", [ROLE, user.publicKey, users[0].publicKey]),
+          ),
+      );
+      expect(await client.getRoleExpiry({ args: [ROLE, users[1].toString()] })).toEqual(0n);
+    });
+
+    test("granting again after expiry emits role granted", async () => {
+      const expiry = (await getPrevBlockTimestamp(localnet)) + SECONDS_IN_DAY;
+      await client.send.grantRoleUntil({
+        sender: defaultAdmin,
+        args: [ROLE, users[2].toString(), expiry],
+        boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[2].publicKey)],
+      });
+      await advancePrevBlockTimestamp(localnet, SECONDS_IN_DAY);
+
+      const res = await client.send.grantRole({
+        sender: defaultAdmin,
+        args: [ROLE, users[2].toString()],
+        boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, users[2].publicKey)],
+      });
+      expect(res.confirmations[0].logs).toEqual([
+        getEventBytes("RoleGranted(byte[16],address,address)", [ROLE, users[2].publicKey, defaultAdmin.publicKey]),
+      ]);
+    });
+  });
+
+  describe("prune expired", () => {
+    test("fails when exceeds maximum batch size", async () => {
+      const accounts = Array.from({ length: 13 }, () => users[0].toString());
+      await expect(client.send.pruneExpired({ sender: users[0], args: [ROLE, accounts] })).rejects.toThrow(
+        "Exceeds maximum batch size",
+      );
+    });
+
+    test("deletes expired grants only and returns freed minimum balance", async () => {
+      // user 0 and user 2 have permanent grants, user 1 has no grant
+      const expiry = (await getPrevBlockTimestamp(localnet)) + SECONDS_IN_DAY;
+      for (const user of users.slice(1)) {
+        await client.send.revokeRole({
+          sender: defaultAdmin,
+          args: [ROLE, user.toString()],
+          boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, user.publicKey)],
+        });
+        await client.send.grantRoleUntil({
+          sender: defaultAdmin,
+          args: [ROLE, user.toString(), expiry],
+          boxReferences: [...adminBoxReferences(), getAddressRolesBoxKey(ROLE, user.publicKey)],
+        });
+      }
+      await advancePrevBlockTimestamp(localnet, SECONDS_IN_DAY);
+
+      // prune as anyone
+      const minBalanceBefore = (await localnet.algorand.account.getInformation(client.appAddress)).minBalance;
+      const res = await client.send.pruneExpired({
+        sender: users[0],
+        args: [ROLE, users.map((user) => user.toString())],
+        boxReferences: users.map((user) => getAddressRolesBoxKey(ROLE, user.publicKey)),
+      });
+      const minBalanceAfter = (await localnet.algorand.account.getInformation(client.appAddress)).minBalance;
+      expect(res.return).toEqual(2n * EXPIRING_GRANT_MIN_BALANCE);
+      expect(minBalanceBefore.microAlgos - minBalanceAfter.microAlgos).toEqual(2n * EXPIRING_GRANT_MIN_BALANCE);
+      // the last log is the return value
+      expect(res.confirmations[0].logs!.slice(0, -1)).toEqual(
+        users
+          .slice(1)
+          .map((user) =>
+            getEventBytes("RoleRevoked(byte[16],address,address)", [ROLE, user.publicKey, users[0].publicKey]),
+          ),
+      );
+
+      // permanent grant is kept
+      expect(await client.hasRole({ args: [ROLE, users[0].toString()] })).toBeTruthy();
+    });
+  });
+});
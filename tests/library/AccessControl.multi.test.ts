@@ -0,0 +1,168 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import type { Account, Address } from "algosdk";
+
+import { MockAccessControlClient, MockAccessControlFactory } from "../../specs/client/MockAccessControl.client.ts";
+import { getAddressRolesBoxKey, getRoleBoxKey } from "../utils/boxes.ts";
+import { getRandomBytes } from "../utils/bytes.ts";
+
+describe("AccessControl multiple roles", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const OPERATOR_ROLE = getRandomBytes(16);
+  const ADMIN_ROLE = getRandomBytes(16);
+  const OTHER_ROLE = getRandomBytes(16);
+
+  let client: MockAccessControlClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let defaultAdmin: Address & Account & TransactionSignerAccount;
+  let operator: Address & Account & TransactionSignerAccount;
+  let user: Address & Account & TransactionSignerAccount;
+
+  async function grantRole(role: Uint8Array, account: Address) {
+    await client.send.grantRole({
+      sender: defaultAdmin,
+      args: [role, account.toString()],
+      boxReferences: [
+        getRoleBoxKey(role),
+        getAddressRolesBoxKey(role, account.publicKey),
+        getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+      ],
+    });
+  }
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    defaultAdmin = await generateAccount({ initialFunds: (100).algo() });
+    operator = await generateAccount({ initialFunds: (100).algo() });
+    user = await generateAccount({ initialFunds: (100).algo() });
+
+    const factory = algorand.client.getTypedAppFactory(MockAccessControlFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+    await client.send.initialise({
+      args: [defaultAdmin.toString()],
+      boxReferences: [
+        getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+        getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, defaultAdmin.publicKey),
+      ],
+    });
+
+    // operator has operator and other role, default admin has admin role
+    await grantRole(OPERATOR_ROLE, operator);
+    await grantRole(OTHER_ROLE, operator);
+    await grantRole(ADMIN_ROLE, defaultAdmin);
+  });
+
+  describe("has any role", () => {
+    test("returns false for no roles", async () => {
+      expect(await client.hasAnyRole({ args: [[], operator.toString()] })).toBeFalsy();
+    });
+
+    test.each([
+      { name: "first", roles: [OPERATOR_ROLE, ADMIN_ROLE], expected: true },
+      { name: "last", roles: [ADMIN_ROLE, OPERATOR_ROLE], expected: true },
+      { name: "none", roles: [ADMIN_ROLE, DEFAULT_ADMIN_ROLE], expected: false },
+    ])("returns $expected when operator has $name of roles", async ({ roles, expected }) => {
+      expect(await client.hasAnyRole({ args: [roles, operator.toString()] })).toEqual(expected);
+    });
+
+    test("only needs box references until first role held", async () => {
+      // the unreferenced box of the second role is never read
+      await expect(
+        client.send.checkAnyRole({
+          args: [[OPERATOR_ROLE, ADMIN_ROLE], operator.toString()],
+          boxReferences: [getAddressRolesBoxKey(OPERATOR_ROLE, operator.publicKey)],
+          populateAppCallResources: false,
+        }),
+      ).resolves.toBeDefined();
+    });
+  });
+
+  describe("has all roles", () => {
+    test("returns false for no roles", async () => {
+      expect(await client.hasAllRoles({ args: [[], user.toString()] })).toBeFalsy();
+    });
+
+    test.each([
+      { name: "all", roles: [OPERATOR_ROLE, OTHER_ROLE], expected: true },
+      { name: "some", roles: [OPERATOR_ROLE, ADMIN_ROLE], expected: false },
+      { name: "none", roles: [ADMIN_ROLE, DEFAULT_ADMIN_ROLE], expected: false },
+    ])("returns $expected when operator has $name of roles", async ({ roles, expected }) => {
+      expect(await client.hasAllRoles({ args: [roles, operator.toString()] })).toEqual(expected);
+    });
+  });
+
+  describe("check sender any role", () => {
+    test("fails when caller has none of roles", async () => {
+      await expect(
+        client.send.checkSenderAnyRole({
+          sender: user,
+          args: [[OPERATOR_ROLE, ADMIN_ROLE]],
+          boxReferences: [
+            getAddressRolesBoxKey(OPERATOR_ROLE, user.publicKey),
+            getAddressRolesBoxKey(ADMIN_ROLE, user.publicKey),
+          ],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test.each([
+      { name: "operator", sender: () => operator },
+      { name: "admin", sender: () => defaultAdmin },
+    ])("succeeds when caller is $name", async ({ sender }) => {
+      await expect(
+        client.send.checkSenderAnyRole({
+          sender: sender(),
+          args: [[OPERATOR_ROLE, ADMIN_ROLE]],
+          boxReferences: [
+            getAddressRolesBoxKey(OPERATOR_ROLE, sender().publicKey),
+            getAddressRolesBoxKey(ADMIN_ROLE, sender().publicKey),
+          ],
+        }),
+      ).resolves.toBeDefined();
+    });
+  });
+
+  describe("check sender all roles", () => {
+    test("fails for no roles", async () => {
+      await expect(
+        client.send.checkSenderAllRoles({ sender: defaultAdmin, args: [[]] }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("fails when caller is missing one of roles", async () => {
+      await expect(
+        client.send.checkSenderAllRoles({
+          sender: operator,
+          args: [[OPERATOR_ROLE, ADMIN_ROLE]],
+          boxReferences: [
+            getAddressRolesBoxKey(OPERATOR_ROLE, operator.publicKey),
+            getAddressRolesBoxKey(ADMIN_ROLE, operator.publicKey),
+          ],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("succeeds when caller has all of roles", async () => {
+      await expect(
+        client.send.checkSenderAllRoles({
+          sender: operator,
+          args: [[OPERATOR_ROLE, OTHER_ROLE]],
+          boxReferences: [
+            getAddressRolesBoxKey(OPERATOR_ROLE, operator.publicKey),
+            getAddressRolesBoxKey(OTHER_ROLE, operator.publicKey),
+          ],
+        }),
+      ).resolves.toBeDefined();
+    });
+  });
+});
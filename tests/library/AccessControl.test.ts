@@ -13,6 +13,8 @@ describe("AccessControl", () => {
   const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
   const ROLE = getRandomBytes(16);
   const OTHER_ROLE = getRandomBytes(16);
+  // address role box value of a permanent grant, the ARC-4 bool true
+  const PERMANENT_GRANT = Uint8Array.from([0x80]);
 
   let factory: MockAccessControlFactory;
   let client: MockAccessControlClient;
@@ -91,7 +93,8 @@ describe("AccessControl", () => {
       });
       expect(roleAdmin).toBeDefined();
       expect(Uint8Array.from(roleAdmin!)).toEqual(DEFAULT_ADMIN_ROLE);
-      expect(addressRole).toBeTruthy();
+      expect(addressRole).toBeDefined();
+      expect(Uint8Array.from(addressRole!)).toEqual(PERMANENT_GRANT);
     });
   });
 
@@ -185,7 +188,8 @@ describe("AccessControl", () => {
       });
       expect(roleAdmin).toBeDefined();
       expect(Uint8Array.from(roleAdmin!)).toEqual(DEFAULT_ADMIN_ROLE);
-      expect(addressRole).toBeTruthy();
+      expect(addressRole).toBeDefined();
+      expect(Uint8Array.from(addressRole!)).toEqual(PERMANENT_GRANT);
     });
 
     test("succeeds on second time without emitting event", async () => {
@@ -0,0 +1,176 @@
+import { Config } from "@algorandfoundation/algokit-utils";
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { nullLogger } from "@algorandfoundation/algokit-utils/types/logging";
+import { type Account, type Address, getApplicationAddress } from "algosdk";
+
+import {
+  BitmapUInt64SetLibExposedClient,
+  BitmapUInt64SetLibExposedFactory,
+} from "../../specs/client/BitmapUInt64SetLibExposed.client.ts";
+import { convertNumberToBytes } from "../utils/bytes.ts";
+import { getRandomUInt } from "../utils/uint.ts";
+
+describe("BitmapUInt64SetLib", () => {
+  const localnet = algorandFixture();
+
+  let factory: BitmapUInt64SetLibExposedFactory;
+  let client: BitmapUInt64SetLibExposedClient;
+  let appId: bigint;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  const MAX_ITEMS = 262080n;
+  const boxReferences = Array(8).fill("uint64_set");
+
+  beforeAll(async () => {
+    Config.configure({ logger: nullLogger });
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    factory = algorand.client.getTypedAppFactory(BitmapUInt64SetLibExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+  });
+
+  test("deploys with correct state", async () => {
+    const { appClient, result } = await factory.deploy();
+    appId = result.appId;
+    client = appClient;
+    expect(appId).not.toEqual(0n);
+
+    // fund with large amount so not to worry about box size
+    await localnet.algorand.send.payment({
+      sender: creator,
+      receiver: getApplicationAddress(appId),
+      amount: (20).algo(),
+    });
+  });
+
+  beforeEach(async () => {
+    if (client) await client.send.reset({ args: [], boxReferences });
+  });
+
+  test("empty when box doesn't exist", async () => {
+    expect(await client.popcount({ args: [], boxReferences })).toEqual(0n);
+    expect(await client.capacity({ args: [], boxReferences })).toEqual(0n);
+    expect(await client.hasItem({ args: [0n], boxReferences })).toBeFalsy();
+    expect((await client.send.removeItem({ args: [0n], boxReferences })).return).toBeFalsy();
+    const res = await client.send.removeRange({ args: [0n, 100n], boxReferences, extraFee: (15_000).microAlgos() });
+    expect(res.return).toEqual(0n);
+  });
+
+  describe("add item", () => {
+    test("sets bit and grows box in whole words", async () => {
+      expect((await client.send.addItem({ args: [1n], boxReferences })).return).toBeTruthy();
+      expect(await client.capacity({ args: [], boxReferences })).toEqual(64n);
+      expect(await client.appClient.getBoxValue("uint64_set")).toEqual(
+        Uint8Array.from([...convertNumberToBytes(1, 8), 0b01000000, 0, 0, 0, 0, 0, 0, 0]),
+      );
+
+      expect((await client.send.addItem({ args: [64n], boxReferences })).return).toBeTruthy();
+      expect(await client.capacity({ args: [], boxReferences })).toEqual(128n);
+      expect(await client.popcount({ args: [], boxReferences })).toEqual(2n);
+      expect(await client.hasItem({ args: [1n], boxReferences })).toBeTruthy();
+      expect(await client.hasItem({ args: [64n], boxReferences })).toBeTruthy();
+      expect(await client.hasItem({ args: [0n], boxReferences })).toBeFalsy();
+      expect(await client.hasItem({ args: [128n], boxReferences })).toBeFalsy();
+    });
+
+    test("doesn't add when already present", async () => {
+      await client.send.addItem({ args: [5n], boxReferences });
+      expect((await client.send.addItem({ args: [5n], boxReferences })).return).toBeFalsy();
+      expect(await client.popcount({ args: [], boxReferences })).toEqual(1n);
+    });
+  });
+
+  describe("remove item", () => {
+    test("clears bit", async () => {
+      await client.send.addItem({ args: [5n], boxReferences });
+      await client.send.addItem({ args: [7n], boxReferences });
+      expect((await client.send.removeItem({ args: [5n], boxReferences })).return).toBeTruthy();
+      expect((await client.send.removeItem({ args: [5n], boxReferences })).return).toBeFalsy();
+      expect((await client.send.removeItem({ args: [1000n], boxReferences })).return).toBeFalsy();
+      expect(await client.hasItem({ args: [5n], boxReferences })).toBeFalsy();
+      expect(await client.hasItem({ args: [7n], boxReferences })).toBeTruthy();
+      expect(await client.popcount({ args: [], boxReferences })).toEqual(1n);
+    });
+  });
+
+  describe("ranges", () => {
+    test("fails if invalid range", async () => {
+      await expect(
+        client.send.addRange({ args: [2n, 1n], boxReferences, extraFee: (15_000).microAlgos() }),
+      ).rejects.toThrow("Invalid range");
+      await expect(
+        client.send.removeRange({ args: [2n, 1n], boxReferences, extraFee: (15_000).microAlgos() }),
+      ).rejects.toThrow("Invalid range");
+    });
+
+    test("adds and removes ranges across words", async () => {
+      const expected = new Set<bigint>();
+      await client.send.addItem({ args: [3n], boxReferences });
+      await client.send.addItem({ args: [200n], boxReferences });
+      expected.add(3n).add(200n);
+
+      // add [2, 130) of which 3 is already present
+      let res = await client.send.addRange({ args: [2n, 130n], boxReferences, extraFee: (15_000).microAlgos() });
+      expect(res.return).toEqual(127n);
+      for (let i = 2n; i < 130n; i++) expected.add(i);
+      expect(await client.popcount({ args: [], boxReferences })).toEqual(BigInt(expected.size));
+
+      // remove [60, 250) of which 71 items are present
+      res = await client.send.removeRange({ args: [60n, 250n], boxReferences, extraFee: (15_000).microAlgos() });
+      expect(res.return).toEqual(71n);
+      for (let i = 60n; i < 250n; i++) expected.delete(i);
+      expect(await client.popcount({ args: [], boxReferences })).toEqual(BigInt(expected.size));
+
+      // check
+      for (let i = 0n; i < 256n; i++) {
+        expect(await client.hasItem({ args: [i], boxReferences })).toEqual(expected.has(i));
+      }
+    }, 60_000);
+
+    test("empty range is noop", async () => {
+      const res = await client.send.addRange({ args: [10n, 10n], boxReferences, extraFee: (15_000).microAlgos() });
+      expect(res.return).toEqual(0n);
+      expect(await client.capacity({ args: [], boxReferences })).toEqual(0n);
+    });
+  });
+
+  test("happy path", async () => {
+    const expected = new Set<bigint>();
+    for (let i = 0; i < 50; i++) {
+      const item = getRandomUInt(4096);
+      const res = await client.send.addItem({ args: [item], boxReferences });
+      expect(res.return).toEqual(!expected.has(item));
+      expected.add(item);
+    }
+    for (const item of [...expected].slice(0, 20)) {
+      expect((await client.send.removeItem({ args: [item], boxReferences })).return).toBeTruthy();
+      expected.delete(item);
+    }
+    expect(await client.popcount({ args: [], boxReferences })).toEqual(BigInt(expected.size));
+    for (const item of expected) expect(await client.hasItem({ args: [item], boxReferences })).toBeTruthy();
+  }, 60_000);
+
+  test("supports up to maximum item", async () => {
+    // full box needs 32 box references so spread across group
+    const fullBoxGroup = () =>
+      client
+        .newGroup()
+        .popcount({ args: [], boxReferences, note: "1" })
+        .popcount({ args: [], boxReferences, note: "2" })
+        .popcount({ args: [], boxReferences, note: "3" });
+
+    const res = await fullBoxGroup().addItem({ args: [MAX_ITEMS - 1n], boxReferences }).send();
+    expect(res.returns[3]).toBeTruthy();
+    expect(await client.capacity({ args: [], boxReferences })).toEqual(MAX_ITEMS);
+    await expect(fullBoxGroup().addItem({ args: [MAX_ITEMS], boxReferences }).send()).rejects.toThrow(
+      "Item exceeds maximum",
+    );
+  });
+});
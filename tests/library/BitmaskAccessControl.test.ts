@@ -0,0 +1,208 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import type { Account, Address } from "algosdk";
+
+import {
+  MockBitmaskAccessControlClient,
+  MockBitmaskAccessControlFactory,
+} from "../../specs/client/MockBitmaskAccessControl.client.ts";
+import { getAddressRolesMaskBoxKey, getRoleBoxKey } from "../utils/boxes.ts";
+import { getEventBytes, getRandomBytes } from "../utils/bytes.ts";
+
+describe("BitmaskAccessControl", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const ROLE = getRandomBytes(16);
+  const OTHER_ROLE = getRandomBytes(16);
+
+  // 2500 + 400 * (21 byte key + 17 byte role data)
+  const ROLE_MIN_BALANCE = 17_700n;
+  // 2500 + 400 * (46 byte key + 8 byte bitmask)
+  const ADDRESS_MIN_BALANCE = 24_100n;
+
+  let client: MockBitmaskAccessControlClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let defaultAdmin: Address & Account & TransactionSignerAccount;
+  let user: Address & Account & TransactionSignerAccount;
+
+  async function getAppMinBalance() {
+    const { minBalance } = await localnet.algorand.account.getInformation(client.appAddress);
+    return minBalance.microAlgos;
+  }
+
+  function grantRole(role: Uint8Array, account: Address) {
+    return client.send.grantRole({
+      sender: defaultAdmin,
+      args: [role, account.toString()],
+      boxReferences: [
+        getRoleBoxKey(role),
+        getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+        getAddressRolesMaskBoxKey(account.publicKey),
+        getAddressRolesMaskBoxKey(defaultAdmin.publicKey),
+      ],
+    });
+  }
+
+  function revokeRole(role: Uint8Array, account: Address) {
+    return client.send.revokeRole({
+      sender: defaultAdmin,
+      args: [role, account.toString()],
+      boxReferences: [
+        getRoleBoxKey(role),
+        getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+        getAddressRolesMaskBoxKey(account.publicKey),
+        getAddressRolesMaskBoxKey(defaultAdmin.publicKey),
+      ],
+    });
+  }
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    defaultAdmin = await generateAccount({ initialFunds: (100).algo() });
+    user = await generateAccount({ initialFunds: (100).algo() });
+
+    const factory = algorand.client.getTypedAppFactory(MockBitmaskAccessControlFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+  });
+
+  test("initialise registers default admin role to index zero", async () => {
+    const appMinBalance = await getAppMinBalance();
+
+    await client.send.initialise({
+      args: [defaultAdmin.toString()],
+      boxReferences: [getRoleBoxKey(DEFAULT_ADMIN_ROLE), getAddressRolesMaskBoxKey(defaultAdmin.publicKey)],
+    });
+
+    expect(await client.hasRole({ args: [DEFAULT_ADMIN_ROLE, defaultAdmin.toString()] })).toBeTruthy();
+    expect(await client.getRoleIndex({ args: [DEFAULT_ADMIN_ROLE] })).toEqual(0n);
+    expect(await client.getRolesMask({ args: [defaultAdmin.toString()] })).toEqual(1n);
+    expect(await client.state.global.numRoles()).toEqual(1n);
+    expect(await getAppMinBalance()).toEqual(appMinBalance + ROLE_MIN_BALANCE + ADDRESS_MIN_BALANCE);
+  });
+
+  test("unknown role has no index and is not held", async () => {
+    await expect(client.send.getRoleIndex({ args: [ROLE] })).rejects.toThrow("Unknown role");
+    expect(await client.hasRole({ args: [ROLE, user.toString()] })).toBeFalsy();
+    expect(Uint8Array.from(await client.getRoleAdmin({ args: [ROLE] }))).toEqual(DEFAULT_ADMIN_ROLE);
+  });
+
+  describe("grant role", () => {
+    test("fails when caller is not admin", async () => {
+      await expect(
+        client.send.grantRole({
+          sender: user,
+          args: [ROLE, user.toString()],
+          boxReferences: [
+            getRoleBoxKey(ROLE),
+            getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+            getAddressRolesMaskBoxKey(user.publicKey),
+          ],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("succeeds and registers new role", async () => {
+      const res = await grantRole(ROLE, user);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("RoleGranted(byte[16],address,address)", [ROLE, user.publicKey, defaultAdmin.publicKey]),
+      );
+      expect(await client.hasRole({ args: [ROLE, user.toString()] })).toBeTruthy();
+      expect(await client.hasRole({ args: [ROLE, defaultAdmin.toString()] })).toBeFalsy();
+      expect(await client.getRoleIndex({ args: [ROLE] })).toEqual(1n);
+      expect(await client.getRolesMask({ args: [user.toString()] })).toEqual(0b10n);
+
+      const roleData = await client.state.box.roles.value(ROLE);
+      expect(Uint8Array.from(roleData!.adminRole)).toEqual(DEFAULT_ADMIN_ROLE);
+      expect(roleData!.index).toEqual(1);
+    });
+
+    test("succeeds on second time without emitting event", async () => {
+      const res = await grantRole(ROLE, user);
+      expect(res.confirmations[0].logs).toBeUndefined();
+      expect(await client.getRolesMask({ args: [user.toString()] })).toEqual(0b10n);
+    });
+
+    test("succeeds for another role reusing the address box", async () => {
+      const appMinBalance = await getAppMinBalance();
+
+      await grantRole(OTHER_ROLE, user);
+      expect(await client.getRoleIndex({ args: [OTHER_ROLE] })).toEqual(2n);
+      expect(await client.getRolesMask({ args: [user.toString()] })).toEqual(0b110n);
+      expect(await client.hasRolesMask({ args: [0b110n, user.toString()] })).toBeTruthy();
+      expect(await client.hasRolesMask({ args: [0b111n, user.toString()] })).toBeFalsy();
+      expect(await client.hasRolesMask({ args: [0n, user.toString()] })).toBeFalsy();
+
+      // only the new role box is paid for
+      expect(await getAppMinBalance()).toEqual(appMinBalance + ROLE_MIN_BALANCE);
+    });
+  });
+
+  describe("revoke role", () => {
+    test("succeeds without emitting event when role unknown", async () => {
+      const unknownRole = getRandomBytes(16);
+      const res = await revokeRole(unknownRole, user);
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("succeeds and keeps other roles", async () => {
+      const res = await revokeRole(ROLE, user);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("RoleRevoked(byte[16],address,address)", [ROLE, user.publicKey, defaultAdmin.publicKey]),
+      );
+      expect(await client.hasRole({ args: [ROLE, user.toString()] })).toBeFalsy();
+      expect(await client.hasRole({ args: [OTHER_ROLE, user.toString()] })).toBeTruthy();
+      expect(await client.getRolesMask({ args: [user.toString()] })).toEqual(0b100n);
+    });
+
+    test("succeeds on second time without emitting event", async () => {
+      const res = await revokeRole(ROLE, user);
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("succeeds and deletes address box when last role renounced", async () => {
+      const appMinBalance = await getAppMinBalance();
+
+      const res = await client.send.renounceRole({
+        sender: user,
+        args: [OTHER_ROLE],
+        boxReferences: [getRoleBoxKey(OTHER_ROLE), getAddressRolesMaskBoxKey(user.publicKey)],
+      });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("RoleRevoked(byte[16],address,address)", [OTHER_ROLE, user.publicKey, user.publicKey]),
+      );
+      expect(await client.getRolesMask({ args: [user.toString()] })).toEqual(0n);
+      await expect(client.state.box.addressesRoles.value(user.toString())).rejects.toThrow("box not found");
+      expect(await getAppMinBalance()).toEqual(appMinBalance - ADDRESS_MIN_BALANCE);
+    });
+  });
+
+  describe("set role admin", () => {
+    test("succeeds and registers new role", async () => {
+      const newRole = getRandomBytes(16);
+      const res = await client.send.setRoleAdmin({
+        args: [newRole, ROLE],
+        boxReferences: [getRoleBoxKey(newRole)],
+      });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("RoleAdminChanged(byte[16],byte[16],byte[16])", [newRole, DEFAULT_ADMIN_ROLE, ROLE]),
+      );
+      expect(Uint8Array.from(await client.getRoleAdmin({ args: [newRole] }))).toEqual(ROLE);
+      expect(await client.getRoleIndex({ args: [newRole] })).toEqual(3n);
+    });
+
+    test("keeps index of existing role", async () => {
+      await client.send.setRoleAdmin({ args: [ROLE, OTHER_ROLE], boxReferences: [getRoleBoxKey(ROLE)] });
+      expect(Uint8Array.from(await client.getRoleAdmin({ args: [ROLE] }))).toEqual(OTHER_ROLE);
+      expect(await client.getRoleIndex({ args: [ROLE] })).toEqual(1n);
+    });
+  });
+});
@@ -0,0 +1,163 @@
+import { Config } from "@algorandfoundation/algokit-utils";
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { nullLogger } from "@algorandfoundation/algokit-utils/types/logging";
+import { type Account, type Address, getApplicationAddress } from "algosdk";
+
+import {
+  BoxUInt64SetLibExposedClient,
+  BoxUInt64SetLibExposedFactory,
+} from "../../specs/client/BoxUInt64SetLibExposed.client.ts";
+import { convertNumberToBytes } from "../utils/bytes.ts";
+import { getAppBudgetConsumed } from "../utils/cost.ts";
+import { MAX_UINT64, getRandomUInt } from "../utils/uint.ts";
+
+describe("BoxUInt64SetLib", () => {
+  const localnet = algorandFixture();
+
+  let factory: BoxUInt64SetLibExposedFactory;
+  let client: BoxUInt64SetLibExposedClient;
+  let appId: bigint;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  // each box reference provides 1KB of box quota so need 32 across the group for a full box
+  const boxReferences = Array(8).fill("uint64_set");
+
+  async function getBoxItems(): Promise<bigint[]> {
+    const boxNames = await client.appClient.getBoxNames();
+    if (!boxNames.some(({ name }) => name === "uint64_set")) return [];
+    const value = await client.appClient.getBoxValue("uint64_set");
+    const items = [];
+    for (let i = 0; i < value.length; i += 8) items.push(Buffer.from(value.slice(i, i + 8)).readBigUInt64BE());
+    return items;
+  }
+
+  beforeAll(async () => {
+    Config.configure({ logger: nullLogger });
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    factory = algorand.client.getTypedAppFactory(BoxUInt64SetLibExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+  });
+
+  test("deploys with correct state", async () => {
+    const { appClient, result } = await factory.deploy();
+    appId = result.appId;
+    client = appClient;
+    expect(appId).not.toEqual(0n);
+
+    // fund with large amount so not to worry about box size
+    await localnet.algorand.send.payment({
+      sender: creator,
+      receiver: getApplicationAddress(appId),
+      amount: (20).algo(),
+    });
+  });
+
+  beforeEach(async () => {
+    if (client) await client.send.reset({ args: [], boxReferences });
+  });
+
+  test("empty when box doesn't exist", async () => {
+    expect(await client.length({ args: [], boxReferences })).toEqual(0n);
+    expect(await client.hasItem({ args: [0n], boxReferences })).toBeFalsy();
+    await expect(client.send.getItem({ args: [0n], boxReferences })).rejects.toThrow("Index out of bounds");
+  });
+
+  test("adds items in sorted order and creates box", async () => {
+    expect((await client.send.addItem({ args: [34n], boxReferences })).return).toBeTruthy();
+    expect((await client.send.addItem({ args: [2n], boxReferences })).return).toBeTruthy();
+    expect((await client.send.addItem({ args: [873099n], boxReferences })).return).toBeTruthy();
+    expect((await client.send.addItem({ args: [5n], boxReferences })).return).toBeTruthy();
+    expect((await client.send.addItem({ args: [MAX_UINT64], boxReferences })).return).toBeTruthy();
+
+    expect(await getBoxItems()).toEqual([2n, 5n, 34n, 873099n, MAX_UINT64]);
+    expect(await client.length({ args: [], boxReferences })).toEqual(5n);
+    expect(await client.getItem({ args: [2n], boxReferences })).toEqual(34n);
+    expect(await client.appClient.getBoxValue("uint64_set")).toEqual(
+      Uint8Array.from([2n, 5n, 34n, 873099n, MAX_UINT64].flatMap((item) => [...convertNumberToBytes(item, 8)])),
+    );
+  });
+
+  test("doesn't add item when already present", async () => {
+    for (const item of [34n, 2n, 5n]) await client.send.addItem({ args: [item], boxReferences });
+    for (const item of [34n, 2n, 5n]) {
+      expect((await client.send.addItem({ args: [item], boxReferences })).return).toBeFalsy();
+    }
+    expect(await getBoxItems()).toEqual([2n, 5n, 34n]);
+  });
+
+  test("removes items keeping order and deletes box when empty", async () => {
+    for (const item of [34n, 2n, 5n, 873099n]) await client.send.addItem({ args: [item], boxReferences });
+
+    expect((await client.send.removeItem({ args: [6n], boxReferences })).return).toBeFalsy();
+    expect((await client.send.removeItem({ args: [5n], boxReferences })).return).toBeTruthy();
+    expect(await getBoxItems()).toEqual([2n, 34n, 873099n]);
+    expect((await client.send.removeItem({ args: [873099n], boxReferences })).return).toBeTruthy();
+    expect(await getBoxItems()).toEqual([2n, 34n]);
+    expect((await client.send.removeItem({ args: [2n], boxReferences })).return).toBeTruthy();
+    expect(await getBoxItems()).toEqual([34n]);
+    expect((await client.send.removeItem({ args: [34n], boxReferences })).return).toBeTruthy();
+    expect(await client.appClient.getBoxNames()).toEqual([]);
+    expect((await client.send.removeItem({ args: [34n], boxReferences })).return).toBeFalsy();
+  });
+
+  test("happy path", async () => {
+    const expected = new Set<bigint>();
+
+    // continually add and remove items
+    const cycles = 5;
+    const numItemsAddedPerCycle = 20;
+    const numItemsRemovedPerCycle = 10;
+    for (let i = 0; i < cycles; i++) {
+      for (let j = 0; j < numItemsAddedPerCycle; j++) {
+        const item = getRandomUInt(MAX_UINT64);
+        const res = await client.send.addItem({ args: [item], boxReferences });
+        expect(res.return).toBeTruthy();
+        expected.add(item);
+      }
+      for (let j = 0; j < numItemsRemovedPerCycle; j++) {
+        const items = await getBoxItems();
+        const item = items[Number(getRandomUInt(items.length - 1))];
+        const res = await client.send.removeItem({ args: [item], boxReferences });
+        expect(res.return).toBeTruthy();
+        expected.delete(item);
+      }
+    }
+
+    // check result
+    expect(await getBoxItems()).toEqual([...expected].sort((a, b) => (a < b ? -1 : a > b ? 1 : 0)));
+    for (const item of expected) expect(await client.hasItem({ args: [item], boxReferences })).toBeTruthy();
+  }, 60_000);
+
+  test("supports up to 4096 items at near-constant cost", async () => {
+    const maxItems = 4096;
+
+    // add items using groups with enough box references to cover a full box
+    const groupSize = 4;
+    for (let i = 0; i < maxItems; i += groupSize) {
+      const group = client.newGroup();
+      for (let j = i; j < i + groupSize; j++) group.addItem({ args: [j], boxReferences, note: `${j}` });
+      await group.send();
+    }
+    expect(await client.length({ args: [], boxReferences })).toEqual(BigInt(maxItems));
+
+    // cannot exceed box size
+    const fullGroup = client.newGroup();
+    for (let j = 0; j < groupSize; j++) fullGroup.addItem({ args: [maxItems + j], boxReferences, note: `${j}` });
+    await expect(fullGroup.send()).rejects.toThrow("Set is full");
+
+    // cost only grows with log of size
+    const hasCost = await getAppBudgetConsumed(client.newGroup().hasItem({ args: [0n], boxReferences }));
+    const removeCost = await getAppBudgetConsumed(client.newGroup().removeItem({ args: [0n], boxReferences }));
+    console.log("Opcode cost with 4096 items", { has: hasCost, remove: removeCost });
+    expect(hasCost).toBeLessThan(700);
+    expect(removeCost).toBeLessThan(700);
+  }, 600_000);
+});
@@ -0,0 +1,219 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { type Account, type Address } from "algosdk";
+
+import {
+  PackedRateLimiterExposedClient,
+  PackedRateLimiterExposedFactory,
+} from "../../specs/client/PackedRateLimiterExposed.client.ts";
+import { getBucketGroupBoxKey } from "../utils/boxes.ts";
+import { getEventBytes, getRandomBytes } from "../utils/bytes.ts";
+import { SECONDS_IN_DAY, advancePrevBlockTimestamp, getPrevBlockTimestamp } from "../utils/time.ts";
+
+describe("PackedRateLimiter", () => {
+  const localnet = algorandFixture();
+
+  let client: PackedRateLimiterExposedClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  const groupId = getRandomBytes(32);
+  const boxReferences = [getBucketGroupBoxKey(groupId)];
+  const limit = BigInt(1000n * 10n ** 18n);
+  const duration = SECONDS_IN_DAY;
+
+  // 2500 + 400 * (50 byte key + 80 byte bucket) for the group box, then 400 * 80 for each additional bucket
+  const GROUP_MIN_BALANCE = 54_500n;
+  const BUCKET_MIN_BALANCE = 32_000n;
+
+  async function getAppMinBalance() {
+    const { minBalance } = await localnet.algorand.account.getInformation(client.appAddress);
+    return minBalance.microAlgos;
+  }
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    const factory = algorand.client.getTypedAppFactory(PackedRateLimiterExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+  });
+
+  test("get group size is zero if group unknown", async () => {
+    expect(await client.getGroupSize({ args: [groupId] })).toEqual(0n);
+  });
+
+  test("get current capacity fails if bucket unknown", async () => {
+    await expect(client.send.getCurrentCapacity({ args: [groupId, 0n], boxReferences })).rejects.toThrow(
+      "Unknown bucket",
+    );
+  });
+
+  describe("add bucket", () => {
+    test("succeeds and creates group", async () => {
+      const appMinBalance = await getAppMinBalance();
+      const prevBlockTimestamp = await getPrevBlockTimestamp(localnet);
+
+      const res = await client.send.addBucket({ args: [groupId, limit, duration], boxReferences });
+      expect(res.return).toEqual(0n);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("GroupBucketAdded(byte[32],uint64,uint256,uint64)", [groupId, 0n, limit, duration]),
+      );
+
+      expect(await client.getGroupSize({ args: [groupId] })).toEqual(1n);
+      const expectedBucket = { limit, currentCapacity: limit, duration, lastUpdated: prevBlockTimestamp };
+      expect(await client.getBucket({ args: [groupId, 0n] })).toEqual(expectedBucket);
+      expect(await getAppMinBalance()).toEqual(appMinBalance + GROUP_MIN_BALANCE);
+    });
+
+    test("succeeds and appends to existing group", async () => {
+      const appMinBalance = await getAppMinBalance();
+
+      const res = await client.send.addBucket({ args: [groupId, limit / 2n, 0n], boxReferences });
+      expect(res.return).toEqual(1n);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("GroupBucketAdded(byte[32],uint64,uint256,uint64)", [groupId, 1n, limit / 2n, 0n]),
+      );
+
+      expect(await client.getGroupSize({ args: [groupId] })).toEqual(2n);
+      expect(await client.getRateLimit({ args: [groupId, 1n] })).toEqual(limit / 2n);
+      expect(await client.getRateDuration({ args: [groupId, 1n] })).toEqual(0n);
+      expect(await getAppMinBalance()).toEqual(appMinBalance + BUCKET_MIN_BALANCE);
+
+      // earlier slot is unaffected
+      expect(await client.getRateLimit({ args: [groupId, 0n] })).toEqual(limit);
+      expect(await client.getRateDuration({ args: [groupId, 0n] })).toEqual(duration);
+    });
+
+    test("succeeds for third bucket", async () => {
+      const res = await client.send.addBucket({ args: [groupId, limit, duration], boxReferences });
+      expect(res.return).toEqual(2n);
+    });
+
+    test("fails to access slot beyond group size", async () => {
+      await expect(client.send.checkBucketKnown({ args: [groupId, 3n], boxReferences })).rejects.toThrow(
+        "Unknown bucket",
+      );
+    });
+  });
+
+  describe("consume and fill", () => {
+    afterEach(async () => {
+      await client.send.setCurrentCapacity({ args: [groupId, 0n, limit], boxReferences });
+      await client.send.setCurrentCapacity({ args: [groupId, 2n, limit], boxReferences });
+    });
+
+    test("consume amount succeeds and only updates its slot", async () => {
+      const amount = limit / 4n;
+      const res = await client.send.consumeAmount({ args: [groupId, 2n, amount], boxReferences });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("GroupBucketConsumed(byte[32],uint64,uint256)", [groupId, 2n, amount]),
+      );
+      expect((await client.getBucket({ args: [groupId, 2n] })).currentCapacity).toEqual(limit - amount);
+      expect((await client.getBucket({ args: [groupId, 0n] })).currentCapacity).toEqual(limit);
+    });
+
+    test("consume amount fails if insufficient capacity", async () => {
+      await expect(client.send.consumeAmount({ args: [groupId, 0n, limit + 1n], boxReferences })).rejects.toThrow(
+        "Insufficient capacity to consume",
+      );
+    });
+
+    test("consume amount ignores zero duration bucket", async () => {
+      const res = await client.send.consumeAmount({ args: [groupId, 1n, limit + 1n], boxReferences });
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("capacity refills over time", async () => {
+      await client.send.setCurrentCapacity({ args: [groupId, 0n, 0n], boxReferences });
+      await advancePrevBlockTimestamp(localnet, duration / 2n);
+      expect(await client.getCurrentCapacity({ args: [groupId, 0n] })).toEqual(limit / 2n);
+    });
+
+    test("consume amounts succeeds with a single box reference", async () => {
+      const res = await client.send.consumeAmounts({
+        args: [groupId, [0n, 1n, 2n], [1n, 2n, 3n]],
+        boxReferences,
+      });
+      expect(res.confirmations[0].logs).toHaveLength(1);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("GroupBucketsConsumed(byte[32],uint64[],uint256[])", [groupId, [0n, 2n], [1n, 3n]]),
+      );
+      expect((await client.getBucket({ args: [groupId, 0n] })).currentCapacity).toEqual(limit - 1n);
+      expect((await client.getBucket({ args: [groupId, 2n] })).currentCapacity).toEqual(limit - 3n);
+    });
+
+    test("consume and fill amounts of only zero duration buckets emit no event", async () => {
+      let res = await client.send.consumeAmounts({ args: [groupId, [1n], [limit + 1n]], boxReferences });
+      expect(res.confirmations[0].logs).toBeUndefined();
+      res = await client.send.fillAmounts({ args: [groupId, [1n], [1n]], boxReferences });
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("consume amounts fails atomically if insufficient capacity", async () => {
+      await expect(
+        client.send.consumeAmounts({ args: [groupId, [0n, 2n], [1n, limit + 1n]], boxReferences }),
+      ).rejects.toThrow("Insufficient capacity to consume");
+      expect((await client.getBucket({ args: [groupId, 0n] })).currentCapacity).toEqual(limit);
+    });
+
+    test("consume amounts fails if mismatched slots and amounts", async () => {
+      await expect(client.send.consumeAmounts({ args: [groupId, [0n, 2n], [1n]], boxReferences })).rejects.toThrow(
+        "Mismatched buckets and amounts",
+      );
+    });
+
+    test("fill amounts succeeds without exceeding limit", async () => {
+      await client.send.setCurrentCapacity({ args: [groupId, 0n, limit - 10n], boxReferences });
+      const res = await client.send.fillAmounts({ args: [groupId, [0n, 2n], [20n, 5n]], boxReferences });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("GroupBucketsFilled(byte[32],uint64[],uint256[])", [groupId, [0n, 2n], [10n, 0n]]),
+      );
+      expect((await client.getBucket({ args: [groupId, 0n] })).currentCapacity).toEqual(limit);
+    });
+  });
+
+  describe("update bucket", () => {
+    test("update rate limit succeeds", async () => {
+      const res = await client.send.updateRateLimit({ args: [groupId, 2n, limit / 2n], boxReferences });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("GroupBucketRateLimitUpdated(byte[32],uint64,uint256)", [groupId, 2n, limit / 2n]),
+      );
+      expect(await client.getRateLimit({ args: [groupId, 2n] })).toEqual(limit / 2n);
+      expect(await client.getCurrentCapacity({ args: [groupId, 2n] })).toEqual(limit / 2n);
+    });
+
+    test("update rate duration succeeds", async () => {
+      const res = await client.send.updateRateDuration({ args: [groupId, 2n, duration * 2n], boxReferences });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("GroupBucketRateDurationUpdated(byte[32],uint64,uint64)", [groupId, 2n, duration * 2n]),
+      );
+      expect(await client.getRateDuration({ args: [groupId, 2n] })).toEqual(duration * 2n);
+    });
+  });
+
+  describe("remove group", () => {
+    test("fails if group unknown", async () => {
+      const unknownGroupId = getRandomBytes(32);
+      await expect(
+        client.send.removeGroup({ args: [unknownGroupId], boxReferences: [getBucketGroupBoxKey(unknownGroupId)] }),
+      ).rejects.toThrow("Unknown bucket group");
+    });
+
+    test("succeeds and frees minimum balance", async () => {
+      const appMinBalance = await getAppMinBalance();
+
+      const res = await client.send.removeGroup({ args: [groupId], boxReferences });
+      expect(res.confirmations[0].logs![0]).toEqual(getEventBytes("BucketGroupRemoved(byte[32])", [groupId]));
+
+      expect(await client.getGroupSize({ args: [groupId] })).toEqual(0n);
+      expect(await getAppMinBalance()).toEqual(appMinBalance - GROUP_MIN_BALANCE - 2n * BUCKET_MIN_BALANCE);
+    });
+  });
+});
@@ -0,0 +1,250 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { getApplicationAddress } from "algosdk";
+import type { Account, Address } from "algosdk";
+
+import { LargeContractToUpgradeToFactory } from "../../specs/client/LargeContractToUpgradeTo.client.ts";
+import {
+  SimplePackedUpgradeableClient,
+  SimplePackedUpgradeableFactory,
+} from "../../specs/client/SimplePackedUpgradeable.client.ts";
+import { getAddressRolesBoxKey, getRoleBoxKey } from "../utils/boxes.ts";
+import { getEventBytes, getRandomBytes, getRoleBytes } from "../utils/bytes.ts";
+import { calculateProgramSha256 } from "../utils/contract.ts";
+import { SECONDS_IN_DAY, SECONDS_IN_HOUR, advancePrevBlockTimestamp, getPrevBlockTimestamp } from "../utils/time.ts";
+import { getRandomUInt } from "../utils/uint.ts";
+
+describe("PackedUpgradeable", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const UPGRADEABLE_ADMIN_ROLE = getRoleBytes("UPGRADEABLE_ADMIN");
+
+  const MIN_UPGRADE_DELAY = SECONDS_IN_DAY;
+
+  let factory: SimplePackedUpgradeableFactory;
+  let client: SimplePackedUpgradeableClient;
+  let appId: bigint;
+
+  let approvalProgramToUpdateTo: Uint8Array;
+  let clearStateProgramToUpdateTo: Uint8Array;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let admin: Address & Account & TransactionSignerAccount;
+  let user: Address & Account & TransactionSignerAccount;
+
+  const adminBoxReferences = () => [
+    getRoleBoxKey(UPGRADEABLE_ADMIN_ROLE),
+    getAddressRolesBoxKey(UPGRADEABLE_ADMIN_ROLE, admin.publicKey),
+  ];
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    admin = await generateAccount({ initialFunds: (100).algo() });
+    user = await generateAccount({ initialFunds: (100).algo() });
+
+    factory = algorand.client.getTypedAppFactory(SimplePackedUpgradeableFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+
+    // prepare contract to upgrade to
+    const updatedContractFactory = localnet.algorand.client.getTypedAppFactory(LargeContractToUpgradeToFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    const { result } = await updatedContractFactory.deploy();
+    const app = await localnet.algorand.app.getById(result.appId);
+    approvalProgramToUpdateTo = app.approvalProgram;
+    clearStateProgramToUpdateTo = app.clearStateProgram;
+  });
+
+  test("deploys with correct state and a single global byte slice", async () => {
+    const { appClient, result } = await factory.deploy({
+      createParams: {
+        sender: creator,
+        method: "create",
+        args: [MIN_UPGRADE_DELAY],
+        extraProgramPages: 3,
+      },
+    });
+    appId = result.appId;
+    client = appClient;
+
+    expect(await client.isInitialised()).toBeFalsy();
+    expect(await client.getVersion()).toEqual(1n);
+    expect(await client.getActiveMinUpgradeDelay()).toEqual(MIN_UPGRADE_DELAY);
+    expect(Uint8Array.from(await client.upgradableAdminRole())).toEqual(UPGRADEABLE_ADMIN_ROLE);
+
+    const app = await localnet.algorand.app.getById(appId);
+    expect(app.globalInts).toEqual(0);
+    expect(app.globalByteSlices).toEqual(1);
+  });
+
+  describe("when uninitialised", () => {
+    test("fails to schedule contract upgrade", async () => {
+      await expect(
+        client.send.scheduleContractUpgrade({ sender: admin, args: [getRandomBytes(32), 0] }),
+      ).rejects.toThrow("Uninitialised contract");
+    });
+
+    test("fails to initialise if caller is not creator", async () => {
+      await expect(client.send.initialise({ sender: admin, args: [admin.toString()] })).rejects.toThrow(
+        "Caller must be the contract creator",
+      );
+    });
+
+    test("succeeds to initialise", async () => {
+      const fundingTxn = await localnet.algorand.createTransaction.payment({
+        sender: creator,
+        receiver: getApplicationAddress(appId),
+        amount: (190_000).microAlgos(),
+      });
+      await client
+        .newGroup()
+        .addTransaction(fundingTxn)
+        .initialise({
+          args: [admin.toString()],
+          boxReferences: [
+            getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+            getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey),
+            ...adminBoxReferences(),
+          ],
+        })
+        .send();
+      expect(await client.isInitialised()).toBeTruthy();
+      expect(await client.hasRole({ args: [UPGRADEABLE_ADMIN_ROLE, admin.toString()] })).toBeTruthy();
+    });
+
+    test("fails to initialise again", async () => {
+      await expect(client.send.initialise({ args: [admin.toString()] })).rejects.toThrow(
+        "Contract already initialised",
+      );
+    });
+  });
+
+  describe("update min upgrade delay", () => {
+    test("fails when caller is not upgradeable admin", async () => {
+      await expect(
+        client.send.updateMinUpgradeDelay({
+          sender: user,
+          args: [SECONDS_IN_DAY, 0],
+          boxReferences: [
+            getRoleBoxKey(UPGRADEABLE_ADMIN_ROLE),
+            getAddressRolesBoxKey(UPGRADEABLE_ADMIN_ROLE, user.publicKey),
+          ],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("succeeds and becomes active at timestamp", async () => {
+      let prevTimestamp = await getPrevBlockTimestamp(localnet);
+      const timestamp = prevTimestamp + MIN_UPGRADE_DELAY;
+
+      // temporary change which becomes active
+      const tempMinUpgradeDelay = getRandomUInt(SECONDS_IN_HOUR);
+      const res = await client.send.updateMinUpgradeDelay({
+        sender: admin,
+        args: [tempMinUpgradeDelay, timestamp],
+        boxReferences: adminBoxReferences(),
+      });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("MinimumUpgradeDelayChange(uint64,uint64)", [tempMinUpgradeDelay, timestamp]),
+      );
+
+      // not active and then active
+      expect(await client.getActiveMinUpgradeDelay()).toEqual(MIN_UPGRADE_DELAY);
+      prevTimestamp = await getPrevBlockTimestamp(localnet);
+      await advancePrevBlockTimestamp(localnet, timestamp - prevTimestamp);
+      expect(await client.getActiveMinUpgradeDelay()).toEqual(tempMinUpgradeDelay);
+    });
+  });
+
+  describe("schedule and cancel contract upgrade", () => {
+    test("fails when timestamp is not sufficiently in future", async () => {
+      const prevTimestamp = await getPrevBlockTimestamp(localnet);
+      const minUpgradeDelay = await client.getActiveMinUpgradeDelay();
+      await expect(
+        client.send.scheduleContractUpgrade({
+          sender: admin,
+          args: [getRandomBytes(32), prevTimestamp + minUpgradeDelay - 1n],
+          boxReferences: adminBoxReferences(),
+        }),
+      ).rejects.toThrow("Must schedule at least min upgrade delay time in future");
+    });
+
+    test("cancel fails when no upgrade scheduled", async () => {
+      await expect(
+        client.send.cancelContractUpgrade({ sender: admin, args: [], boxReferences: adminBoxReferences() }),
+      ).rejects.toThrow("Upgrade not scheduled");
+    });
+
+    test("succeeds to schedule and cancel", async () => {
+      const programSha256 = getRandomBytes(32);
+      const timestamp = (await getPrevBlockTimestamp(localnet)) + MIN_UPGRADE_DELAY;
+      const res = await client.send.scheduleContractUpgrade({
+        sender: admin,
+        args: [programSha256, timestamp],
+        boxReferences: adminBoxReferences(),
+      });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("UpgradeScheduled(byte[32],uint64)", [programSha256, timestamp]),
+      );
+
+      await client.send.cancelContractUpgrade({ sender: admin, args: [], boxReferences: adminBoxReferences() });
+      await expect(client.send.update.completeContractUpgrade({ sender: user, args: [] })).rejects.toThrow(
+        "Upgrade not scheduled",
+      );
+    });
+  });
+
+  describe("complete contract upgrade", () => {
+    let timestamp: bigint;
+
+    beforeAll(async () => {
+      const programSha256 = calculateProgramSha256(approvalProgramToUpdateTo, clearStateProgramToUpdateTo);
+      timestamp = (await getPrevBlockTimestamp(localnet)) + MIN_UPGRADE_DELAY;
+      await client.send.scheduleContractUpgrade({
+        sender: admin,
+        args: [programSha256, timestamp],
+        boxReferences: adminBoxReferences(),
+      });
+    });
+
+    test("fails when timestamp not been reached", async () => {
+      const prevTimestamp = await getPrevBlockTimestamp(localnet);
+      await advancePrevBlockTimestamp(localnet, timestamp - prevTimestamp - 1n);
+      await expect(client.send.update.completeContractUpgrade({ sender: user, args: [] })).rejects.toThrow(
+        "Schedule complete ts not met",
+      );
+    });
+
+    test("fails when program sha256 is different", async () => {
+      const prevTimestamp = await getPrevBlockTimestamp(localnet);
+      await advancePrevBlockTimestamp(localnet, timestamp - prevTimestamp);
+      await expect(client.send.update.completeContractUpgrade({ sender: user, args: [] })).rejects.toThrow(
+        "Invalid program SHA256",
+      );
+    });
+
+    test("succeeds and completes scheduled upgrade", async () => {
+      const programSha256 = calculateProgramSha256(approvalProgramToUpdateTo, clearStateProgramToUpdateTo);
+      const res = await localnet.algorand.send.appUpdateMethodCall({
+        sender: user,
+        appId,
+        method: client.appClient.getABIMethod("complete_contract_upgrade"),
+        approvalProgram: approvalProgramToUpdateTo,
+        clearStateProgram: clearStateProgramToUpdateTo,
+      });
+
+      const updatedApp = await localnet.algorand.app.getById(appId);
+      expect(updatedApp.approvalProgram).toEqual(approvalProgramToUpdateTo);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("UpgradeCompleted(byte[32],uint64)", [programSha256, 2n]),
+      );
+    });
+  });
+});
@@ -0,0 +1,157 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { type Account, type Address } from "algosdk";
+
+import { RateLimiterExposedClient, RateLimiterExposedFactory } from "../../specs/client/RateLimiterExposed.client.ts";
+import { getBucketBoxKey } from "../utils/boxes.ts";
+import { getEventBytes, getRandomBytes } from "../utils/bytes.ts";
+import { SECONDS_IN_DAY } from "../utils/time.ts";
+
+describe("RateLimiter batch", () => {
+  const localnet = algorandFixture();
+
+  let client: RateLimiterExposedClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  const limit = BigInt(1000n * 10n ** 18n);
+  const duration = SECONDS_IN_DAY;
+
+  const globalBucketId = getRandomBytes(32);
+  const chainBucketId = getRandomBytes(32);
+  const assetBucketId = getRandomBytes(32);
+  const zeroDurationBucketId = getRandomBytes(32);
+  const bucketIds = [globalBucketId, chainBucketId, assetBucketId];
+  const boxReferences = [...bucketIds, zeroDurationBucketId].map(getBucketBoxKey);
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    const factory = algorand.client.getTypedAppFactory(RateLimiterExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+
+    for (const bucketId of bucketIds) await client.send.addBucket({ args: [bucketId, limit, duration] });
+    await client.send.addBucket({ args: [zeroDurationBucketId, limit, 0n] });
+  });
+
+  afterEach(async () => {
+    // reset current capacity
+    for (const bucketId of bucketIds) await client.send.setCurrentCapacity({ args: [bucketId, limit] });
+  });
+
+  describe("consume amounts", () => {
+    test("fails if mismatched buckets and amounts", async () => {
+      await expect(client.send.consumeAmounts({ args: [bucketIds, [1n, 2n]], boxReferences })).rejects.toThrow(
+        "Mismatched buckets and amounts",
+      );
+    });
+
+    test("fails if exceeds maximum batch size", async () => {
+      const ids = Array(16).fill(globalBucketId);
+      await expect(
+        client.send.consumeAmounts({ args: [ids, Array(16).fill(1n)], boxReferences }),
+      ).rejects.toThrow("Exceeds maximum batch size");
+    });
+
+    test("fails if any bucket is unknown", async () => {
+      const unknownBucketId = getRandomBytes(32);
+      await expect(
+        client.send.consumeAmounts({
+          args: [[globalBucketId, unknownBucketId], [1n, 1n]],
+          boxReferences: [getBucketBoxKey(globalBucketId), getBucketBoxKey(unknownBucketId)],
+        }),
+      ).rejects.toThrow("Unknown bucket");
+    });
+
+    test("fails atomically if any bucket has insufficient capacity", async () => {
+      await client.send.setCurrentCapacity({ args: [assetBucketId, 10n] });
+      await expect(
+        client.send.consumeAmounts({ args: [bucketIds, [5n, 5n, 11n]], boxReferences }),
+      ).rejects.toThrow("Insufficient capacity to consume");
+      expect((await client.getBucket({ args: [globalBucketId] })).currentCapacity).toEqual(limit);
+      expect((await client.getBucket({ args: [chainBucketId] })).currentCapacity).toEqual(limit);
+    });
+
+    test("succeeds and emits single event", async () => {
+      const amounts = [100n, 200n, 300n];
+      const res = await client.send.consumeAmounts({
+        args: [[...bucketIds, zeroDurationBucketId], [...amounts, 400n]],
+        boxReferences,
+      });
+      expect(res.confirmations[0].logs).toHaveLength(1);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("BucketsConsumed(byte[32][],uint256[])", [bucketIds, amounts]),
+      );
+      for (let i = 0; i < bucketIds.length; i++) {
+        expect((await client.getBucket({ args: [bucketIds[i]] })).currentCapacity).toEqual(limit - amounts[i]);
+      }
+    });
+
+    test.each([
+      { name: "empty batch", args: [[], []] },
+      { name: "only zero duration buckets", args: [[zeroDurationBucketId], [400n]] },
+    ])("succeeds without emitting event for $name", async ({ args }) => {
+      const res = await client.send.consumeAmounts({
+        args: args as [Uint8Array[], bigint[]],
+        boxReferences,
+      });
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("succeeds and consumes repeated bucket cumulatively", async () => {
+      await client.send.setCurrentCapacity({ args: [globalBucketId, 10n] });
+      await client.send.consumeAmounts({ args: [[globalBucketId, globalBucketId], [4n, 6n]], boxReferences });
+      expect((await client.getBucket({ args: [globalBucketId] })).currentCapacity).toEqual(0n);
+
+      await client.send.setCurrentCapacity({ args: [globalBucketId, 10n] });
+      await expect(
+        client.send.consumeAmounts({ args: [[globalBucketId, globalBucketId], [4n, 7n]], boxReferences }),
+      ).rejects.toThrow("Insufficient capacity to consume");
+    });
+  });
+
+  describe("fill amounts", () => {
+    test("fails if mismatched buckets and amounts", async () => {
+      await expect(client.send.fillAmounts({ args: [bucketIds, [1n]], boxReferences })).rejects.toThrow(
+        "Mismatched buckets and amounts",
+      );
+    });
+
+    test("succeeds without exceeding limits and emits single event", async () => {
+      await client.send.setCurrentCapacity({ args: [globalBucketId, limit - 50n] });
+      await client.send.setCurrentCapacity({ args: [chainBucketId, limit - 50n] });
+
+      const res = await client.send.fillAmounts({
+        args: [[globalBucketId, chainBucketId, zeroDurationBucketId], [20n, 80n, 1n]],
+        boxReferences,
+      });
+      expect(res.confirmations[0].logs).toHaveLength(1);
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("BucketsFilled(byte[32][],uint256[])", [
+          [globalBucketId, chainBucketId],
+          [20n, 50n],
+        ]),
+      );
+      expect((await client.getBucket({ args: [globalBucketId] })).currentCapacity).toEqual(limit - 30n);
+      expect((await client.getBucket({ args: [chainBucketId] })).currentCapacity).toEqual(limit);
+    });
+
+    test.each([
+      { name: "empty batch", args: [[], []] },
+      { name: "only zero duration buckets", args: [[zeroDurationBucketId], [1n]] },
+    ])("succeeds without emitting event for $name", async ({ args }) => {
+      const res = await client.send.fillAmounts({
+        args: args as [Uint8Array[], bigint[]],
+        boxReferences,
+      });
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+  });
+});
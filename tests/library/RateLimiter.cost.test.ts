@@ -0,0 +1,99 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { type Account, type Address } from "algosdk";
+
+import { RateLimiterExposedClient, RateLimiterExposedFactory } from "../../specs/client/RateLimiterExposed.client.ts";
+import { getRandomBytes } from "../utils/bytes.ts";
+import { getAppBudgetConsumed } from "../utils/cost.ts";
+import { SECONDS_IN_DAY, advancePrevBlockTimestamp } from "../utils/time.ts";
+
+// Logs the opcode cost of every RateLimiterExposed method so it can be compared between revisions.
+describe("RateLimiter opcode cost", () => {
+  const localnet = algorandFixture();
+
+  // cost of each method when the bucket was loaded and stored for every field, which none may now exceed
+  const COSTS_BEFORE: Record<string, number> = {
+    getCurrentCapacity: 161,
+    hasCapacity: 185,
+    getRateLimit: 30,
+    getRateDuration: 32,
+    getBucket: 35,
+    checkBucketKnown: 22,
+    setCurrentCapacity: 40,
+    addBucket: 50,
+    removeBucket: 30,
+    updateRateLimit: 238,
+    updateRateDuration: 170,
+    consumeAmount: 226,
+    fillAmount: 257,
+    updateCapacity: 152,
+    "consumeAmount (zero duration)": 72,
+  };
+
+  let client: RateLimiterExposedClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  const bucketId = getRandomBytes(32);
+  const zeroDurationBucketId = getRandomBytes(32);
+  const limit = BigInt(1000n * 10n ** 18n);
+  const duration = SECONDS_IN_DAY;
+
+  const costs: Record<string, number> = {};
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    const factory = algorand.client.getTypedAppFactory(RateLimiterExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+
+    // bucket which is partially consumed so every method refills
+    await client.send.addBucket({ args: [bucketId, limit, duration] });
+    await client.send.addBucket({ args: [zeroDurationBucketId, limit, 0n] });
+    await client.send.setCurrentCapacity({ args: [bucketId, limit / 4n] });
+    await advancePrevBlockTimestamp(localnet, duration / 4n);
+  });
+
+  afterAll(() => {
+    console.table(
+      Object.fromEntries(
+        Object.entries(costs).map(([method, cost]) => [method, { before: COSTS_BEFORE[method], cost }]),
+      ),
+    );
+  });
+
+  test.each([
+    { method: "getCurrentCapacity", call: () => client.newGroup().getCurrentCapacity({ args: [bucketId] }) },
+    { method: "hasCapacity", call: () => client.newGroup().hasCapacity({ args: [bucketId, 1n] }) },
+    { method: "getRateLimit", call: () => client.newGroup().getRateLimit({ args: [bucketId] }) },
+    { method: "getRateDuration", call: () => client.newGroup().getRateDuration({ args: [bucketId] }) },
+    { method: "getBucket", call: () => client.newGroup().getBucket({ args: [bucketId] }) },
+    { method: "checkBucketKnown", call: () => client.newGroup().checkBucketKnown({ args: [bucketId] }) },
+    { method: "setCurrentCapacity", call: () => client.newGroup().setCurrentCapacity({ args: [bucketId, 1n] }) },
+    { method: "addBucket", call: () => client.newGroup().addBucket({ args: [getRandomBytes(32), limit, duration] }) },
+    { method: "removeBucket", call: () => client.newGroup().removeBucket({ args: [bucketId] }) },
+    { method: "updateRateLimit", call: () => client.newGroup().updateRateLimit({ args: [bucketId, limit / 2n] }) },
+    {
+      method: "updateRateDuration",
+      call: () => client.newGroup().updateRateDuration({ args: [bucketId, duration / 2n] }),
+    },
+    { method: "consumeAmount", call: () => client.newGroup().consumeAmount({ args: [bucketId, 1n] }) },
+    { method: "fillAmount", call: () => client.newGroup().fillAmount({ args: [bucketId, 1n] }) },
+    { method: "updateCapacity", call: () => client.newGroup().updateCapacity({ args: [bucketId] }) },
+    {
+      method: "consumeAmount (zero duration)",
+      call: () => client.newGroup().consumeAmount({ args: [zeroDurationBucketId, 1n] }),
+    },
+  ])("$method", async ({ method, call }) => {
+    costs[method] = await getAppBudgetConsumed(call());
+    expect(costs[method]).toBeGreaterThan(0);
+    expect(costs[method]).toBeLessThanOrEqual(COSTS_BEFORE[method]);
+  });
+});
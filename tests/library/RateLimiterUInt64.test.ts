@@ -0,0 +1,274 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { type Account, type Address, getApplicationAddress } from "algosdk";
+
+import { RateLimiterExposedClient, RateLimiterExposedFactory } from "../../specs/client/RateLimiterExposed.client.ts";
+import {
+  RateLimiterUInt64ExposedClient,
+  RateLimiterUInt64ExposedFactory,
+} from "../../specs/client/RateLimiterUInt64Exposed.client.ts";
+import { getBucketBoxKey } from "../utils/boxes.ts";
+import { getEventBytes, getRandomBytes } from "../utils/bytes.ts";
+import { getAppBudgetConsumed } from "../utils/cost.ts";
+import { SECONDS_IN_DAY, advancePrevBlockTimestamp, getPrevBlockTimestamp } from "../utils/time.ts";
+import { MAX_INT64, MAX_UINT64, getRandomUInt } from "../utils/uint.ts";
+
+describe("RateLimiterUInt64", () => {
+  const localnet = algorandFixture();
+
+  let factory: RateLimiterUInt64ExposedFactory;
+  let client: RateLimiterUInt64ExposedClient;
+  let appId: bigint;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  const bucketId = getRandomBytes(32);
+  const limit = BigInt(1000n * 10n ** 6n); // 1000 of token with 6 decimals
+  const duration = SECONDS_IN_DAY;
+
+  const zeroDurationBucketId = getRandomBytes(32);
+
+  async function addBucket(id: Uint8Array, bucketLimit: bigint, bucketDuration: bigint) {
+    const APP_MIN_BALANCE = (135_700).microAlgos();
+    const fundingTxn = await localnet.algorand.createTransaction.payment({
+      sender: creator,
+      receiver: getApplicationAddress(appId),
+      amount: APP_MIN_BALANCE,
+    });
+    return client
+      .newGroup()
+      .addTransaction(fundingTxn)
+      .addBucket({ args: [id, bucketLimit, bucketDuration], boxReferences: [getBucketBoxKey(id)] })
+      .send();
+  }
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    factory = algorand.client.getTypedAppFactory(RateLimiterUInt64ExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+  });
+
+  test("deploys with correct state", async () => {
+    const { appClient, result } = await factory.deploy();
+    appId = result.appId;
+    client = appClient;
+
+    expect(appId).not.toEqual(0n);
+  });
+
+  test("get current capacity fails if bucket unknown", async () => {
+    await expect(client.send.getCurrentCapacity({ args: [bucketId] })).rejects.toThrow("Unknown bucket");
+  });
+
+  describe("add bucket", () => {
+    test("succeeds with same event and 32 byte bucket", async () => {
+      const prevBlockTimestamp = await getPrevBlockTimestamp(localnet);
+
+      const res = await addBucket(bucketId, limit, duration);
+      expect(res.confirmations[1].logs).toBeDefined();
+      expect(res.confirmations[1].logs![0]).toEqual(
+        getEventBytes("BucketAdded(byte[32],uint256,uint64)", [bucketId, limit, duration]),
+      );
+
+      const expectedBucket = { limit, currentCapacity: limit, duration, lastUpdated: prevBlockTimestamp };
+      expect(await client.getBucket({ args: [bucketId] })).toEqual(expectedBucket);
+      expect(await client.getCurrentCapacity({ args: [bucketId] })).toEqual(limit);
+      expect(await client.getRateLimit({ args: [bucketId] })).toEqual(limit);
+      expect(await client.getRateDuration({ args: [bucketId] })).toEqual(duration);
+      expect(await client.appClient.getBoxValue(getBucketBoxKey(bucketId))).toHaveLength(32);
+    });
+
+    test("fails if already exists", async () => {
+      await expect(
+        client.send.addBucket({ args: [bucketId, limit, duration], boxReferences: [getBucketBoxKey(bucketId)] }),
+      ).rejects.toThrow("Bucket already exists");
+    });
+
+    test("succeeds with zero duration", async () => {
+      await addBucket(zeroDurationBucketId, limit, 0n);
+    });
+  });
+
+  describe("update capacity", () => {
+    afterAll(async () => {
+      await client.send.setCurrentCapacity({ args: [bucketId, limit] });
+    });
+
+    test.each([
+      { name: "remains same when time delta is zero", capacity: limit / 2n, timeDelta: 0n, expected: limit / 2n },
+      {
+        name: "increases capacity proportional to time passed",
+        capacity: limit / 4n,
+        timeDelta: duration / 4n,
+        expected: limit / 2n,
+      },
+      { name: "increases capacity without exceeding limit", capacity: limit / 4n, timeDelta: duration, expected: limit },
+    ])("succeeds and $name", async ({ capacity, timeDelta, expected }) => {
+      await advancePrevBlockTimestamp(localnet, SECONDS_IN_DAY);
+      await client.send.setCurrentCapacity({ args: [bucketId, capacity] });
+      await advancePrevBlockTimestamp(localnet, timeDelta);
+      const prevBlockTimestamp = await getPrevBlockTimestamp(localnet);
+
+      await client.send.updateCapacity({ args: [bucketId], boxReferences: [getBucketBoxKey(bucketId)] });
+
+      expect(await client.getCurrentCapacity({ args: [bucketId] })).toEqual(expected);
+      const expectedBucket = { limit, currentCapacity: expected, duration, lastUpdated: prevBlockTimestamp };
+      expect(await client.getBucket({ args: [bucketId] })).toEqual(expectedBucket);
+    });
+
+    test("succeeds and doesn't overflow", async () => {
+      // setup
+      await client.send.updateRateLimit({ args: [bucketId, MAX_UINT64] });
+      await client.send.updateRateDuration({ args: [bucketId, 1n] });
+      await client.send.setCurrentCapacity({ args: [bucketId, 0n] });
+      await advancePrevBlockTimestamp(localnet, MAX_INT64);
+
+      // refill would be MAX_UINT64 * time delta which exceeds 64 bits
+      expect(await client.getCurrentCapacity({ args: [bucketId] })).toEqual(MAX_UINT64);
+      const res = await client.send.fillAmount({ args: [bucketId, MAX_UINT64] });
+      expect(res.confirmations[0].logs![0]).toEqual(getEventBytes("BucketFilled(byte[32],uint256)", [bucketId, 0n]));
+
+      // reset limit and duration
+      await client.send.updateRateLimit({ args: [bucketId, limit] });
+      await client.send.updateRateDuration({ args: [bucketId, duration] });
+    });
+  });
+
+  describe("update rate limit", () => {
+    afterEach(async () => {
+      await client.send.updateRateLimit({ args: [bucketId, limit] });
+      await client.send.setCurrentCapacity({ args: [bucketId, limit] });
+    });
+
+    test("succeeds and reduces current capacity to zero when delta exceeds current capacity", async () => {
+      await client.send.setCurrentCapacity({ args: [bucketId, limit / 8n] });
+      const newLimit = limit / 2n;
+      const res = await client.send.updateRateLimit({ args: [bucketId, newLimit] });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("BucketRateLimitUpdated(byte[32],uint256)", [bucketId, newLimit]),
+      );
+      expect(await client.getCurrentCapacity({ args: [bucketId] })).toEqual(0n);
+      expect(await client.getRateLimit({ args: [bucketId] })).toEqual(newLimit);
+    });
+
+    test("succeeds and increases current capacity by delta", async () => {
+      await client.send.setCurrentCapacity({ args: [bucketId, limit / 8n] });
+      await advancePrevBlockTimestamp(localnet, duration / 2n);
+      const oldCapacity = await client.getCurrentCapacity({ args: [bucketId] });
+
+      const newLimit = 4n * limit;
+      await client.send.updateRateLimit({ args: [bucketId, newLimit] });
+      expect(await client.getCurrentCapacity({ args: [bucketId] })).toEqual(oldCapacity + newLimit - limit);
+    });
+  });
+
+  describe("has capacity", () => {
+    test("returns false when amount doesn't fit in uint64", async () => {
+      expect(await client.hasCapacity({ args: [bucketId, 0n] })).toBeTruthy();
+      expect(await client.hasCapacity({ args: [bucketId, limit] })).toBeTruthy();
+      expect(await client.hasCapacity({ args: [bucketId, limit + 1n] })).toBeFalsy();
+      expect(await client.hasCapacity({ args: [bucketId, MAX_UINT64 + 1n] })).toBeFalsy();
+    });
+
+    test("always returns true when duration is zero", async () => {
+      expect(await client.hasCapacity({ args: [zeroDurationBucketId, MAX_UINT64 + 1n] })).toBeTruthy();
+    });
+  });
+
+  describe("consume amount", () => {
+    test("ignores if duration is zero", async () => {
+      const res = await client.send.consumeAmount({
+        args: [zeroDurationBucketId, 1n],
+        boxReferences: [getBucketBoxKey(zeroDurationBucketId)],
+      });
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("fails when insufficient capacity", async () => {
+      await client.send.setCurrentCapacity({ args: [bucketId, limit / 8n] });
+      await advancePrevBlockTimestamp(localnet, getRandomUInt(duration / 2n));
+      const capacity = await client.getCurrentCapacity({ args: [bucketId] });
+      await expect(client.send.consumeAmount({ args: [bucketId, capacity + 1n] })).rejects.toThrow(
+        "Insufficient capacity to consume",
+      );
+    });
+
+    test("succeeds when sufficient capacity", async () => {
+      await client.send.setCurrentCapacity({ args: [bucketId, limit / 8n] });
+      await advancePrevBlockTimestamp(localnet, getRandomUInt(duration / 2n));
+      const prevBlockTimestamp = await getPrevBlockTimestamp(localnet);
+      const capacity = await client.getCurrentCapacity({ args: [bucketId] });
+
+      const amount = getRandomUInt(capacity);
+      const res = await client.send.consumeAmount({ args: [bucketId, amount] });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("BucketConsumed(byte[32],uint256)", [bucketId, amount]),
+      );
+      const expectedBucket = { limit, currentCapacity: capacity - amount, duration, lastUpdated: prevBlockTimestamp };
+      expect(await client.getBucket({ args: [bucketId] })).toEqual(expectedBucket);
+    });
+  });
+
+  describe("fill amount", () => {
+    afterEach(async () => {
+      await client.send.setCurrentCapacity({ args: [bucketId, limit] });
+    });
+
+    test("succeeds and doesn't exceed limit", async () => {
+      await client.send.setCurrentCapacity({ args: [bucketId, limit / 8n] });
+      const capacity = await client.getCurrentCapacity({ args: [bucketId] });
+
+      const amount = limit - capacity + 1n;
+      const res = await client.send.fillAmount({ args: [bucketId, amount] });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("BucketFilled(byte[32],uint256)", [bucketId, amount - 1n]),
+      );
+      expect(await client.getCurrentCapacity({ args: [bucketId] })).toEqual(limit);
+    });
+  });
+
+  describe("opcode cost", () => {
+    let uint256Client: RateLimiterExposedClient;
+
+    beforeAll(async () => {
+      const uint256Factory = localnet.algorand.client.getTypedAppFactory(RateLimiterExposedFactory, {
+        defaultSender: creator,
+        defaultSigner: creator.signer,
+      });
+      ({ appClient: uint256Client } = await uint256Factory.deploy());
+      await localnet.algorand.send.payment({
+        sender: creator,
+        receiver: uint256Client.appAddress,
+        amount: (1).algo(),
+      });
+      await uint256Client.send.addBucket({
+        args: [bucketId, limit, duration],
+        boxReferences: [getBucketBoxKey(bucketId)],
+      });
+      await client.send.setCurrentCapacity({ args: [bucketId, limit / 2n] });
+      await uint256Client.send.setCurrentCapacity({ args: [bucketId, limit / 2n] });
+      await advancePrevBlockTimestamp(localnet, duration / 4n);
+    });
+
+    test("consume amount is cheaper than uint256 buckets", async () => {
+      const uint64Cost = await getAppBudgetConsumed(client.newGroup().consumeAmount({ args: [bucketId, 1n] }));
+      const uint256Cost = await getAppBudgetConsumed(uint256Client.newGroup().consumeAmount({ args: [bucketId, 1n] }));
+      console.log("Opcode cost of consume amount", { uint64: uint64Cost, uint256: uint256Cost });
+      expect(uint64Cost).toBeLessThan(uint256Cost);
+    });
+  });
+
+  describe("remove bucket", () => {
+    test("succeeds", async () => {
+      const res = await client.send.removeBucket({ args: [bucketId], boxReferences: [getBucketBoxKey(bucketId)] });
+      expect(res.confirmations[0].logs![0]).toEqual(getEventBytes("BucketRemoved(byte[32])", [bucketId]));
+      await expect(client.state.box.rateLimitBuckets.value(bucketId)).rejects.toThrow("box not found");
+    });
+  });
+});
@@ -0,0 +1,153 @@
+import { Config } from "@algorandfoundation/algokit-utils";
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { nullLogger } from "@algorandfoundation/algokit-utils/types/logging";
+import { type Account, type Address, getApplicationAddress } from "algosdk";
+
+import {
+  ShardedUInt64SetLibExposedClient,
+  ShardedUInt64SetLibExposedFactory,
+} from "../../specs/client/ShardedUInt64SetLibExposed.client.ts";
+import { getShardBoxKey } from "../utils/boxes.ts";
+import { MAX_UINT64, getRandomUInt } from "../utils/uint.ts";
+
+describe("ShardedUInt64SetLib", () => {
+  const localnet = algorandFixture();
+
+  let factory: ShardedUInt64SetLibExposedFactory;
+  let client: ShardedUInt64SetLibExposedClient;
+  let appId: bigint;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  const BOX_PREFIX = "uint64_set_";
+  const NUM_SHARDS = 4n;
+
+  function getShardBoxReferences(item: bigint): Uint8Array[] {
+    return Array(4).fill(getShardBoxKey(BOX_PREFIX, item % NUM_SHARDS));
+  }
+
+  async function getAllItems(): Promise<bigint[]> {
+    const items = [];
+    const pageSize = 127n;
+    for (let shard = 0n; shard < NUM_SHARDS; shard++) {
+      const boxReferences = Array(4).fill(getShardBoxKey(BOX_PREFIX, shard));
+      for (let start = 0n; ; start += pageSize) {
+        const page = await client.getPage({ args: [shard, start, pageSize], boxReferences });
+        items.push(...page);
+        if (page.length < pageSize) break;
+      }
+    }
+    return items;
+  }
+
+  beforeAll(async () => {
+    Config.configure({ logger: nullLogger });
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    factory = algorand.client.getTypedAppFactory(ShardedUInt64SetLibExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+  });
+
+  test("deploys with correct state", async () => {
+    const { appClient, result } = await factory.deploy();
+    appId = result.appId;
+    client = appClient;
+    expect(appId).not.toEqual(0n);
+    expect(await client.numShards()).toEqual(NUM_SHARDS);
+
+    // fund with large amount so not to worry about box size
+    await localnet.algorand.send.payment({
+      sender: creator,
+      receiver: getApplicationAddress(appId),
+      amount: (20).algo(),
+    });
+  });
+
+  beforeEach(async () => {
+    if (!client) return;
+    for (let shard = 0n; shard < NUM_SHARDS; shard++) {
+      await client.send.resetShard({ args: [shard], boxReferences: Array(4).fill(getShardBoxKey(BOX_PREFIX, shard)) });
+    }
+  });
+
+  test("gets shard of item", async () => {
+    expect(await client.getShard({ args: [0n] })).toEqual(0n);
+    expect(await client.getShard({ args: [5n] })).toEqual(1n);
+    expect(await client.getShard({ args: [MAX_UINT64] })).toEqual(MAX_UINT64 % NUM_SHARDS);
+  });
+
+  test("adds, checks and removes items only referencing the item's shard", async () => {
+    const items = [34n, 2n, 5n, 873099n, 8n];
+    for (const item of items) {
+      const res = await client.send.addItem({ args: [item], boxReferences: getShardBoxReferences(item) });
+      expect(res.return).toBeTruthy();
+    }
+    for (const item of items) {
+      expect(await client.hasItem({ args: [item], boxReferences: getShardBoxReferences(item) })).toBeTruthy();
+      const res = await client.send.addItem({ args: [item], boxReferences: getShardBoxReferences(item) });
+      expect(res.return).toBeFalsy();
+    }
+    expect(await client.hasItem({ args: [6n], boxReferences: getShardBoxReferences(6n) })).toBeFalsy();
+
+    // items are stored in their shard
+    expect(await client.shardLength({ args: [0n], boxReferences: getShardBoxReferences(0n) })).toEqual(1n);
+    expect(await client.shardLength({ args: [1n], boxReferences: getShardBoxReferences(1n) })).toEqual(1n);
+    expect(await client.shardLength({ args: [2n], boxReferences: getShardBoxReferences(2n) })).toEqual(2n);
+    expect(await client.shardLength({ args: [3n], boxReferences: getShardBoxReferences(3n) })).toEqual(1n);
+    expect(await getAllItems()).toEqual([8n, 5n, 2n, 34n, 873099n]);
+
+    // remove
+    const boxReferences = getShardBoxReferences(5n);
+    expect((await client.send.removeItem({ args: [5n], boxReferences })).return).toBeTruthy();
+    expect((await client.send.removeItem({ args: [5n], boxReferences })).return).toBeFalsy();
+    expect(await getAllItems()).toEqual([8n, 2n, 34n, 873099n]);
+  });
+
+  test("fails when shard box isn't referenced", async () => {
+    await expect(client.send.addItem({ args: [1n], boxReferences: [getShardBoxKey(BOX_PREFIX, 0n)] })).rejects.toThrow();
+  });
+
+  describe("get page", () => {
+    test("returns empty page when shard is empty or start is past the end", async () => {
+      expect(await client.getPage({ args: [0n, 0n, 10n], boxReferences: getShardBoxReferences(0n) })).toEqual([]);
+      await client.send.addItem({ args: [4n], boxReferences: getShardBoxReferences(4n) });
+      expect(await client.getPage({ args: [0n, 1n, 10n], boxReferences: getShardBoxReferences(0n) })).toEqual([]);
+    });
+
+    test("streams pages of shard", async () => {
+      const numItems = 300n;
+      for (let i = 0n; i < numItems; i++) {
+        const item = i * NUM_SHARDS;
+        await client.send.addItem({ args: [item], boxReferences: getShardBoxReferences(item) });
+      }
+      const boxReferences = getShardBoxReferences(0n);
+      const page0 = await client.getPage({ args: [0n, 0n, 200n], boxReferences });
+      expect(page0.length).toEqual(127); // capped at max page size
+      expect(page0[0]).toEqual(0n);
+      const page1 = await client.getPage({ args: [0n, 127n, 127n], boxReferences });
+      expect(page1[0]).toEqual(127n * NUM_SHARDS);
+      const page2 = await client.getPage({ args: [0n, 254n, 127n], boxReferences });
+      expect(page2.length).toEqual(46);
+      expect(page2[45]).toEqual((numItems - 1n) * NUM_SHARDS);
+    }, 120_000);
+  });
+
+  test("happy path", async () => {
+    const expected = new Set<bigint>();
+    for (let i = 0; i < 40; i++) {
+      const item = getRandomUInt(MAX_UINT64);
+      const res = await client.send.addItem({ args: [item], boxReferences: getShardBoxReferences(item) });
+      expect(res.return).toBeTruthy();
+      expected.add(item);
+    }
+    const items = await getAllItems();
+    expect(items.length).toEqual(expected.size);
+    expect(new Set(items)).toEqual(expected);
+  }, 60_000);
+});
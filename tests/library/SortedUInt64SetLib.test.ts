@@ -0,0 +1,230 @@
+import { Config } from "@algorandfoundation/algokit-utils";
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { nullLogger } from "@algorandfoundation/algokit-utils/types/logging";
+import { type Account, type Address, getApplicationAddress } from "algosdk";
+
+import {
+  SortedUInt64SetLibExposedClient,
+  SortedUInt64SetLibExposedFactory,
+} from "../../specs/client/SortedUInt64SetLibExposed.client.ts";
+import {
+  UInt64SetLibExposedClient,
+  UInt64SetLibExposedFactory,
+} from "../../specs/client/UInt64SetLibExposed.client.ts";
+import { getAppBudgetConsumed } from "../utils/cost.ts";
+import { MAX_UINT64, getRandomUInt } from "../utils/uint.ts";
+
+describe("SortedUInt64SetLib", () => {
+  const localnet = algorandFixture();
+
+  let factory: SortedUInt64SetLibExposedFactory;
+  let client: SortedUInt64SetLibExposedClient;
+  let appId: bigint;
+
+  let creator: Address & Account & TransactionSignerAccount;
+
+  const boxReferences = ["uint64_set", "uint64_set", "uint64_set", "uint64_set"];
+
+  beforeAll(async () => {
+    Config.configure({ logger: nullLogger });
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+
+    factory = algorand.client.getTypedAppFactory(SortedUInt64SetLibExposedFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+  });
+
+  test("deploys with correct state", async () => {
+    const { appClient, result } = await factory.deploy();
+    appId = result.appId;
+    client = appClient;
+    expect(appId).not.toEqual(0n);
+  });
+
+  describe("has item", () => {
+    test("returns true when present", async () => {
+      const items = [2n, 5n, 34n, 873099n];
+      for (let i = 0; i < items.length; i++) {
+        expect(await client.hasItem({ args: [items[i], items] })).toBeTruthy();
+      }
+    });
+
+    test("returns false when not present", async () => {
+      const items = [2n, 5n, 34n, 873099n];
+      expect(await client.hasItem({ args: [0n, items] })).toBeFalsy();
+      expect(await client.hasItem({ args: [6n, items] })).toBeFalsy();
+      expect(await client.hasItem({ args: [2402174n, items] })).toBeFalsy();
+      expect(await client.hasItem({ args: [0n, []] })).toBeFalsy();
+    });
+  });
+
+  describe("add item", () => {
+    test("inserts into sorted position when new", async () => {
+      expect(await client.addItem({ args: [4n, []] })).toEqual([true, [4n]]);
+      expect(await client.addItem({ args: [1n, [4n]] })).toEqual([true, [1n, 4n]]);
+      expect(await client.addItem({ args: [2567325n, [1n, 4n]] })).toEqual([true, [1n, 4n, 2567325n]]);
+      expect(await client.addItem({ args: [2n, [1n, 4n, 2567325n]] })).toEqual([true, [1n, 2n, 4n, 2567325n]]);
+      expect(await client.addItem({ args: [MAX_UINT64, [0n]] })).toEqual([true, [0n, MAX_UINT64]]);
+    });
+
+    test("doesn't insert into array when already present", async () => {
+      const items = [2n, 5n, 34n, 873099n];
+      for (let i = 0; i < items.length; i++) {
+        expect(await client.addItem({ args: [items[i], items] })).toEqual([false, items]);
+      }
+    });
+  });
+
+  describe("remove item", () => {
+    test("removes from end of array", async () => {
+      expect(await client.removeItem({ args: [873099n, [2n, 5n, 34n, 873099n]] })).toEqual([true, [2n, 5n, 34n]]);
+      expect(await client.removeItem({ args: [34n, [34n]] })).toEqual([true, []]);
+    });
+
+    test("removes from not end of array keeping order", async () => {
+      expect(await client.removeItem({ args: [2n, [2n, 5n, 34n, 873099n]] })).toEqual([true, [5n, 34n, 873099n]]);
+      expect(await client.removeItem({ args: [5n, [2n, 5n, 34n, 873099n]] })).toEqual([true, [2n, 34n, 873099n]]);
+      expect(await client.removeItem({ args: [34n, [2n, 5n, 34n, 873099n]] })).toEqual([true, [2n, 5n, 873099n]]);
+    });
+
+    test("doesn't remove from array when not present", async () => {
+      const items = [2n, 5n, 34n, 873099n];
+      expect(await client.removeItem({ args: [0n, items] })).toEqual([false, items]);
+      expect(await client.removeItem({ args: [6n, items] })).toEqual([false, items]);
+      expect(await client.removeItem({ args: [2402174n, items] })).toEqual([false, items]);
+      expect(await client.removeItem({ args: [0n, []] })).toEqual([false, []]);
+    });
+  });
+
+  describe("dynamic tests", () => {
+    beforeAll(async () => {
+      // fund with large amount so not to worry about box size
+      await localnet.algorand.send.payment({
+        sender: creator,
+        receiver: getApplicationAddress(appId),
+        amount: (10).algo(),
+      });
+    });
+
+    beforeEach(async () => {
+      await client.send.dynamicReset({ args: [], boxReferences: ["uint64_set"] });
+    });
+
+    test("happy path", async () => {
+      const expected = new Set<bigint>();
+
+      // continually add and remove items
+      const cycles = 5;
+      const numItemsAddedPerCycle = 20;
+      const numItemsRemovedPerCycle = 10;
+      for (let i = 0; i < cycles; i++) {
+        // add random items
+        for (let j = 0; j < numItemsAddedPerCycle; j++) {
+          const item = getRandomUInt(MAX_UINT64);
+          const res = await client.send.dynamicAddItem({ args: [item], boxReferences: ["uint64_set"] });
+          expect(res.return).toBeTruthy();
+          expected.add(item);
+        }
+
+        // remove random items
+        for (let j = 0; j < numItemsRemovedPerCycle; j++) {
+          const items = await client.state.box.uint64Set();
+          expect(items).toBeDefined();
+          const item = items![Number(getRandomUInt(items!.length - 1))];
+          const res = await client.send.dynamicRemoveItem({ args: [item], boxReferences: ["uint64_set"] });
+          expect(res.return).toBeTruthy();
+          expected.delete(item);
+        }
+      }
+
+      // check result is sorted
+      const items = await client.state.box.uint64Set();
+      expect(items).toBeDefined();
+      expect(items).toEqual([...expected].sort((a, b) => (a < b ? -1 : a > b ? 1 : 0)));
+      for (const item of expected) {
+        expect(await client.dynamicHasItem({ args: [item], boxReferences: ["uint64_set"] })).toBeTruthy();
+      }
+    }, 60_000);
+
+    test("supports up to 511 items without extra budget", async () => {
+      const maxItems = 511;
+
+      // add items in reverse so each is inserted at the start
+      for (let i = maxItems - 1; i >= 0; i--) {
+        const res = await client.send.dynamicAddItem({ args: [i], boxReferences });
+        expect(res.return).toBeTruthy();
+      }
+
+      // has items
+      for (let i = 0; i < maxItems; i++) {
+        expect(await client.dynamicHasItem({ args: [i], boxReferences })).toBeTruthy();
+      }
+
+      // remove items
+      for (let i = 0; i < maxItems; i++) {
+        const res = await client.send.dynamicRemoveItem({ args: [i], boxReferences });
+        expect(res.return).toBeTruthy();
+      }
+
+      // should be empty
+      const items = await client.state.box.uint64Set();
+      expect(items).toBeDefined();
+      expect(items!.length).toEqual(0);
+    }, 120_000);
+  });
+
+  describe("opcode cost", () => {
+    let linearClient: UInt64SetLibExposedClient;
+
+    beforeAll(async () => {
+      const linearFactory = localnet.algorand.client.getTypedAppFactory(UInt64SetLibExposedFactory, {
+        defaultSender: creator,
+        defaultSigner: creator.signer,
+      });
+      ({ appClient: linearClient } = await linearFactory.deploy());
+      await localnet.algorand.send.payment({
+        sender: creator,
+        receiver: linearClient.appAddress,
+        amount: (10).algo(),
+      });
+    });
+
+    test.each([16, 128, 511])("is cheaper than linear set with %i items", async (numItems) => {
+      await client.send.dynamicReset({ args: [], boxReferences: ["uint64_set"] });
+      await linearClient.send.dynamicReset({ args: [], boxReferences: ["uint64_set"] });
+
+      // fill both sets with the same items, leaving one gap in the middle to add
+      const missing = BigInt(Math.floor(numItems / 2));
+      for (let i = 0n; i < BigInt(numItems); i++) {
+        if (i === missing) continue;
+        await client.send.dynamicAddItem({ args: [i], boxReferences });
+        await linearClient.send.dynamicAddItem({ args: [i], boxReferences, extraFee: (15_000).microAlgos() });
+      }
+
+      // measure each operation in the worst case for the linear set
+      const last = BigInt(numItems - 1);
+      const sorted = {
+        has: await getAppBudgetConsumed(client.newGroup().dynamicHasItem({ args: [last], boxReferences })),
+        add: await getAppBudgetConsumed(client.newGroup().dynamicAddItem({ args: [missing], boxReferences })),
+        remove: await getAppBudgetConsumed(client.newGroup().dynamicRemoveItem({ args: [last], boxReferences })),
+      };
+      const linear = {
+        has: await getAppBudgetConsumed(linearClient.newGroup().dynamicHasItem({ args: [last], boxReferences })),
+        add: await getAppBudgetConsumed(linearClient.newGroup().dynamicAddItem({ args: [missing], boxReferences })),
+        remove: await getAppBudgetConsumed(
+          linearClient.newGroup().dynamicRemoveItem({ args: [last], boxReferences }),
+        ),
+      };
+      console.log(`Opcode cost with ${numItems} items`, { sorted, linear });
+
+      expect(sorted.has).toBeLessThan(linear.has);
+      expect(sorted.add).toBeLessThan(linear.add);
+      expect(sorted.remove).toBeLessThan(linear.remove);
+    }, 300_000);
+  });
+});
@@ -0,0 +1,93 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import { type Account, type Address } from "algosdk";
+
+import { SimpleUpgradeableFactory } from "../../specs/client/SimpleUpgradeable.client.ts";
+import { getAddressRolesBoxKey, getRoleBoxKey } from "../utils/boxes.ts";
+import { getRoleBytes } from "../utils/bytes.ts";
+import { calculateProgramSha256 } from "../utils/contract.ts";
+import { getAppBudgetConsumed } from "../utils/cost.ts";
+import { getPrevBlockTimestamp } from "../utils/time.ts";
+
+// Logs the opcode cost of completing an upgrade to programs of 1 to 4 program pages (of 2048 bytes, so 1 or 2 pages
+// of 4096 bytes in the transaction) so it can be compared between revisions.
+describe("Upgradeable opcode cost", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const UPGRADEABLE_ADMIN_ROLE = getRoleBytes("UPGRADEABLE_ADMIN");
+
+  const PROGRAM_PAGE_SIZE = 2048;
+  // version 11, pushint 1
+  const CLEAR_STATE_PROGRAM = Uint8Array.from([0x0b, 0x81, 0x01]);
+
+  let factory: SimpleUpgradeableFactory;
+
+  let admin: Address & Account & TransactionSignerAccount;
+
+  const costs: Record<string, number> = {};
+
+  function getApprovalProgramOfSize(size: number): Uint8Array {
+    // version 11, pushint 1, then "return" opcodes which approve the call on the first one
+    return Uint8Array.from([0x0b, 0x81, 0x01, ...Array(size - 3).fill(0x43)]);
+  }
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    admin = await generateAccount({ initialFunds: (100).algo() });
+
+    factory = algorand.client.getTypedAppFactory(SimpleUpgradeableFactory, {
+      defaultSender: admin,
+      defaultSigner: admin.signer,
+    });
+  });
+
+  afterAll(() => {
+    console.table(costs);
+  });
+
+  test.each([1, 2, 3, 4])("complete contract upgrade to %i program pages", async (pages) => {
+    const approvalProgram = getApprovalProgramOfSize(pages * PROGRAM_PAGE_SIZE - CLEAR_STATE_PROGRAM.length);
+
+    // new app with no upgrade delay and enough extra pages
+    const { appClient: client } = await factory.send.create.create({ args: [0n], extraProgramPages: 3 });
+    const fundingTxn = await localnet.algorand.createTransaction.payment({
+      sender: admin,
+      receiver: client.appAddress,
+      amount: (190_000).microAlgos(),
+    });
+    await client
+      .newGroup()
+      .addTransaction(fundingTxn)
+      .initialise({
+        args: [admin.toString()],
+        boxReferences: [
+          getRoleBoxKey(DEFAULT_ADMIN_ROLE),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey),
+          getRoleBoxKey(UPGRADEABLE_ADMIN_ROLE),
+          getAddressRolesBoxKey(UPGRADEABLE_ADMIN_ROLE, admin.publicKey),
+        ],
+      })
+      .send();
+    await client.send.scheduleContractUpgrade({
+      args: [calculateProgramSha256(approvalProgram, CLEAR_STATE_PROGRAM), await getPrevBlockTimestamp(localnet)],
+      boxReferences: [
+        getRoleBoxKey(UPGRADEABLE_ADMIN_ROLE),
+        getAddressRolesBoxKey(UPGRADEABLE_ADMIN_ROLE, admin.publicKey),
+      ],
+    });
+
+    const composer = localnet.algorand.newGroup().addAppUpdateMethodCall({
+      sender: admin,
+      appId: client.appId,
+      method: client.appClient.getABIMethod("complete_contract_upgrade"),
+      approvalProgram,
+      clearStateProgram: CLEAR_STATE_PROGRAM,
+    });
+    const method = `completeContractUpgrade (${pages} pages)`;
+    costs[method] = await getAppBudgetConsumed(composer);
+    expect(costs[method]).toBeLessThanOrEqual(700);
+  });
+});
@@ -0,0 +1,125 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import type { Account, Address } from "algosdk";
+
+import {
+  MockAccessControlWithGroupCacheClient,
+  MockAccessControlWithGroupCacheFactory,
+} from "../../../specs/client/MockAccessControlWithGroupCache.client.ts";
+import { getAddressRolesBoxKey, getRoleBoxKey } from "../../utils/boxes.ts";
+import { getRandomBytes } from "../../utils/bytes.ts";
+
+describe("AccessControlWithGroupCache", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const ROLE = getRandomBytes(16);
+
+  let client: MockAccessControlWithGroupCacheClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let admin: Address & Account & TransactionSignerAccount;
+  let user: Address & Account & TransactionSignerAccount;
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    admin = await generateAccount({ initialFunds: (100).algo() });
+    user = await generateAccount({ initialFunds: (100).algo() });
+
+    const factory = algorand.client.getTypedAppFactory(MockAccessControlWithGroupCacheFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+    await client.send.initialise({
+      args: [admin.toString()],
+      boxReferences: [getRoleBoxKey(DEFAULT_ADMIN_ROLE), getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey)],
+    });
+  });
+
+  test("role is not cached outside of group", async () => {
+    expect(await client.isSenderRoleCached({ sender: admin, args: [DEFAULT_ADMIN_ROLE] })).toBeFalsy();
+  });
+
+  test("role is cached for later transactions of same sender in group", async () => {
+    const res = await client
+      .newGroup()
+      .checkSenderRole({
+        sender: admin,
+        args: [DEFAULT_ADMIN_ROLE],
+        boxReferences: [getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey)],
+      })
+      .isSenderRoleCached({ sender: admin, args: [DEFAULT_ADMIN_ROLE] })
+      .isSenderRoleCached({ sender: admin, args: [ROLE] })
+      .isSenderRoleCached({ sender: user, args: [DEFAULT_ADMIN_ROLE] })
+      .send({ populateAppCallResources: false });
+    expect(res.returns).toEqual([undefined, true, false, false]);
+  });
+
+  test("cached role check succeeds without box reference", async () => {
+    // check sender role twice, where only the first reads the box
+    const res = await client
+      .newGroup()
+      .checkSenderRole({
+        sender: admin,
+        args: [DEFAULT_ADMIN_ROLE],
+        boxReferences: [getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey)],
+      })
+      .checkSenderRole({ sender: admin, args: [DEFAULT_ADMIN_ROLE], note: "cached" })
+      .send({ populateAppCallResources: false });
+    expect(res.confirmations).toHaveLength(2);
+  });
+
+  test("cache is invalidated by revocation in group", async () => {
+    // grant role to user so it can be revoked later in the group
+    await client.send.grantRole({
+      sender: admin,
+      args: [ROLE, user.toString()],
+      boxReferences: [
+        getRoleBoxKey(ROLE),
+        getAddressRolesBoxKey(ROLE, user.publicKey),
+        getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey),
+      ],
+    });
+
+    const res = await client
+      .newGroup()
+      .checkSenderRole({
+        sender: admin,
+        args: [DEFAULT_ADMIN_ROLE],
+        boxReferences: [getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey)],
+      })
+      .isSenderRoleCached({ sender: admin, args: [DEFAULT_ADMIN_ROLE] })
+      .revokeRole({
+        sender: admin,
+        args: [ROLE, user.toString()],
+        boxReferences: [getRoleBoxKey(ROLE), getAddressRolesBoxKey(ROLE, user.publicKey)],
+      })
+      .isSenderRoleCached({ sender: admin, args: [DEFAULT_ADMIN_ROLE], note: "after revoke" })
+      .send({ populateAppCallResources: false });
+    expect(res.returns).toEqual([undefined, true, undefined, false]);
+    expect(await client.state.global.roleRevocations()).toEqual(1n);
+  });
+
+  test("check still fails for sender without role", async () => {
+    await expect(
+      client
+        .newGroup()
+        .checkSenderRole({
+          sender: admin,
+          args: [DEFAULT_ADMIN_ROLE],
+          boxReferences: [getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey)],
+        })
+        .checkSenderRole({
+          sender: user,
+          args: [DEFAULT_ADMIN_ROLE],
+          boxReferences: [getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, user.publicKey)],
+        })
+        .send(),
+    ).rejects.toThrow("Access control unauthorised account");
+  });
+});
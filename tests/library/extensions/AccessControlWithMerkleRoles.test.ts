@@ -0,0 +1,137 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import type { Account, Address } from "algosdk";
+
+import {
+  MockAccessControlWithMerkleRolesClient,
+  MockAccessControlWithMerkleRolesFactory,
+} from "../../../specs/client/MockAccessControlWithMerkleRoles.client.ts";
+import { getAddressRolesBoxKey, getMerkleRootBoxKey, getRoleBoxKey } from "../../utils/boxes.ts";
+import { getEventBytes, getRandomBytes } from "../../utils/bytes.ts";
+import { getMerkleTree } from "../../utils/merkle.ts";
+
+describe("AccessControlWithMerkleRoles", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const ROLE = getRandomBytes(16);
+
+  let client: MockAccessControlWithMerkleRolesClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let admin: Address & Account & TransactionSignerAccount;
+  let members: (Address & Account & TransactionSignerAccount)[];
+  let nonMember: Address & Account & TransactionSignerAccount;
+
+  // members plus random addresses so the tree has several levels
+  let tree: { root: Uint8Array; proofs: Uint8Array[][] };
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    admin = await generateAccount({ initialFunds: (100).algo() });
+    members = await Promise.all(Array.from({ length: 3 }, () => generateAccount({ initialFunds: (1).algo() })));
+    nonMember = await generateAccount({ initialFunds: (1).algo() });
+    tree = getMerkleTree([
+      ...members.map((member) => member.publicKey),
+      ...Array.from({ length: 6 }, () => getRandomBytes(32)),
+    ]);
+
+    const factory = algorand.client.getTypedAppFactory(MockAccessControlWithMerkleRolesFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+    await client.send.initialise({
+      args: [admin.toString()],
+      boxReferences: [getRoleBoxKey(DEFAULT_ADMIN_ROLE), getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey)],
+    });
+  });
+
+  describe("set merkle root", () => {
+    test("fails when caller is not admin", async () => {
+      await expect(
+        client.send.setMerkleRoot({
+          sender: members[0],
+          args: [ROLE, tree.root],
+          boxReferences: [getRoleBoxKey(ROLE), getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, members[0].publicKey)],
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("succeeds and emits event", async () => {
+      const res = await client.send.setMerkleRoot({
+        sender: admin,
+        args: [ROLE, tree.root],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey),
+          getMerkleRootBoxKey(ROLE),
+        ],
+      });
+      expect(res.confirmations[0].logs).toEqual([
+        getEventBytes("RoleMerkleRootUpdated(byte[16],byte[32],address)", [ROLE, tree.root, admin.publicKey]),
+      ]);
+      expect(Uint8Array.from(await client.getMerkleRoot({ args: [ROLE] }))).toEqual(tree.root);
+    });
+  });
+
+  describe("check role with proof", () => {
+    test("succeeds for every member with only the root box reference", async () => {
+      for (const [i, member] of members.entries()) {
+        expect(await client.hasRoleWithProof({ args: [ROLE, member.toString(), tree.proofs[i]] })).toBeTruthy();
+        await client.send.checkSenderRoleWithProof({
+          sender: member,
+          args: [ROLE, tree.proofs[i]],
+          boxReferences: [getMerkleRootBoxKey(ROLE)],
+          populateAppCallResources: false,
+        });
+      }
+    });
+
+    test("fails for non member", async () => {
+      await expect(
+        client.send.checkRoleWithProof({ args: [ROLE, nonMember.toString(), tree.proofs[0]] }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("fails for member with another member's proof", async () => {
+      await expect(
+        client.send.checkRoleWithProof({ args: [ROLE, members[0].toString(), tree.proofs[1]] }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+
+    test("succeeds for account granted role without proof", async () => {
+      await client.send.grantRole({
+        sender: admin,
+        args: [ROLE, nonMember.toString()],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey),
+          getAddressRolesBoxKey(ROLE, nonMember.publicKey),
+        ],
+      });
+      await client.send.checkRoleWithProof({ args: [ROLE, nonMember.toString(), []] });
+    });
+  });
+
+  describe("remove merkle root", () => {
+    test("zero root deletes box and members no longer have role", async () => {
+      await client.send.setMerkleRoot({
+        sender: admin,
+        args: [ROLE, new Uint8Array(32)],
+        boxReferences: [
+          getRoleBoxKey(ROLE),
+          getAddressRolesBoxKey(DEFAULT_ADMIN_ROLE, admin.publicKey),
+          getMerkleRootBoxKey(ROLE),
+        ],
+      });
+      expect(Uint8Array.from(await client.getMerkleRoot({ args: [ROLE] }))).toEqual(new Uint8Array(32));
+      await expect(client.state.box.merkleRoots.value(ROLE)).rejects.toThrow("box not found");
+      expect(await client.hasRoleWithProof({ args: [ROLE, members[0].toString(), tree.proofs[0]] })).toBeFalsy();
+    });
+  });
+});
@@ -0,0 +1,190 @@
+import { algorandFixture } from "@algorandfoundation/algokit-utils/testing";
+import type { TransactionSignerAccount } from "@algorandfoundation/algokit-utils/types/account";
+import type { Account, Address } from "algosdk";
+
+import {
+  MockAccessControlWithPinnedRolesClient,
+  MockAccessControlWithPinnedRolesFactory,
+} from "../../../specs/client/MockAccessControlWithPinnedRoles.client.ts";
+import { getAddressRolesBoxKey, getRoleBoxKey } from "../../utils/boxes.ts";
+import { getEventBytes, getRandomBytes } from "../../utils/bytes.ts";
+
+describe("AccessControlWithPinnedRoles", () => {
+  const localnet = algorandFixture();
+
+  const DEFAULT_ADMIN_ROLE = new Uint8Array(16);
+  const PINNED_ROLE = getRandomBytes(16);
+  const UNPINNED_ROLE = getRandomBytes(16);
+  const OTHER_ADMIN_ROLE = getRandomBytes(16);
+
+  let client: MockAccessControlWithPinnedRolesClient;
+
+  let creator: Address & Account & TransactionSignerAccount;
+  let admin: Address & Account & TransactionSignerAccount;
+  let users: (Address & Account & TransactionSignerAccount)[];
+
+  beforeAll(async () => {
+    await localnet.newScope();
+    const { algorand, generateAccount } = localnet.context;
+
+    creator = await generateAccount({ initialFunds: (100).algo() });
+    admin = await generateAccount({ initialFunds: (100).algo() });
+    users = await Promise.all(Array.from({ length: 4 }, () => generateAccount({ initialFunds: (1).algo() })));
+
+    const factory = algorand.client.getTypedAppFactory(MockAccessControlWithPinnedRolesFactory, {
+      defaultSender: creator,
+      defaultSigner: creator.signer,
+    });
+    ({ appClient: client } = await factory.deploy());
+    await localnet.algorand.send.payment({ sender: creator, receiver: client.appAddress, amount: (1).algo() });
+  });
+
+  test("initialise pins default admin role without creating boxes", async () => {
+    await client.send.initialise({
+      args: [admin.toString()],
+      boxReferences: [getRoleBoxKey(DEFAULT_ADMIN_ROLE)],
+      populateAppCallResources: false,
+    });
+    expect(await client.isRolePinned({ args: [DEFAULT_ADMIN_ROLE] })).toBeTruthy();
+    expect(await client.hasRole({ args: [DEFAULT_ADMIN_ROLE, admin.toString()] })).toBeTruthy();
+    await expect(
+      client.state.box.addressesRoles.value({ role: DEFAULT_ADMIN_ROLE, address: admin.toString() }),
+    ).rejects.toThrow("box not found");
+  });
+
+  test("check sender role of pinned role needs no box references", async () => {
+    await expect(
+      client.send.checkSenderRole({ sender: admin, args: [DEFAULT_ADMIN_ROLE], populateAppCallResources: false }),
+    ).resolves.toBeDefined();
+    await expect(
+      client.send.checkSenderRole({ sender: users[0], args: [DEFAULT_ADMIN_ROLE], populateAppCallResources: false }),
+    ).rejects.toThrow("Access control unauthorised account");
+  });
+
+  describe("pin role", () => {
+    test("succeeds for unused role", async () => {
+      await client.send.pinRole({ args: [PINNED_ROLE], boxReferences: [getRoleBoxKey(PINNED_ROLE)] });
+      expect(await client.isRolePinned({ args: [PINNED_ROLE] })).toBeTruthy();
+    });
+
+    test("fails if already pinned", async () => {
+      await expect(
+        client.send.pinRole({ args: [PINNED_ROLE], boxReferences: [getRoleBoxKey(PINNED_ROLE)] }),
+      ).rejects.toThrow("Role already pinned");
+    });
+
+    test("fails if role already in use", async () => {
+      await client.send.grantRole({
+        sender: admin,
+        args: [UNPINNED_ROLE, users[0].toString()],
+        boxReferences: [getRoleBoxKey(UNPINNED_ROLE), getAddressRolesBoxKey(UNPINNED_ROLE, users[0].publicKey)],
+      });
+      await expect(
+        client.send.pinRole({ args: [UNPINNED_ROLE], boxReferences: [getRoleBoxKey(UNPINNED_ROLE)] }),
+      ).rejects.toThrow("Role already in use");
+      expect(await client.hasRole({ args: [UNPINNED_ROLE, users[0].toString()] })).toBeTruthy();
+    });
+  });
+
+  describe("grant and revoke pinned role", () => {
+    test("grant succeeds up to maximum holders", async () => {
+      for (const user of users.slice(0, 3)) {
+        const res = await client.send.grantRole({
+          sender: admin,
+          args: [PINNED_ROLE, user.toString()],
+          // the admin role of a pinned role is in global state so no box is read
+          populateAppCallResources: false,
+        });
+        expect(res.confirmations[0].logs![0]).toEqual(
+          getEventBytes("RoleGranted(byte[16],address,address)", [PINNED_ROLE, user.publicKey, admin.publicKey]),
+        );
+      }
+      for (const user of users.slice(0, 3)) {
+        expect(await client.hasRole({ args: [PINNED_ROLE, user.toString()] })).toBeTruthy();
+      }
+      expect(await client.hasRole({ args: [PINNED_ROLE, users[3].toString()] })).toBeFalsy();
+    });
+
+    test("grant succeeds without emitting event if already holder", async () => {
+      const res = await client.send.grantRole({
+        sender: admin,
+        args: [PINNED_ROLE, users[1].toString()],
+        boxReferences: [getRoleBoxKey(PINNED_ROLE)],
+      });
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("grant fails if holders full", async () => {
+      await expect(
+        client.send.grantRole({
+          sender: admin,
+          args: [PINNED_ROLE, users[3].toString()],
+          boxReferences: [getRoleBoxKey(PINNED_ROLE)],
+        }),
+      ).rejects.toThrow("Pinned role holders full");
+    });
+
+    test("revoke succeeds and keeps other holders", async () => {
+      const res = await client.send.revokeRole({
+        sender: admin,
+        args: [PINNED_ROLE, users[1].toString()],
+        populateAppCallResources: false,
+      });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("RoleRevoked(byte[16],address,address)", [PINNED_ROLE, users[1].publicKey, admin.publicKey]),
+      );
+      expect(await client.hasRole({ args: [PINNED_ROLE, users[0].toString()] })).toBeTruthy();
+      expect(await client.hasRole({ args: [PINNED_ROLE, users[1].toString()] })).toBeFalsy();
+      expect(await client.hasRole({ args: [PINNED_ROLE, users[2].toString()] })).toBeTruthy();
+    });
+
+    test("revoke succeeds without emitting event if not holder", async () => {
+      const res = await client.send.revokeRole({
+        sender: admin,
+        args: [PINNED_ROLE, users[1].toString()],
+        boxReferences: [getRoleBoxKey(PINNED_ROLE)],
+      });
+      expect(res.confirmations[0].logs).toBeUndefined();
+    });
+
+    test("grant until fails", async () => {
+      await expect(
+        client.send.grantRoleUntil({
+          sender: admin,
+          args: [PINNED_ROLE, users[3].toString(), 2n ** 63n],
+          boxReferences: [getRoleBoxKey(PINNED_ROLE)],
+        }),
+      ).rejects.toThrow("Pinned role cannot expire");
+    });
+
+    test("renounce succeeds", async () => {
+      await client.send.renounceRole({ sender: users[2], args: [PINNED_ROLE] });
+      expect(await client.hasRole({ args: [PINNED_ROLE, users[2].toString()] })).toBeFalsy();
+    });
+  });
+
+  describe("set role admin of pinned role", () => {
+    test("stores admin role in global state", async () => {
+      const res = await client.send.setRoleAdmin({
+        args: [PINNED_ROLE, OTHER_ADMIN_ROLE],
+        populateAppCallResources: false,
+      });
+      expect(res.confirmations[0].logs![0]).toEqual(
+        getEventBytes("RoleAdminChanged(byte[16],byte[16],byte[16])", [
+          PINNED_ROLE,
+          DEFAULT_ADMIN_ROLE,
+          OTHER_ADMIN_ROLE,
+        ]),
+      );
+      expect(Uint8Array.from(await client.getRoleAdmin({ args: [PINNED_ROLE] }))).toEqual(OTHER_ADMIN_ROLE);
+      await expect(
+        client.send.grantRole({
+          sender: admin,
+          args: [PINNED_ROLE, users[2].toString()],
+          boxReferences: [getAddressRolesBoxKey(OTHER_ADMIN_ROLE, admin.publicKey)],
+          populateAppCallResources: false,
+        }),
+      ).rejects.toThrow("Access control unauthorised account");
+    });
+  });
+});
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+from algosdk import account, encoding
+
+from scripts.boxes import (
+    get_address_roles_box_key,
+    get_address_roles_box_keys,
+    get_address_roles_mask_box_key,
+    get_bucket_box_key,
+    get_bucket_box_keys,
+    get_bucket_group_box_key,
+    get_merkle_root_box_key,
+    get_role_box_key,
+    get_role_box_keys,
+    get_shard_box_key,
+)
+from scripts.identifiers import get_identifier, get_role_id
+
+
+def test_role_box_key_from_id_or_name():
+    role = get_role_id("MY_ROLE")
+    assert get_role_box_key(role) == b"role_" + role
+    assert get_role_box_key("MY_ROLE") == b"role_" + role
+
+
+def test_address_roles_box_key_from_public_key_or_address():
+    _, address = account.generate_account()
+    public_key = encoding.decode_address(address)
+    role = os.urandom(16)
+    assert get_address_roles_box_key(role, public_key) == b"address_roles_" + role + public_key
+    assert get_address_roles_box_key(role, address) == b"address_roles_" + role + public_key
+
+
+def test_bucket_box_key():
+    bucket_id = os.urandom(32)
+    assert get_bucket_box_key(bucket_id) == b"rate_limit_buckets_" + bucket_id
+
+
+def test_other_box_keys():
+    role, group_id, public_key = os.urandom(16), os.urandom(32), os.urandom(32)
+    assert get_shard_box_key("shards_", 258) == b"shards_\x01\x02"
+    assert get_bucket_group_box_key(group_id) == b"rate_limit_groups_" + group_id
+    assert get_address_roles_mask_box_key(public_key) == b"address_roles_" + public_key
+    assert get_merkle_root_box_key(role) == b"merkle_roots_" + role
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda: get_role_box_key(os.urandom(15)),
+        lambda: get_address_roles_box_key(os.urandom(16), os.urandom(31)),
+        lambda: get_bucket_box_key(os.urandom(16)),
+        lambda: get_bucket_group_box_key(os.urandom(31)),
+    ],
+)
+def test_invalid_lengths(call):
+    with pytest.raises(ValueError):
+        call()
+
+
+def test_bulk_keys_match_single_keys():
+    role = os.urandom(16)
+    public_keys = [os.urandom(32) for _ in range(1000)]
+    bucket_ids = [os.urandom(32) for _ in range(1000)]
+    names = [f"ROLE_{idx}" for idx in range(100)]
+
+    assert get_address_roles_box_keys(role, public_keys) == [get_address_roles_box_key(role, pk) for pk in public_keys]
+    assert get_bucket_box_keys(bucket_ids) == [get_bucket_box_key(bucket_id) for bucket_id in bucket_ids]
+    assert get_role_box_keys(names) == [get_role_box_key(get_role_id(name)) for name in names]
+
+
+def test_role_id_derivation_is_memoized():
+    get_identifier.cache_clear()
+    get_role_box_keys(["MY_ROLE"] * 1000)
+    assert get_identifier.cache_info().misses == 1
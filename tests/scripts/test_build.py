@@ -0,0 +1,188 @@
+import json
+import sys
+import textwrap
+
+import pytest
+
+from scripts.build import CACHE_FILE_NAME, build, get_source_tree, hash_build_inputs
+
+# stands in for the compiler, outputting a TEAL file and an ARC-56 spec per source file
+FAKE_COMPILER = """
+import sys
+from pathlib import Path
+
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("fake 1.0")
+    sys.exit(0)
+source = Path(args[-1])
+if "FAIL" in source.read_text():
+    print("compilation failed")
+    sys.exit(1)
+out_dir = Path(args[args.index("--out-dir") + 1])
+(out_dir / f"{source.stem}.approval.teal").write_text(source.read_text())
+(out_dir / f"{source.stem}.arc56.json").write_text("{}")
+with open(Path(__file__).parent / "compiled.log", "a") as log:
+    log.write(source.stem + "\\n")
+"""
+
+FLAGS = ("--output-teal", "--output-arc56")
+
+
+@pytest.fixture
+def contracts_dir(tmp_path):
+    contracts_dir = tmp_path / "contracts"
+    (contracts_dir / "library" / "test").mkdir(parents=True)
+    for package in ("", "library", "library/test"):
+        (contracts_dir / package / "__init__.py").write_text("")
+    (contracts_dir / "types.py").write_text("Bytes32 = bytes\n")
+    (contracts_dir / "library" / "Limiter.py").write_text(textwrap.dedent("""
+        from ..types import Bytes32
+
+        class Limiter(ARC4Contract):
+            pass
+    """))
+    (contracts_dir / "library" / "Other.py").write_text("class Other(ARC4Contract):\n    pass\n")
+    (contracts_dir / "library" / "test" / "LimiterExposed.py").write_text(textwrap.dedent("""
+        from .. import Limiter
+
+        class LimiterExposed(Limiter.Limiter):
+            pass
+    """))
+    (contracts_dir / "library" / "test" / "Large.py").write_text(textwrap.dedent("""
+        from contracts.types import Bytes32
+
+        class Large(ARC4Contract):
+            pass
+    """))
+    return contracts_dir
+
+
+@pytest.fixture
+def compiler(tmp_path):
+    script = tmp_path / "compiler.py"
+    script.write_text(FAKE_COMPILER)
+    log = tmp_path / "compiled.log"
+
+    def compiled() -> list[str]:
+        # the source files compiled since last called
+        stems = log.read_text().split() if log.exists() else []
+        log.unlink(missing_ok=True)
+        return sorted(stems)
+
+    return (sys.executable, str(script)), compiled
+
+
+def relative_tree(contracts_dir, path):
+    return [source.relative_to(contracts_dir.resolve()).as_posix() for source in get_source_tree(path, contracts_dir)]
+
+
+def test_source_tree_follows_relative_and_absolute_imports(contracts_dir):
+    assert relative_tree(contracts_dir, contracts_dir / "library" / "test" / "LimiterExposed.py") == [
+        "__init__.py",
+        "library/Limiter.py",
+        "library/__init__.py",
+        "library/test/LimiterExposed.py",
+        "library/test/__init__.py",
+        "types.py",
+    ]
+    assert relative_tree(contracts_dir, contracts_dir / "library" / "test" / "Large.py") == [
+        "__init__.py",
+        "library/__init__.py",
+        "library/test/Large.py",
+        "library/test/__init__.py",
+        "types.py",
+    ]
+
+
+def test_hash_changes_with_version_flags_and_sources(contracts_dir):
+    sources = get_source_tree(contracts_dir / "library" / "Limiter.py", contracts_dir)
+    digest = hash_build_inputs(sources, contracts_dir, "1.0", FLAGS)
+    assert hash_build_inputs(sources, contracts_dir, "1.0", FLAGS) == digest
+    assert hash_build_inputs(sources, contracts_dir, "1.1", FLAGS) != digest
+    assert hash_build_inputs(sources, contracts_dir, "1.0", FLAGS[:1]) != digest
+
+    (contracts_dir / "types.py").write_text("Bytes32 = bytearray\n")
+    assert hash_build_inputs(sources, contracts_dir, "1.0", FLAGS) != digest
+
+
+def test_build_outputs_and_skips_unchanged(tmp_path, contracts_dir, compiler):
+    command, compiled = compiler
+    specs_dir = tmp_path / "specs"
+
+    result = build(contracts_dir, specs_dir, command, FLAGS, jobs=2)
+    assert sorted(result.compiled) == [
+        "library/Limiter.py", "library/Other.py", "library/test/Large.py", "library/test/LimiterExposed.py"
+    ]
+    assert compiled() == ["Large", "Limiter", "LimiterExposed", "Other"]
+    assert (specs_dir / "teal" / "Limiter.approval.teal").exists()
+    assert (specs_dir / "arc56" / "Limiter.arc56.json").exists()
+
+    # nothing changed
+    result = build(contracts_dir, specs_dir, command, FLAGS)
+    assert result.compiled == []
+    assert len(result.skipped) == 4
+    assert compiled() == []
+
+    # only the contracts which import the changed module are recompiled
+    limiter = contracts_dir / "library" / "Limiter.py"
+    limiter.write_text(limiter.read_text() + "\n# changed\n")
+    build(contracts_dir, specs_dir, command, FLAGS)
+    assert compiled() == ["Limiter", "LimiterExposed"]
+
+    # a missing output is recompiled
+    (specs_dir / "arc56" / "Other.arc56.json").unlink()
+    build(contracts_dir, specs_dir, command, FLAGS)
+    assert compiled() == ["Other"]
+
+    build(contracts_dir, specs_dir, command, FLAGS, force=True)
+    assert compiled() == ["Large", "Limiter", "LimiterExposed", "Other"]
+
+
+def test_build_recompiles_when_flags_change(tmp_path, contracts_dir, compiler):
+    command, compiled = compiler
+    specs_dir = tmp_path / "specs"
+    build(contracts_dir, specs_dir, command, FLAGS)
+    compiled()
+
+    build(contracts_dir, specs_dir, command, FLAGS[:1])
+    assert compiled() == ["Large", "Limiter", "LimiterExposed", "Other"]
+
+
+def test_failed_compilation_is_retried(tmp_path, contracts_dir, compiler):
+    command, compiled = compiler
+    specs_dir = tmp_path / "specs"
+    other = contracts_dir / "library" / "Other.py"
+    other.write_text(other.read_text() + "# FAIL\n")
+
+    result = build(contracts_dir, specs_dir, command, FLAGS)
+    assert list(result.failed) == ["library/Other.py"]
+    assert "compilation failed" in result.failed["library/Other.py"]
+    assert "library/Other.py" not in json.loads((specs_dir / CACHE_FILE_NAME).read_text())
+    compiled()
+
+    result = build(contracts_dir, specs_dir, command, FLAGS)
+    assert list(result.failed) == ["library/Other.py"]
+    assert compiled() == []
+
+
+def test_removed_source_outputs_are_deleted(tmp_path, contracts_dir, compiler):
+    command, compiled = compiler
+    specs_dir = tmp_path / "specs"
+    build(contracts_dir, specs_dir, command, FLAGS)
+    compiled()
+
+    (contracts_dir / "library" / "Other.py").unlink()
+    result = build(contracts_dir, specs_dir, command, FLAGS)
+    assert result.removed == ["library/Other.py"]
+    assert compiled() == []
+    assert not (specs_dir / "teal" / "Other.approval.teal").exists()
+    assert not (specs_dir / "arc56" / "Other.arc56.json").exists()
+    assert "library/Other.py" not in json.loads((specs_dir / CACHE_FILE_NAME).read_text())
+    assert (specs_dir / "arc56" / "Limiter.arc56.json").exists()
+
+    # a forced build keeps track of the outputs too
+    (contracts_dir / "library" / "test" / "Large.py").unlink()
+    result = build(contracts_dir, specs_dir, command, FLAGS, force=True)
+    assert result.removed == ["library/test/Large.py"]
+    assert not (specs_dir / "arc56" / "Large.arc56.json").exists()
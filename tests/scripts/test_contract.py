@@ -0,0 +1,43 @@
+import hashlib
+import os
+
+import pytest
+
+from scripts.contract import PAGE_SIZE, calculate_program_sha256, main
+
+
+def naive_program_sha256(approval_program: bytes, clear_state_program: bytes) -> bytes:
+    # direct port of calculateProgramSha256 in tests/utils/contract.ts
+    program = b"approval"
+    for offset in range(0, len(approval_program), PAGE_SIZE):
+        program += hashlib.sha256(approval_program[offset:offset + PAGE_SIZE]).digest()
+    program += b"clear"
+    for offset in range(0, len(clear_state_program), PAGE_SIZE):
+        program += hashlib.sha256(clear_state_program[offset:offset + PAGE_SIZE]).digest()
+    return hashlib.sha256(program).digest()
+
+
+@pytest.mark.parametrize("approval_size", [1, PAGE_SIZE - 1, PAGE_SIZE, PAGE_SIZE + 1, 2 * PAGE_SIZE])
+@pytest.mark.parametrize("clear_size", [1, PAGE_SIZE + 1])
+def test_matches_naive_implementation(approval_size, clear_size):
+    approval_program, clear_state_program = os.urandom(approval_size), os.urandom(clear_size)
+    expected = naive_program_sha256(approval_program, clear_state_program)
+    assert calculate_program_sha256(approval_program, clear_state_program) == expected
+    assert calculate_program_sha256(memoryview(approval_program), bytearray(clear_state_program)) == expected
+
+
+def test_single_page_layout():
+    approval_program, clear_state_program = b"\x0b\x81\x01", b"\x0b\x81\x01"
+    page_digest = hashlib.sha256(approval_program).digest()
+    expected = hashlib.sha256(b"approval" + page_digest + b"clear" + page_digest).digest()
+    assert calculate_program_sha256(approval_program, clear_state_program) == expected
+
+
+def test_main_prints_program_sha256(tmp_path, capsys):
+    approval, clear = tmp_path / "approval.bin", tmp_path / "clear.bin"
+    approval.write_bytes(os.urandom(PAGE_SIZE + 10))
+    clear.write_bytes(os.urandom(10))
+
+    assert main([str(approval), str(clear)]) == 0
+    expected = naive_program_sha256(approval.read_bytes(), clear.read_bytes())
+    assert capsys.readouterr().out.strip() == expected.hex()
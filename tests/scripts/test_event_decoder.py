@@ -0,0 +1,133 @@
+import json
+import os
+import random
+
+import numpy as np
+import pytest
+
+from scripts.event_decoder import (
+    LogBuffer,
+    decode_logs,
+    get_selectors,
+    load_event_specs,
+    main,
+    uint256_to_float,
+    uint256_to_int,
+)
+from scripts.events import EVENT_FIELDS, decode_event, encode_event
+
+
+def write_spec(specs_dir, name, event_names):
+    # shaped like the events of the ARC-56 specs output by puyapy
+    events = [
+        {
+            "name": event_name,
+            "args": [{"type": arc4_type, "name": field} for field, arc4_type in EVENT_FIELDS[event_name]],
+        }
+        for event_name in event_names
+    ]
+    (specs_dir / f"{name}.arc56.json").write_text(json.dumps({"name": name, "events": events}))
+
+
+@pytest.fixture
+def specs(tmp_path):
+    write_spec(tmp_path, "MockAccessControl", ["RoleAdminChanged", "RoleGranted", "RoleRevoked"])
+    write_spec(tmp_path, "RateLimiterExposed", ["BucketAdded", "BucketConsumed", "BucketFilled", "BucketsConsumed"])
+    write_spec(tmp_path, "MockAccessControlCopy", ["RoleGranted"])
+    return load_event_specs(tmp_path)
+
+
+def random_logs(count: int) -> list[bytes]:
+    rng = random.Random(0)
+    logs = []
+    for _ in range(count):
+        kind = rng.randrange(5)
+        if kind == 0:
+            logs.append(encode_event("BucketConsumed", bucket_id=rng.randbytes(32), amount=rng.getrandbits(256)))
+        elif kind == 1:
+            logs.append(encode_event("BucketFilled", bucket_id=rng.randbytes(32), amount=rng.getrandbits(100)))
+        elif kind == 2:
+            logs.append(encode_event("RoleGranted", role=rng.randbytes(16), account=rng.randbytes(32),
+                                     sender=rng.randbytes(32)))
+        elif kind == 3:
+            logs.append(encode_event("BucketsConsumed", bucket_ids=[rng.randbytes(32)], amounts=[1]))
+        else:
+            # not an event, or too short to have a selector
+            logs.append(rng.randbytes(rng.randrange(8)))
+    return logs
+
+
+def test_specs_are_loaded_once_per_event(specs):
+    assert sorted(spec.name for spec in specs.values()) == [
+        "BucketAdded", "BucketConsumed", "BucketFilled", "BucketsConsumed", "RoleAdminChanged", "RoleGranted",
+        "RoleRevoked",
+    ]
+    widths = {spec.name: spec.dtype.itemsize for spec in specs.values() if spec.dtype is not None}
+    assert widths["RoleGranted"] == 16 + 32 + 32
+    assert widths["BucketAdded"] == 32 + 32 + 8
+    # dynamic arrays aren't fixed width
+    assert "BucketsConsumed" not in widths
+
+
+def test_selectors():
+    logs = LogBuffer.from_logs([b"\x01\x02\x03\x04\x05", b"\x01\x02", b"", b"\xff\x00\x00\x01"])
+    assert get_selectors(logs).tolist() == [0x01020304, 0, 0, 0xFF000001]
+
+
+def test_matches_python_decoder(specs):
+    logs = random_logs(2000)
+    decoded = decode_logs(LogBuffer.from_logs(logs), specs)
+
+    decoded_indices = set()
+    for name, events in decoded.items():
+        for idx, record in zip(events.indices, events.records):
+            expected = decode_event(logs[idx])
+            assert expected.name == name
+            for field, arc4_type in EVENT_FIELDS[name]:
+                if arc4_type == "uint256":
+                    assert uint256_to_int(record[field]) == expected.args[field]
+                elif arc4_type == "uint64":
+                    assert int(record[field]) == expected.args[field]
+                else:
+                    assert record[field].tobytes() == expected.args[field]
+            decoded_indices.add(int(idx))
+
+    # every other log is a dynamic event or not a fixed width event
+    for idx, log in enumerate(logs):
+        if idx not in decoded_indices:
+            event = decode_event(log) if len(log) >= 4 else None
+            assert event is None or event.name == "BucketsConsumed"
+
+
+def test_uint256_conversions(specs):
+    amounts = [0, 1, 2**64, 2**128 + 5, 2**256 - 1]
+    logs = LogBuffer.from_logs(encode_event("BucketConsumed", bucket_id=bytes(32), amount=amount) for amount in amounts)
+    records = decode_logs(logs, specs)["BucketConsumed"].records
+    assert uint256_to_int(records["amount"]).tolist() == amounts
+    assert np.allclose(uint256_to_float(records["amount"]), [float(amount) for amount in amounts])
+    # the least significant word of an amount below 2^64
+    assert int(records["amount"]["lo"][1, 1]) == 1
+
+
+def test_decodes_memory_mapped_logs(tmp_path, specs):
+    logs = random_logs(500)
+    LogBuffer.from_logs(logs).save(tmp_path / "logs")
+
+    mapped = LogBuffer.load(tmp_path / "logs")
+    assert isinstance(mapped.data, np.memmap)
+    assert len(mapped) == len(logs) and mapped[7] == logs[7]
+
+    in_memory = decode_logs(LogBuffer.from_logs(logs), specs)
+    for name, events in decode_logs(mapped, specs).items():
+        assert np.array_equal(events.indices, in_memory[name].indices)
+        assert events.records.tobytes() == in_memory[name].records.tobytes()
+
+
+def test_main(tmp_path, capsys):
+    write_spec(tmp_path, "RateLimiterExposed", ["BucketConsumed"])
+    LogBuffer.from_logs([encode_event("BucketConsumed", bucket_id=bytes(32), amount=1), os.urandom(3)]).save(
+        tmp_path / "logs"
+    )
+    assert main([str(tmp_path / "logs"), "--specs-dir", str(tmp_path)]) == 0
+    assert capsys.readouterr().out == "BucketConsumed: 1\nUndecoded: 1\n"
+    assert main([str(tmp_path / "logs"), "--specs-dir", str(tmp_path / "missing")]) == 1
@@ -0,0 +1,43 @@
+import pytest
+from algosdk import encoding
+
+from scripts.events import EVENT_FIELDS, decode_event, encode_event, get_event_signature, get_selector
+
+
+def test_selector_is_sha512_256_of_signature():
+    signature = "RoleGranted(byte[16],address,address)"
+    assert get_event_signature("RoleGranted") == signature
+    assert get_selector(signature) == encoding.checksum(signature.encode())[:4]
+
+
+def test_signatures_are_unique():
+    selectors = {get_selector(get_event_signature(name)) for name in EVENT_FIELDS}
+    assert len(selectors) == len(EVENT_FIELDS)
+
+
+def test_static_event_layout():
+    log = encode_event("BucketConsumed", bucket_id=bytes(range(32)), amount=2**200 + 1)
+    assert log[4:36] == bytes(range(32))
+    assert log[36:] == (2**200 + 1).to_bytes(32, "big")
+
+    event = decode_event(log)
+    assert event.name == "BucketConsumed"
+    assert event.args == {"bucket_id": bytes(range(32)), "amount": 2**200 + 1}
+
+
+def test_dynamic_event_layout():
+    bucket_ids, amounts = [bytes([1]) * 32, bytes([2]) * 32], [5, 6]
+    log = encode_event("BucketsConsumed", bucket_ids=bucket_ids, amounts=amounts)
+    # offsets of the two arrays, each after the 4 byte head and the previous array
+    assert log[4:8] == (4).to_bytes(2, "big") + (4 + 2 + 64).to_bytes(2, "big")
+    assert decode_event(log).args == {"bucket_ids": bucket_ids, "amounts": amounts}
+
+
+def test_unknown_log_is_ignored():
+    assert decode_event(b"\x00\x01\x02\x03") is None
+    assert decode_event(b"") is None
+
+
+def test_encode_rejects_wrong_size():
+    with pytest.raises(ValueError, match="Expected 32 bytes"):
+        encode_event("BucketRemoved", bucket_id=bytes(16))
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from scripts.identifiers import (
+    check_module,
+    format_constant,
+    get_bucket_id,
+    get_identifier,
+    get_role_id,
+    keccak256,
+    main,
+)
+
+LIBRARY_IDENTIFIERS = Path(__file__).parents[2] / "contracts" / "library" / "identifiers.py"
+
+
+def test_keccak256_matches_known_digest():
+    # keccak256 of the empty string, which differs from sha3_256
+    assert keccak256(b"").hex() == "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+
+
+def test_role_and_bucket_sizes():
+    assert get_role_id("MY_ROLE") == keccak256(b"MY_ROLE")[:16]
+    assert get_bucket_id("INBOUND") == keccak256(b"INBOUND")
+
+
+@pytest.mark.parametrize("size", [0, 33])
+def test_invalid_size(size):
+    with pytest.raises(ValueError):
+        get_identifier("MY_ROLE", size)
+
+
+def test_format_constant_round_trips():
+    source = format_constant("MY_ROLE", 16, "MY_ROLE_ROLE")
+    assert source.startswith('# keccak256("MY_ROLE")[:16]\nMY_ROLE_ROLE = b"\\x')
+    assert check_module(source) == []
+
+    namespace: dict[str, bytes] = {}
+    exec(source, namespace)
+    assert namespace["MY_ROLE_ROLE"] == get_role_id("MY_ROLE")
+
+
+def test_check_module_detects_mismatch():
+    source = format_constant("MY_ROLE", 16, "MY_ROLE_ROLE").replace('("MY_ROLE")', '("OTHER_ROLE")')
+    assert check_module(source) == ["MY_ROLE_ROLE"]
+
+
+def test_check_fails_without_constants(tmp_path, capsys):
+    with pytest.raises(ValueError, match="No identifier constants found"):
+        check_module('MY_ROLE_ROLE = b"\\x00"\n')
+
+    module = tmp_path / "identifiers.py"
+    module.write_text("")
+    assert main(["--check", str(module)]) == 1
+    assert "No identifier constants found" in capsys.readouterr().err
+
+
+def test_library_identifiers_match(capsys):
+    assert check_module(LIBRARY_IDENTIFIERS.read_text()) == []
+    assert main(["--check", str(LIBRARY_IDENTIFIERS)]) == 0
+
+    from contracts.library.identifiers import UPGRADEABLE_ADMIN_ROLE
+    assert UPGRADEABLE_ADMIN_ROLE == get_role_id("UPGRADEABLE_ADMIN")
+
+
+def test_main_prints_constants(capsys):
+    assert main(["--role", "MY_ROLE", "--bucket", "INBOUND"]) == 0
+    out = capsys.readouterr().out
+    assert "MY_ROLE_ROLE = " in out
+    assert "INBOUND_BUCKET = " in out
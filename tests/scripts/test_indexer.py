@@ -0,0 +1,95 @@
+import base64
+import json
+from pathlib import Path
+
+from scripts.boxes import get_address_roles_box_key, get_bucket_box_key, get_role_box_key
+from scripts.identifiers import get_bucket_id, get_role_id
+from scripts.indexer import Bucket, Checkpoint, LogRecord, StateIndex
+
+FIXTURE = Path(__file__).parent / "fixtures" / "indexer_logs.json"
+
+DEFAULT_ADMIN_ROLE = bytes(16)
+ROLE = get_role_id("ROLE")
+ROLE_ADMIN = get_role_id("ROLE_ADMIN")
+BUCKET = get_bucket_id("INBOUND")
+# addresses of the accounts in the fixture
+ADMIN = bytes(range(32))
+USER = bytes(range(32, 64))
+
+
+def load_records() -> list[LogRecord]:
+    return [
+        LogRecord(record["round"], record["intra_round_offset"], record["log_index"], record["timestamp"],
+                  base64.b64decode(record["log"]))
+        for record in json.loads(FIXTURE.read_text())
+    ]
+
+
+def test_applies_recorded_logs():
+    index = StateIndex()
+    # one of the logs is not an event
+    assert index.apply_records(load_records()) == 12
+
+    assert not index.has_role(DEFAULT_ADMIN_ROLE, ADMIN, 1130)
+    assert index.get_role_admin(ROLE) == ROLE_ADMIN
+    assert index.has_role(ROLE, USER, 1999)
+    assert not index.has_role(ROLE, USER, 2000)
+    assert index.get_role_holders(ROLE, 1130) == [USER]
+
+    # added with 1000 capacity at 1000, refilling 10 per second:
+    # 1050: 1000 - 800 = 200
+    # 1100: 200 + 500 - 500 = 200
+    # 1110: 200 + 100 = 300 then reduced by the 500 decrease in limit to 0
+    # 1120: 0 + 50 + 50 = 100
+    # 1130: 100 + 50 - 20 = 130
+    assert index.buckets[BUCKET] == Bucket(limit=500, current_capacity=130, duration=100, last_updated=1130)
+    assert index.get_current_capacity(BUCKET, 1150) == 230
+    assert index.get_current_capacity(BUCKET, 9999) == 500
+
+    assert index.scheduled_upgrade == (bytes(32), 5000)
+    assert index.checkpoint == Checkpoint(17, 0, 0)
+
+
+def test_applied_logs_are_skipped():
+    records = load_records()
+    index = StateIndex()
+    index.apply_records(records)
+    assert index.apply_records(records) == 0
+    assert index.buckets[BUCKET].current_capacity == 130
+
+
+def test_resumes_from_saved_checkpoint(tmp_path):
+    records = load_records()
+    expected = StateIndex()
+    expected.apply_records(records)
+
+    # stop part way through a round, then restart from the saved index and refetch from the checkpoint's round
+    index = StateIndex()
+    index.apply_records(records[:9])
+    index.save(tmp_path / "index.json")
+
+    restarted = StateIndex.load(tmp_path / "index.json")
+    assert restarted == index
+    assert restarted.apply_records(record for record in records if record.round >= restarted.checkpoint.round) == 3
+    assert restarted == expected
+
+
+def test_from_boxes():
+    bucket = Bucket(limit=1000, current_capacity=400, duration=100, last_updated=1000)
+    boxes = {
+        get_role_box_key(ROLE): ROLE_ADMIN,
+        get_address_roles_box_key(ROLE, ADMIN): b"\x80",
+        get_address_roles_box_key(ROLE, USER): (2000).to_bytes(8, "big"),
+        get_bucket_box_key(BUCKET): b"".join(
+            value.to_bytes(size, "big") for value, size in ((1000, 32), (400, 32), (100, 8), (1000, 8))
+        ),
+        b"other": b"",
+    }
+    index = StateIndex.from_boxes(boxes, round=16)
+    assert index.get_role_admin(ROLE) == ROLE_ADMIN
+    assert index.grants == {(ROLE, ADMIN): 0, (ROLE, USER): 2000}
+    assert index.buckets == {BUCKET: bucket}
+
+    # logs up to and including the snapshot round are already reflected in the boxes
+    assert index.apply_records(load_records()) == 1
+    assert index.buckets[BUCKET].current_capacity == 1000 - 20
@@ -0,0 +1,65 @@
+import hashlib
+import json
+
+import pytest
+from algosdk import account, encoding
+
+from scripts.merkle import build_levels, build_tree, get_leaf, hash_pair, main, verify_proof
+
+
+def random_addresses(count: int) -> list[str]:
+    return [account.generate_account()[1] for _ in range(count)]
+
+
+def test_leaf_is_prefixed_hash_of_public_key():
+    address = random_addresses(1)[0]
+    assert get_leaf(address) == hashlib.sha256(b"\x00" + encoding.decode_address(address)).digest()
+
+
+def test_hash_pair_is_order_independent():
+    left, right = hashlib.sha256(b"left").digest(), hashlib.sha256(b"right").digest()
+    assert hash_pair(left, right) == hash_pair(right, left)
+
+
+def test_single_member_root_is_leaf():
+    address = random_addresses(1)[0]
+    root, proofs = build_tree([address])
+    assert root == get_leaf(address)
+    assert proofs[address] == []
+
+
+@pytest.mark.parametrize("count", [2, 3, 5, 8, 13])
+def test_every_proof_verifies(count):
+    addresses = random_addresses(count)
+    root, proofs = build_tree(addresses)
+    for address in addresses:
+        assert verify_proof(root, get_leaf(address), proofs[address])
+
+
+def test_proof_does_not_verify_for_non_member():
+    addresses = random_addresses(4)
+    root, proofs = build_tree(addresses[:3])
+    assert not verify_proof(root, get_leaf(addresses[3]), proofs[addresses[0]])
+
+
+def test_odd_node_is_carried_up():
+    leaves = [hashlib.sha256(bytes([idx])).digest() for idx in range(3)]
+    levels = build_levels(leaves)
+    assert levels[1] == [hash_pair(leaves[0], leaves[1]), leaves[2]]
+
+
+def test_no_leaves():
+    with pytest.raises(ValueError):
+        build_levels([])
+
+
+def test_main_prints_root_and_proofs(tmp_path, capsys):
+    addresses = random_addresses(3)
+    members = tmp_path / "members.txt"
+    members.write_text("\n".join(addresses) + "\n")
+
+    assert main([str(members)]) == 0
+    output = json.loads(capsys.readouterr().out)
+    root, proofs = build_tree(addresses)
+    assert output["root"] == root.hex()
+    assert output["proofs"][addresses[0]] == [node.hex() for node in proofs[addresses[0]]]
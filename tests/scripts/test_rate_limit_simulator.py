@@ -0,0 +1,136 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from scripts.indexer import Bucket
+from scripts.rate_limit_simulator import main, simulate
+
+START = 1_700_000_000
+
+
+def replay(timestamps, amounts, limit, duration, initial=None):
+    # one bucket at a time, following RateLimiter step by step
+    if initial is None:
+        bucket = Bucket(limit, limit, duration, timestamps[0])
+    else:
+        bucket = copy.copy(initial)
+        bucket.refill(timestamps[0])
+        if limit < bucket.limit:
+            diff = bucket.limit - limit
+            bucket.current_capacity = bucket.current_capacity - diff if bucket.current_capacity > diff else 0
+        else:
+            bucket.current_capacity += limit - bucket.limit
+        bucket.limit = limit
+        bucket.refill(timestamps[0])
+        bucket.duration = duration
+
+    outcomes = []
+    for timestamp, amount in zip(timestamps, amounts):
+        refilled = copy.copy(bucket)
+        refilled.refill(timestamp)
+        if not bucket.duration:
+            outcomes.append(True)
+        elif amount < 0:
+            refilled.current_capacity += min(-amount, refilled.limit - refilled.current_capacity)
+            bucket = refilled
+            outcomes.append(True)
+        elif amount <= refilled.current_capacity:
+            refilled.current_capacity -= amount
+            bucket = refilled
+            outcomes.append(True)
+        else:
+            outcomes.append(False)
+    return outcomes, bucket
+
+
+def random_traffic(seed, count, max_amount):
+    rng = random.Random(seed)
+    timestamps = sorted(START + rng.randrange(0, 7 * 86_400) for _ in range(count))
+    # one in five is a fill
+    amounts = [-rng.randrange(max_amount) if rng.random() < 0.2 else rng.randrange(max_amount) for _ in range(count)]
+    return timestamps, amounts
+
+
+@pytest.mark.parametrize("max_amount", [1_000, 10**21])
+@pytest.mark.parametrize("initial", [None, Bucket(5_000, 1_234, 3_600, START - 100), Bucket(5_000, 0, 0, START - 100)])
+def test_matches_step_by_step_replay(max_amount, initial):
+    timestamps, amounts = random_traffic(max_amount, 300, max_amount)
+    scale = max_amount // 1_000
+    limits = [limit * scale for limit in (0, 500, 2_000, 5_000, 20_000)] * 3
+    durations = [duration for duration in (0, 3_601, 86_400) for _ in range(5)]
+    if initial is not None:
+        initial = Bucket(
+            initial.limit * scale, initial.current_capacity * scale, initial.duration, initial.last_updated
+        )
+
+    result = simulate(timestamps, amounts, limits, durations, initial=initial, record_outcomes=True)
+    assert result.final_capacity.dtype == (np.int64 if max_amount == 1_000 else object)
+    for idx, (limit, duration) in enumerate(zip(limits, durations)):
+        outcomes, bucket = replay(timestamps, amounts, limit, duration, initial)
+        assert result.outcomes[idx].tolist() == outcomes
+        assert result.rejected[idx] == outcomes.count(False)
+        assert result.accepted[idx] == outcomes.count(True)
+        assert result.rejected_amount[idx] == sum(
+            amount for amount, outcome in zip(amounts, outcomes) if not outcome
+        )
+        assert (result.final_capacity[idx], result.final_last_updated[idx]) == (
+            bucket.current_capacity, bucket.last_updated
+        )
+
+
+def test_rejected_consume_leaves_bucket_unchanged():
+    # refills 1 per 10 seconds, the rejected consume at 15 would otherwise lose the refill of its 5 seconds
+    result = simulate([START, START + 15, START + 20], [10, 2, 2], [10], [100], record_outcomes=True)
+    assert result.outcomes.tolist() == [[True, False, True]]
+    assert result.final_capacity.tolist() == [0]
+    assert result.final_last_updated.tolist() == [START + 20]
+
+
+def test_rejected_amount_is_exact():
+    # each amount fits in int64 but their total doesn't
+    result = simulate([START] * 8, [2**61] * 8, [10], [10])
+    assert result.final_capacity.dtype == np.int64
+    assert result.rejected.tolist() == [8]
+    assert result.rejected_amount.tolist() == [2**64]
+
+
+def test_time_at_capacity():
+    # full at the start, then empty and refilling 1 per second, so full again 10 seconds after the consume
+    result = simulate([START + 5], [10], [10, 10, 10], [10, 20, 0], start_timestamp=START, end_timestamp=START + 100)
+    assert result.time_at_capacity.tolist() == [5 + 85, 5 + 75, 0]
+
+    # a partial refill lands on the limit after the ceiling of the time needed
+    result = simulate([START], [7], [3], [10], end_timestamp=START + 30)
+    assert result.rejected.tolist() == [1]
+    assert result.time_at_capacity.tolist() == [30]
+    result = simulate([START], [2], [3], [10], end_timestamp=START + 30)
+    assert result.time_at_capacity.tolist() == [30 - 7]
+
+
+def test_lower_limit_reduces_capacity():
+    initial = Bucket(100, 60, 100, START)
+    result = simulate([START], [0], [50, 10, 150], [100, 100, 100], initial=initial)
+    assert result.final_capacity.tolist() == [10, 0, 110]
+
+
+def test_rejects_malformed_input():
+    with pytest.raises(ValueError, match="Mismatched timestamps and amounts"):
+        simulate([START], [], [1], [1])
+    with pytest.raises(ValueError, match="Mismatched limits and durations"):
+        simulate([START], [1], [1, 2], [1])
+    with pytest.raises(ValueError, match="non-decreasing"):
+        simulate([START + 1, START], [1, 1], [1], [1])
+    with pytest.raises(ValueError, match="non-negative"):
+        simulate([START], [1], [-1], [1])
+
+
+def test_main(tmp_path, capsys):
+    traffic = tmp_path / "traffic.csv"
+    traffic.write_text(f"timestamp,amount\n{START + 10},70\n{START},50\n{START + 20},-30\n")
+    assert main([str(traffic), "--limit", "100", "200", "--duration", "100"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    assert lines[1].split()[:3] == ["100", "100", "1"]
+    assert lines[2].split()[:3] == ["200", "100", "0"]
@@ -0,0 +1,183 @@
+import json
+
+from scripts.teal_report import (
+    CostAnalysis,
+    Instruction,
+    Program,
+    analyse,
+    find_regressions,
+    get_opcode_cost,
+    get_program_pages,
+    main,
+)
+
+# shaped like the router and subroutines output by puyapy
+APPROVAL_TEAL = """#pragma version 11
+#pragma typetrack false
+
+// algopy.arc4.ARC4Contract.approval_program() -> uint64:
+main:
+    intcblock 0 1
+    txn NumAppArgs
+    bz main_bare_routing@5
+    pushbytess 0x01020304 0x05060708 // method "hash(byte[])void", method "sum(uint64)void"
+    txna ApplicationArgs 0
+    match main_hash_route@3 main_sum_route@4
+    err
+
+main_hash_route@3:
+    txna ApplicationArgs 1
+    callsub hash_twice
+    pop
+    intc_1 // 1
+    return
+
+main_sum_route@4:
+    txna ApplicationArgs 1
+    btoi
+    callsub sum
+    pop
+    intc_1 // 1
+    return
+
+main_bare_routing@5:
+    txn OnCompletion
+    !
+    return
+
+// tests.Example.hash_twice(value: bytes) -> bytes:
+hash_twice:
+    proto 1 1
+    frame_dig -1
+    sha256
+    frame_dig -1
+    len
+    bz hash_twice_after@2
+    sha256
+    pushbytes "//" // not a comment
+    concat
+
+hash_twice_after@2:
+    retsub
+
+// tests.Example.sum(n: uint64) -> uint64:
+sum:
+    proto 1 1
+    intc_0 // 0
+
+sum_while_top@1:
+    dup
+    frame_dig -1
+    <
+    bz sum_after_while@2
+    intc_1 // 1
+    +
+    b sum_while_top@1
+
+sum_after_while@2:
+    retsub
+"""
+
+
+def write_contract(teal_dir, name, approval_size=None, clear_size=None):
+    (teal_dir / f"{name}.approval.teal").write_text(APPROVAL_TEAL)
+    if approval_size is not None:
+        (teal_dir / f"{name}.approval.bin").write_bytes(bytes(approval_size))
+        (teal_dir / f"{name}.clear.bin").write_bytes(bytes(clear_size))
+
+
+def test_abi_methods_and_subroutines():
+    program = Program(APPROVAL_TEAL)
+    assert program.get_abi_methods() == {"hash(byte[])void": "main_hash_route@3", "sum(uint64)void": "main_sum_route@4"}
+    assert program.get_subroutines() == ["hash_twice", "sum"]
+
+
+def test_subroutine_cost_takes_most_expensive_branch():
+    analysis = CostAnalysis(Program(APPROVAL_TEAL))
+    # proto, frame_dig, sha256, frame_dig, len, bz, sha256, pushbytes, concat, retsub
+    cost = analysis.get_subroutine_cost("hash_twice")
+    assert cost.cost == 1 + 1 + 35 + 1 + 1 + 1 + 35 + 1 + 1 + 1
+    assert not cost.has_loop
+
+
+def test_loop_is_flagged():
+    analysis = CostAnalysis(Program(APPROVAL_TEAL))
+    # proto, intc_0, loop condition (dup, frame_dig, <, bz) then the more expensive of the body up to the jump back
+    # (intc_1, +, b) or the exit (retsub)
+    cost = analysis.get_subroutine_cost("sum")
+    assert cost.cost == 2 + 4 + 3
+    assert cost.has_loop
+
+
+def test_method_cost_includes_router_and_subroutines():
+    analysis = CostAnalysis(Program(APPROVAL_TEAL))
+    # txna, callsub, pop, intc_1, return
+    hash_route = 5 + analysis.get_subroutine_cost("hash_twice").cost
+    assert analysis.get_cost("main_hash_route@3").cost == hash_route
+    # intcblock, txn, bz, pushbytess, txna, match then the most expensive route
+    assert analysis.get_cost("main").cost == 6 + hash_route
+
+
+def test_opcode_cost_depends_on_curve():
+    assert get_opcode_cost(Instruction("ec_add", ["BN254g1"], "")) == 125
+    assert get_opcode_cost(Instruction("ec_add", ["BLS12_381g2"], "")) == 290
+    assert get_opcode_cost(Instruction("ecdsa_verify", ["Secp256r1"], "")) == 2500
+    assert get_opcode_cost(Instruction("sha256", [], "")) == 35
+    assert get_opcode_cost(Instruction("pushint", ["5"], "")) == 1
+
+
+def test_program_pages():
+    assert get_program_pages(2000, 48) == 1
+    assert get_program_pages(2000, 49) == 2
+    assert get_program_pages(8000, 192) == 4
+
+
+def test_analyse_reports_methods_loops_and_size(tmp_path):
+    write_contract(tmp_path, "Example", approval_size=3000, clear_size=10)
+    report = analyse(tmp_path)
+    assert set(report["Example"]["methods"]) == {"hash(byte[])void", "sum(uint64)void"}
+    assert set(report["Example"]["subroutines"]) == {"hash_twice", "sum"}
+    assert report["Example"]["loops"] == ["sum(uint64)void", "sum"]
+    assert report["Example"]["bytes"] == 3010
+    assert report["Example"]["pages"] == 2
+
+
+def test_size_is_omitted_without_bytecode(tmp_path):
+    write_contract(tmp_path, "Example")
+    assert "bytes" not in analyse(tmp_path)["Example"]
+
+
+def test_find_regressions():
+    report = {"Example": {"methods": {"a()void": 12, "new()void": 50}, "subroutines": {"s": 5}, "pages": 2}}
+    baseline = {"Example": {"methods": {"a()void": 10}, "subroutines": {"s": 5}, "pages": 1}}
+    assert find_regressions(report, baseline) == [
+        "Example a()void: 10 -> 12 opcodes", "Example new()void: not in baseline, 50 opcodes", "Example pages: 1 -> 2"
+    ]
+    assert find_regressions(report, baseline, tolerance=2) == [
+        "Example new()void: not in baseline, 50 opcodes", "Example pages: 1 -> 2"
+    ]
+    assert find_regressions(report, {}) == ["Example: not in baseline"]
+
+
+def test_main_updates_baseline_and_checks(tmp_path, capsys):
+    teal_dir, baseline = tmp_path / "teal", tmp_path / "baseline.json"
+    teal_dir.mkdir()
+    write_contract(teal_dir, "Example")
+
+    args = ["--teal-dir", str(teal_dir), "--baseline", str(baseline)]
+    # fails until the baseline is recorded
+    assert main([*args, "--check"]) == 1
+    assert "run --update-baseline first" in capsys.readouterr().err
+    assert main([*args, "--update-baseline"]) == 0
+    assert main([*args, "--check"]) == 0
+
+    # lower the baseline so the current cost is a regression
+    costs = json.loads(baseline.read_text())
+    costs["Example"]["subroutines"]["hash_twice"] -= 1
+    baseline.write_text(json.dumps(costs))
+    assert main([*args, "--check"]) == 1
+    assert "Regression: Example hash_twice" in capsys.readouterr().err
+
+
+def test_main_without_teal(tmp_path):
+    assert main(["--teal-dir", str(tmp_path)]) == 1
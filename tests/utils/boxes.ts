@@ -17,3 +17,26 @@ export function getBucketBoxKey(bucketId: Uint8Array): Uint8Array {
   if (bucketId.length !== 32) throw Error("Bucket id must be 32 bytes");
   return Uint8Array.from([...enc.encode("rate_limit_buckets_"), ...bucketId]);
 }
+
+// ShardedUInt64SetLib
+export function getShardBoxKey(boxPrefix: string, shard: number | bigint): Uint8Array {
+  return Uint8Array.from([...enc.encode(boxPrefix), ...convertNumberToBytes(shard, 2)]);
+}
+
+// PackedRateLimiter
+export function getBucketGroupBoxKey(groupId: Uint8Array): Uint8Array {
+  if (groupId.length !== 32) throw Error("Group id must be 32 bytes");
+  return Uint8Array.from([...enc.encode("rate_limit_groups_"), ...groupId]);
+}
+
+// BitmaskAccessControl
+export function getAddressRolesMaskBoxKey(addressPk: Uint8Array): Uint8Array {
+  if (addressPk.length !== 32) throw Error("Address must be 32 bytes");
+  return Uint8Array.from([...enc.encode("address_roles_"), ...addressPk]);
+}
+
+// AccessControlWithMerkleRoles
+export function getMerkleRootBoxKey(role: Uint8Array): Uint8Array {
+  if (role.length !== 16) throw Error("Role must be 16 bytes");
+  return Uint8Array.from([...enc.encode("merkle_roots_"), ...role]);
+}
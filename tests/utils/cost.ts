@@ -0,0 +1,21 @@
+import { type modelsv2 } from "algosdk";
+
+type SimulatableComposer = {
+  simulate(params: {
+    allowUnnamedResources?: boolean;
+    extraOpcodeBudget?: number;
+    skipSignatures?: boolean;
+  }): Promise<{ simulateResponse: modelsv2.SimulateResponse }>;
+};
+
+export async function getAppBudgetConsumed(composer: SimulatableComposer): Promise<number> {
+  const { simulateResponse } = await composer.simulate({
+    allowUnnamedResources: true,
+    extraOpcodeBudget: 320_000,
+    skipSignatures: true,
+  });
+  const [txnGroup] = simulateResponse.txnGroups;
+  if (txnGroup.failureMessage) throw Error(txnGroup.failureMessage);
+  if (txnGroup.appBudgetConsumed === undefined) throw Error("Unknown app budget consumed");
+  return Number(txnGroup.appBudgetConsumed);
+}
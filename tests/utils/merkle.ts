@@ -0,0 +1,38 @@
+import { sha256 } from "@noble/hashes/sha2";
+
+function compare(a: Uint8Array, b: Uint8Array): number {
+  for (let i = 0; i < a.length; i++) if (a[i] !== b[i]) return a[i] - b[i];
+  return 0;
+}
+
+export function getMerkleLeaf(addressPk: Uint8Array): Uint8Array {
+  if (addressPk.length !== 32) throw Error("Address must be 32 bytes");
+  return sha256(Uint8Array.from([0, ...addressPk]));
+}
+
+export function hashMerklePair(a: Uint8Array, b: Uint8Array): Uint8Array {
+  const [left, right] = compare(a, b) < 0 ? [a, b] : [b, a];
+  return sha256(Uint8Array.from([1, ...left, ...right]));
+}
+
+export function getMerkleTree(addressPks: Uint8Array[]): { root: Uint8Array; proofs: Uint8Array[][] } {
+  if (addressPks.length === 0) throw Error("No leaves");
+  let level = addressPks.map(getMerkleLeaf);
+  const indexes = addressPks.map((_, i) => i);
+  const proofs: Uint8Array[][] = addressPks.map(() => []);
+
+  while (level.length > 1) {
+    // record sibling of each leaf's current node, a node without sibling is carried up unchanged
+    indexes.forEach((index, i) => {
+      const sibling = index ^ 1;
+      if (sibling < level.length) proofs[i].push(level[sibling]);
+      indexes[i] = Math.floor(index / 2);
+    });
+
+    const parents: Uint8Array[] = [];
+    for (let i = 0; i + 1 < level.length; i += 2) parents.push(hashMerklePair(level[i], level[i + 1]));
+    if (level.length % 2) parents.push(level[level.length - 1]);
+    level = parents;
+  }
+  return { root: level[0], proofs };
+}